@@ -0,0 +1,46 @@
+"""015: allow ORDER_AMENDED in wal_events.event_type
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE wal_events DROP CONSTRAINT ck_wal_event_type;")
+    op.execute("""
+        ALTER TABLE wal_events ADD CONSTRAINT ck_wal_event_type CHECK (
+            event_type IN (
+                'ORDER_ACCEPTED',
+                'ORDER_MATCHED',
+                'ORDER_PARTIALLY_FILLED',
+                'ORDER_CANCELLED',
+                'ORDER_EXPIRED',
+                'ORDER_AMENDED'
+            )
+        );
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM wal_events WHERE event_type = 'ORDER_AMENDED';")
+    op.execute("ALTER TABLE wal_events DROP CONSTRAINT ck_wal_event_type;")
+    op.execute("""
+        ALTER TABLE wal_events ADD CONSTRAINT ck_wal_event_type CHECK (
+            event_type IN (
+                'ORDER_ACCEPTED',
+                'ORDER_MATCHED',
+                'ORDER_PARTIALLY_FILLED',
+                'ORDER_CANCELLED',
+                'ORDER_EXPIRED'
+            )
+        );
+    """)
@@ -0,0 +1,34 @@
+"""016: create journal_projection table
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE journal_projection (
+            id          SMALLINT    PRIMARY KEY,
+            last_seq    BIGINT      NOT NULL DEFAULT 0,
+            updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            CONSTRAINT ck_journal_projection_singleton CHECK (id = 1)
+        );
+    """)
+    op.execute("INSERT INTO journal_projection (id, last_seq) VALUES (1, 0);")
+    op.execute(
+        "COMMENT ON TABLE journal_projection IS "
+        "'Last command journal seq applied to the projected tables (journal mode)';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS journal_projection CASCADE;")
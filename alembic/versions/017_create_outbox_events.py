@@ -0,0 +1,43 @@
+"""017: create outbox_events table
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE outbox_events (
+            id              BIGSERIAL       PRIMARY KEY,
+            event_type      VARCHAR(30)     NOT NULL,
+            market_id       VARCHAR(64),
+            user_id         VARCHAR(64),
+            payload         JSONB           NOT NULL,
+            created_at      TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+            CONSTRAINT ck_outbox_event_type CHECK (
+                event_type IN (
+                    'ORDER_UPDATED',
+                    'TRADE_EXECUTED',
+                    'BALANCE_CHANGED',
+                    'POSITION_CHANGED'
+                )
+            )
+        );
+    """)
+    op.execute(
+        "COMMENT ON TABLE outbox_events IS "
+        "'Transactional outbox — rows are deleted once the relay has published them';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS outbox_events CASCADE;")
@@ -0,0 +1,31 @@
+"""018: add wal_events.book_seq (per-market order book sequence number)
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE wal_events ADD COLUMN book_seq BIGINT;")
+    op.execute(
+        "CREATE INDEX idx_wal_market_book_seq ON wal_events (market_id, book_seq DESC) "
+        "WHERE book_seq IS NOT NULL;"
+    )
+    op.execute(
+        "COMMENT ON COLUMN wal_events.book_seq IS "
+        "'Order book version after the engine command that wrote this row';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_wal_market_book_seq;")
+    op.execute("ALTER TABLE wal_events DROP COLUMN IF EXISTS book_seq;")
@@ -0,0 +1,46 @@
+"""019: create market_candles table
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE market_candles (
+            market_id       VARCHAR(64)     NOT NULL,
+            interval        VARCHAR(3)      NOT NULL,
+            bucket_start    TIMESTAMPTZ     NOT NULL,
+            open_price      SMALLINT        NOT NULL,
+            high_price      SMALLINT        NOT NULL,
+            low_price       SMALLINT        NOT NULL,
+            close_price     SMALLINT        NOT NULL,
+            volume          BIGINT          NOT NULL,
+            trade_count     INT             NOT NULL,
+            updated_at      TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (market_id, interval, bucket_start),
+            CONSTRAINT ck_market_candles_interval CHECK (interval IN ('1m', '5m', '1h', '1d')),
+            CONSTRAINT ck_market_candles_prices   CHECK (
+                low_price BETWEEN 1 AND 99 AND high_price BETWEEN low_price AND 99
+            ),
+            CONSTRAINT ck_market_candles_volume   CHECK (volume > 0 AND trade_count > 0)
+        );
+    """)
+    op.execute(
+        "COMMENT ON TABLE market_candles IS "
+        "'OHLCV per market and interval (YES prices) — merged in from the live aggregator, "
+        "rebuilt from trades by scripts/backfill_candles.py';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS market_candles CASCADE;")
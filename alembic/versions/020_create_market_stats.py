@@ -0,0 +1,43 @@
+"""020: create market_stats table
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are created by the first trade of each market; markets that already
+    # traded are filled in by `python -m scripts.reconcile_market_stats`.
+    op.execute("""
+        CREATE TABLE market_stats (
+            market_id       VARCHAR(64)     PRIMARY KEY,
+            trade_count     BIGINT          NOT NULL DEFAULT 0,
+            volume          BIGINT          NOT NULL DEFAULT 0,
+            notional        BIGINT          NOT NULL DEFAULT 0,
+            fees            BIGINT          NOT NULL DEFAULT 0,
+            trader_sketch   BYTEA           NOT NULL,
+            reconciled_at   TIMESTAMPTZ     DEFAULT NULL,
+            updated_at      TIMESTAMPTZ     NOT NULL DEFAULT NOW(),
+            CONSTRAINT ck_market_stats_totals CHECK (
+                trade_count >= 0 AND volume >= 0 AND notional >= 0 AND fees >= 0
+            )
+        );
+    """)
+    op.execute(
+        "COMMENT ON TABLE market_stats IS "
+        "'Running trade totals per market, updated with every trades insert; "
+        "trader_sketch is a HyperLogLog of buy/sell user ids';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS market_stats CASCADE;")
@@ -0,0 +1,44 @@
+"""021: add positions.version
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Like accounts.version: POSITION_CHANGED events carry it so consumers can
+    # drop snapshots older than one they already applied. Bumped by trigger
+    # because positions are written from many places; writers that set the
+    # version themselves (the journal projector) keep theirs.
+    op.execute("ALTER TABLE positions ADD COLUMN version BIGINT NOT NULL DEFAULT 0;")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION fn_bump_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.version = OLD.version THEN
+                NEW.version = OLD.version + 1;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_positions_version
+            BEFORE UPDATE ON positions
+            FOR EACH ROW EXECUTE FUNCTION fn_bump_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_positions_version ON positions;")
+    op.execute("DROP FUNCTION IF EXISTS fn_bump_version();")
+    op.execute("ALTER TABLE positions DROP COLUMN IF EXISTS version;")
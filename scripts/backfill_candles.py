@@ -0,0 +1,53 @@
+"""Backfill market_candles from the trades table.
+
+Streams each market's trades in keyset chunks (idx_trades_market_time) and
+rewrites every 1m/5m/1h/1d bucket that closed at least --settle-seconds
+before the run started, committing per chunk. Safe to re-run, and safe
+while the app runs with CANDLES_ENABLED as long as --settle-seconds exceeds
+CANDLES_FLUSH_MS: the live aggregator has already saved those buckets, and
+the backfill replaces them with the same totals.
+
+Needs Postgres, e.g. ``docker compose up -d && alembic upgrade head``.
+
+Usage:
+    JWT_SECRET=x python -m scripts.backfill_candles                  # every market
+    JWT_SECRET=x python -m scripts.backfill_candles --market mkt-1 --chunk-size 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+from src.pm_common.database import batch_session_factory, dispose_engines
+from src.pm_market.application.candles import backfill_market
+from src.pm_market.infrastructure.persistence import MarketRepository
+
+
+async def main(args: argparse.Namespace) -> int:
+    before = datetime.now(UTC) - timedelta(seconds=args.settle_seconds)
+    repo = MarketRepository()
+    try:
+        async with batch_session_factory() as db:
+            market_ids = args.market or await repo.list_market_ids(db)
+            for market_id in market_ids:
+                start = time.perf_counter()
+                written = await backfill_market(db, market_id, before, args.chunk_size, repo)
+                print(f"{market_id}: {written} candles in {time.perf_counter() - start:.1f}s")
+    finally:
+        await dispose_engines()
+    return 0
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--market", action="append", help="market id (repeatable); default all")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="trades read per query")
+    parser.add_argument("--settle-seconds", type=float, default=60.0,
+                        help="skip buckets that closed less than this long ago")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(_parse_args())))
@@ -0,0 +1,360 @@
+"""Matching-engine micro-benchmarks over synthetic books (no Postgres needed).
+
+Each scenario builds a resting book and a stream of takers, then measures:
+    add      OrderBook.add_order per resting order
+    cancel   OrderBook.cancel_order per resting order, in random order
+    match    match_order per taker against the full book
+    rebuild  MatchingEngine.rebuild_orderbook over the resting set (bulk load,
+             MemoryClearingStore in place of Postgres)
+plus the memory held per resting order by a built book.
+
+Scenarios:
+    deep_level   every resting ask at one price, takers sweep a few orders each
+    wide_book    asks and bids spread over every price, takers cross many levels
+    self_trade   one level dominated by the taker's own orders (rotation cost)
+    amm_ladder   AMM quotes on every level both sides, small random takers
+
+Usage:
+    JWT_SECRET=x python -m scripts.bench_matching [--size 10000] [--out run.json]
+    JWT_SECRET=x python -m scripts.bench_matching --compare before.json --out after.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_account.domain.constants import AMM_USER_ID
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_matching.domain.models import BookOrder
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_matching.engine.matching_algo import match_order
+from src.pm_matching.engine.order_book import OrderBook
+from src.pm_order.domain.models import Order
+
+_MARKET_ID = "bench-mkt"
+_CREATED_AT = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@dataclass
+class Scenario:
+    name: str
+    resting: list[Order]
+    takers: list[Order]
+
+
+def _order(
+    order_id: str, user_id: str, direction: str, price: int, quantity: int
+) -> Order:
+    book_type = "NATIVE_BUY" if direction == "BUY" else "NATIVE_SELL"
+    return Order(
+        id=order_id,
+        client_order_id=order_id,
+        market_id=_MARKET_ID,
+        user_id=user_id,
+        original_side="YES",
+        original_direction=direction,
+        original_price=price,
+        book_type=book_type,
+        book_direction=direction,
+        book_price=price,
+        quantity=quantity,
+        created_at=_CREATED_AT,
+    )
+
+
+def _deep_level(size: int, rng: random.Random) -> Scenario:
+    resting = [_order(f"r{i}", f"u{i % 1000}", "SELL", 50, 10) for i in range(size)]
+    takers = [_order(f"t{i}", "taker", "BUY", 50, 25) for i in range(size // 3)]
+    return Scenario("deep_level", resting, takers)
+
+
+def _wide_book(size: int, rng: random.Random) -> Scenario:
+    resting = []
+    for i in range(size):
+        if i % 2:
+            resting.append(_order(f"r{i}", f"u{i % 1000}", "SELL", 51 + i % 49, 10))
+        else:
+            resting.append(_order(f"r{i}", f"u{i % 1000}", "BUY", 1 + i % 49, 10))
+    # Each taker eats ~3 levels' worth of orders on one side
+    per_level = max(1, size // 98)
+    takers = [
+        _order(f"t{i}", "taker", "BUY" if i % 2 else "SELL", 99 if i % 2 else 1, 30 * per_level)
+        for i in range(max(1, size // (3 * per_level)))
+    ]
+    return Scenario("wide_book", resting, takers)
+
+
+def _self_trade(size: int, rng: random.Random) -> Scenario:
+    resting = [
+        _order(f"r{i}", "self" if rng.random() < 0.9 else f"u{i % 1000}", "SELL", 50, 10)
+        for i in range(size)
+    ]
+    takers = [_order(f"t{i}", "self", "BUY", 50, 10) for i in range(min(200, size // 20))]
+    return Scenario("self_trade", resting, takers)
+
+
+def _amm_ladder(size: int, rng: random.Random) -> Scenario:
+    per_level = max(1, size // 98)
+    resting = []
+    for level in range(49):
+        for j in range(per_level):
+            resting.append(_order(f"a{level}-{j}", AMM_USER_ID, "SELL", 51 + level, 10))
+            resting.append(_order(f"b{level}-{j}", AMM_USER_ID, "BUY", 49 - level, 10))
+    takers = []
+    for i in range(len(resting) // 2):
+        direction = "BUY" if i % 2 else "SELL"
+        price = rng.randint(51, 54) if direction == "BUY" else rng.randint(46, 49)
+        takers.append(_order(f"t{i}", f"u{i % 1000}", direction, price, rng.randint(1, 20)))
+    return Scenario("amm_ladder", resting, takers)
+
+
+SCENARIOS: dict[str, Callable[[int, random.Random], Scenario]] = {
+    "deep_level": _deep_level,
+    "wide_book": _wide_book,
+    "self_trade": _self_trade,
+    "amm_ladder": _amm_ladder,
+}
+
+
+def _book_order(o: Order) -> BookOrder:
+    return BookOrder(
+        order_id=o.id,
+        user_id=o.user_id,
+        book_type=o.book_type,
+        quantity=o.remaining_quantity,
+        created_at=o.created_at or _CREATED_AT,
+    )
+
+
+def _build(resting: list[Order]) -> OrderBook:
+    ob = OrderBook(market_id=_MARKET_ID)
+    for o in resting:
+        ob.add_order(_book_order(o), price=o.book_price, side=o.book_direction)
+    return ob
+
+
+def _fresh(orders: list[Order]) -> list[Order]:
+    """Unfilled copies, since matching mutates the takers."""
+    return [
+        _order(o.id, o.user_id, o.book_direction, o.book_price, o.quantity) for o in orders
+    ]
+
+
+def _summary(samples_ns: list[int]) -> dict[str, float]:
+    if not samples_ns:
+        return {"ops": 0}
+    samples_ns.sort()
+    n = len(samples_ns)
+    total_s = sum(samples_ns) / 1e9
+
+    def pct(q: float) -> float:
+        return round(samples_ns[min(n - 1, int(n * q))] / 1000, 3)
+
+    return {
+        "ops": n,
+        "ops_per_sec": round(n / total_s) if total_s else 0,
+        "p50_us": pct(0.50),
+        "p95_us": pct(0.95),
+        "p99_us": pct(0.99),
+        "max_us": round(samples_ns[-1] / 1000, 3),
+    }
+
+
+def _bench_add(sc: Scenario, repeat: int) -> dict[str, float]:
+    samples: list[int] = []
+    for _ in range(repeat):
+        ob = OrderBook(market_id=_MARKET_ID)
+        entries = [(_book_order(o), o.book_price, o.book_direction) for o in sc.resting]
+        for bo, price, side in entries:
+            t0 = time.perf_counter_ns()
+            ob.add_order(bo, price, side)
+            samples.append(time.perf_counter_ns() - t0)
+    return _summary(samples)
+
+
+def _bench_cancel(sc: Scenario, repeat: int, rng: random.Random) -> dict[str, float]:
+    samples: list[int] = []
+    for _ in range(repeat):
+        ob = _build(sc.resting)
+        ids = [o.id for o in sc.resting]
+        rng.shuffle(ids)
+        for order_id in ids:
+            t0 = time.perf_counter_ns()
+            ob.cancel_order(order_id)
+            samples.append(time.perf_counter_ns() - t0)
+    return _summary(samples)
+
+
+def _bench_match(sc: Scenario, repeat: int) -> dict[str, float]:
+    samples: list[int] = []
+    fills = 0
+    for _ in range(repeat):
+        ob = _build(sc.resting)
+        for taker in _fresh(sc.takers):
+            t0 = time.perf_counter_ns()
+            trades = match_order(taker, ob)
+            samples.append(time.perf_counter_ns() - t0)
+            fills += len(trades)
+    result = _summary(samples)
+    result["fills_per_taker"] = round(fills / len(samples), 2) if samples else 0
+    return result
+
+
+class _ListRepo:
+    """Serves list_open_by_market from a list, standing in for the DB."""
+
+    def __init__(self, orders: list[Order]) -> None:
+        self._orders = orders
+
+    async def list_open_by_market(self, market_id: str, db: AsyncSession) -> list[Order]:
+        return self._orders
+
+
+def _bench_rebuild(sc: Scenario, repeat: int) -> dict[str, float]:
+    repo: Any = _ListRepo(sc.resting)
+    db: Any = None
+    samples: list[int] = []
+
+    async def run() -> None:
+        for _ in range(repeat):
+            engine = MatchingEngine(store=MemoryClearingStore())
+            t0 = time.perf_counter_ns()
+            await engine.rebuild_orderbook(_MARKET_ID, repo, db)
+            samples.append(time.perf_counter_ns() - t0)
+
+    asyncio.run(run())
+    samples.sort()
+    mean_ms = sum(samples) / len(samples) / 1e6
+    return {
+        "runs": len(samples),
+        "orders": len(sc.resting),
+        "mean_ms": round(mean_ms, 3),
+        "min_ms": round(samples[0] / 1e6, 3),
+        "orders_per_sec": round(len(sc.resting) / (mean_ms / 1000)) if mean_ms else 0,
+    }
+
+
+def _memory_per_order(sc: Scenario) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    ob = _build(sc.resting)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del ob
+    return round(allocated / len(sc.resting), 1) if sc.resting else 0.0
+
+
+def run_scenario(sc: Scenario, repeat: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "resting_orders": len(sc.resting),
+        "takers": len(sc.takers),
+        "add": _bench_add(sc, repeat),
+        "cancel": _bench_cancel(sc, repeat, rng),
+        "match": _bench_match(sc, repeat),
+        "rebuild": _bench_rebuild(sc, repeat),
+        "bytes_per_resting_order": _memory_per_order(sc),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip()
+
+
+def run(names: list[str], size: int, repeat: int, seed: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name in names:
+        sc = SCENARIOS[name](size, random.Random(seed))
+        results[name] = run_scenario(sc, repeat, seed)
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "git": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "size": size,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    """Throughput and p99 changes per scenario/operation, after vs before."""
+    lines: list[str] = []
+    for name, ops in after["scenarios"].items():
+        old_ops = before.get("scenarios", {}).get(name)
+        if old_ops is None:
+            continue
+        for op in ("add", "cancel", "match"):
+            old, new = old_ops[op], ops[op]
+            if not old.get("ops_per_sec") or not new.get("ops_per_sec"):
+                continue
+            ratio = new["ops_per_sec"] / old["ops_per_sec"]
+            lines.append(
+                f"{name:<11} {op:<7} {old['ops_per_sec']:>10} -> {new['ops_per_sec']:>10} ops/s"
+                f" ({ratio:5.2f}x)  p99 {old['p99_us']}us -> {new['p99_us']}us"
+            )
+        old_rb, new_rb = old_ops["rebuild"], ops["rebuild"]
+        lines.append(
+            f"{name:<11} rebuild {old_rb['mean_ms']:>10} -> {new_rb['mean_ms']:>10} ms"
+        )
+    return lines
+
+
+def _print_table(report: dict[str, Any]) -> None:
+    for name, res in report["scenarios"].items():
+        print(f"\n{name}: {res['resting_orders']} resting, {res['takers']} takers, "
+              f"{res['bytes_per_resting_order']} B/order")
+        for op in ("add", "cancel", "match"):
+            s = res[op]
+            print(f"  {op:<7} {s.get('ops_per_sec', 0):>10} ops/s  p50 {s.get('p50_us')}us  "
+                  f"p95 {s.get('p95_us')}us  p99 {s.get('p99_us')}us  max {s.get('max_us')}us")
+        rb = res["rebuild"]
+        print(f"  rebuild {rb['mean_ms']}ms mean ({rb['orders_per_sec']} orders/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000, help="resting orders per scenario")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="earlier JSON report to diff against")
+    args = parser.parse_args()
+
+    report = run(args.scenario or list(SCENARIOS), args.size, args.repeat, args.seed)
+    _print_table(report)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nwrote {args.out}")
+    if args.compare:
+        print()
+        for line in compare(json.loads(args.compare.read_text()), report):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Event-loop lag under concurrent logins: inline bcrypt vs the password pool.
+
+A 1 ms ticker runs alongside N concurrent verify_password calls; its worst
+and p99 overshoot is the stall an order request would have seen.
+
+Usage: JWT_SECRET=x python -m scripts.bench_password_loop_lag [--logins 32]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from src.pm_common.errors import ServiceBusyError
+from src.pm_gateway.auth.password import hash_password, run_password_work, verify_password
+
+_TICK_SECONDS = 0.001
+
+
+async def _measure(
+    logins: int, login: Callable[[str, str], Awaitable[bool]], hashed: str
+) -> dict[str, float]:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(_TICK_SECONDS)
+            lags.append((time.perf_counter() - start - _TICK_SECONDS) * 1000)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(login("Bench1pass", hashed) for _ in range(logins)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick_task
+    lags.sort()
+    return {
+        "wall_s": round(elapsed, 3),
+        "rejected": sum(isinstance(r, ServiceBusyError) for r in results),
+        "ticks": len(lags),
+        "lag_max_ms": round(lags[-1], 2),
+        "lag_p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 2),
+        "lag_mean_ms": round(statistics.fmean(lags), 2),
+    }
+
+
+async def _inline(plain: str, hashed: str) -> bool:
+    return verify_password(plain, hashed)
+
+
+async def _pooled(plain: str, hashed: str) -> bool:
+    return await run_password_work(verify_password, plain, hashed)
+
+
+async def main(logins: int) -> None:
+    hashed = hash_password("Bench1pass")
+    for name, login in (("inline", _inline), ("pooled", _pooled)):
+        print(name, await _measure(logins, login, hashed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=32)
+    asyncio.run(main(parser.parse_args().logins))
@@ -0,0 +1,348 @@
+"""End-to-end order load harness for src.main:app.
+
+Simulated users place, cancel and amend ("replace" down to a smaller size)
+orders concurrently for a fixed duration. Every user is one coroutine with
+at most one request in flight, so --users is the concurrency. A share of
+traffic set by --hot-share goes to the first market and the rest spreads
+over the other --markets. --read-weight mixes in GET /orders and order book
+reads. At the end the harness reports orders/sec, p50/p95/p99 latency per
+endpoint and the DB pool's checkouts, checkout wait and hold time over the
+trading phase (from /metrics), then runs POST /admin/verify-invariants and
+exits non-zero if it reports violations.
+
+Needs Postgres and Redis, e.g. ``docker compose up -d && alembic upgrade head``.
+
+In-process (ASGI transport, runs the app lifespan itself):
+    JWT_SECRET=x python -m scripts.load_orders --users 50 --duration 30
+
+Against a running server (start it with RATE_LIMIT_ENABLED=false, or the
+per-IP auth limit rejects the user setup):
+    python -m scripts.load_orders --base-url http://localhost:8000 --users 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+_API = "/api/v1"
+_PASSWORD = "Load1234pass"
+_DEPOSIT_CENTS = 10_000_000
+
+
+@dataclass
+class Stats:
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, dict[int, int]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(int))
+    )
+    transport_errors: int = 0
+    orders_placed: int = 0
+    trades: int = 0
+
+    def record(self, endpoint: str, status: int, ms: float) -> None:
+        self.latencies_ms[endpoint].append(ms)
+        self.statuses[endpoint][status] += 1
+
+
+@dataclass
+class SimUser:
+    name: str
+    token: str = ""
+    open_orders: list[tuple[str, int]] = field(default_factory=list)  # (order_id, quantity)
+
+
+async def _call(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    endpoint: str,
+    method: str,
+    path: str,
+    token: str = "",
+    body: dict[str, Any] | None = None,
+) -> tuple[int, dict[str, Any]]:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    start = time.perf_counter()
+    try:
+        resp = await client.request(method, _API + path, json=body, headers=headers)
+    except httpx.HTTPError:
+        stats.transport_errors += 1
+        return 0, {}
+    stats.record(endpoint, resp.status_code, (time.perf_counter() - start) * 1000)
+    try:
+        return resp.status_code, resp.json()
+    except ValueError:
+        return resp.status_code, {}
+
+
+async def _setup_user(client: httpx.AsyncClient, stats: Stats, user: SimUser) -> None:
+    await _call(client, stats, "POST /auth/register", "POST", "/auth/register", body={
+        "username": user.name, "email": f"{user.name}@load.test", "password": _PASSWORD,
+    })
+    status, data = await _call(client, stats, "POST /auth/login", "POST", "/auth/login", body={
+        "username": user.name, "password": _PASSWORD,
+    })
+    if status != 200:
+        raise RuntimeError(f"login failed for {user.name}: {status} {data}")
+    user.token = data["data"]["access_token"]
+    await _call(client, stats, "POST /account/deposit", "POST", "/account/deposit",
+                user.token, {"amount_cents": _DEPOSIT_CENTS})
+
+
+async def _active_markets(client: httpx.AsyncClient, stats: Stats, token: str) -> list[str]:
+    status, data = await _call(
+        client, stats, "GET /markets", "GET", "/markets?status=ACTIVE&limit=100", token
+    )
+    if status != 200:
+        raise RuntimeError(f"listing markets failed: {status} {data}")
+    return [m["id"] for m in data["data"]["items"]]
+
+
+def _pick_market(markets: list[str], hot_share: float, rng: random.Random) -> str:
+    if len(markets) == 1 or rng.random() < hot_share:
+        return markets[0]
+    return rng.choice(markets[1:])
+
+
+async def _place(
+    client: httpx.AsyncClient, stats: Stats, user: SimUser, market_id: str, rng: random.Random
+) -> None:
+    # Funds only: BUY YES rests as a bid, BUY NO as a synthetic ask, so they cross
+    body = {
+        "client_order_id": uuid.uuid4().hex,
+        "market_id": market_id,
+        "side": rng.choice(("YES", "NO")),
+        "direction": "BUY",
+        "price_cents": rng.randint(45, 55),
+        "quantity": rng.randint(1, 20),
+    }
+    status, data = await _call(client, stats, "POST /orders", "POST", "/orders", user.token, body)
+    if status != 201:
+        return
+    stats.orders_placed += 1
+    stats.trades += len(data.get("trades", []))
+    order = data["order"]
+    if order["status"] in ("OPEN", "PARTIALLY_FILLED"):
+        user.open_orders.append((order["id"], order["quantity"]))
+
+
+async def _cancel(
+    client: httpx.AsyncClient, stats: Stats, user: SimUser, rng: random.Random
+) -> None:
+    order_id, _ = user.open_orders.pop(rng.randrange(len(user.open_orders)))
+    await _call(client, stats, "POST /orders/{id}/cancel", "POST",
+                f"/orders/{order_id}/cancel", user.token)
+
+
+async def _amend(
+    client: httpx.AsyncClient, stats: Stats, user: SimUser, rng: random.Random
+) -> None:
+    i = rng.randrange(len(user.open_orders))
+    order_id, quantity = user.open_orders[i]
+    if quantity <= 1:
+        user.open_orders.pop(i)
+        return
+    new_quantity = rng.randint(1, quantity - 1)
+    status, _ = await _call(client, stats, "POST /orders/{id}/amend", "POST",
+                            f"/orders/{order_id}/amend", user.token, {"quantity": new_quantity})
+    if status == 200:
+        user.open_orders[i] = (order_id, new_quantity)
+    else:
+        user.open_orders.pop(i)  # filled or cancelled meanwhile
+
+
+async def _read(
+    client: httpx.AsyncClient, stats: Stats, user: SimUser, market_id: str, rng: random.Random
+) -> None:
+    if rng.random() < 0.5:
+        await _call(client, stats, "GET /orders", "GET", "/orders?limit=20", user.token)
+    else:
+        await _call(client, stats, "GET /markets/{id}/orderbook", "GET",
+                    f"/markets/{market_id}/orderbook", user.token)
+
+
+_POOL_SERIES = (
+    "pm_db_pool_checkouts_total",
+    "pm_db_pool_checkout_wait_ms_sum",
+    "pm_db_pool_checkout_wait_ms_count",
+    "pm_db_pool_hold_ms_sum",
+    "pm_db_pool_hold_ms_count",
+)
+
+
+async def _pool_sample(client: httpx.AsyncClient) -> dict[str, float]:
+    """Pool counters from /metrics, summed over labels."""
+    resp = await client.get("/metrics")
+    totals: dict[str, float] = defaultdict(float)
+    for line in resp.text.splitlines():
+        name, _, value = line.partition(" ")
+        name = name.split("{", 1)[0]
+        if name in _POOL_SERIES:
+            totals[name] += float(value)
+    return totals
+
+
+def _pool_report(
+    before: dict[str, float], after: dict[str, float], requests: int
+) -> dict[str, float]:
+    delta = {name: after.get(name, 0.0) - before.get(name, 0.0) for name in _POOL_SERIES}
+    waits = delta["pm_db_pool_checkout_wait_ms_count"]
+    holds = delta["pm_db_pool_hold_ms_count"]
+    return {
+        "checkouts": delta["pm_db_pool_checkouts_total"],
+        "checkouts_per_request": round(delta["pm_db_pool_checkouts_total"] / requests, 3)
+        if requests
+        else 0.0,
+        "mean_checkout_wait_ms": round(delta["pm_db_pool_checkout_wait_ms_sum"] / waits, 3)
+        if waits
+        else 0.0,
+        "mean_hold_ms": round(delta["pm_db_pool_hold_ms_sum"] / holds, 3) if holds else 0.0,
+    }
+
+
+async def _run_user(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    user: SimUser,
+    markets: list[str],
+    args: argparse.Namespace,
+    deadline: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    weights = (args.place_weight, args.cancel_weight, args.amend_weight, args.read_weight)
+    while time.perf_counter() < deadline:
+        action = rng.choices(("place", "cancel", "amend", "read"), weights)[0]
+        if action == "read":
+            await _read(client, stats, user, _pick_market(markets, args.hot_share, rng), rng)
+        elif action == "place" or not user.open_orders:
+            await _place(client, stats, user, _pick_market(markets, args.hot_share, rng), rng)
+        elif action == "cancel":
+            await _cancel(client, stats, user, rng)
+        else:
+            await _amend(client, stats, user, rng)
+
+
+def _percentile(sorted_ms: list[float], q: float) -> float:
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * q))], 2)
+
+
+def _report(
+    stats: Stats, elapsed: float, invariants: dict[str, Any], db_pool: dict[str, float]
+) -> dict[str, Any]:
+    endpoints: dict[str, Any] = {}
+    for endpoint, samples in sorted(stats.latencies_ms.items()):
+        samples.sort()
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "per_sec": round(len(samples) / elapsed, 1),
+            "p50_ms": _percentile(samples, 0.50),
+            "p95_ms": _percentile(samples, 0.95),
+            "p99_ms": _percentile(samples, 0.99),
+            "max_ms": round(samples[-1], 2),
+            "statuses": dict(stats.statuses[endpoint]),
+        }
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "orders_placed": stats.orders_placed,
+        "orders_per_sec": round(stats.orders_placed / elapsed, 1),
+        "trades": stats.trades,
+        "transport_errors": stats.transport_errors,
+        "endpoints": endpoints,
+        "db_pool": db_pool,
+        "invariants": invariants,
+    }
+
+
+async def _client_for(args: argparse.Namespace, stack: AsyncExitStack) -> httpx.AsyncClient:
+    timeout = httpx.Timeout(args.timeout)
+    if args.base_url:
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+        return await stack.enter_async_context(
+            httpx.AsyncClient(base_url=args.base_url, timeout=timeout, limits=limits)
+        )
+    from config.settings import settings
+    from src.main import app
+
+    settings.RATE_LIMIT_ENABLED = False
+    await stack.enter_async_context(app.router.lifespan_context(app))
+    transport = httpx.ASGITransport(app=app)
+    return await stack.enter_async_context(
+        httpx.AsyncClient(transport=transport, base_url="http://load", timeout=timeout)
+    )
+
+
+async def main(args: argparse.Namespace) -> int:
+    run_id = uuid.uuid4().hex[:8]
+    users = [SimUser(f"load_{run_id}_{i}") for i in range(args.users)]
+    async with AsyncExitStack() as stack:
+        client = await _client_for(args, stack)
+        setup_stats = Stats()
+        sem = asyncio.Semaphore(args.setup_concurrency)
+
+        async def setup(user: SimUser) -> None:
+            async with sem:
+                await _setup_user(client, setup_stats, user)
+
+        print(f"setting up {len(users)} users ...", file=sys.stderr)
+        await asyncio.gather(*(setup(u) for u in users))
+        markets = (await _active_markets(client, setup_stats, users[0].token))[: args.markets]
+        if not markets:
+            raise RuntimeError("no ACTIVE markets to trade")
+        print(f"trading {markets} for {args.duration}s (hot: {markets[0]})", file=sys.stderr)
+
+        stats = Stats()
+        pool_before = await _pool_sample(client)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            _run_user(client, stats, u, markets, args, deadline, args.seed + i)
+            for i, u in enumerate(users)
+        ))
+        elapsed = time.perf_counter() - start
+        requests = sum(len(samples) for samples in stats.latencies_ms.values())
+        db_pool = _pool_report(pool_before, await _pool_sample(client), requests)
+
+        status, data = await _call(client, stats, "POST /admin/verify-invariants", "POST",
+                                   "/admin/verify-invariants", users[0].token)
+        invariants = data.get("data") or {"ok": False, "violations": [f"HTTP {status}"]}
+
+    report = _report(stats, elapsed, invariants, db_pool)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+    return 0 if invariants.get("ok") else 1
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="server URL; omit to drive the app in-process")
+    parser.add_argument("--users", type=int, default=50, help="simulated users (= concurrency)")
+    parser.add_argument("--markets", type=int, default=3, help="ACTIVE markets to spread over")
+    parser.add_argument("--hot-share", type=float, default=0.8,
+                        help="fraction of orders sent to the hottest market")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of trading")
+    parser.add_argument("--place-weight", type=float, default=6.0)
+    parser.add_argument("--cancel-weight", type=float, default=2.0)
+    parser.add_argument("--amend-weight", type=float, default=2.0)
+    parser.add_argument("--read-weight", type=float, default=0.0,
+                        help="GET /orders and order book reads mixed into the trading")
+    parser.add_argument("--setup-concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, help="also write the JSON report here")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(_parse_args())))
@@ -0,0 +1,52 @@
+"""Rebuild market_stats from the trades table.
+
+Recomputes each market's running totals and trader sketch from its trades
+and commits per market. Safe while the app runs: the rebuild locks the
+market's row, so trades cleared meanwhile land on top of it. Run it once
+after `alembic upgrade` to 020 for markets that already traded, and
+whenever the running totals are suspected to have drifted.
+
+Needs Postgres, e.g. ``docker compose up -d && alembic upgrade head``.
+
+Usage:
+    JWT_SECRET=x python -m scripts.reconcile_market_stats                # every market
+    JWT_SECRET=x python -m scripts.reconcile_market_stats --market mkt-1
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from src.pm_clearing.infrastructure import market_stats
+from src.pm_common.database import batch_session_factory, dispose_engines
+from src.pm_market.infrastructure.persistence import MarketRepository
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        async with batch_session_factory() as db:
+            market_ids = args.market or await MarketRepository().list_market_ids(db)
+            await db.commit()
+            for market_id in market_ids:
+                start = time.perf_counter()
+                async with db.begin():
+                    stats, exact = await market_stats.reconcile(market_id, db)
+                print(
+                    f"{market_id}: {stats.trade_count} trades, "
+                    f"{stats.unique_traders} traders (exact {exact}) "
+                    f"in {time.perf_counter() - start:.1f}s"
+                )
+    finally:
+        await dispose_engines()
+    return 0
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--market", action="append", help="market id (repeatable); default all")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(_parse_args())))
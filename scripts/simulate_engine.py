@@ -0,0 +1,148 @@
+"""Capacity simulation: random order flow through the real MatchingEngine, in memory.
+
+Runs MatchingEngine over MemoryClearingStore + MemoryOrderRepository, so every
+order goes through the full risk -> freeze -> match -> clear -> netting ->
+invariant path without Postgres. Traders buy and sell YES/NO around a drifting
+mid price and cancel some resting orders; after the run the script checks that
+cash is conserved and each market's reserve backs its outstanding pairs.
+
+Orders rolled back by the engine's post-trade invariant check are counted and
+the first few messages printed, rather than aborting the run.
+
+Usage:
+    JWT_SECRET=x python -m scripts.simulate_engine [--orders 100000] [--users 200]
+    JWT_SECRET=x python -m scripts.simulate_engine --markets 10 --cancel-share 0.2
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Any
+
+from src.pm_clearing.infrastructure.fee_collector import PLATFORM_FEE_USER_ID
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.errors import AppError
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.domain.models import Order
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+
+_DB: Any = None
+
+
+def _order(
+    n: int, user_id: str, market_id: str, side: str, direction: str, price: int, qty: int
+) -> Order:
+    return Order(
+        id=f"sim-{n}",
+        client_order_id=f"sim-{n}",
+        market_id=market_id,
+        user_id=user_id,
+        original_side=side,
+        original_direction=direction,
+        original_price=price,
+        book_type="",
+        book_direction="",
+        book_price=0,
+        quantity=qty,
+        time_in_force="GTC",
+        status="OPEN",
+    )
+
+
+async def simulate(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    store = MemoryClearingStore(keep_journals=False)
+    engine = MatchingEngine(store=store)
+    repo = MemoryOrderRepository(store)
+
+    markets = [f"sim-mkt-{i}" for i in range(args.markets)]
+    for market_id in markets:
+        store.open_market(market_id)
+    users = [f"sim-user-{i}" for i in range(args.users)]
+    store.open_account(PLATFORM_FEE_USER_ID)
+    for user_id in users:
+        store.open_account(user_id, args.balance)
+    cash_in = args.balance * len(users)
+
+    mids = dict.fromkeys(markets, 50)
+    resting: list[tuple[str, str]] = []
+    placed = rejected = cancelled = trades = 0
+    violations: list[str] = []
+    started = time.perf_counter()
+    for n in range(args.orders):
+        if resting and rng.random() < args.cancel_share:
+            order_id, user_id = resting.pop(rng.randrange(len(resting)))
+            try:
+                await engine.cancel_order(order_id, user_id, repo, _DB)
+                cancelled += 1
+            except AppError:
+                pass  # filled since it was placed
+            continue
+
+        market_id = rng.choice(markets)
+        user_id = rng.choice(users)
+        mids[market_id] = min(95, max(5, mids[market_id] + rng.choice((-1, 0, 1))))
+        side = rng.choice(("YES", "NO"))
+        mid = mids[market_id] if side == "YES" else 100 - mids[market_id]
+        position = store.positions.get((user_id, market_id))
+        held = 0
+        if position is not None:
+            held = position.available_yes if side == "YES" else position.available_no
+        direction = "SELL" if held and rng.random() < 0.5 else "BUY"
+        qty = min(held, rng.randint(1, 20)) if direction == "SELL" else rng.randint(1, 20)
+        offset = rng.randint(-3, 3)
+        price = min(99, max(1, mid + offset if direction == "BUY" else mid - offset))
+
+        try:
+            order, fills, _ = await engine.place_order(
+                _order(n, user_id, market_id, side, direction, price, qty), repo, _DB
+            )
+        except AppError:
+            rejected += 1
+            continue
+        except AssertionError as exc:
+            violations.append(str(exc))
+            continue
+        placed += 1
+        trades += len(fills)
+        if order.remaining_quantity > 0:
+            resting.append((order.id, user_id))
+    elapsed = time.perf_counter() - started
+
+    handled = placed + rejected + cancelled + len(violations)
+    print(f"orders     {handled} in {elapsed:.2f}s ({handled / elapsed:,.0f}/s)")
+    print(f"placed     {placed}  rejected {rejected}  cancelled {cancelled}")
+    print(f"trades     {trades}  journal rows {store.journal_counts}")
+    print(f"invariant rollbacks {len(violations)}")
+    for message in violations[:5]:
+        print(f"  {message}")
+
+    ok = True
+    held_cash = sum(a.available_balance + a.frozen_balance for a in store.accounts.values())
+    reserves = sum(m.reserve_balance for m in store.markets.values())
+    if held_cash + reserves != cash_in:
+        print(f"FAIL cash not conserved: {held_cash} + {reserves} != {cash_in}")
+        ok = False
+    for m in store.markets.values():
+        if m.total_yes_shares != m.total_no_shares or m.reserve_balance != 100 * m.total_yes_shares:
+            print(f"FAIL market {m.id} reserve/shares mismatch: {m}")
+            ok = False
+    print("invariants ok" if ok else "invariants FAILED")
+    return 0 if ok else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--markets", type=int, default=5)
+    parser.add_argument("--balance", type=int, default=10_000_000, help="cents per user")
+    parser.add_argument("--cancel-share", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(simulate(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
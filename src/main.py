@@ -9,12 +9,13 @@ import uvloop
 
 uvloop.install()
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy import text
 
 from config.settings import settings
@@ -23,28 +24,80 @@ from src.pm_account.api.router import router as account_router
 from src.pm_admin.api.router import router as admin_router
 from src.pm_clearing.api.amm_router import router as amm_clearing_router
 from src.pm_clearing.api.trades_router import router as trades_router
-from src.pm_common.database import engine
+from src.pm_clearing.infrastructure.outbox_relay import get_outbox_relay
+from src.pm_common.database import ENGINES, async_session_factory, dispose_engines, engine
 from src.pm_common.errors import AppError
+from src.pm_common.log_queue import start_queue_logging, stop_queue_logging
+from src.pm_common.metrics import REGISTRY
 from src.pm_common.redis_client import close_redis, get_redis
 from src.pm_common.response import error_response
+from src.pm_common.sampling_profiler import SamplingProfilerMiddleware
+from src.pm_common.sql_profiler import SqlProfilerMiddleware
+from src.pm_common.sql_profiler import install as install_sql_profiler
 from src.pm_gateway.api.router import router as auth_router
+from src.pm_gateway.middleware.rate_limit import RateLimitMiddleware
 from src.pm_gateway.middleware.request_log import RequestLogMiddleware
 from src.pm_market.api.router import router as market_router
+from src.pm_market.application.candles import get_candle_aggregator
+from src.pm_market.application.feed import get_market_data_feed
+from src.pm_market.application.read_cache import get_market_read_cache
+from src.pm_market.application.ticker import get_market_ticker
+from src.pm_matching.application.journaled_engine import get_journaled_engine
+from src.pm_matching.application.service import get_matching_engine
 from src.pm_order.api.amm_router import router as amm_order_router
 from src.pm_order.api.router import router as order_router
+from src.pm_order.application.idempotency import get_client_order_filter
+from src.pm_order.application.user_stream import get_user_event_stream
+from src.pm_order.infrastructure.persistence import OrderRepository
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Startup: verify DB + Redis connections. Shutdown: dispose."""
+    """Startup: verify DB + Redis, load order books and ticker stats. Shutdown: dispose."""
     # Startup
+    start_queue_logging(("pm.request",))
     async with engine.connect() as conn:
         await conn.execute(text("SELECT 1"))
     await get_redis()
+    async with async_session_factory() as session:
+        if settings.JOURNAL_MODE_ENABLED:
+            journaled = get_journaled_engine()
+            await journaled.start(session)
+            # Trades replayed but not yet projected are missing until newer ones arrive
+            await journaled.engine.load_trade_tapes(session)
+            await get_client_order_filter().warm_up(OrderRepository(), session)
+            # Orders placed since the last projection are only in the store
+            for (user_id, client_order_id), order_id in journaled.store.client_order_ids.items():
+                get_client_order_filter().add(user_id, client_order_id, order_id)
+        else:
+            await get_matching_engine().warm_up(OrderRepository(), session)
+            await get_client_order_filter().warm_up(OrderRepository(), session)
+        await get_market_ticker().warm_up(session)
+    get_matching_engine().add_listener(get_market_ticker().on_outcome)
+    get_matching_engine().add_listener(get_market_read_cache().on_outcome)
+    background: list[asyncio.Task[None]] = []
+    if settings.OUTBOX_ENABLED:
+        background.append(asyncio.create_task(get_outbox_relay().run()))
+    if settings.MARKET_FEED_ENABLED:
+        feed = get_market_data_feed()
+        get_matching_engine().add_listener(feed.on_outcome)
+        background.append(asyncio.create_task(feed.run()))
+    if settings.USER_STREAM_ENABLED:
+        get_matching_engine().add_listener(get_user_event_stream().on_outcome, events=True)
+    if settings.CANDLES_ENABLED:
+        get_matching_engine().add_listener(get_candle_aggregator().on_outcome)
+        background.append(asyncio.create_task(get_candle_aggregator().run()))
     yield
     # Shutdown
-    await engine.dispose()
+    for task in background:
+        task.cancel()
+    if settings.CANDLES_ENABLED:
+        await get_candle_aggregator().flush_once()
+    if settings.JOURNAL_MODE_ENABLED:
+        await get_journaled_engine().stop()
+    await dispose_engines()
     await close_redis()
+    stop_queue_logging()
 
 
 app = FastAPI(
@@ -54,6 +107,8 @@ app = FastAPI(
 )
 
 
+# Added first (innermost) so CORS headers also reach its 429s
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Dev only — restrict in production
@@ -61,7 +116,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(RequestLogMiddleware)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(SamplingProfilerMiddleware)
+if settings.SQL_PROFILE_ENABLED:
+    for pooled_engine in ENGINES.values():
+        install_sql_profiler(pooled_engine)
+    app.add_middleware(SqlProfilerMiddleware)
+app.add_middleware(RequestLogMiddleware)  # outermost: logs and tags 429s too
 
 
 @app.exception_handler(AppError)
@@ -87,3 +148,9 @@ app.include_router(amm_order_router, prefix="/api/v1/amm/orders")
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok", "version": "0.1.0"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of every registered metric."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -3,14 +3,13 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_account.application.positions_schemas import (
     PositionListResponse,
     PositionResponse,
 )
 from src.pm_account.infrastructure.positions_repository import PositionsRepository
-from src.pm_common.database import get_db_session
+from src.pm_common.database import ReadDbSession
 from src.pm_common.errors import AppError
 from src.pm_common.response import ApiResponse, success_response
 from src.pm_gateway.auth.dependencies import get_current_user
@@ -23,7 +22,7 @@ _repo = PositionsRepository()
 @router.get("")
 async def list_positions(
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
 ) -> ApiResponse:
     items = await _repo.list_by_user(str(current_user.id), db)
     data = PositionListResponse(
@@ -37,7 +36,7 @@ async def list_positions(
 async def get_position(
     market_id: str,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
 ) -> ApiResponse:
     pos = await _repo.get_by_market(str(current_user.id), market_id, db)
     if pos is None:
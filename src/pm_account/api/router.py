@@ -3,11 +3,10 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_account.application.schemas import DepositRequest, WithdrawRequest
 from src.pm_account.application.service import AccountApplicationService
-from src.pm_common.database import get_db_session
+from src.pm_common.database import DbSession, ReadDbSession
 from src.pm_common.response import ApiResponse, success_response
 from src.pm_gateway.auth.dependencies import get_current_user
 from src.pm_gateway.user.db_models import UserModel
@@ -20,7 +19,7 @@ _service = AccountApplicationService()
 @router.get("/balance")
 async def get_balance(
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
     request: Request,
 ) -> ApiResponse:
     data = await _service.get_balance(db, str(current_user.id))
@@ -33,7 +32,7 @@ async def get_balance(
 async def deposit(
     body: DepositRequest,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
     request: Request,
 ) -> ApiResponse:
     data = await _service.deposit(db, str(current_user.id), body.amount_cents)
@@ -46,7 +45,7 @@ async def deposit(
 async def withdraw(
     body: WithdrawRequest,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
     request: Request,
 ) -> ApiResponse:
     data = await _service.withdraw(db, str(current_user.id), body.amount_cents)
@@ -58,7 +57,7 @@ async def withdraw(
 @router.get("/ledger")
 async def list_ledger(
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
     request: Request,
     cursor: str | None = Query(None, description="Pagination cursor (opaque Base64)"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
@@ -8,6 +8,7 @@ Other operations (get_balance, list_ledger) are read-only and run without explic
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from src.pm_account.application.schemas import (
     BalanceResponse,
     DepositResponse,
@@ -22,6 +23,7 @@ from src.pm_account.domain.repository import AccountRepositoryProtocol
 from src.pm_account.infrastructure.persistence import AccountRepository
 from src.pm_common.cents import cents_to_display
 from src.pm_common.errors import InternalError
+from src.pm_matching.application.journaled_engine import get_journaled_engine
 
 
 class AccountApplicationService:
@@ -29,6 +31,12 @@ class AccountApplicationService:
         self._repo: AccountRepositoryProtocol = repo or AccountRepository()
 
     async def get_balance(self, db: AsyncSession, user_id: str) -> BalanceResponse:
+        if settings.JOURNAL_MODE_ENABLED:
+            held = get_journaled_engine().store.accounts.get(user_id)
+            if held is not None:
+                return BalanceResponse.from_cents(
+                    user_id=user_id, available=held.available_balance, frozen=held.frozen_balance
+                )
         account = await self._repo.get_account_by_user_id(db, user_id)
         if account is None:
             raise InternalError(f"Account not found for user {user_id}")
@@ -41,6 +49,12 @@ class AccountApplicationService:
     async def deposit(
         self, db: AsyncSession, user_id: str, amount_cents: int
     ) -> DepositResponse:
+        if settings.JOURNAL_MODE_ENABLED:
+            # The ledger row is written by the projector; the journal seq identifies it
+            available, seq = await get_journaled_engine().deposit(user_id, amount_cents)
+            return DepositResponse.from_result(
+                available=available, amount=amount_cents, entry_id=seq
+            )
         try:
             account, entry = await self._repo.deposit(db, user_id, amount_cents)
             await db.commit()
@@ -56,6 +70,11 @@ class AccountApplicationService:
     async def withdraw(
         self, db: AsyncSession, user_id: str, amount_cents: int
     ) -> WithdrawResponse:
+        if settings.JOURNAL_MODE_ENABLED:
+            available, seq = await get_journaled_engine().withdraw(user_id, amount_cents)
+            return WithdrawResponse.from_result(
+                available=available, amount=amount_cents, entry_id=seq
+            )
         try:
             account, entry = await self._repo.withdraw(db, user_id, amount_cents)
             await db.commit()
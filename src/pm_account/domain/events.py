@@ -1,9 +1,41 @@
-"""Domain events for pm_account — TODO: implement in Phase 2.
+"""Domain events for pm_account.
 
-Phase 2 events to add:
-  - BalanceChanged(user_id, old_balance, new_balance, entry_id)
-  - PositionChanged(user_id, market_id, side, old_volume, new_volume)
-
-Use case: decouple async notifications (WebSocket, email) from core balance logic.
-Implementation: Redis Pub/Sub or internal asyncio.Queue.
+Emitted through the transactional outbox (see
+src/pm_clearing/infrastructure/outbox.py) after every engine command that
+touches a user's balance or position, so notifications, analytics and the
+AMM can follow state changes without polling.
 """
+
+from dataclasses import asdict, dataclass
+from typing import Any, ClassVar
+
+
+@dataclass(frozen=True)
+class BalanceChanged:
+    event_type: ClassVar[str] = "BALANCE_CHANGED"
+
+    user_id: str
+    available_balance: int
+    frozen_balance: int
+    version: int  # accounts.version; ignore a snapshot older than one already applied
+
+    def payload(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class PositionChanged:
+    event_type: ClassVar[str] = "POSITION_CHANGED"
+
+    user_id: str
+    market_id: str
+    yes_volume: int
+    yes_cost_sum: int
+    yes_pending_sell: int
+    no_volume: int
+    no_cost_sum: int
+    no_pending_sell: int
+    version: int  # positions.version, per (user, market)
+
+    def payload(self) -> dict[str, Any]:
+        return asdict(self)
@@ -29,6 +29,7 @@ class Position:
     no_volume: int = 0
     no_cost_sum: int = 0        # cents, total purchase cost (not avg price)
     no_pending_sell: int = 0    # frozen NO shares awaiting sell
+    version: int = 0            # bumped on every change
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
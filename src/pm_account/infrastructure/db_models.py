@@ -45,6 +45,7 @@ class PositionORM(Base):
     no_volume: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     no_cost_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
     no_pending_sell: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -2,15 +2,15 @@
 """Admin REST API."""
 from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_admin.application.service import AdminService
-from src.pm_common.database import get_db_session
+from src.pm_common.database import BatchDbSession
 from src.pm_common.response import ApiResponse, success_response
 from src.pm_gateway.auth.dependencies import get_current_user
 from src.pm_gateway.user.db_models import UserModel
+from src.pm_matching.application.journaled_engine import require_sql_mode
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 _service = AdminService()
@@ -20,12 +20,12 @@ class ResolveRequest(BaseModel):
     outcome: Literal["YES", "NO"]  # MVP TODO: VOID settlement not yet implemented
 
 
-@router.post("/markets/{market_id}/resolve")
+@router.post("/markets/{market_id}/resolve", dependencies=[Depends(require_sql_mode)])
 async def resolve_market(
     market_id: str,
     body: ResolveRequest,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: BatchDbSession,
 ) -> ApiResponse:
     result = await _service.resolve_market(market_id, body.outcome, db)
     return success_response(result)
@@ -35,16 +35,35 @@ async def resolve_market(
 async def get_market_stats(
     market_id: str,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: BatchDbSession,
 ) -> ApiResponse:
     result = await _service.get_market_stats(market_id, db)
     return success_response(result)
 
 
+@router.post("/markets/{market_id}/stats/reconcile")
+async def reconcile_market_stats(
+    market_id: str,
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+    db: BatchDbSession,
+) -> ApiResponse:
+    result = await _service.reconcile_market_stats(market_id, db)
+    return success_response(result)
+
+
+@router.get("/sql-profile")
+async def get_sql_profile(
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+    top: Annotated[int, Query(ge=1, le=200)] = 20,
+) -> ApiResponse:
+    result = _service.sql_profile_report(top)
+    return success_response(result)
+
+
 @router.post("/verify-invariants")
 async def verify_invariants(
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: BatchDbSession,
 ) -> ApiResponse:
     result = await _service.verify_all_invariants(db)
     return success_response(result)
@@ -5,10 +5,15 @@ from typing import Any
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from src.pm_clearing.domain.global_invariants import verify_global_invariants
 from src.pm_clearing.domain.invariants import verify_invariants_after_trade
 from src.pm_clearing.domain.settlement import settle_market
-from src.pm_common.errors import AppError
+from src.pm_clearing.infrastructure import market_stats
+from src.pm_common import sql_profiler
+from src.pm_common.errors import AppError, SqlProfilerDisabledError
+from src.pm_market.application.read_cache import get_market_read_cache
+from src.pm_matching.application.service import get_matching_engine
 
 _GET_MARKET_SQL = text("SELECT id, status FROM markets WHERE id = :market_id")
 _LIST_ACTIVE_MARKETS_SQL = text(
@@ -39,17 +44,6 @@ _UNFREEZE_NO_SQL = text("""
     UPDATE positions SET no_pending_sell = no_pending_sell - :qty, updated_at = NOW()
     WHERE user_id = :user_id AND market_id = :market_id
 """)
-_STATS_SQL = text("""
-    SELECT
-        COUNT(*) AS total_trades,
-        COALESCE(SUM(quantity), 0) AS total_volume,
-        COALESCE(SUM(taker_fee + maker_fee), 0) AS total_fees,
-        COUNT(DISTINCT buy_user_id) + COUNT(DISTINCT sell_user_id) AS unique_traders
-    FROM trades
-    WHERE market_id = :market_id
-""")
-
-
 class AdminService:
     async def resolve_market(
         self, market_id: str, outcome: str, db: AsyncSession
@@ -94,6 +88,8 @@ class AdminService:
         except Exception:
             await db.rollback()
             raise
+        get_matching_engine().drop_market(market_id)
+        get_market_read_cache().invalidate_market(market_id)
 
         return {
             "market_id": market_id,
@@ -105,16 +101,30 @@ class AdminService:
         row = (await db.execute(_GET_MARKET_SQL, {"market_id": market_id})).fetchone()
         if row is None:
             raise AppError(3001, "Market not found", http_status=404)
-        stats = (await db.execute(_STATS_SQL, {"market_id": market_id})).fetchone()
+        return _stats_body(market_id, row.status, await market_stats.get(market_id, db))
+
+    async def reconcile_market_stats(self, market_id: str, db: AsyncSession) -> dict[str, Any]:
+        """Rebuild the market's running stats from its trades."""
+        row = (await db.execute(_GET_MARKET_SQL, {"market_id": market_id})).fetchone()
+        if row is None:
+            raise AppError(3001, "Market not found", http_status=404)
+        try:
+            stats, exact_traders = await market_stats.reconcile(market_id, db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
         return {
-            "market_id": market_id,
-            "status": row.status,
-            "total_trades": stats.total_trades if stats else 0,
-            "total_volume": int(stats.total_volume) if stats else 0,
-            "total_fees": int(stats.total_fees) if stats else 0,
-            "unique_traders": int(stats.unique_traders) if stats else 0,
+            **_stats_body(market_id, row.status, stats),
+            "exact_unique_traders": exact_traders,
         }
 
+    def sql_profile_report(self, top: int) -> dict[str, Any]:
+        """Log and return the top-N statements by total DB time since start-up."""
+        if not settings.SQL_PROFILE_ENABLED:
+            raise SqlProfilerDisabledError()
+        return {"statements": sql_profiler.log_report(top)}
+
     async def verify_all_invariants(self, db: AsyncSession) -> dict[str, object]:
         """Run per-market (INV-1/2/3) and global (INV-G) invariant checks."""
         violations: list[str] = []
@@ -130,6 +140,20 @@ class AdminService:
         return {"ok": len(violations) == 0, "violations": violations}
 
 
+def _stats_body(market_id: str, status: str, stats: market_stats.MarketStats) -> dict[str, Any]:
+    return {
+        "market_id": market_id,
+        "status": status,
+        "total_trades": stats.trade_count,
+        "total_volume": stats.volume,
+        "total_notional": stats.notional,
+        "total_fees": stats.fees,
+        "vwap_cents": stats.vwap_cents,
+        "unique_traders": stats.unique_traders,
+        "reconciled_at": stats.reconciled_at,
+    }
+
+
 class _MarketStateShim:
     """Duck-typed MarketState for invariant checks (read-only, no fee fields needed)."""
 
@@ -21,17 +21,18 @@ from src.pm_common.database import get_db_session
 from src.pm_common.response import ApiResponse, success_response
 from src.pm_gateway.auth.dependencies import require_amm_user
 from src.pm_gateway.user.db_models import UserModel
+from src.pm_matching.application.journaled_engine import require_sql_mode
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["AMM"])
 
 
-@router.post("/mint", status_code=201)
+@router.post("/mint", status_code=201, dependencies=[Depends(require_sql_mode)])
 async def privileged_mint(
     request: MintRequest,
     current_user: UserModel = Depends(require_amm_user),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session, scope="function"),
 ) -> ApiResponse:
     """Privileged Mint: create YES+NO share pairs for AMM.
 
@@ -60,11 +61,11 @@ async def privileged_mint(
     )
 
 
-@router.post("/burn")
+@router.post("/burn", dependencies=[Depends(require_sql_mode)])
 async def privileged_burn(
     request: BurnRequest,
     current_user: UserModel = Depends(require_amm_user),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session, scope="function"),
 ) -> ApiResponse:
     """Privileged Burn (Auto-Merge): destroy YES+NO share pairs, recover cash.
 
@@ -3,11 +3,10 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_clearing.application.trades_schemas import TradeListResponse, TradeResponse
 from src.pm_clearing.infrastructure.trades_repository import TradesRepository
-from src.pm_common.database import get_db_session
+from src.pm_common.database import ReadDbSession
 from src.pm_common.response import ApiResponse, success_response
 from src.pm_gateway.auth.dependencies import get_current_user
 from src.pm_gateway.user.db_models import UserModel
@@ -19,7 +18,7 @@ _repo = TradesRepository()
 @router.get("")
 async def list_trades(
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
     market_id: str | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
     cursor: str | None = Query(None),
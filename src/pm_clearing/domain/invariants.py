@@ -2,19 +2,17 @@
 
 import logging
 
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-logger = logging.getLogger(__name__)
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 
-_COST_SUM_SQL = text("""
-    SELECT COALESCE(SUM(yes_cost_sum + no_cost_sum), 0)
-    FROM positions
-    WHERE market_id = :market_id
-""")
+logger = logging.getLogger(__name__)
 
 
-async def verify_invariants_after_trade(market: object, db: AsyncSession) -> None:
+async def verify_invariants_after_trade(
+    market: object, db: AsyncSession, store: ClearingStore = sql_clearing_store
+) -> None:
     """Verify critical market invariants after a trade. Raises AssertionError if violated.
 
     INV-1: total_yes_shares == total_no_shares
@@ -32,8 +30,7 @@ async def verify_invariants_after_trade(market: object, db: AsyncSession) -> Non
         f"INV-2 violated: reserve={reserve} != yes_shares * 100 = {yes * 100}"
     )
 
-    cost_row = await db.execute(_COST_SUM_SQL, {"market_id": market_id})
-    total_cost = cost_row.scalar_one()
+    total_cost = await store.market_cost_sum(market_id, db)
     assert reserve + pnl == total_cost, (
         f"INV-3 violated: reserve({reserve}) + pnl({pnl}) = {reserve + pnl} "
         f"!= total_cost_sum={total_cost}"
@@ -1,39 +1,19 @@
 """Auto-netting: cancel opposing YES/NO positions and release frozen cost."""
 
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_account.domain.constants import AMM_USER_ID
 from src.pm_clearing.domain.fee import calc_released_cost
-
-_GET_POSITION_SQL = text("""
-    SELECT yes_volume, yes_cost_sum, yes_pending_sell,
-           no_volume,  no_cost_sum,  no_pending_sell
-    FROM positions
-    WHERE user_id = :user_id AND market_id = :market_id
-    FOR UPDATE
-""")
-
-_UPDATE_POSITION_NET_SQL = text("""
-    UPDATE positions
-    SET yes_volume       = yes_volume       - :qty,
-        yes_cost_sum     = yes_cost_sum     - :yes_cost,
-        no_volume        = no_volume        - :qty,
-        no_cost_sum      = no_cost_sum      - :no_cost,
-        updated_at = NOW()
-    WHERE user_id = :user_id AND market_id = :market_id
-""")
-
-_CREDIT_AVAILABLE_SQL = text("""
-    UPDATE accounts
-    SET available_balance = available_balance + :amount,
-        version = version + 1, updated_at = NOW()
-    WHERE user_id = :user_id
-""")
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 
 
 async def _do_netting(
-    user_id: str, market_id: str, market: object, db: AsyncSession
+    user_id: str,
+    market_id: str,
+    market: object,
+    db: AsyncSession,
+    store: ClearingStore = sql_clearing_store,
 ) -> int:
     """Auto-net YES+NO positions. Returns qty netted (0 if nothing to net).
 
@@ -42,18 +22,10 @@ async def _do_netting(
     if user_id == AMM_USER_ID:
         return 0
 
-
-    row = (
-        await db.execute(_GET_POSITION_SQL, {"user_id": user_id, "market_id": market_id})
-    ).fetchone()
+    row = await store.get_position(user_id, market_id, db)
     if row is None:
         return 0
-    yes_vol: int = int(row[0])
-    yes_cost: int = int(row[1])
-    yes_pend: int = int(row[2])
-    no_vol: int = int(row[3])
-    no_cost: int = int(row[4])
-    no_pend: int = int(row[5])
+    yes_vol, yes_cost, yes_pend, no_vol, no_cost, no_pend = row
     available_yes = yes_vol - yes_pend
     available_no = no_vol - no_pend
     nettable = min(available_yes, available_no)
@@ -65,17 +37,8 @@ async def _do_netting(
     total_cost_released = yes_cost_rel + no_cost_rel
     refund = nettable * 100
 
-    await db.execute(
-        _UPDATE_POSITION_NET_SQL,
-        {
-            "user_id": user_id,
-            "market_id": market_id,
-            "qty": nettable,
-            "yes_cost": yes_cost_rel,
-            "no_cost": no_cost_rel,
-        },
-    )
-    await db.execute(_CREDIT_AVAILABLE_SQL, {"user_id": user_id, "amount": refund})
+    await store.net_position(user_id, market_id, nettable, yes_cost_rel, no_cost_rel, db)
+    await store.credit_available(user_id, refund, db)
 
     market.reserve_balance -= refund  # type: ignore[attr-defined]
     market.total_yes_shares -= nettable  # type: ignore[attr-defined]
@@ -86,7 +49,11 @@ async def _do_netting(
 
 
 async def execute_netting_if_needed(
-    user_id: str, market_id: str, market: object, db: AsyncSession
+    user_id: str,
+    market_id: str,
+    market: object,
+    db: AsyncSession,
+    store: ClearingStore = sql_clearing_store,
 ) -> int:
     """Execute auto-netting if user has it enabled.
 
@@ -94,13 +61,9 @@ async def execute_netting_if_needed(
     dual-sided inventory. See data dictionary v1.3 §3.3.
     """
     # --- AMM prerequisite: check auto_netting_enabled ---
-    netting_check = await db.execute(
-        text("SELECT auto_netting_enabled FROM accounts WHERE user_id = :uid"),
-        {"uid": user_id},
-    )
-    auto_netting = netting_check.scalar()
+    auto_netting = await store.auto_netting_enabled(user_id, db)
     if auto_netting is False:  # explicit False, not None
         return 0  # skip netting for this user
     # --- end AMM prerequisite ---
 
-    return await _do_netting(user_id, market_id, market, db)
+    return await _do_netting(user_id, market_id, market, db, store)
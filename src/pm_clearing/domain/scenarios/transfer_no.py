@@ -1,98 +1,40 @@
 """TRANSFER_NO scenario: SYNTHETIC_BUY + SYNTHETIC_SELL — NO shares change hands."""
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_clearing.domain.fee import calc_released_cost
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 from src.pm_matching.domain.models import TradeResult
 
-_UNFREEZE_DEBIT_SQL = text("""
-    UPDATE accounts
-    SET frozen_balance    = frozen_balance    - :unfreeze,
-        available_balance = available_balance + :refund,
-        version = version + 1, updated_at = NOW()
-    WHERE user_id = :user_id
-""")
-
-_ADD_NO_VOLUME_SQL = text("""
-    INSERT INTO positions (user_id, market_id, no_volume, no_cost_sum)
-    VALUES (:user_id, :market_id, :qty, :cost)
-    ON CONFLICT (user_id, market_id) DO UPDATE
-    SET no_volume   = positions.no_volume   + :qty,
-        no_cost_sum = positions.no_cost_sum + :cost,
-        updated_at = NOW()
-""")
-
-_GET_BUYER_NO_SQL = text("""
-    SELECT no_volume, no_cost_sum, no_pending_sell
-    FROM positions WHERE user_id = :user_id AND market_id = :market_id
-    FOR UPDATE
-""")
-
-_REDUCE_NO_VOLUME_SQL = text("""
-    UPDATE positions
-    SET no_volume       = no_volume       - :qty,
-        no_cost_sum     = no_cost_sum     - :cost_released,
-        no_pending_sell = no_pending_sell - :qty,
-        updated_at = NOW()
-    WHERE user_id = :user_id AND market_id = :market_id
-""")
-
-_ADD_BALANCE_SQL = text("""
-    UPDATE accounts
-    SET available_balance = available_balance + :amount,
-        version = version + 1, updated_at = NOW()
-    WHERE user_id = :user_id
-""")
-
 
 async def clear_transfer_no(
-    trade: TradeResult, market: object, db: AsyncSession
+    trade: TradeResult,
+    market: object,
+    db: AsyncSession,
+    store: ClearingStore = sql_clearing_store,
 ) -> tuple[int | None, int | None]:
     """TRANSFER_NO: SYNTHETIC_BUY + SYNTHETIC_SELL — NO shares change hands."""
     no_trade_price = 100 - trade.price  # convert YES trade price to NO price
     seller_cost = no_trade_price * trade.quantity  # SYNTHETIC_SELL (Buy NO) pays this
 
     # "seller" (Buy NO / SYNTHETIC_SELL): unfreeze funds, gain NO shares
-    await db.execute(
-        _UNFREEZE_DEBIT_SQL,
-        {"user_id": trade.sell_user_id, "unfreeze": seller_cost, "refund": 0},
-    )
-    await db.execute(
-        _ADD_NO_VOLUME_SQL,
-        {
-            "user_id": trade.sell_user_id,
-            "market_id": trade.market_id,
-            "qty": trade.quantity,
-            "cost": seller_cost,
-        },
+    await store.debit_frozen(trade.sell_user_id, seller_cost, 0, db)
+    await store.add_shares(
+        trade.sell_user_id, trade.market_id, "NO", trade.quantity, seller_cost, db
     )
 
     # "buyer" (Sell NO / SYNTHETIC_BUY): fetch NO position, release pending, gain funds
-    row = (
-        await db.execute(
-            _GET_BUYER_NO_SQL,
-            {"user_id": trade.buy_user_id, "market_id": trade.market_id},
-        )
-    ).fetchone()
+    row = await store.get_shares(trade.buy_user_id, trade.market_id, "NO", db)
     if row is None:
         raise RuntimeError(f"Buyer NO position not found: {trade.buy_user_id}")
     no_vol, no_cost, _ = row
     cost_released = calc_released_cost(no_cost, no_vol, trade.quantity)
     proceeds = no_trade_price * trade.quantity
 
-    await db.execute(
-        _REDUCE_NO_VOLUME_SQL,
-        {
-            "user_id": trade.buy_user_id,
-            "market_id": trade.market_id,
-            "qty": trade.quantity,
-            "cost_released": cost_released,
-        },
-    )
-    await db.execute(
-        _ADD_BALANCE_SQL,
-        {"user_id": trade.buy_user_id, "amount": proceeds},
+    await store.reduce_shares(
+        trade.buy_user_id, trade.market_id, "NO", trade.quantity, cost_released, db
     )
+    await store.credit_available(trade.buy_user_id, proceeds, db)
 
     market.pnl_pool -= proceeds - cost_released  # type: ignore[attr-defined]
 
@@ -5,6 +5,8 @@ from src.pm_clearing.domain.scenarios.burn import clear_burn
 from src.pm_clearing.domain.scenarios.mint import clear_mint
 from src.pm_clearing.domain.scenarios.transfer_no import clear_transfer_no
 from src.pm_clearing.domain.scenarios.transfer_yes import clear_transfer_yes
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 from src.pm_common.enums import TradeScenario
 from src.pm_matching.domain.models import TradeResult
 from src.pm_matching.engine.scenario import determine_scenario
@@ -15,14 +17,15 @@ async def settle_trade(
     market: object,
     db: AsyncSession,
     fee_bps: int,
+    store: ClearingStore = sql_clearing_store,
 ) -> tuple[int | None, int | None]:
     """Determine scenario and dispatch to the appropriate clearing function."""
     scenario = determine_scenario(trade.buy_book_type, trade.sell_book_type)
     if scenario == TradeScenario.MINT:
-        return await clear_mint(trade, market, db)
+        return await clear_mint(trade, market, db, store)
     elif scenario == TradeScenario.TRANSFER_YES:
-        return await clear_transfer_yes(trade, market, db)
+        return await clear_transfer_yes(trade, market, db, store)
     elif scenario == TradeScenario.TRANSFER_NO:
-        return await clear_transfer_no(trade, market, db)
+        return await clear_transfer_no(trade, market, db, store)
     else:
-        return await clear_burn(trade, market, db)
+        return await clear_burn(trade, market, db, store)
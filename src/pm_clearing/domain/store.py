@@ -0,0 +1,155 @@
+"""ClearingStore Protocol — storage contract for freeze, clearing, fees and netting.
+
+Every read and write made while placing, cancelling or amending an order goes
+through one of these methods, so the real MatchingEngine can run against
+Postgres (SqlClearingStore) or entirely in memory (MemoryClearingStore).
+
+Like the repositories, methods take the session as their last argument; the
+in-memory store ignores it. ``side`` is "YES" or "NO".
+"""
+from contextlib import AbstractAsyncContextManager
+from typing import Any, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ClearingStore(Protocol):
+    def transaction(self, db: AsyncSession) -> AbstractAsyncContextManager[Any]:
+        """Savepoint around one engine command; rolled back if the block raises."""
+        ...
+
+    async def commit(self, db: AsyncSession) -> None:
+        """Make a finished command durable; the engine calls it before publishing the command."""
+        ...
+
+    # accounts
+    async def freeze_funds(self, user_id: str, amount: int, db: AsyncSession) -> bool:
+        """Move ``amount`` from available to frozen. False if available is too low."""
+        ...
+
+    async def unfreeze_funds(self, user_id: str, amount: int, db: AsyncSession) -> None: ...
+
+    async def debit_frozen(
+        self, user_id: str, amount: int, refund: int, db: AsyncSession
+    ) -> None:
+        """frozen -= amount; available += refund."""
+        ...
+
+    async def credit_available(self, user_id: str, amount: int, db: AsyncSession) -> bool:
+        """available += amount. False if the account does not exist."""
+        ...
+
+    async def debit_available(self, user_id: str, amount: int, db: AsyncSession) -> None: ...
+
+    async def auto_netting_enabled(self, user_id: str, db: AsyncSession) -> bool | None: ...
+
+    async def get_balances(
+        self, user_ids: list[str], db: AsyncSession
+    ) -> dict[str, tuple[int, int, int]]:
+        """{user_id: (available_balance, frozen_balance, version)}; missing accounts omitted."""
+        ...
+
+    # positions
+    async def freeze_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, db: AsyncSession
+    ) -> bool:
+        """pending_sell += qty if enough free shares. False otherwise."""
+        ...
+
+    async def release_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, db: AsyncSession
+    ) -> None:
+        """pending_sell -= qty."""
+        ...
+
+    async def add_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, cost: int, db: AsyncSession
+    ) -> None:
+        """volume += qty and cost_sum += cost, creating the position if needed."""
+        ...
+
+    async def get_shares(
+        self, user_id: str, market_id: str, side: str, db: AsyncSession
+    ) -> tuple[int, int, int] | None:
+        """(volume, cost_sum, pending_sell) for one side, locked for update."""
+        ...
+
+    async def reduce_shares(
+        self,
+        user_id: str,
+        market_id: str,
+        side: str,
+        qty: int,
+        cost_released: int,
+        db: AsyncSession,
+    ) -> None:
+        """Sell-side fill: volume and pending_sell -= qty, cost_sum -= cost_released."""
+        ...
+
+    async def get_position(
+        self, user_id: str, market_id: str, db: AsyncSession
+    ) -> tuple[int, int, int, int, int, int] | None:
+        """(yes_volume, yes_cost_sum, yes_pending_sell, no_volume, no_cost_sum,
+        no_pending_sell), locked for update."""
+        ...
+
+    async def get_positions(
+        self, market_id: str, user_ids: list[str], db: AsyncSession
+    ) -> dict[str, tuple[int, int, int, int, int, int, int]]:
+        """{user_id: get_position() tuple + (version,)} for one market, without locking."""
+        ...
+
+    async def net_position(
+        self,
+        user_id: str,
+        market_id: str,
+        qty: int,
+        yes_cost: int,
+        no_cost: int,
+        db: AsyncSession,
+    ) -> None: ...
+
+    async def market_cost_sum(self, market_id: str, db: AsyncSession) -> int: ...
+
+    # markets
+    async def market_status(self, market_id: str, db: AsyncSession) -> str | None: ...
+
+    async def load_market(self, market_id: str, db: AsyncSession) -> Any:
+        """Market row (id, status, reserve_balance, pnl_pool, total_yes_shares,
+        total_no_shares, taker_fee_bps), locked for update."""
+        ...
+
+    async def save_market(self, market: Any, db: AsyncSession) -> None:
+        """Persist reserve_balance, pnl_pool and the share totals of ``market``."""
+        ...
+
+    # journals
+    async def insert_ledger(
+        self,
+        user_id: str,
+        entry_type: str,
+        amount: int,
+        balance_after: int,
+        reference_type: str,
+        reference_id: str | None,
+        db: AsyncSession,
+    ) -> None: ...
+
+    async def insert_wal_event(
+        self,
+        market_id: str,
+        event_type: str,
+        payload: dict[str, object],
+        db: AsyncSession,
+        book_seq: int | None = None,
+    ) -> None: ...
+
+    async def get_book_seq(self, market_id: str, db: AsyncSession) -> int:
+        """Highest book_seq recorded in wal_events for the market (0 if none)."""
+        ...
+
+    async def insert_trade(self, row: dict[str, Any], db: AsyncSession) -> None: ...
+
+    async def insert_outbox_events(self, rows: list[dict[str, Any]], db: AsyncSession) -> None:
+        """Queue rows of (event_type, market_id, user_id, payload) for the outbox relay."""
+        ...
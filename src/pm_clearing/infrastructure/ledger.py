@@ -1,22 +1,11 @@
-"""DB helpers for ledger_entries and wal_events.
+"""Helpers for ledger_entries and wal_events.
 
 Called from MatchingEngine within a transaction.
 """
-import json
-
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-_INSERT_LEDGER_SQL = text("""
-    INSERT INTO ledger_entries
-        (user_id, entry_type, amount, balance_after, reference_type, reference_id)
-    VALUES (:user_id, :entry_type, :amount, :balance_after, :reference_type, :reference_id)
-""")
-
-_INSERT_WAL_SQL = text("""
-    INSERT INTO wal_events (market_id, event_type, payload)
-    VALUES (:market_id, :event_type, :payload)
-""")
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 
 
 async def write_ledger(
@@ -27,18 +16,11 @@ async def write_ledger(
     reference_type: str,
     reference_id: str,
     db: AsyncSession,
+    store: ClearingStore = sql_clearing_store,
 ) -> None:
     """Insert one row into ledger_entries within the caller's transaction."""
-    await db.execute(
-        _INSERT_LEDGER_SQL,
-        {
-            "user_id": user_id,
-            "entry_type": entry_type,
-            "amount": amount,
-            "balance_after": balance_after,
-            "reference_type": reference_type,
-            "reference_id": reference_id,
-        },
+    await store.insert_ledger(
+        user_id, entry_type, amount, balance_after, reference_type, reference_id, db
     )
 
 
@@ -49,18 +31,14 @@ async def write_wal_event(
     user_id: str,
     payload: dict[str, object],
     db: AsyncSession,
+    store: ClearingStore = sql_clearing_store,
+    book_seq: int | None = None,
 ) -> None:
     """Insert one row into wal_events within the caller's transaction.
 
     order_id and user_id are stored inside the JSONB payload column
-    (the table has a GIN index on payload->'order_id').
+    (the table has a GIN index on payload->'order_id'). book_seq is the
+    market's order book sequence number after the command that wrote it.
     """
     full_payload = {"order_id": order_id, "user_id": user_id, **payload}
-    await db.execute(
-        _INSERT_WAL_SQL,
-        {
-            "market_id": market_id,
-            "event_type": event_type,
-            "payload": json.dumps(full_payload),
-        },
-    )
+    await store.insert_wal_event(market_id, event_type, full_payload, db, book_seq)
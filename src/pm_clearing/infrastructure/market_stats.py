@@ -0,0 +1,165 @@
+"""Running per-market trade statistics (market_stats).
+
+record_trade() is called by SqlClearingStore.insert_trade, so the totals
+move in the same transaction as the trades row they count, in SQL mode and
+in the journal projector alike. Unique traders are a HyperLogLog of buy and
+sell user ids kept in trader_sketch: a trade raises at most two registers,
+which the upsert does in place with set_byte(), so no statement ever reads
+the sketch back into Python on the hot path.
+
+reconcile() rebuilds a market's row from the trades table (admin endpoint,
+scripts/reconcile_market_stats.py). It locks the row first: a clearing
+transaction that inserted a trade the rebuild cannot see yet blocks on that
+lock when it updates the totals, and applies its trade on top after.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_common.hyperloglog import HyperLogLog
+
+SKETCH_PRECISION = 11  # 2048 registers, ~2.3% standard error
+
+_EMPTY_SKETCH = f"decode(repeat('00', {1 << SKETCH_PRECISION}), 'hex')"
+
+_RECORD_TRADE_SQL = text(f"""
+    INSERT INTO market_stats (market_id, trade_count, volume, notional, fees, trader_sketch)
+    VALUES (:market_id, 1, :quantity, :notional, :fees,
+            set_byte(set_byte({_EMPTY_SKETCH}, :buy_reg, :buy_rank), :sell_reg, :sell_rank))
+    ON CONFLICT (market_id) DO UPDATE
+    SET trade_count = market_stats.trade_count + 1,
+        volume = market_stats.volume + EXCLUDED.volume,
+        notional = market_stats.notional + EXCLUDED.notional,
+        fees = market_stats.fees + EXCLUDED.fees,
+        trader_sketch = set_byte(
+            set_byte(market_stats.trader_sketch, :buy_reg,
+                     GREATEST(get_byte(market_stats.trader_sketch, :buy_reg), :buy_rank)),
+            :sell_reg, GREATEST(get_byte(market_stats.trader_sketch, :sell_reg), :sell_rank)),
+        updated_at = NOW()
+""")
+
+_GET_STATS_SQL = text("""
+    SELECT trade_count, volume, notional, fees, trader_sketch, reconciled_at
+    FROM market_stats WHERE market_id = :market_id
+""")
+
+_LOCK_SQL = text(f"""
+    INSERT INTO market_stats (market_id, trader_sketch) VALUES (:market_id, {_EMPTY_SKETCH})
+    ON CONFLICT (market_id) DO UPDATE SET updated_at = market_stats.updated_at
+""")
+
+_AGGREGATE_SQL = text("""
+    SELECT COUNT(*) AS trade_count,
+           COALESCE(SUM(quantity), 0) AS volume,
+           COALESCE(SUM(price::BIGINT * quantity), 0) AS notional,
+           COALESCE(SUM(maker_fee + taker_fee), 0) AS fees
+    FROM trades WHERE market_id = :market_id
+""")
+
+_TRADERS_SQL = text("""
+    SELECT buy_user_id FROM trades WHERE market_id = :market_id
+    UNION
+    SELECT sell_user_id FROM trades WHERE market_id = :market_id
+""")
+
+_REPLACE_SQL = text("""
+    UPDATE market_stats
+    SET trade_count = :trade_count, volume = :volume, notional = :notional, fees = :fees,
+        trader_sketch = :trader_sketch, reconciled_at = NOW(), updated_at = NOW()
+    WHERE market_id = :market_id
+    RETURNING reconciled_at
+""")
+
+
+@dataclass
+class MarketStats:
+    trade_count: int = 0
+    volume: int = 0
+    notional: int = 0  # sum of price * quantity, in cents (YES price)
+    fees: int = 0
+    unique_traders: int = 0
+    reconciled_at: datetime | None = None
+
+    @property
+    def vwap_cents(self) -> float | None:
+        return round(self.notional / self.volume, 2) if self.volume else None
+
+
+def _sketch(registers: bytes | None = None) -> HyperLogLog:
+    return HyperLogLog(SKETCH_PRECISION, registers)
+
+
+async def record_trade(row: dict[str, Any], db: AsyncSession) -> None:
+    """Fold one trades row (see trades_writer.write_trade) into its market's totals."""
+    sketch = _sketch()
+    buy_reg, buy_rank = sketch.register(row["buy_user_id"])
+    sell_reg, sell_rank = sketch.register(row["sell_user_id"])
+    if buy_reg == sell_reg:  # the outer set_byte would overwrite the inner one
+        buy_rank = sell_rank = max(buy_rank, sell_rank)
+    await db.execute(
+        _RECORD_TRADE_SQL,
+        {
+            "market_id": row["market_id"],
+            "quantity": row["quantity"],
+            "notional": row["price"] * row["quantity"],
+            "fees": row["maker_fee"] + row["taker_fee"],
+            "buy_reg": buy_reg,
+            "buy_rank": buy_rank,
+            "sell_reg": sell_reg,
+            "sell_rank": sell_rank,
+        },
+    )
+
+
+async def get(market_id: str, db: AsyncSession) -> MarketStats:
+    """The market's running totals; all zero before its first trade."""
+    row = (await db.execute(_GET_STATS_SQL, {"market_id": market_id})).fetchone()
+    if row is None:
+        return MarketStats()
+    return MarketStats(
+        trade_count=int(row.trade_count),
+        volume=int(row.volume),
+        notional=int(row.notional),
+        fees=int(row.fees),
+        unique_traders=_sketch(bytes(row.trader_sketch)).count(),
+        reconciled_at=row.reconciled_at,
+    )
+
+
+async def reconcile(market_id: str, db: AsyncSession) -> tuple[MarketStats, int]:
+    """Recompute the market's row from trades in the caller's transaction.
+
+    Returns the new totals and the exact number of distinct traders, which
+    the sketch estimates from then on.
+    """
+    await db.execute(_LOCK_SQL, {"market_id": market_id})
+    totals = (await db.execute(_AGGREGATE_SQL, {"market_id": market_id})).one()
+    sketch = _sketch()
+    traders = 0
+    result = await db.stream(_TRADERS_SQL, {"market_id": market_id})
+    async for user_id in result.scalars():
+        sketch.add(user_id)
+        traders += 1
+    stats = MarketStats(
+        trade_count=int(totals.trade_count),
+        volume=int(totals.volume),
+        notional=int(totals.notional),
+        fees=int(totals.fees),
+        unique_traders=sketch.count(),
+    )
+    reconciled = await db.execute(
+        _REPLACE_SQL,
+        {
+            "market_id": market_id,
+            "trade_count": stats.trade_count,
+            "volume": stats.volume,
+            "notional": stats.notional,
+            "fees": stats.fees,
+            "trader_sketch": sketch.to_bytes(),
+        },
+    )
+    stats.reconciled_at = reconciled.scalar_one()
+    return stats, traders
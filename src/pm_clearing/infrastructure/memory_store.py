@@ -0,0 +1,435 @@
+"""MemoryClearingStore — dict-backed ClearingStore for simulation and tests.
+
+Runs the real MatchingEngine without Postgres: pass the store to
+MatchingEngine(store=...), use MemoryOrderRepository(store) as the order
+repository and pass ``None`` wherever a session is expected.
+
+transaction() mirrors a savepoint: every entity touched inside it is
+snapshotted first and restored if the block raises, and journal rows
+appended inside it are dropped. Single event loop, no locking.
+
+With keep_journals=False ledger, WAL, trade and outbox rows are only counted, which
+keeps memory flat when simulating millions of orders.
+
+take_changes() hands out copies of every row touched since the last call plus
+the journal rows appended meanwhile; the journaled engine uses it to feed the
+Postgres projector.
+"""
+import copy
+from collections.abc import AsyncIterator, MutableMapping
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_account.domain.models import Position
+
+
+@dataclass
+class MemoryAccount:
+    available_balance: int = 0
+    frozen_balance: int = 0
+    auto_netting_enabled: bool = True
+    version: int = 0  # bumped on every change, like accounts.version
+
+
+@dataclass
+class MemoryMarket:
+    id: str
+    status: str = "ACTIVE"
+    reserve_balance: int = 0
+    pnl_pool: int = 0
+    total_yes_shares: int = 0
+    total_no_shares: int = 0
+    taker_fee_bps: int = 20
+
+
+@dataclass
+class ChangeSet:
+    """Row images and journal rows produced since the previous take_changes()."""
+
+    accounts: dict[str, MemoryAccount] = field(default_factory=dict)
+    positions: dict[tuple[str, str], Position] = field(default_factory=dict)
+    markets: dict[str, MemoryMarket] = field(default_factory=dict)
+    orders: dict[str, Any] = field(default_factory=dict)
+    ledger: list[dict[str, Any]] = field(default_factory=list)
+    wal_events: list[dict[str, Any]] = field(default_factory=list)
+    trades: list[dict[str, Any]] = field(default_factory=list)
+    outbox: list[dict[str, Any]] = field(default_factory=list)
+
+    def merge(self, later: "ChangeSet") -> None:
+        """Fold ``later`` into this set: newer row images win, journal rows append."""
+        self.accounts.update(later.accounts)
+        self.positions.update(later.positions)
+        self.markets.update(later.markets)
+        self.orders.update(later.orders)
+        self.ledger.extend(later.ledger)
+        self.wal_events.extend(later.wal_events)
+        self.trades.extend(later.trades)
+        self.outbox.extend(later.outbox)
+
+
+class MemoryClearingStore:
+    def __init__(self, keep_journals: bool = True) -> None:
+        self.accounts: dict[str, MemoryAccount] = {}
+        self.positions: dict[tuple[str, str], Position] = {}
+        self.markets: dict[str, MemoryMarket] = {}
+        self.orders: dict[str, Any] = {}  # owned by MemoryOrderRepository
+        self.client_order_ids: dict[tuple[str, str], str] = {}  # ditto
+        self.keep_journals = keep_journals
+        self.ledger: list[dict[str, Any]] = []
+        self.wal_events: list[dict[str, Any]] = []
+        self.trades: list[dict[str, Any]] = []
+        self.outbox: list[dict[str, Any]] = []
+        self.journal_counts = {"ledger": 0, "wal_events": 0, "trades": 0, "outbox": 0}
+        self.book_seqs: dict[str, int] = {}  # highest wal_events.book_seq per market
+        self._undo: list[tuple[MutableMapping[Any, Any], Any, Any]] | None = None
+        self._dirty: dict[int, set[Any]] = {
+            id(self.accounts): set(),
+            id(self.positions): set(),
+            id(self.markets): set(),
+            id(self.orders): set(),
+        }
+
+    # -- setup helpers -----------------------------------------------------
+
+    def open_account(
+        self, user_id: str, available: int = 0, auto_netting_enabled: bool = True
+    ) -> MemoryAccount:
+        account = MemoryAccount(available, 0, auto_netting_enabled)
+        self.accounts[user_id] = account
+        return account
+
+    def open_market(self, market_id: str, taker_fee_bps: int = 20) -> MemoryMarket:
+        market = MemoryMarket(market_id, taker_fee_bps=taker_fee_bps)
+        self.markets[market_id] = market
+        return market
+
+    # -- transactions ------------------------------------------------------
+
+    def touch(self, table: MutableMapping[Any, Any], key: Any) -> None:
+        """Snapshot ``table[key]`` so the enclosing transaction can restore it."""
+        if self._undo is not None:
+            self._undo.append((table, key, copy.copy(table.get(key))))
+        dirty = self._dirty.get(id(table))
+        if dirty is not None:
+            dirty.add(key)
+
+    def take_changes(self) -> ChangeSet:
+        """Copy out every row touched since the last call and drain the journals.
+
+        Rows touched by a rolled-back transaction are included with their restored
+        value, which is harmless for an upserting consumer.
+        """
+        changes = ChangeSet(
+            accounts=self._images(self.accounts),
+            positions=self._images(self.positions),
+            markets=self._images(self.markets),
+            orders=self._images(self.orders),
+            ledger=self.ledger,
+            wal_events=self.wal_events,
+            trades=self.trades,
+            outbox=self.outbox,
+        )
+        self.ledger, self.wal_events, self.trades, self.outbox = [], [], [], []
+        return changes
+
+    def _images(self, table: dict[Any, Any]) -> dict[Any, Any]:
+        keys = self._dirty[id(table)]
+        images = {k: copy.copy(table[k]) for k in keys if k in table}
+        keys.clear()
+        return images
+
+    def transaction(self, db: AsyncSession) -> AbstractAsyncContextManager[Any]:
+        return self._transaction()
+
+    async def commit(self, db: AsyncSession) -> None:
+        """Nothing to flush; the journaled engine makes commands durable itself."""
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[None]:
+        outer = self._undo is None
+        if outer:
+            self._undo = []
+        assert self._undo is not None
+        mark = len(self._undo)
+        journal_marks = (
+            len(self.ledger), len(self.wal_events), len(self.trades), len(self.outbox)
+        )
+        counts = dict(self.journal_counts)
+        try:
+            yield
+        except BaseException:
+            while len(self._undo) > mark:
+                table, key, old = self._undo.pop()
+                if old is None:
+                    table.pop(key, None)
+                else:
+                    table[key] = old
+            del self.ledger[journal_marks[0]:]
+            del self.wal_events[journal_marks[1]:]
+            del self.trades[journal_marks[2]:]
+            del self.outbox[journal_marks[3]:]
+            self.journal_counts = counts
+            raise
+        finally:
+            if outer:
+                self._undo = None
+
+    def _account(self, user_id: str) -> MemoryAccount | None:
+        account = self.accounts.get(user_id)
+        if account is not None:
+            self.touch(self.accounts, user_id)
+            account.version += 1
+        return account
+
+    def _position(self, user_id: str, market_id: str, create: bool = False) -> Position | None:
+        key = (user_id, market_id)
+        position = self.positions.get(key)
+        if position is None and not create:
+            return None
+        self.touch(self.positions, key)
+        if position is None:
+            position = self.positions[key] = Position(user_id=user_id, market_id=market_id)
+        position.version += 1
+        return position
+
+    # -- accounts ----------------------------------------------------------
+
+    async def freeze_funds(self, user_id: str, amount: int, db: AsyncSession) -> bool:
+        account = self.accounts.get(user_id)
+        if account is None or account.available_balance < amount:
+            return False
+        self._account(user_id)
+        account.available_balance -= amount
+        account.frozen_balance += amount
+        return True
+
+    async def unfreeze_funds(self, user_id: str, amount: int, db: AsyncSession) -> None:
+        account = self._account(user_id)
+        if account is not None:
+            account.available_balance += amount
+            account.frozen_balance -= amount
+
+    async def debit_frozen(
+        self, user_id: str, amount: int, refund: int, db: AsyncSession
+    ) -> None:
+        account = self._account(user_id)
+        if account is not None:
+            account.frozen_balance -= amount
+            account.available_balance += refund
+
+    async def credit_available(self, user_id: str, amount: int, db: AsyncSession) -> bool:
+        account = self._account(user_id)
+        if account is None:
+            return False
+        account.available_balance += amount
+        return True
+
+    async def debit_available(self, user_id: str, amount: int, db: AsyncSession) -> None:
+        account = self._account(user_id)
+        if account is not None:
+            account.available_balance -= amount
+
+    async def auto_netting_enabled(self, user_id: str, db: AsyncSession) -> bool | None:
+        account = self.accounts.get(user_id)
+        return None if account is None else account.auto_netting_enabled
+
+    async def get_balances(
+        self, user_ids: list[str], db: AsyncSession
+    ) -> dict[str, tuple[int, int, int]]:
+        return {
+            uid: (a.available_balance, a.frozen_balance, a.version)
+            for uid in user_ids
+            if (a := self.accounts.get(uid)) is not None
+        }
+
+    # -- positions ---------------------------------------------------------
+
+    async def freeze_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, db: AsyncSession
+    ) -> bool:
+        position = self.positions.get((user_id, market_id))
+        if position is None:
+            return False
+        free = position.available_yes if side == "YES" else position.available_no
+        if free < qty:
+            return False
+        self._position(user_id, market_id)
+        if side == "YES":
+            position.yes_pending_sell += qty
+        else:
+            position.no_pending_sell += qty
+        return True
+
+    async def release_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, db: AsyncSession
+    ) -> None:
+        position = self._position(user_id, market_id)
+        if position is None:
+            return
+        if side == "YES":
+            position.yes_pending_sell -= qty
+        else:
+            position.no_pending_sell -= qty
+
+    async def add_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, cost: int, db: AsyncSession
+    ) -> None:
+        position = self._position(user_id, market_id, create=True)
+        assert position is not None
+        if side == "YES":
+            position.yes_volume += qty
+            position.yes_cost_sum += cost
+        else:
+            position.no_volume += qty
+            position.no_cost_sum += cost
+
+    async def get_shares(
+        self, user_id: str, market_id: str, side: str, db: AsyncSession
+    ) -> tuple[int, int, int] | None:
+        p = self.positions.get((user_id, market_id))
+        if p is None:
+            return None
+        if side == "YES":
+            return (p.yes_volume, p.yes_cost_sum, p.yes_pending_sell)
+        return (p.no_volume, p.no_cost_sum, p.no_pending_sell)
+
+    async def reduce_shares(
+        self,
+        user_id: str,
+        market_id: str,
+        side: str,
+        qty: int,
+        cost_released: int,
+        db: AsyncSession,
+    ) -> None:
+        position = self._position(user_id, market_id)
+        if position is None:
+            return
+        if side == "YES":
+            position.yes_volume -= qty
+            position.yes_cost_sum -= cost_released
+            position.yes_pending_sell -= qty
+        else:
+            position.no_volume -= qty
+            position.no_cost_sum -= cost_released
+            position.no_pending_sell -= qty
+
+    async def get_position(
+        self, user_id: str, market_id: str, db: AsyncSession
+    ) -> tuple[int, int, int, int, int, int] | None:
+        p = self.positions.get((user_id, market_id))
+        if p is None:
+            return None
+        return (
+            p.yes_volume, p.yes_cost_sum, p.yes_pending_sell,
+            p.no_volume, p.no_cost_sum, p.no_pending_sell,
+        )
+
+    async def get_positions(
+        self, market_id: str, user_ids: list[str], db: AsyncSession
+    ) -> dict[str, tuple[int, int, int, int, int, int, int]]:
+        positions = {}
+        for uid in user_ids:
+            p = self.positions.get((uid, market_id))
+            if p is not None:
+                positions[uid] = (
+                    p.yes_volume, p.yes_cost_sum, p.yes_pending_sell,
+                    p.no_volume, p.no_cost_sum, p.no_pending_sell, p.version,
+                )
+        return positions
+
+    async def net_position(
+        self,
+        user_id: str,
+        market_id: str,
+        qty: int,
+        yes_cost: int,
+        no_cost: int,
+        db: AsyncSession,
+    ) -> None:
+        position = self._position(user_id, market_id)
+        if position is None:
+            return
+        position.yes_volume -= qty
+        position.yes_cost_sum -= yes_cost
+        position.no_volume -= qty
+        position.no_cost_sum -= no_cost
+
+    async def market_cost_sum(self, market_id: str, db: AsyncSession) -> int:
+        return sum(
+            p.yes_cost_sum + p.no_cost_sum
+            for (_, mid), p in self.positions.items()
+            if mid == market_id
+        )
+
+    # -- markets -----------------------------------------------------------
+
+    async def market_status(self, market_id: str, db: AsyncSession) -> str | None:
+        market = self.markets.get(market_id)
+        return None if market is None else market.status
+
+    async def load_market(self, market_id: str, db: AsyncSession) -> Any:
+        return self.markets.get(market_id)
+
+    async def save_market(self, market: Any, db: AsyncSession) -> None:
+        stored = self.markets[market.id]
+        self.touch(self.markets, market.id)
+        stored.reserve_balance = market.reserve_balance
+        stored.pnl_pool = market.pnl_pool
+        stored.total_yes_shares = market.total_yes_shares
+        stored.total_no_shares = market.total_no_shares
+
+    # -- journals ----------------------------------------------------------
+
+    def _append(self, journal: str, rows: list[dict[str, Any]], row: dict[str, Any]) -> None:
+        self.journal_counts[journal] += 1
+        if self.keep_journals:
+            rows.append(row)
+
+    async def insert_ledger(
+        self,
+        user_id: str,
+        entry_type: str,
+        amount: int,
+        balance_after: int,
+        reference_type: str,
+        reference_id: str | None,
+        db: AsyncSession,
+    ) -> None:
+        self._append("ledger", self.ledger, {
+            "user_id": user_id,
+            "entry_type": entry_type,
+            "amount": amount,
+            "balance_after": balance_after,
+            "reference_type": reference_type,
+            "reference_id": reference_id,
+        })
+
+    async def insert_wal_event(
+        self,
+        market_id: str,
+        event_type: str,
+        payload: dict[str, object],
+        db: AsyncSession,
+        book_seq: int | None = None,
+    ) -> None:
+        self._append("wal_events", self.wal_events, {
+            "market_id": market_id, "event_type": event_type, "payload": payload,
+            "book_seq": book_seq,
+        })
+        if book_seq is not None and book_seq > self.book_seqs.get(market_id, 0):
+            self.touch(self.book_seqs, market_id)
+            self.book_seqs[market_id] = book_seq
+
+    async def get_book_seq(self, market_id: str, db: AsyncSession) -> int:
+        return self.book_seqs.get(market_id, 0)
+
+    async def insert_trade(self, row: dict[str, Any], db: AsyncSession) -> None:
+        self._append("trades", self.trades, row)
+
+    async def insert_outbox_events(self, rows: list[dict[str, Any]], db: AsyncSession) -> None:
+        for row in rows:
+            self._append("outbox", self.outbox, row)
@@ -0,0 +1,105 @@
+"""Transactional outbox — domain events written inside the clearing transaction.
+
+Built by MatchingEngine at the end of place, cancel, amend, replace and
+batch cancel, and inserted within the same transaction as the state change,
+so an event row exists if and only if the change it describes committed.
+OutboxRelay (outbox_relay.py) publishes committed rows to the event stream
+and deletes them. The same rows are handed to engine listeners that ask for events
+(see MatchingEngine.add_listener), e.g. the private user stream.
+
+Per command the engine queues:
+  - ORDER_UPDATED     for the incoming order and every maker it filled against
+  - TRADE_EXECUTED    for each fill, with fees and realized PnL of both sides
+  - BALANCE_CHANGED   for every user whose cash moved (absolute balances)
+  - POSITION_CHANGED  for every user whose shares moved (absolute position)
+
+Balance and position snapshots carry the row's version: the stream does not
+deliver them in commit order, so consumers keep the highest version seen.
+"""
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_account.domain.events import BalanceChanged, PositionChanged
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
+from src.pm_order.domain.models import Order
+
+ORDER_UPDATED = "ORDER_UPDATED"
+TRADE_EXECUTED = "TRADE_EXECUTED"
+
+
+def order_payload(order: Order) -> dict[str, Any]:
+    return {
+        "order_id": order.id,
+        "client_order_id": order.client_order_id,
+        "market_id": order.market_id,
+        "user_id": order.user_id,
+        "side": order.original_side,
+        "direction": order.original_direction,
+        "price": order.original_price,
+        "quantity": order.quantity,
+        "filled_quantity": order.filled_quantity,
+        "remaining_quantity": order.remaining_quantity,
+        "status": order.status,
+        "time_in_force": order.time_in_force,
+    }
+
+
+def trade_payload(row: dict[str, Any]) -> dict[str, Any]:
+    """A trades row (see trades_writer.write_trade) in JSON-safe form."""
+    return {**row, "executed_at": row["executed_at"].isoformat()}
+
+
+async def outbox_rows(
+    orders: list[Order],
+    trades: list[dict[str, Any]],
+    db: AsyncSession,
+    store: ClearingStore = sql_clearing_store,
+) -> list[dict[str, Any]]:
+    """Event rows for one command's ``orders`` (all in one market) and ``trades``."""
+    if not orders:
+        return []
+    market_id = orders[0].market_id
+    rows: list[dict[str, Any]] = [
+        {
+            "event_type": ORDER_UPDATED,
+            "market_id": market_id,
+            "user_id": order.user_id,
+            "payload": order_payload(order),
+        }
+        for order in orders
+    ]
+    cash_users = {o.user_id for o in orders if o.frozen_asset_type == "FUNDS"}
+    share_users = {o.user_id for o in orders if o.frozen_asset_type != "FUNDS"}
+    for trade in trades:
+        rows.append(
+            {
+                "event_type": TRADE_EXECUTED,
+                "market_id": market_id,
+                "user_id": None,
+                "payload": trade_payload(trade),
+            }
+        )
+        parties = {trade["buy_user_id"], trade["sell_user_id"]}
+        cash_users |= parties
+        share_users |= parties
+
+    balances = await store.get_balances(sorted(cash_users), db)
+    for user_id, (available, frozen, version) in balances.items():
+        rows.append(_row(BalanceChanged(user_id, available, frozen, version), None, user_id))
+    positions = await store.get_positions(market_id, sorted(share_users), db)
+    for user_id, position in positions.items():
+        rows.append(_row(PositionChanged(user_id, market_id, *position), market_id, user_id))
+    return rows
+
+
+def _row(
+    event: BalanceChanged | PositionChanged, market_id: str | None, user_id: str
+) -> dict[str, Any]:
+    return {
+        "event_type": event.event_type,
+        "market_id": market_id,
+        "user_id": user_id,
+        "payload": event.payload(),
+    }
@@ -0,0 +1,163 @@
+"""OutboxRelay — publishes committed outbox_events rows to the domain event stream.
+
+One background task per app instance (started in main.lifespan when
+OUTBOX_ENABLED). Each batch claims the oldest rows with DELETE ... RETURNING
+over FOR UPDATE SKIP LOCKED, publishes them in one round trip and commits;
+if publishing fails the transaction rolls back and the rows are retried on
+the next tick. A crash between publish and commit republishes the batch, so
+delivery is at-least-once.
+
+The stream is not in outbox_id order. Ids are taken at INSERT, not at
+commit, so a market committing late can publish a lower id after a higher
+one, and relays in several processes publish interleaved batches. Consumers
+therefore:
+  - resume from the stream's own entry id (the XADD id, or LocalEventStream's
+    append index), never from outbox_id;
+  - dedupe redeliveries on outbox_id as a set of recently seen ids, not as a
+    watermark;
+  - apply a BALANCE_CHANGED or POSITION_CHANGED payload only if its
+    ``version`` is above the one they hold for that account or position.
+
+Stream entry fields (all strings): outbox_id, event_type, market_id,
+user_id, payload (JSON), created_at. Consumers read the Redis Stream
+OUTBOX_STREAM_KEY with XREAD or a consumer group; LocalEventStream is an
+in-process stand-in with the same entries for tests and single-node setups.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.settings import settings
+from src.pm_common.database import async_session_factory
+from src.pm_common.metrics import REGISTRY
+from src.pm_common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_CLAIM_SQL = text("""
+    DELETE FROM outbox_events
+    WHERE id IN (
+        SELECT id FROM outbox_events ORDER BY id LIMIT :limit FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, event_type, market_id, user_id, payload, created_at
+""")
+
+_PUBLISHED = REGISTRY.counter("pm_outbox_published_total", "Outbox events published")
+_BATCH_SIZE = REGISTRY.histogram(
+    "pm_outbox_relay_batch_size",
+    "Outbox events published per relay batch",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+
+
+class EventPublisher(Protocol):
+    async def publish(self, entries: list[dict[str, str]]) -> None: ...
+
+
+class RedisStreamPublisher:
+    def __init__(self, stream: str, maxlen: int) -> None:
+        self._stream = stream
+        self._maxlen = maxlen
+
+    async def publish(self, entries: list[dict[str, str]]) -> None:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for fields in entries:
+                pipe.xadd(
+                    self._stream,
+                    fields,  # type: ignore[arg-type]  # dict is invariant in its value type
+                    maxlen=self._maxlen,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+
+class LocalEventStream:
+    """Bounded in-process event stream; entry ids count appends, like XADD ids."""
+
+    def __init__(self, maxlen: int) -> None:
+        self._entries: deque[tuple[int, dict[str, str]]] = deque(maxlen=maxlen)
+        self._last_id = 0
+
+    async def publish(self, entries: list[dict[str, str]]) -> None:
+        for fields in entries:
+            self._last_id += 1
+            self._entries.append((self._last_id, fields))
+
+    def read(self, after_id: int = 0, count: int = 100) -> list[tuple[int, dict[str, str]]]:
+        """Up to ``count`` (entry id, fields) appended after entry ``after_id``, oldest first."""
+        return [e for e in self._entries if e[0] > after_id][:count]
+
+
+def _entry(row: Any) -> dict[str, str]:
+    payload = row.payload if isinstance(row.payload, str) else json.dumps(row.payload)
+    return {
+        "outbox_id": str(row.id),
+        "event_type": row.event_type,
+        "market_id": row.market_id or "",
+        "user_id": row.user_id or "",
+        "payload": payload,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        publisher: EventPublisher,
+        batch_size: int = 500,
+        interval_ms: float = 100.0,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ) -> None:
+        self.publisher = publisher
+        self._batch_size = batch_size
+        self._interval = interval_ms / 1000
+        self._session_factory = session_factory
+
+    async def run(self) -> None:
+        """Relay until cancelled; drains without sleeping while batches come back full."""
+        while True:
+            try:
+                published = await self.relay_once()
+            except Exception:
+                logger.exception("Outbox relay batch failed; retrying")
+                published = 0
+            if published < self._batch_size:
+                await asyncio.sleep(self._interval)
+
+    async def relay_once(self) -> int:
+        """Publish and delete one batch of committed events. Returns how many."""
+        async with self._session_factory() as db, db.begin():
+            result = await db.execute(_CLAIM_SQL, {"limit": self._batch_size})
+            rows = sorted(result.fetchall(), key=lambda r: r.id)
+            if not rows:
+                return 0
+            await self.publisher.publish([_entry(r) for r in rows])
+        _PUBLISHED.labels().inc(len(rows))
+        _BATCH_SIZE.labels().observe(len(rows))
+        return len(rows)
+
+
+_relay: OutboxRelay | None = None
+
+
+def get_outbox_relay() -> OutboxRelay:
+    global _relay  # noqa: PLW0603
+    if _relay is None:
+        publisher: EventPublisher
+        if settings.OUTBOX_PUBLISHER == "local":
+            publisher = LocalEventStream(settings.OUTBOX_STREAM_MAXLEN)
+        else:
+            publisher = RedisStreamPublisher(
+                settings.OUTBOX_STREAM_KEY, settings.OUTBOX_STREAM_MAXLEN
+            )
+        _relay = OutboxRelay(
+            publisher, settings.OUTBOX_RELAY_BATCH, settings.OUTBOX_RELAY_INTERVAL_MS
+        )
+    return _relay
@@ -0,0 +1,422 @@
+"""SqlClearingStore — ClearingStore over the accounts/positions/markets tables.
+
+The statements are the ones the scenario handlers, fee collector, netting,
+freeze and engine used to issue inline; each method runs in the caller's
+transaction. insert_trade also folds the trade into market_stats.
+"""
+import json
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_clearing.infrastructure import market_stats
+
+_FREEZE_FUNDS_SQL = text("""
+    UPDATE accounts
+    SET available_balance = available_balance - :amount,
+        frozen_balance     = frozen_balance   + :amount,
+        version = version + 1, updated_at = NOW()
+    WHERE user_id = :user_id AND available_balance >= :amount
+    RETURNING id
+""")
+
+_UNFREEZE_FUNDS_SQL = text("""
+    UPDATE accounts SET available_balance=available_balance+:amount,
+    frozen_balance=frozen_balance-:amount, version=version+1, updated_at=NOW()
+    WHERE user_id=:user_id
+""")
+
+_DEBIT_FROZEN_SQL = text("""
+    UPDATE accounts
+    SET frozen_balance    = frozen_balance    - :amount,
+        available_balance = available_balance + :refund,
+        version = version + 1, updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+_CREDIT_AVAILABLE_SQL = text("""
+    UPDATE accounts
+    SET available_balance = available_balance + :amount,
+        version = version + 1, updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+_DEBIT_AVAILABLE_SQL = text("""
+    UPDATE accounts
+    SET available_balance = available_balance - :amount,
+        version = version + 1, updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+_AUTO_NETTING_SQL = text("SELECT auto_netting_enabled FROM accounts WHERE user_id = :uid")
+
+_FREEZE_SHARES_SQL = {
+    side: text(f"""
+        UPDATE positions
+        SET {s}_pending_sell = {s}_pending_sell + :qty, updated_at = NOW()
+        WHERE user_id = :user_id AND market_id = :market_id
+          AND ({s}_volume - {s}_pending_sell) >= :qty
+        RETURNING id
+    """)
+    for side, s in (("YES", "yes"), ("NO", "no"))
+}
+
+_RELEASE_SHARES_SQL = {
+    side: text(
+        f"UPDATE positions SET {s}_pending_sell={s}_pending_sell-:qty, updated_at=NOW()"
+        " WHERE user_id=:user_id AND market_id=:market_id"
+    )
+    for side, s in (("YES", "yes"), ("NO", "no"))
+}
+
+_ADD_SHARES_SQL = {
+    side: text(f"""
+        INSERT INTO positions (user_id, market_id, {s}_volume, {s}_cost_sum)
+        VALUES (:user_id, :market_id, :qty, :cost)
+        ON CONFLICT (user_id, market_id) DO UPDATE
+        SET {s}_volume   = positions.{s}_volume   + :qty,
+            {s}_cost_sum = positions.{s}_cost_sum + :cost,
+            updated_at = NOW()
+    """)
+    for side, s in (("YES", "yes"), ("NO", "no"))
+}
+
+_GET_SHARES_SQL = {
+    side: text(f"""
+        SELECT {s}_volume, {s}_cost_sum, {s}_pending_sell
+        FROM positions WHERE user_id = :user_id AND market_id = :market_id
+        FOR UPDATE
+    """)
+    for side, s in (("YES", "yes"), ("NO", "no"))
+}
+
+_REDUCE_SHARES_SQL = {
+    side: text(f"""
+        UPDATE positions
+        SET {s}_volume       = {s}_volume       - :qty,
+            {s}_cost_sum     = {s}_cost_sum     - :cost_released,
+            {s}_pending_sell = {s}_pending_sell - :qty,
+            updated_at = NOW()
+        WHERE user_id = :user_id AND market_id = :market_id
+    """)
+    for side, s in (("YES", "yes"), ("NO", "no"))
+}
+
+_GET_POSITION_SQL = text("""
+    SELECT yes_volume, yes_cost_sum, yes_pending_sell,
+           no_volume,  no_cost_sum,  no_pending_sell
+    FROM positions
+    WHERE user_id = :user_id AND market_id = :market_id
+    FOR UPDATE
+""")
+
+_GET_POSITIONS_SQL = text("""
+    SELECT user_id, yes_volume, yes_cost_sum, yes_pending_sell,
+           no_volume,  no_cost_sum,  no_pending_sell, version
+    FROM positions
+    WHERE market_id = :market_id AND user_id = ANY(:user_ids)
+""")
+
+_GET_BALANCES_SQL = text("""
+    SELECT user_id, available_balance, frozen_balance, version
+    FROM accounts
+    WHERE user_id = ANY(:user_ids)
+""")
+
+_NET_POSITION_SQL = text("""
+    UPDATE positions
+    SET yes_volume       = yes_volume       - :qty,
+        yes_cost_sum     = yes_cost_sum     - :yes_cost,
+        no_volume        = no_volume        - :qty,
+        no_cost_sum      = no_cost_sum      - :no_cost,
+        updated_at = NOW()
+    WHERE user_id = :user_id AND market_id = :market_id
+""")
+
+_COST_SUM_SQL = text("""
+    SELECT COALESCE(SUM(yes_cost_sum + no_cost_sum), 0)
+    FROM positions
+    WHERE market_id = :market_id
+""")
+
+_MARKET_STATUS_SQL = text("SELECT status FROM markets WHERE id = :market_id")
+
+_GET_MARKET_SQL = text("""
+    SELECT id, status, reserve_balance, pnl_pool,
+           total_yes_shares, total_no_shares,
+           taker_fee_bps
+    FROM markets WHERE id = :market_id FOR UPDATE
+""")
+
+_UPDATE_MARKET_SQL = text("""
+    UPDATE markets
+    SET reserve_balance = :reserve_balance,
+        pnl_pool = :pnl_pool,
+        total_yes_shares = :total_yes_shares,
+        total_no_shares  = :total_no_shares,
+        updated_at = NOW()
+    WHERE id = :id
+""")
+
+_INSERT_LEDGER_SQL = text("""
+    INSERT INTO ledger_entries
+        (user_id, entry_type, amount, balance_after, reference_type, reference_id)
+    VALUES (:user_id, :entry_type, :amount, :balance_after, :reference_type, :reference_id)
+""")
+
+_INSERT_WAL_SQL = text("""
+    INSERT INTO wal_events (market_id, event_type, payload, book_seq)
+    VALUES (:market_id, :event_type, :payload, :book_seq)
+""")
+
+_BOOK_SEQ_SQL = text("""
+    SELECT COALESCE(MAX(book_seq), 0) FROM wal_events
+    WHERE market_id = :market_id AND book_seq IS NOT NULL
+""")
+
+_INSERT_TRADE_SQL = text("""
+    INSERT INTO trades (
+        trade_id, market_id, scenario,
+        buy_order_id, sell_order_id,
+        buy_user_id, sell_user_id,
+        buy_book_type, sell_book_type,
+        price, quantity,
+        maker_order_id, taker_order_id,
+        maker_fee, taker_fee,
+        buy_realized_pnl, sell_realized_pnl,
+        executed_at
+    ) VALUES (
+        :trade_id, :market_id, :scenario,
+        :buy_order_id, :sell_order_id,
+        :buy_user_id, :sell_user_id,
+        :buy_book_type, :sell_book_type,
+        :price, :quantity,
+        :maker_order_id, :taker_order_id,
+        :maker_fee, :taker_fee,
+        :buy_realized_pnl, :sell_realized_pnl,
+        :executed_at
+    )
+""")
+
+
+_INSERT_OUTBOX_SQL = text("""
+    INSERT INTO outbox_events (event_type, market_id, user_id, payload)
+    VALUES (:event_type, :market_id, :user_id, :payload)
+""")
+
+
+class SqlClearingStore:
+    def transaction(self, db: AsyncSession) -> AbstractAsyncContextManager[Any]:
+        return db.begin_nested()
+
+    async def commit(self, db: AsyncSession) -> None:
+        await db.commit()
+
+    async def freeze_funds(self, user_id: str, amount: int, db: AsyncSession) -> bool:
+        result = await db.execute(_FREEZE_FUNDS_SQL, {"user_id": user_id, "amount": amount})
+        return result.fetchone() is not None
+
+    async def unfreeze_funds(self, user_id: str, amount: int, db: AsyncSession) -> None:
+        await db.execute(_UNFREEZE_FUNDS_SQL, {"user_id": user_id, "amount": amount})
+
+    async def debit_frozen(
+        self, user_id: str, amount: int, refund: int, db: AsyncSession
+    ) -> None:
+        await db.execute(
+            _DEBIT_FROZEN_SQL, {"user_id": user_id, "amount": amount, "refund": refund}
+        )
+
+    async def credit_available(self, user_id: str, amount: int, db: AsyncSession) -> bool:
+        result = await db.execute(_CREDIT_AVAILABLE_SQL, {"user_id": user_id, "amount": amount})
+        return bool(result.rowcount != 0)  # type: ignore[attr-defined]
+
+    async def debit_available(self, user_id: str, amount: int, db: AsyncSession) -> None:
+        await db.execute(_DEBIT_AVAILABLE_SQL, {"user_id": user_id, "amount": amount})
+
+    async def auto_netting_enabled(self, user_id: str, db: AsyncSession) -> bool | None:
+        result = await db.execute(_AUTO_NETTING_SQL, {"uid": user_id})
+        return result.scalar()
+
+    async def get_balances(
+        self, user_ids: list[str], db: AsyncSession
+    ) -> dict[str, tuple[int, int, int]]:
+        rows = await db.execute(_GET_BALANCES_SQL, {"user_ids": user_ids})
+        return {row.user_id: (int(row[1]), int(row[2]), int(row[3])) for row in rows}
+
+    async def freeze_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, db: AsyncSession
+    ) -> bool:
+        result = await db.execute(
+            _FREEZE_SHARES_SQL[side], {"user_id": user_id, "market_id": market_id, "qty": qty}
+        )
+        return result.fetchone() is not None
+
+    async def release_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, db: AsyncSession
+    ) -> None:
+        await db.execute(
+            _RELEASE_SHARES_SQL[side], {"user_id": user_id, "market_id": market_id, "qty": qty}
+        )
+
+    async def add_shares(
+        self, user_id: str, market_id: str, side: str, qty: int, cost: int, db: AsyncSession
+    ) -> None:
+        await db.execute(
+            _ADD_SHARES_SQL[side],
+            {"user_id": user_id, "market_id": market_id, "qty": qty, "cost": cost},
+        )
+
+    async def get_shares(
+        self, user_id: str, market_id: str, side: str, db: AsyncSession
+    ) -> tuple[int, int, int] | None:
+        row = (
+            await db.execute(_GET_SHARES_SQL[side], {"user_id": user_id, "market_id": market_id})
+        ).fetchone()
+        return None if row is None else (row[0], row[1], row[2])
+
+    async def reduce_shares(
+        self,
+        user_id: str,
+        market_id: str,
+        side: str,
+        qty: int,
+        cost_released: int,
+        db: AsyncSession,
+    ) -> None:
+        await db.execute(
+            _REDUCE_SHARES_SQL[side],
+            {
+                "user_id": user_id,
+                "market_id": market_id,
+                "qty": qty,
+                "cost_released": cost_released,
+            },
+        )
+
+    async def get_position(
+        self, user_id: str, market_id: str, db: AsyncSession
+    ) -> tuple[int, int, int, int, int, int] | None:
+        row = (
+            await db.execute(_GET_POSITION_SQL, {"user_id": user_id, "market_id": market_id})
+        ).fetchone()
+        if row is None:
+            return None
+        return (
+            int(row[0]), int(row[1]), int(row[2]), int(row[3]), int(row[4]), int(row[5])
+        )
+
+    async def get_positions(
+        self, market_id: str, user_ids: list[str], db: AsyncSession
+    ) -> dict[str, tuple[int, int, int, int, int, int, int]]:
+        rows = await db.execute(
+            _GET_POSITIONS_SQL, {"market_id": market_id, "user_ids": user_ids}
+        )
+        return {
+            row.user_id: (
+                int(row[1]), int(row[2]), int(row[3]), int(row[4]), int(row[5]), int(row[6]),
+                int(row[7]),
+            )
+            for row in rows
+        }
+
+    async def net_position(
+        self,
+        user_id: str,
+        market_id: str,
+        qty: int,
+        yes_cost: int,
+        no_cost: int,
+        db: AsyncSession,
+    ) -> None:
+        await db.execute(
+            _NET_POSITION_SQL,
+            {
+                "user_id": user_id,
+                "market_id": market_id,
+                "qty": qty,
+                "yes_cost": yes_cost,
+                "no_cost": no_cost,
+            },
+        )
+
+    async def market_cost_sum(self, market_id: str, db: AsyncSession) -> int:
+        result = await db.execute(_COST_SUM_SQL, {"market_id": market_id})
+        return result.scalar_one()  # type: ignore[no-any-return]
+
+    async def market_status(self, market_id: str, db: AsyncSession) -> str | None:
+        result = await db.execute(_MARKET_STATUS_SQL, {"market_id": market_id})
+        return result.scalar_one_or_none()
+
+    async def load_market(self, market_id: str, db: AsyncSession) -> Any:
+        return (await db.execute(_GET_MARKET_SQL, {"market_id": market_id})).fetchone()
+
+    async def save_market(self, market: Any, db: AsyncSession) -> None:
+        await db.execute(
+            _UPDATE_MARKET_SQL,
+            {
+                "id": market.id,
+                "reserve_balance": market.reserve_balance,
+                "pnl_pool": market.pnl_pool,
+                "total_yes_shares": market.total_yes_shares,
+                "total_no_shares": market.total_no_shares,
+            },
+        )
+
+    async def insert_ledger(
+        self,
+        user_id: str,
+        entry_type: str,
+        amount: int,
+        balance_after: int,
+        reference_type: str,
+        reference_id: str | None,
+        db: AsyncSession,
+    ) -> None:
+        await db.execute(
+            _INSERT_LEDGER_SQL,
+            {
+                "user_id": user_id,
+                "entry_type": entry_type,
+                "amount": amount,
+                "balance_after": balance_after,
+                "reference_type": reference_type,
+                "reference_id": reference_id,
+            },
+        )
+
+    async def insert_wal_event(
+        self,
+        market_id: str,
+        event_type: str,
+        payload: dict[str, object],
+        db: AsyncSession,
+        book_seq: int | None = None,
+    ) -> None:
+        await db.execute(
+            _INSERT_WAL_SQL,
+            {
+                "market_id": market_id,
+                "event_type": event_type,
+                "payload": json.dumps(payload),
+                "book_seq": book_seq,
+            },
+        )
+
+    async def get_book_seq(self, market_id: str, db: AsyncSession) -> int:
+        result = await db.execute(_BOOK_SEQ_SQL, {"market_id": market_id})
+        return int(result.scalar_one())
+
+    async def insert_trade(self, row: dict[str, Any], db: AsyncSession) -> None:
+        await db.execute(_INSERT_TRADE_SQL, row)
+        await market_stats.record_trade(row, db)  # after the insert; see market_stats.reconcile
+
+    async def insert_outbox_events(self, rows: list[dict[str, Any]], db: AsyncSession) -> None:
+        if rows:
+            await db.execute(
+                _INSERT_OUTBOX_SQL, [{**row, "payload": json.dumps(row["payload"])} for row in rows]
+            )
+
+
+sql_clearing_store = SqlClearingStore()
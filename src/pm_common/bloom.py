@@ -0,0 +1,92 @@
+"""Dependency-free Bloom filter.
+
+Answers "definitely absent" or "possibly present". False negatives are
+impossible; the false-positive rate grows as the filter fills past its
+design capacity.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over str keys (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not (0.0 < fp_rate < 1.0):
+            raise ValueError("fp_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def estimated_fp_rate(self) -> float:
+        """Theoretical false-positive rate at the current fill level."""
+        return (1.0 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class ScalableBloomFilter:
+    """Chain of Bloom filters that grows instead of saturating.
+
+    When the newest layer reaches capacity a new one is appended with
+    ``growth`` times the capacity and a tighter error budget, so the
+    compound false-positive rate stays near ``fp_rate``.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 256,
+        fp_rate: float = 0.01,
+        growth: int = 4,
+        tightening: float = 0.5,
+    ) -> None:
+        self._growth = growth
+        self._tightening = tightening
+        self._layers = [BloomFilter(initial_capacity, fp_rate * (1 - tightening))]
+
+    def add(self, key: str) -> None:
+        layer = self._layers[-1]
+        if layer.is_full:
+            layer = BloomFilter(
+                layer.capacity * self._growth, layer.fp_rate * self._tightening
+            )
+            self._layers.append(layer)
+        layer.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in layer for layer in self._layers)
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self._layers)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(layer._bits) for layer in self._layers)
+
+    def estimated_fp_rate(self) -> float:
+        miss = 1.0
+        for layer in self._layers:
+            miss *= 1.0 - layer.estimated_fp_rate()
+        return 1.0 - miss
@@ -1,5 +1,36 @@
-from collections.abc import AsyncGenerator
+"""Async engines, pool instrumentation and the request session dependencies.
 
+One engine and pool per class of traffic, so one class cannot take
+another's connections:
+
+- ``write`` (engine, async_session_factory, DbSession): order placement,
+  cancels, clearing, account mutations, the journal projector and other
+  background writers. Always the primary.
+- ``read`` (read_engine, read_session_factory, ReadDbSession): interactive
+  list/detail endpoints. DATABASE_READ_URL points it at a replica, so those
+  endpoints may briefly lag their own writes; anything that must see them
+  (e.g. rebuilding an in-memory book) uses the write pool.
+- ``batch`` (batch_engine, batch_session_factory, BatchDbSession): admin
+  endpoints and scripts. Primary, small pool, long statement timeout.
+
+Each pool has its own size, overflow and server-side statement_timeout
+(DB_<CLASS>_* settings), and every pool metric carries a ``pool`` label.
+
+Sessions are lazy: an AsyncSession checks a connection out of the pool on
+its first execute and returns it when its transaction ends or it closes, so
+a request answered from a cache, or rejected before touching the DB, never
+takes a pool slot. The session dependencies also close the request's
+session as soon as the endpoint function returns instead of after the
+response has been sent. pm_db_pool_checkouts_total,
+pm_db_pool_checkout_wait_ms and pm_db_pool_hold_ms show how often and for
+how long slots are taken (scripts/load_orders.py reports them per run).
+"""
+import time
+from collections.abc import AsyncGenerator, Callable
+from typing import Annotated, Any
+
+from fastapi import Depends
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -7,8 +38,20 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config.settings import settings
+from src.pm_common.metrics import REGISTRY
+
+_POOL_CHECKOUT_WAIT_MS = REGISTRY.histogram(
+    "pm_db_pool_checkout_wait_ms", "Time waiting to check a connection out of the pool", ("pool",)
+)
+_POOL_CHECKOUTS = REGISTRY.counter(
+    "pm_db_pool_checkouts_total", "Connections checked out of the pool", ("pool",)
+)
+_POOL_HOLD_MS = REGISTRY.histogram(
+    "pm_db_pool_hold_ms", "Time a connection stays checked out, checkout to checkin", ("pool",)
+)
 
 
 class Base(DeclarativeBase):
@@ -17,21 +60,143 @@ class Base(DeclarativeBase):
     pass
 
 
-engine: AsyncEngine = create_async_engine(
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Default async pool, plus a histogram of checkout wait time."""
+
+    workload = "write"  # set per engine by _create_engine
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _POOL_CHECKOUT_WAIT_MS.labels(self.workload).observe(
+                (time.perf_counter() - start) * 1000
+            )
+
+
+def _checkout_listener(workload: str) -> Callable[[Any, Any, Any], None]:
+    def on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        _POOL_CHECKOUTS.labels(workload).inc()
+        record.info["pm_checked_out"] = (workload, time.perf_counter())
+
+    return on_checkout
+
+
+def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+    checked_out = record.info.pop("pm_checked_out", None)
+    if checked_out is not None:
+        workload, started = checked_out
+        _POOL_HOLD_MS.labels(workload).observe((time.perf_counter() - started) * 1000)
+
+
+def _create_engine(
+    workload: str, url: str, pool_size: int, max_overflow: int, statement_timeout_ms: int
+) -> AsyncEngine:
+    created = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        poolclass=TimedQueuePool,
+        # asyncpg: applied as a session setting on every new connection; 0 = no limit
+        connect_args={"server_settings": {"statement_timeout": str(statement_timeout_ms)}},
+    )
+    pool = created.pool
+    if isinstance(pool, TimedQueuePool):
+        pool.workload = workload
+    event.listen(created.sync_engine, "checkout", _checkout_listener(workload))
+    event.listen(created.sync_engine, "checkin", _on_checkin)
+    return created
+
+
+engine: AsyncEngine = _create_engine(
+    "write",
+    settings.DATABASE_URL,
+    settings.DB_WRITE_POOL_SIZE,
+    settings.DB_WRITE_MAX_OVERFLOW,
+    settings.DB_WRITE_STATEMENT_TIMEOUT_MS,
+)
+read_engine: AsyncEngine = _create_engine(
+    "read",
+    settings.DATABASE_READ_URL or settings.DATABASE_URL,
+    settings.DB_READ_POOL_SIZE,
+    settings.DB_READ_MAX_OVERFLOW,
+    settings.DB_READ_STATEMENT_TIMEOUT_MS,
+)
+batch_engine: AsyncEngine = _create_engine(
+    "batch",
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=20,
-    max_overflow=10,
+    settings.DB_BATCH_POOL_SIZE,
+    settings.DB_BATCH_MAX_OVERFLOW,
+    settings.DB_BATCH_STATEMENT_TIMEOUT_MS,
 )
+ENGINES: dict[str, AsyncEngine] = {"write": engine, "read": read_engine, "batch": batch_engine}
+
+
+def _pool_connections() -> list[tuple[tuple[str, str], float]]:
+    samples: list[tuple[tuple[str, str], float]] = []
+    for workload, workload_engine in ENGINES.items():
+        pool = workload_engine.pool
+        if not isinstance(pool, TimedQueuePool):
+            continue
+        samples += [
+            ((workload, "checked_out"), pool.checkedout()),
+            ((workload, "idle"), pool.checkedin()),
+            ((workload, "overflow"), max(0, pool.overflow())),
+        ]
+    return samples
+
+
+REGISTRY.callback(
+    "pm_db_pool_connections",
+    "DB pool connections by pool and state",
+    _pool_connections,
+    ("pool", "state"),
+)
+
+
+async def dispose_engines() -> None:
+    for workload_engine in ENGINES.values():
+        await workload_engine.dispose()
+
 
 async_session_factory = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+read_session_factory = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+batch_session_factory = async_sessionmaker(
+    batch_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency: yields an AsyncSession, auto-closes after request."""
     async with async_session_factory() as session:
         yield session
+
+
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Like get_db_session, on the read pool (replica when DATABASE_READ_URL is set)."""
+    async with read_session_factory() as session:
+        yield session
+
+
+async def get_batch_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Like get_db_session, on the admin/batch pool."""
+    async with batch_session_factory() as session:
+        yield session
+
+
+# Request sessions for route and dependency signatures, e.g. ``db: DbSession``
+DbSession = Annotated[AsyncSession, Depends(get_db_session, scope="function")]
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db_session, scope="function")]
+BatchDbSession = Annotated[AsyncSession, Depends(get_batch_db_session, scope="function")]
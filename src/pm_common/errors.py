@@ -145,3 +145,23 @@ class RateLimitError(AppError):
 class InternalError(AppError):
     def __init__(self, detail: str = "Internal server error") -> None:
         super().__init__(9002, detail, 500)
+
+
+class ServiceBusyError(AppError):
+    def __init__(self) -> None:
+        super().__init__(9003, "Service busy, retry later", 503)
+
+
+class SqlProfilerDisabledError(AppError):
+    def __init__(self) -> None:
+        super().__init__(9004, "SQL profiler is disabled (set SQL_PROFILE_ENABLED)", 409)
+
+
+class JournalModeError(AppError):
+    def __init__(self) -> None:
+        super().__init__(9005, "Not available while the journaled engine is enabled", 409)
+
+
+class ProjectionHaltedError(AppError):
+    def __init__(self) -> None:
+        super().__init__(9006, "Journal projection halted; commands refused until repaired", 503)
@@ -0,0 +1,55 @@
+"""Dependency-free HyperLogLog distinct counter.
+
+Estimates how many distinct str keys were added using one byte per
+register: 2**precision bytes in all, standard error about
+1.04 / sqrt(2**precision). Small counts fall back to linear counting and
+are near exact. Registers are a plain byte string, so a sketch can live in
+a BYTEA column and be updated there one register at a time (see
+``register()``).
+"""
+
+import hashlib
+import math
+
+
+class HyperLogLog:
+    """HyperLogLog over str keys (64-bit blake2b hash, one byte per register)."""
+
+    def __init__(self, precision: int = 11, registers: bytes | None = None) -> None:
+        if not (4 <= precision <= 16):
+            raise ValueError("precision must be in [4, 16]")
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is not None and len(registers) != self.size:
+            raise ValueError(f"expected {self.size} registers, got {len(registers)}")
+        self._registers = bytearray(registers if registers is not None else self.size)
+
+    def register(self, key: str) -> tuple[int, int]:
+        """(register index, rank) that adding ``key`` raises to at least."""
+        h = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        width = 64 - self.precision
+        rest = h & ((1 << width) - 1)
+        return h >> width, width - rest.bit_length() + 1
+
+    def add(self, key: str) -> None:
+        index, rank = self.register(key)
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold ``other`` (same precision) in: afterwards this counts the union."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def count(self) -> int:
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._registers)
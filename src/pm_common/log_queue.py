@@ -0,0 +1,45 @@
+"""Non-blocking logging: route selected loggers through a QueueHandler.
+
+Handlers that write to streams or files do blocking I/O under a lock. With
+start_queue_logging() the event loop only enqueues the LogRecord; a
+QueueListener thread formats and writes it.
+"""
+
+import logging
+import logging.handlers
+import queue
+
+_listener: logging.handlers.QueueListener | None = None
+_attached: list[tuple[logging.Logger, logging.Handler]] = []
+
+
+def start_queue_logging(logger_names: tuple[str, ...], level: int = logging.INFO) -> None:
+    """Attach a QueueHandler to each named logger and start the listener thread."""
+    global _listener  # noqa: PLW0603
+    if _listener is not None:
+        return
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    for name in logger_names:
+        lg = logging.getLogger(name)
+        handler = logging.handlers.QueueHandler(log_queue)
+        lg.addHandler(handler)
+        lg.setLevel(level)
+        lg.propagate = False
+        _attached.append((lg, handler))
+    _listener.start()
+
+
+def stop_queue_logging() -> None:
+    """Flush pending records, stop the listener thread and detach the handlers."""
+    global _listener  # noqa: PLW0603
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    for lg, handler in _attached:
+        lg.removeHandler(handler)
+        lg.propagate = True
+    _attached.clear()
@@ -0,0 +1,220 @@
+"""Dependency-free metrics: counters, gauges, histograms and a text-exposition registry.
+
+Single event loop, no locking: inc() is one addition and observe() is a
+bisect plus two increments, cheap enough to leave on in production.
+Latencies are recorded in milliseconds (metric names end in ``_ms``).
+
+Usage:
+    ORDERS = REGISTRY.counter("pm_orders_total", "Orders placed", ("market_id",))
+    ORDERS.labels(market_id).inc()
+
+GET /metrics renders REGISTRY in Prometheus text format.
+"""
+
+import bisect
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# Latency buckets in milliseconds (upper bounds; +Inf is implicit)
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics: le = upper bound)."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, cumulative count) pairs, ending with (+Inf, count)."""
+        out: list[tuple[float, int]] = []
+        running = 0
+        for bound, n in zip((*self.buckets, math.inf), self.counts, strict=True):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by linear interpolation inside its bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        running = 0
+        for bound, n in zip(self.buckets, self.counts, strict=False):
+            if running + n >= rank and n:
+                return lower + (bound - lower) * (rank - running) / n
+            running += n
+            lower = bound
+        return self.buckets[-1]  # falls in +Inf: report the largest finite bound
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Gauge:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class MetricFamily[M]:
+    """One metric name; one child per distinct tuple of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        labelnames: tuple[str, ...],
+        factory: Callable[[], M],
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple[str, ...], M] = {}
+
+    def labels(self, *values: str) -> M:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._factory()
+        return child
+
+    def items(self) -> list[tuple[tuple[str, ...], M]]:
+        return list(self._children.items())
+
+    def clear(self) -> None:
+        self._children.clear()
+
+
+# A callback yields (label values, value) pairs at scrape time
+Sampler = Callable[[], Iterable[tuple[tuple[str, ...], float]]]
+
+
+@dataclass
+class _CallbackFamily:
+    name: str
+    help: str
+    kind: str
+    labelnames: tuple[str, ...]
+    sample: Sampler
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """Process-wide metric families rendered in Prometheus text format 0.0.4."""
+
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily[Any] | _CallbackFamily] = {}
+
+    def _register(self, family: MetricFamily[Any] | _CallbackFamily) -> None:
+        if family.name in self._families:
+            raise ValueError(f"Duplicate metric: {family.name}")
+        self._families[family.name] = family
+
+    def counter(
+        self, name: str, help_text: str, labelnames: tuple[str, ...] = ()
+    ) -> MetricFamily[Counter]:
+        family = MetricFamily(name, help_text, "counter", labelnames, Counter)
+        self._register(family)
+        return family
+
+    def gauge(
+        self, name: str, help_text: str, labelnames: tuple[str, ...] = ()
+    ) -> MetricFamily[Gauge]:
+        family = MetricFamily(name, help_text, "gauge", labelnames, Gauge)
+        self._register(family)
+        return family
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_MS,
+    ) -> MetricFamily[Histogram]:
+        family = MetricFamily(name, help_text, "histogram", labelnames, lambda: Histogram(buckets))
+        self._register(family)
+        return family
+
+    def callback(
+        self,
+        name: str,
+        help_text: str,
+        sample: Sampler,
+        labelnames: tuple[str, ...] = (),
+        kind: str = "gauge",
+    ) -> None:
+        """Register a metric whose values are read from ``sample()`` at scrape time."""
+        self._register(_CallbackFamily(name, help_text, kind, labelnames, sample))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family in self._families.values():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            if isinstance(family, _CallbackFamily):
+                for values, value in family.sample():
+                    lbl = _labels(family.labelnames, values)
+                    lines.append(f"{family.name}{lbl} {_fmt(value)}")
+                continue
+            for values, child in family.items():
+                if isinstance(child, Histogram):
+                    for bound, cum in child.cumulative():
+                        le = _labels(family.labelnames, values, f'le="{_fmt(bound)}"')
+                        lines.append(f"{family.name}_bucket{le} {cum}")
+                    lbl = _labels(family.labelnames, values)
+                    lines.append(f"{family.name}_sum{lbl} {_fmt(child.sum)}")
+                    lines.append(f"{family.name}_count{lbl} {child.count}")
+                else:
+                    lbl = _labels(family.labelnames, values)
+                    lines.append(f"{family.name}{lbl} {_fmt(child.value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
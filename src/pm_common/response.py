@@ -31,5 +31,14 @@ def success_response(data: Any = None) -> ApiResponse:
     return ApiResponse(code=0, message="success", data=data)
 
 
+def success_json(data_json: bytes, request_id: str | None = None) -> bytes:
+    """Success envelope around an already serialized ``data`` value (cached bodies)."""
+    envelope = success_response()
+    if request_id is not None:
+        envelope.request_id = request_id
+    head, tail = envelope.model_dump_json().encode().split(b'"data":null', 1)
+    return head + b'"data":' + data_json + tail
+
+
 def error_response(code: int, message: str) -> ApiResponse:
     return ApiResponse(code=code, message=message, data=None)
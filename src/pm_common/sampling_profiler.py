@@ -0,0 +1,148 @@
+"""Opt-in sampling profiler for individual requests (PROFILER_ENABLED).
+
+A request is profiled when it carries ``X-Profile: <PROFILER_TOKEN>`` (the
+admin gate; header triggering is off while the token is empty) or, for paths
+under PROFILER_PATH_PREFIX, with probability PROFILER_SAMPLE_RATE.
+
+While a profiled request is in flight a daemon thread samples the event-loop
+thread's Python stack every PROFILER_INTERVAL_MS and counts identical
+stacks. The result is written to PROFILER_DIR as a flamegraph-compatible
+collapsed-stack file (``frame;frame;frame count`` per line, for
+flamegraph.pl or speedscope). Frames read ``module:function``.
+
+The sampler sees the whole loop thread, so tasks from concurrent requests
+can appear too; the handler frames of the profiled request identify its
+share. Only one request is profiled at a time. Retention keeps at most
+PROFILER_MAX_FILES files and PROFILER_MAX_BYTES bytes, oldest deleted first.
+"""
+
+import asyncio
+import hmac
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_DEPTH = 128
+_MAX_DISTINCT_STACKS = 10_000
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def _frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}"
+
+
+def collapse(frame: FrameType | None) -> str:
+    """Root-first ``;``-joined stack of ``frame``."""
+    names: list[str] = []
+    while frame is not None and len(names) < _MAX_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples one thread's stack from a background thread until stopped."""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        self.stacks: Counter[str] = Counter()
+        self._thread_id = thread_id
+        self._interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pm-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = collapse(frame)
+            if stack in self.stacks or len(self.stacks) < _MAX_DISTINCT_STACKS:
+                self.stacks[stack] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def write_collapsed(stacks: Counter[str], directory: Path, name: str) -> Path:
+    """Write ``stacks`` to ``directory/name`` and apply the retention limits."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    lines = (f"{stack} {count}\n" for stack, count in stacks.most_common())
+    path.write_text("".join(lines))
+    enforce_retention(directory, settings.PROFILER_MAX_FILES, settings.PROFILER_MAX_BYTES)
+    return path
+
+
+def enforce_retention(directory: Path, max_files: int, max_bytes: int) -> None:
+    files = sorted(directory.glob("*.collapsed"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in files)
+    while files and (len(files) > max_files or total > max_bytes):
+        oldest = files.pop(0)
+        total -= oldest.stat().st_size
+        oldest.unlink(missing_ok=True)
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return str(value.decode("latin-1"))
+    return None
+
+
+def should_profile(scope: Scope) -> bool:
+    token = settings.PROFILER_TOKEN
+    requested = _header(scope, b"x-profile")
+    if token and requested is not None:
+        return hmac.compare_digest(requested, token)
+    rate = settings.PROFILER_SAMPLE_RATE
+    return (
+        rate > 0.0
+        and scope["path"].startswith(settings.PROFILER_PATH_PREFIX)
+        and random.random() < rate
+    )
+
+
+class SamplingProfilerMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy or not should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        sampler = StackSampler(threading.get_ident(), settings.PROFILER_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stacks = sampler.stop()
+            self._busy = False
+            request_id = scope.get("state", {}).get("request_id", "req")
+            slug = _UNSAFE_FILENAME_RE.sub("_", scope["path"].strip("/"))[:60] or "root"
+            stamp = time.strftime("%Y%m%dT%H%M%S")
+            name = f"{stamp}_{scope['method']}_{slug}_{request_id}.collapsed"
+            path = await asyncio.to_thread(
+                write_collapsed, stacks, Path(settings.PROFILER_DIR), name
+            )
+            logger.info("Profile written: %s (%d samples)", path, sum(stacks.values()))
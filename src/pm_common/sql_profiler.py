@@ -0,0 +1,167 @@
+"""Opt-in per-request SQL statement profiler (SQL_PROFILE_ENABLED).
+
+Hooks before/after_cursor_execute on the engine and groups statements by
+normalized text. The profile lives in a ContextVar, which SQLAlchemy's
+greenlet bridge carries into the sync event hooks.
+
+Each profiled response carries:
+    X-DB-Queries:  statements executed while handling the request
+    X-DB-Time-Ms:  total time spent in those statements
+
+A process-wide aggregate backs the top-N report served by
+GET /admin/sql-profile, which also logs it.
+
+When disabled, nothing is installed: no listeners, no middleware, zero cost.
+"""
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGGREGATE_STATEMENTS = 1000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# asyncpg positional params expanded for IN / ANY lists: ($1, $2, $3) -> (...)
+_PARAM_LIST_RE = re.compile(r"\(\s*\$\d+(?:\s*,\s*\$\d+)+\s*\)")
+
+
+@dataclass
+class StatementStats:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+
+class RequestProfile:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: dict[str, StatementStats] = {}
+
+    def record(self, statement: str, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats()
+        stats.add(ms)
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("pm_sql_profile", default=None)
+_aggregate: dict[str, StatementStats] = {}
+_installed: set[int] = set()
+
+
+def normalize(statement: str) -> str:
+    return _PARAM_LIST_RE.sub("(...)", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _current.get() is not None and context is not None:
+        context._pm_sql_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    profile = _current.get()
+    start = getattr(context, "_pm_sql_start", None)
+    if profile is None or start is None:
+        return
+    ms = (time.perf_counter() - start) * 1000
+    key = normalize(statement)
+    profile.record(key, ms)
+    stats = _aggregate.get(key)
+    if stats is None:
+        if len(_aggregate) >= _MAX_AGGREGATE_STATEMENTS:
+            return
+        stats = _aggregate[key] = StatementStats()
+    stats.add(ms)
+
+
+def install(engine: AsyncEngine) -> None:
+    """Attach the cursor hooks to ``engine`` (idempotent)."""
+    sync_engine = engine.sync_engine
+    if id(sync_engine) in _installed:
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    _installed.add(id(sync_engine))
+
+
+def top_statements(n: int = 20) -> list[dict[str, Any]]:
+    """Slowest statements since start-up, by total time."""
+    ranked = sorted(_aggregate.items(), key=lambda kv: kv[1].total_ms, reverse=True)[:n]
+    return [
+        {
+            "statement": stmt,
+            "count": s.count,
+            "total_ms": round(s.total_ms, 3),
+            "avg_ms": round(s.total_ms / s.count, 3),
+            "max_ms": round(s.max_ms, 3),
+        }
+        for stmt, s in ranked
+    ]
+
+
+def log_report(n: int = 20) -> list[dict[str, Any]]:
+    """Log and return the top-N report."""
+    report = top_statements(n)
+    for i, row in enumerate(report, 1):
+        logger.info(
+            "SQL top %d: %d calls, %.1fms total, %.2fms avg, %.2fms max | %s",
+            i,
+            row["count"],
+            row["total_ms"],
+            row["avg_ms"],
+            row["max_ms"],
+            row["statement"][:300],
+        )
+    return report
+
+
+def reset() -> None:
+    _aggregate.clear()
+
+
+class SqlProfilerMiddleware:
+    """Starts a RequestProfile per HTTP request and reports it in response headers."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profile = RequestProfile()
+        token = _current.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(profile.count).encode()))
+                headers.append((b"x-db-time-ms", f"{profile.total_ms:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,34 @@
+"""Server-push WebSocket helper shared by the streaming endpoints."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+
+async def stream_json(websocket: WebSocket, messages: AsyncIterator[dict[str, Any]]) -> None:
+    """Send every message from ``messages`` until either side is done.
+
+    Client frames are read and ignored so a disconnect is noticed even while
+    no messages are being produced; the generator is then cancelled.
+    """
+
+    async def send() -> None:
+        async for message in messages:
+            await websocket.send_json(message)
+
+    async def until_disconnect() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    sender = asyncio.create_task(send())
+    receiver = asyncio.create_task(until_disconnect())
+    done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    if sender in done:
+        with contextlib.suppress(WebSocketDisconnect, RuntimeError):
+            sender.result()  # a send on a closing socket is not an error
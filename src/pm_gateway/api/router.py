@@ -41,7 +41,7 @@ def _get_request_id(request: Request) -> str:
 async def register(
     request: Request,
     body: RegisterRequest,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session, scope="function"),
 ) -> ApiResponse:
     async with db.begin():
         user = await _service.register(body.username, body.email, body.password, db)
@@ -67,7 +67,7 @@ async def register(
 async def login(
     request: Request,
     body: LoginRequest,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session, scope="function"),
 ) -> ApiResponse:
     user, access_token, refresh_token = await _service.login(body.username, body.password, db)
 
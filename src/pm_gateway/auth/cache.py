@@ -0,0 +1,80 @@
+"""Per-process caches for get_current_user.
+
+- Verified access-token payloads, kept until the token's own ``exp``.
+- User records keyed by id, with a short TTL. Whatever changes a user's
+  ``is_active`` must call invalidate_user() after its transaction commits;
+  invalidating earlier lets a concurrent request re-cache the old row.
+  Other processes pick up the change when their entry expires.
+
+Cached users are detached snapshots, not session-bound ORM instances, so a
+rollback in one request cannot expire attributes another request reads.
+"""
+
+import time
+import uuid
+from typing import Any
+
+from src.pm_common.metrics import REGISTRY
+from src.pm_common.ttl_cache import TTLCache
+from src.pm_gateway.user.db_models import UserModel
+
+_TOKEN_CACHE_SIZE = 10_000
+_USER_CACHE_SIZE = 10_000
+_USER_TTL_SECONDS = 30.0
+
+_USER_COLUMNS = tuple(c.key for c in UserModel.__table__.columns)
+
+token_cache: TTLCache[str, dict[str, Any]] = TTLCache(_TOKEN_CACHE_SIZE, ttl=0)
+user_cache: TTLCache[uuid.UUID, dict[str, Any]] = TTLCache(_USER_CACHE_SIZE, _USER_TTL_SECONDS)
+
+
+def get_token_payload(token: str) -> dict[str, Any] | None:
+    return token_cache.get(token)
+
+
+def put_token_payload(token: str, payload: dict[str, Any]) -> None:
+    """Cache a verified payload until its ``exp``; tokens without one are not cached."""
+    exp = payload.get("exp")
+    if isinstance(exp, int | float):
+        token_cache.set(token, payload, ttl=exp - time.time())
+
+
+def get_user(user_id: uuid.UUID) -> UserModel | None:
+    snapshot = user_cache.get(user_id)
+    return UserModel(**snapshot) if snapshot is not None else None
+
+
+def put_user(user: UserModel) -> None:
+    user_cache.set(user.id, {col: getattr(user, col) for col in _USER_COLUMNS})
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    user_cache.invalidate(user_id)
+
+
+def clear() -> None:
+    token_cache.clear()
+    user_cache.clear()
+
+
+def stats() -> dict[str, dict[str, float]]:
+    return {"token": token_cache.stats(), "user": user_cache.stats()}
+
+
+REGISTRY.callback(
+    "pm_auth_cache_lookups_total",
+    "get_current_user cache lookups",
+    lambda: [
+        ((name, result), cache.hits if result == "hit" else cache.misses)
+        for name, cache in (("token", token_cache), ("user", user_cache))
+        for result in ("hit", "miss")
+    ],
+    ("cache", "result"),
+    kind="counter",
+)
+REGISTRY.callback(
+    "pm_auth_cache_entries",
+    "Entries held by the get_current_user caches",
+    lambda: [(("token",), len(token_cache)), (("user",), len(user_cache))],
+    ("cache",),
+)
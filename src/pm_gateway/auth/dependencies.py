@@ -10,14 +10,15 @@ Usage in any protected router:
 
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, WebSocket, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_account.domain.constants import AMM_USER_ID
-from src.pm_common.database import get_db_session
-from src.pm_common.errors import AccountDisabledError, InvalidCredentialsError
+from src.pm_common.database import async_session_factory, get_db_session
+from src.pm_common.errors import AccountDisabledError, AppError, InvalidCredentialsError
+from src.pm_gateway.auth import cache as auth_cache
 from src.pm_gateway.auth.jwt_handler import decode_token
 from src.pm_gateway.user.db_models import UserModel
 
@@ -34,17 +35,49 @@ _CREDENTIALS_EXCEPTION = HTTPException(
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session, scope="function"),
 ) -> UserModel:
     """Extract and validate the JWT Bearer token, return the UserModel.
 
     Raises HTTP 401 if the token is missing, invalid, or expired.
     Raises HTTP 422 (AccountDisabledError) if the user account is disabled.
+
+    Verified payloads and user records are served from auth_cache when
+    present, so most requests skip both the HMAC check and the users query.
+    """
+    return await _user_from_token(token, db)
+
+
+async def get_websocket_user(
+    websocket: WebSocket, token: str | None = Query(None)
+) -> UserModel:
+    """WebSocket variant of get_current_user.
+
+    Browsers cannot set headers on a WebSocket handshake, so the access token
+    may also come as ``?token=``. Uses its own short-lived session rather than
+    get_db_session, which would hold a pooled connection for the whole stream.
+    Rejects the handshake with close code 1008 on any auth failure.
     """
+    if token is None:
+        scheme, _, value = websocket.headers.get("authorization", "").partition(" ")
+        token = value if scheme.lower() == "bearer" else None
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
     try:
-        payload = decode_token(token, expected_type="access")
-    except InvalidCredentialsError:
-        raise _CREDENTIALS_EXCEPTION from None
+        async with async_session_factory() as db:
+            return await _user_from_token(token, db)
+    except (HTTPException, AppError):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION) from None
+
+
+async def _user_from_token(token: str, db: AsyncSession) -> UserModel:
+    payload = auth_cache.get_token_payload(token)
+    if payload is None:
+        try:
+            payload = decode_token(token, expected_type="access")
+        except InvalidCredentialsError:
+            raise _CREDENTIALS_EXCEPTION from None
+        auth_cache.put_token_payload(token, payload)
 
     user_id: str | None = payload.get("sub")
     if not user_id:
@@ -58,10 +91,16 @@ async def get_current_user(
     except ValueError:
         raise _CREDENTIALS_EXCEPTION from None
 
-    result = await db.execute(select(UserModel).where(UserModel.id == user_uuid))
-    user = result.scalar_one_or_none()
+    user = auth_cache.get_user(user_uuid)
     if user is None:
-        raise _CREDENTIALS_EXCEPTION
+        result = await db.execute(select(UserModel).where(UserModel.id == user_uuid))
+        user = result.scalar_one_or_none()
+        # End the lookup's transaction: its connection goes back to the write pool
+        # now rather than staying checked out for the rest of the request.
+        await db.commit()
+        if user is None:
+            raise _CREDENTIALS_EXCEPTION
+        auth_cache.put_user(user)
 
     if not user.is_active:
         raise AccountDisabledError()
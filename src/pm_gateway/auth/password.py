@@ -3,12 +3,31 @@
 Uses the ``bcrypt`` library directly (>=4.0).  passlib[bcrypt] is intentionally
 avoided because passlib is unmaintained and incompatible with bcrypt >=4.
 
+bcrypt is deliberately slow (tens to hundreds of ms per call).  Async callers
+must go through ``run_password_work`` so the work runs on a small dedicated
+thread pool (bcrypt releases the GIL) instead of stalling the event loop, and
+so a login storm queues for at most ``_QUEUE_TIMEOUT_SECONDS`` before being
+rejected with ServiceBusyError.
+
 MVP NOTE: bcrypt is the default choice.  For higher security in production
 consider Argon2id via the ``argon2-cffi`` package.
 """
 
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from src.pm_common.errors import ServiceBusyError
+
+_MAX_CONCURRENCY = min(4, os.cpu_count() or 1)
+_QUEUE_TIMEOUT_SECONDS = 2.0
+
+_executor = ThreadPoolExecutor(max_workers=_MAX_CONCURRENCY, thread_name_prefix="bcrypt")
+_slots = asyncio.Semaphore(_MAX_CONCURRENCY)
+
 
 def hash_password(plain: str) -> str:
     """Hash a plain-text password with bcrypt. Returns a utf-8 hash string."""
@@ -19,3 +38,18 @@ def hash_password(plain: str) -> str:
 def verify_password(plain: str, hashed: str) -> bool:
     """Verify a plain-text password against a bcrypt hash."""
     return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+
+
+async def run_password_work[T](fn: Callable[..., T], *args: str) -> T:
+    """Run hash_password / verify_password off the event loop, with a concurrency cap.
+
+    Raises ServiceBusyError if no worker frees up within the queue timeout.
+    """
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout=_QUEUE_TIMEOUT_SECONDS)
+    except TimeoutError:
+        raise ServiceBusyError() from None
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _slots.release()
@@ -1,33 +1,315 @@
-"""Rate limiting middleware — TODO: not implemented in MVP.
+"""Rate limiting middleware — token buckets, local pre-filter + Redis global limit.
 
-Planned rules (from API contract §1.8):
+Rules (from API contract §1.8):
   - Auth endpoints:  5 req/min/IP   (anti brute-force)
-  - Order endpoint: 30 req/min/user (anti spam)
-  - Query endpoints: 120 req/min/user
-
-Implementation approach (when ready):
-  1. Use Redis INCR + EXPIRE for fixed-window counting
-  2. Key pattern: "ratelimit:{user_id_or_ip}:{endpoint_group}"
-  3. Extract real client IP from X-Forwarded-For header (reverse proxy aware)
-  4. Raise RateLimitError (9001) when limit exceeded
-  5. Add Retry-After header to 429 responses
-
-Example Redis logic:
-    count = await redis.incr(key)
-    if count == 1:
-        await redis.expire(key, 60)
-    if count > limit:
-        raise RateLimitError()
+  - Order endpoint: 30 req/min/user (anti spam) — POST/PUT/PATCH/DELETE under /orders
+  - Query endpoints: 120 req/min/user — every other GET under /api/v1
+
+Each (rule, client) pair has a token bucket of ``limit`` tokens refilled at
+``limit / 60`` per second. A request first takes a token from an in-process
+bucket; an empty local bucket rejects without touching Redis, because this
+process alone has already exceeded the global limit. Otherwise a Lua script
+applies the same bucket atomically in Redis, key pattern
+"ratelimit:{group}:{user_id_or_ip}", so the limit holds across workers.
+
+If Redis is unreachable the limiter fails open on the global check (the
+local bucket still applies), logs a warning and skips Redis for
+``_REDIS_BACKOFF_SECONDS`` so a dead Redis does not add latency per request.
+
+Requests are keyed by JWT ``sub`` when a valid access token is present,
+otherwise by client IP. X-Forwarded-For is only honoured when
+RATE_LIMIT_TRUST_FORWARDED is set (i.e. behind a trusted reverse proxy).
+The AMM system account and /api/v1/amm/* are exempt.
+
+Rejections are rendered as RateLimitError (9001, HTTP 429) with Retry-After.
+The middleware is pure ASGI; its own per-request cost (µs) is tracked in
+``rate_limit_stats``.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+from src.pm_account.domain.constants import AMM_USER_ID
+from src.pm_common.errors import InvalidCredentialsError, RateLimitError
+from src.pm_common.metrics import REGISTRY
+from src.pm_common.redis_client import get_redis
+from src.pm_common.response import error_response
+from src.pm_gateway.auth import cache as auth_cache
+from src.pm_gateway.auth.jwt_handler import decode_token
+
+logger = logging.getLogger(__name__)
+
+_API_PREFIX = "/api/v1"
+_EXEMPT_PREFIXES = (f"{_API_PREFIX}/amm/",)
+_MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_LOCAL_MAX_KEYS = 100_000
+_REDIS_BACKOFF_SECONDS = 5.0
+
+# KEYS[1] = bucket key; ARGV = capacity, refill rate (tokens/s).
+# Returns {allowed (0/1), retry_after_seconds as string}.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry)}
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
 
+@dataclass(frozen=True)
+class RateLimitRule:
+    group: str
+    limit: int  # requests per minute
+    per_ip: bool
+
+    @property
+    def rate(self) -> float:
+        return self.limit / 60.0
+
+
+AUTH_RULE = RateLimitRule("auth", 5, per_ip=True)
+ORDER_RULE = RateLimitRule("order", 30, per_ip=False)
+QUERY_RULE = RateLimitRule("query", 120, per_ip=False)
+
+
+def classify(method: str, path: str) -> RateLimitRule | None:
+    """Pick the rule for a request, or None if it is not rate limited."""
+    if not path.startswith(_API_PREFIX) or path.startswith(_EXEMPT_PREFIXES):
+        return None
+    if path.startswith(f"{_API_PREFIX}/auth/"):
+        return AUTH_RULE
+    if method in _MUTATING_METHODS:
+        if path.startswith(f"{_API_PREFIX}/orders"):
+            return ORDER_RULE
+        return None
+    if method == "GET":
+        return QUERY_RULE
+    return None
+
+
+@dataclass
+class TokenBucket:
+    capacity: float
+    rate: float
+    tokens: float
+    updated: float = field(default_factory=time.monotonic)
+
+    def take(self, now: float) -> float:
+        """Take one token. Returns 0 if allowed, else seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class LocalLimiter:
+    """Per-process token buckets, LRU-bounded to ``max_keys`` clients."""
+
+    def __init__(self, max_keys: int = _LOCAL_MAX_KEYS) -> None:
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def take(self, key: str, rule: RateLimitRule, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rule.limit, rule.rate, rule.limit, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(now)
+
+
+@dataclass
+class RateLimitStats:
+    checks: int = 0
+    local_rejections: int = 0
+    redis_rejections: int = 0
+    redis_errors: int = 0
+    overhead_us_total: float = 0.0
+    overhead_us_max: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "checks": self.checks,
+            "local_rejections": self.local_rejections,
+            "redis_rejections": self.redis_rejections,
+            "redis_errors": self.redis_errors,
+            "overhead_us_avg": self.overhead_us_total / self.checks if self.checks else 0.0,
+            "overhead_us_max": self.overhead_us_max,
+        }
+
+
+rate_limit_stats = RateLimitStats()
+
+REGISTRY.callback(
+    "pm_rate_limit_checks_total",
+    "Requests checked by the rate limiter",
+    lambda: [((), rate_limit_stats.checks)],
+    kind="counter",
+)
+REGISTRY.callback(
+    "pm_rate_limit_rejections_total",
+    "Requests rejected, by the layer that rejected them",
+    lambda: [
+        (("local",), rate_limit_stats.local_rejections),
+        (("redis",), rate_limit_stats.redis_rejections),
+    ],
+    ("layer",),
+    kind="counter",
+)
+REGISTRY.callback(
+    "pm_rate_limit_redis_errors_total",
+    "Redis failures (request allowed)",
+    lambda: [((), rate_limit_stats.redis_errors)],
+    kind="counter",
+)
+REGISTRY.callback(
+    "pm_rate_limit_overhead_us",
+    "Rate limiter cost per checked request (avg and max), microseconds",
+    lambda: [
+        (("avg",), rate_limit_stats.as_dict()["overhead_us_avg"]),
+        (("max",), rate_limit_stats.overhead_us_max),
+    ],
+    ("stat",),
+)
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return str(value.decode("latin-1"))
+    return None
+
+
+def _client_ip(scope: Scope) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return str(client[0]) if client else "unknown"
+
+
+def _user_id(scope: Scope) -> str | None:
+    """JWT sub of a valid access token, without touching the DB."""
+    auth = _header(scope, b"authorization")
+    if not auth or not auth.lower().startswith("bearer "):
+        return None
+    token = auth[7:].strip()
+    payload = auth_cache.get_token_payload(token)
+    if payload is None:
+        try:
+            payload = decode_token(token, expected_type="access")
+        except InvalidCredentialsError:
+            return None
+        auth_cache.put_token_payload(token, payload)
+    sub = payload.get("sub")
+    return str(sub) if sub else None
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.local = LocalLimiter()
+        self.stats = rate_limit_stats
+        self._script: Any = None
+        self._redis_retry_at = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        rule = classify(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        retry_after = await self._check(scope, rule)
+        elapsed_us = (time.perf_counter() - start) * 1_000_000
+        self.stats.checks += 1
+        self.stats.overhead_us_total += elapsed_us
+        self.stats.overhead_us_max = max(self.stats.overhead_us_max, elapsed_us)
+
+        if retry_after > 0:
+            await self._reject(scope, send, retry_after)
+            return
+        await self.app(scope, receive, send)
+
+    async def _check(self, scope: Scope, rule: RateLimitRule) -> float:
+        """Seconds the client must wait, or 0 if the request may proceed."""
+        if rule.per_ip:
+            client = _client_ip(scope)
+        else:
+            user_id = _user_id(scope)
+            if user_id == AMM_USER_ID:
+                return 0.0
+            client = user_id or _client_ip(scope)
+        key = f"ratelimit:{rule.group}:{client}"
+
+        now = time.monotonic()
+        retry_after = self.local.take(key, rule, now)
+        if retry_after > 0:
+            self.stats.local_rejections += 1
+            return retry_after
+        if now < self._redis_retry_at:
+            return 0.0
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """TODO: Implement Redis-based rate limiting."""
+        try:
+            if self._script is None:
+                self._script = (await get_redis()).register_script(_TOKEN_BUCKET_LUA)
+            allowed, retry = await self._script(keys=[key], args=[rule.limit, rule.rate])
+        except Exception:  # fail open on Redis trouble
+            self.stats.redis_errors += 1
+            self._redis_retry_at = now + _REDIS_BACKOFF_SECONDS
+            logger.warning("Rate limiter Redis check failed; allowing %s", key, exc_info=True)
+            return 0.0
+        if int(allowed):
+            return 0.0
+        self.stats.redis_rejections += 1
+        return float(retry)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        # TODO: check rate limit before proceeding
-        return await call_next(request)
+    async def _reject(self, scope: Scope, send: Send, retry_after: float) -> None:
+        exc = RateLimitError()
+        resp = error_response(exc.code, exc.message)
+        request_id = scope.get("state", {}).get("request_id")
+        if request_id:
+            resp.request_id = request_id
+        body = resp.model_dump_json().encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": exc.http_status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,39 +1,107 @@
 """Request logging middleware.
 
-Logs every HTTP request with method, path, status code, latency, and
-a short request ID for correlation. The request_id is also injected into
-request.state so router handlers can include it in ApiResponse.
+Pure ASGI (no BaseHTTPMiddleware response wrapping). For every HTTP request
+it records the latency in a per-route histogram and injects a short request
+ID into request.state so router handlers can include it in ApiResponse.
+
+Routes are keyed by their template (``/api/v1/orders/{order_id}``), not the
+raw path, so histogram cardinality stays bounded.
+
+Log lines are sampled: errors (5xx) and requests slower than
+REQUEST_LOG_SLOW_MS are always logged, the rest with probability
+REQUEST_LOG_SAMPLE_RATE. Set REQUEST_LOG_JSON for one JSON object per line.
+main.py routes the "pm.request" logger through a QueueHandler so the write
+happens off the event loop.
 
 Log format:
     INFO [POST] /api/v1/auth/login → 200 (23ms) req=a1b2c3d4
 """
 
+import json
 import logging
+import os
+import random
 import time
-import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from src.pm_common.metrics import REGISTRY
 
 logger = logging.getLogger("pm.request")
 
+route_latency = REGISTRY.histogram(
+    "pm_http_request_duration_ms", "HTTP request latency by route", ("method", "route")
+)
+
+_UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if isinstance(path, str) else _UNMATCHED_ROUTE
+
+
+class RequestLogMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class RequestLogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         # Inject short request ID into request state for use in handlers
-        request.state.request_id = f"req_{uuid.uuid4().hex[:12]}"
+        request_id = f"req_{os.urandom(6).hex()}"
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
         start = time.perf_counter()
-        response: Response = await call_next(request)
-        elapsed_ms = (time.perf_counter() - start) * 1000
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            route_latency.labels(scope["method"], _route_template(scope)).observe(elapsed_ms)
+            if _should_log(status_code, elapsed_ms):
+                _log(scope, status_code, elapsed_ms, request_id)
+
+
+def _should_log(status_code: int, elapsed_ms: float) -> bool:
+    if status_code >= 500 or elapsed_ms >= settings.REQUEST_LOG_SLOW_MS:
+        return True
+    rate = settings.REQUEST_LOG_SAMPLE_RATE
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
 
+def _log(scope: Scope, status_code: int, elapsed_ms: float, request_id: str) -> None:
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    if settings.REQUEST_LOG_JSON:
         logger.info(
-            "[%s] %s → %d (%.0fms) %s",
-            request.method,
-            request.url.path,
-            response.status_code,
-            elapsed_ms,
-            request.state.request_id,
+            json.dumps(
+                {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": _route_template(scope),
+                    "status": status_code,
+                    "latency_ms": round(elapsed_ms, 2),
+                    "request_id": request_id,
+                }
+            )
         )
-        return response
+        return
+    logger.info(
+        "[%s] %s → %d (%.0fms) %s",
+        scope["method"],
+        scope["path"],
+        status_code,
+        elapsed_ms,
+        request_id,
+    )
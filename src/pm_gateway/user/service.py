@@ -18,7 +18,7 @@ from src.pm_gateway.auth.jwt_handler import (
     create_refresh_token,
     decode_token,
 )
-from src.pm_gateway.auth.password import hash_password, verify_password
+from src.pm_gateway.auth.password import hash_password, run_password_work, verify_password
 from src.pm_gateway.user.db_models import UserModel
 
 
@@ -51,7 +51,7 @@ class UserService:
         user = UserModel(
             username=username,
             email=email,
-            password_hash=hash_password(password),
+            password_hash=await run_password_work(hash_password, password),
             is_active=True,
         )
         db.add(user)
@@ -83,7 +83,9 @@ class UserService:
         result = await db.execute(select(UserModel).where(UserModel.username == username))
         user = result.scalar_one_or_none()
 
-        if user is None or not verify_password(password, user.password_hash):
+        if user is None or not await run_password_work(
+            verify_password, password, user.password_hash
+        ):
             raise InvalidCredentialsError()
 
         if not user.is_active:
@@ -1,31 +1,85 @@
 """pm_market REST endpoints.
 
 GET /markets                          — list with cursor pagination
+GET /markets/ticker                   — top of book, last trade and 24h stats, all active markets
 GET /markets/{market_id}              — full detail
-GET /markets/{market_id}/orderbook    — order book snapshot (DB aggregated)
+GET /markets/{market_id}/orderbook    — in-memory book snapshot, or changes ?since=<seq>
+GET /markets/{market_id}/trades/recent — newest trades from the engine's in-memory tape
+GET /markets/{market_id}/candles      — OHLCV history, optionally downsampled (see candles.py)
+WS  /markets/{market_id}/ws           — live book deltas and trade prints (see feed.py)
+
+Order book responses carry the book's sequence number (MatchingEngine.book_seq)
+and a weak ETag; a matching If-None-Match gets 304 without touching the DB.
+Market rows, list pages and book snapshots go through MarketReadCache.
+Lookups that may read a replica use the read pool; the order book and candles
+stay on the write pool, since a lagging replica could rebuild a stale book or
+miss candles the aggregator has already flushed.
 """
 
-from typing import Annotated
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketException,
+    status,
+)
 
-from src.pm_common.database import get_db_session
-from src.pm_common.response import ApiResponse, success_response
-from src.pm_gateway.auth.dependencies import get_current_user
+from config.settings import settings
+from src.pm_common.database import (
+    DbSession,
+    ReadDbSession,
+    async_session_factory,
+    read_session_factory,
+)
+from src.pm_common.errors import AppError
+from src.pm_common.response import ApiResponse, success_json, success_response
+from src.pm_common.websocket import stream_json
+from src.pm_gateway.auth.dependencies import get_current_user, get_websocket_user
 from src.pm_gateway.user.db_models import UserModel
+from src.pm_market.application.candles import get_candle_aggregator
+from src.pm_market.application.feed import (
+    FeedSubscription,
+    MarketDataFeed,
+    get_market_data_feed,
+)
+from src.pm_market.application.read_cache import get_market_read_cache
+from src.pm_market.application.schemas import OrderbookDeltaResponse, OrderbookResponse
 from src.pm_market.application.service import MarketApplicationService
+from src.pm_market.application.ticker import get_market_ticker
+from src.pm_market.infrastructure.persistence import MarketRepository
+from src.pm_matching.application.service import get_matching_engine
+from src.pm_order.infrastructure.persistence import OrderRepository
 
 router = APIRouter(prefix="/markets", tags=["markets"])
 
-_service = MarketApplicationService()
+_service = MarketApplicationService(cache=get_market_read_cache())
+
+_ETAG_EPOCH = uuid.uuid4().hex[:8]  # seqs are only comparable within one process
+_FULL_DEPTH = 99  # ?since= deltas cover the whole book, so their snapshots do too
+
+
+def _etag(seq: int, depth: int) -> str:
+    return f'W/"{_ETAG_EPOCH}.{seq}.{depth}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return etag in (tag.strip() for tag in header.split(","))
 
 
 @router.get("")
 async def list_markets(
     request: Request,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
     status: str | None = Query(
         None, description="Filter by status. Default: ACTIVE. Use ALL for no filter."
     ),
@@ -39,12 +93,28 @@ async def list_markets(
     return resp
 
 
+async def _active_market_ids() -> list[str]:
+    async with read_session_factory() as db:
+        return await MarketRepository().list_active_market_ids(db)
+
+
+@router.get("/ticker", response_model=None)
+async def get_ticker(
+    request: Request,
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+) -> Response:
+    """Served from a body cached for MARKET_TICKER_REFRESH_MS; see ticker.py."""
+    data = await get_market_ticker().body(_active_market_ids, get_matching_engine().book_top)
+    body = success_json(data, getattr(request.state, "request_id", None))
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/{market_id}")
 async def get_market(
     market_id: str,
     request: Request,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
 ) -> ApiResponse:
     result = await _service.get_market(db, market_id)
     resp = success_response(result.model_dump())
@@ -52,15 +122,118 @@ async def get_market(
     return resp
 
 
-@router.get("/{market_id}/orderbook")
+@router.get("/{market_id}/orderbook", response_model=None)
 async def get_orderbook(
     market_id: str,
     request: Request,
+    response: Response,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
     levels: int = Query(10, ge=1, le=99),
+    since: int | None = Query(
+        None, ge=0, description="Last seq seen: return only level changes after it"
+    ),
+) -> ApiResponse | Response:
+    engine = get_matching_engine()
+    depth = levels if since is None else _FULL_DEPTH
+    data: OrderbookResponse | OrderbookDeltaResponse | None = None
+    # Fast path: a loaded book answers 304s and deltas without DB or market lock.
+    # Market status is checked when a snapshot is built; settled books are dropped.
+    seq = engine.book_seq(market_id)
+    if seq is not None:
+        etag = _etag(seq, depth)
+        if _not_modified(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        changes = engine.book_changes(market_id, since) if since is not None else None
+        if since is not None and changes is not None:
+            data = OrderbookDeltaResponse.from_changes(market_id, since, changes)
+    if data is None:
+
+        async def book(
+            book_market_id: str, book_depth: int
+        ) -> tuple[int, list[tuple[int, int]], list[tuple[int, int]]]:
+            return await engine.book_snapshot(book_market_id, OrderRepository(), db, book_depth)
+
+        data = await _service.get_orderbook(db, market_id, depth, book, engine.recent_trades)
+    if data.seq is not None:
+        response.headers["ETag"] = _etag(data.seq, depth)
+    resp = success_response(data.model_dump())
+    resp.request_id = getattr(request.state, "request_id", resp.request_id)
+    return resp
+
+
+@router.get("/{market_id}/trades/recent")
+async def get_recent_trades(
+    market_id: str,
+    request: Request,
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+    db: ReadDbSession,
+    limit: int = Query(50, ge=1, le=settings.TRADE_TAPE_SIZE),
 ) -> ApiResponse:
-    result = await _service.get_orderbook(db, market_id, levels)
+    result = await _service.get_recent_trades(
+        db, market_id, limit, get_matching_engine().recent_trades
+    )
     resp = success_response(result.model_dump())
     resp.request_id = getattr(request.state, "request_id", resp.request_id)
     return resp
+
+
+@router.get("/{market_id}/candles")
+async def get_candles(
+    market_id: str,
+    request: Request,
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+    db: DbSession,
+    interval: Literal["1m", "5m", "1h", "1d"] = Query("1h"),
+    start: datetime | None = Query(None, description="Inclusive bucket start (ISO 8601)"),
+    end: datetime | None = Query(None, description="Exclusive bucket start (ISO 8601)"),
+    limit: int = Query(500, ge=1, le=1000),
+    points: int | None = Query(
+        None, ge=1, le=1000, description="Merge into wider buckets to return about this many"
+    ),
+) -> ApiResponse:
+    result = await _service.get_candles(
+        db, market_id, interval, start, end, limit, points, get_candle_aggregator().candles
+    )
+    resp = success_response(result.model_dump())
+    resp.request_id = getattr(request.state, "request_id", resp.request_id)
+    return resp
+
+
+async def _book_levels(
+    market_id: str, depth: int
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    async with async_session_factory() as db:
+        return await get_matching_engine().book_levels(market_id, OrderRepository(), db, depth)
+
+
+async def _feed_messages(
+    feed: MarketDataFeed, sub: FeedSubscription
+) -> AsyncIterator[dict[str, Any]]:
+    try:
+        yield await feed.snapshot(sub, _book_levels)
+        while True:
+            update = await sub.next_update()
+            yield update if update is not None else await feed.snapshot(sub, _book_levels)
+    finally:
+        feed.unsubscribe(sub)
+
+
+@router.websocket("/{market_id}/ws")
+async def market_feed(
+    websocket: WebSocket,
+    market_id: str,
+    current_user: Annotated[UserModel, Depends(get_websocket_user)],
+) -> None:
+    if not settings.MARKET_FEED_ENABLED:
+        raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="Feed disabled")
+    try:
+        async with async_session_factory() as db:
+            market = await _service.get_market(db, market_id)
+    except AppError as exc:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=exc.message) from None
+    if market.status != "ACTIVE":
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Market not active")
+    await websocket.accept()
+    feed = get_market_data_feed()
+    await stream_json(websocket, _feed_messages(feed, feed.subscribe(market_id)))
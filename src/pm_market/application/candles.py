@@ -0,0 +1,239 @@
+"""CandleAggregator — incremental 1m/5m/1h/1d OHLCV candles from committed trades.
+
+Registered as a MatchingEngine listener (main.lifespan, CANDLES_ENABLED):
+each trade updates the open candle of every interval in O(1). A flush task
+(run()) saves the candles accumulated since the previous flush every
+``flush_ms`` into market_candles, merging them into any stored row for the
+same bucket, then starts the buckets over from empty. Every trade is saved
+exactly once, so a restart mid-bucket loses nothing that was flushed.
+
+Reads (GET /markets/{id}/candles) take stored rows for the range and merge
+in the unflushed candles held in memory, so the newest buckets are live
+without reading trades.
+
+scripts/backfill_candles.py rebuilds stored history from trades with
+backfill_market() in keyset-paginated chunks.
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.settings import settings
+from src.pm_common.database import async_session_factory
+from src.pm_common.metrics import REGISTRY
+from src.pm_market.domain.models import Candle
+from src.pm_market.domain.repository import MarketRepositoryProtocol
+from src.pm_market.infrastructure.persistence import MarketRepository
+from src.pm_matching.domain.models import CommandOutcome
+
+logger = logging.getLogger(__name__)
+
+INTERVALS: dict[str, int] = {"1m": 60, "5m": 300, "1h": 3600, "1d": 86400}
+
+_FLUSHED = REGISTRY.counter("pm_candles_flushed_total", "Candle deltas saved to market_candles")
+
+
+def bucket_start(at: datetime, seconds: int) -> datetime:
+    """Start of the epoch-aligned bucket of ``seconds`` containing ``at``, in UTC."""
+    epoch = math.floor(at.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, UTC)
+
+
+def merge(older: Candle, newer: Candle) -> Candle:
+    """One candle for the same bucket from two consecutive runs of trades."""
+    return replace(
+        older,
+        high_cents=max(older.high_cents, newer.high_cents),
+        low_cents=min(older.low_cents, newer.low_cents),
+        close_cents=newer.close_cents,
+        volume=older.volume + newer.volume,
+        trades=older.trades + newer.trades,
+    )
+
+
+def downsample(candles: list[Candle], seconds: int) -> list[Candle]:
+    """Regroup time-ordered candles into epoch-aligned buckets of ``seconds``."""
+    out: list[Candle] = []
+    for candle in candles:
+        start = bucket_start(candle.start, seconds)
+        if out and out[-1].start == start:
+            out[-1] = merge(out[-1], candle)
+        else:
+            out.append(replace(candle, start=start))
+    return out
+
+
+class CandleBuilder:
+    """Open candles of every interval, per market, for trades fed in time order."""
+
+    def __init__(self) -> None:
+        self._open: dict[tuple[str, str], Candle] = {}
+
+    def add(self, market_id: str, price: int, quantity: int, at: datetime) -> list[Candle]:
+        """Fold one trade in; returns the candles it closed."""
+        closed: list[Candle] = []
+        for interval, seconds in INTERVALS.items():
+            start = bucket_start(at, seconds)
+            current = self._open.get((market_id, interval))
+            if current is not None and current.start >= start:  # same bucket (or clock step back)
+                current.high_cents = max(current.high_cents, price)
+                current.low_cents = min(current.low_cents, price)
+                current.close_cents = price
+                current.volume += quantity
+                current.trades += 1
+                continue
+            if current is not None:
+                closed.append(current)
+            self._open[market_id, interval] = Candle(
+                market_id, interval, start, price, price, price, price, quantity, 1
+            )
+        return closed
+
+    def take(self, ended_by: datetime | None = None) -> list[Candle]:
+        """Remove and return the open candles; with ``ended_by`` only buckets over by then."""
+        taken = [
+            c
+            for c in self._open.values()
+            if ended_by is None or c.start + timedelta(seconds=INTERVALS[c.interval]) <= ended_by
+        ]
+        for c in taken:
+            del self._open[c.market_id, c.interval]
+        return taken
+
+    def get(self, market_id: str, interval: str) -> Candle | None:
+        return self._open.get((market_id, interval))
+
+
+class CandleAggregator:
+    def __init__(
+        self,
+        flush_ms: float = 1000.0,
+        repo: MarketRepositoryProtocol | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ) -> None:
+        self._interval = flush_ms / 1000
+        self._repo: MarketRepositoryProtocol = repo or MarketRepository()
+        self._session_factory = session_factory
+        self._builder = CandleBuilder()
+        self._pending: list[Candle] = []  # closed since the last flush
+        self._flushing: list[Candle] = []  # being saved; still merged into reads
+        self._flushes = 0  # committed flushes, so reads can detect one in between
+
+    def on_outcome(self, outcome: CommandOutcome) -> None:
+        """Engine listener: fold the command's trades into the open candles."""
+        for row in outcome.trades:
+            self._pending.extend(
+                self._builder.add(
+                    outcome.market_id, row["price"], row["quantity"], row["executed_at"]
+                )
+            )
+
+    async def run(self) -> None:
+        """Flush until cancelled; a failed flush is retried on the next tick."""
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.flush_once()
+            except Exception:
+                logger.exception("Candle flush failed; retrying")
+
+    async def flush_once(self) -> int:
+        """Save every candle accumulated since the previous flush. Returns how many."""
+        batch = self._pending + self._builder.take()
+        self._pending = []
+        if not batch:
+            return 0
+        self._flushing = batch
+        try:
+            async with self._session_factory() as db, db.begin():
+                await self._repo.save_candles(db, batch)
+        except BaseException:
+            self._pending = batch + self._pending  # older deltas first, merge order holds
+            raise
+        finally:
+            self._flushing = []
+        self._flushes += 1
+        _FLUSHED.labels().inc(len(batch))
+        return len(batch)
+
+    def _unflushed(
+        self, market_id: str, interval: str, start: datetime | None, end: datetime | None
+    ) -> list[Candle]:
+        current = self._builder.get(market_id, interval)
+        return [
+            c
+            for c in (*self._flushing, *self._pending, *([current] if current else []))
+            if c.market_id == market_id
+            and c.interval == interval
+            and (start is None or c.start >= start)
+            and (end is None or c.start < end)
+        ]
+
+    async def candles(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        interval: str,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int,
+    ) -> list[Candle]:
+        """The newest ``limit`` candles in [start, end), oldest first: stored plus unflushed."""
+        for _ in range(2):  # a flush committing mid-read would count its candles twice
+            flushes = self._flushes
+            unflushed = self._unflushed(market_id, interval, start, end)
+            stored = await self._repo.list_candles(db, market_id, interval, start, end, limit)
+            if flushes == self._flushes:
+                break
+        by_start = {c.start: c for c in stored}
+        for delta in unflushed:
+            older = by_start.get(delta.start)
+            by_start[delta.start] = merge(older, delta) if older else replace(delta)
+        return sorted(by_start.values(), key=lambda c: c.start)[-limit:]
+
+
+async def backfill_market(
+    db: AsyncSession,
+    market_id: str,
+    before: datetime,
+    chunk_size: int = 5000,
+    repo: MarketRepositoryProtocol | None = None,
+) -> int:
+    """Recompute ``market_id``'s candles from trades executed before ``before``.
+
+    Trades are read in keyset chunks and each chunk's closed candles are
+    written, replacing stored rows, and committed; only buckets over by
+    ``before`` are written. Returns the number of candles written.
+    """
+    repo = repo or MarketRepository()
+    builder = CandleBuilder()
+    written = 0
+    after: tuple[datetime, str] | None = None
+    while True:
+        trades = await repo.list_trades_after(db, market_id, after, before, chunk_size)
+        closed: list[Candle] = []
+        for t in trades:
+            closed.extend(builder.add(market_id, t.price, t.quantity, t.executed_at))
+        if len(trades) < chunk_size:
+            closed.extend(builder.take(ended_by=before))
+        await repo.save_candles(db, closed, replace=True)
+        await db.commit()
+        written += len(closed)
+        if len(trades) < chunk_size:
+            return written
+        after = (trades[-1].executed_at, trades[-1].trade_id)
+
+
+_aggregator: CandleAggregator | None = None
+
+
+def get_candle_aggregator() -> CandleAggregator:
+    global _aggregator  # noqa: PLW0603
+    if _aggregator is None:
+        _aggregator = CandleAggregator(settings.CANDLES_FLUSH_MS)
+    return _aggregator
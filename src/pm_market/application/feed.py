@@ -0,0 +1,191 @@
+"""MarketDataFeed — order book deltas and trade prints for WebSocket subscribers.
+
+Registered as a MatchingEngine listener: after each successful command the
+engine hands over a CommandOutcome, carrying the book's new sequence number,
+which on_outcome() queues in O(1), so the matching path never waits on
+subscribers. A single fan-out task (run()) folds each queued
+outcome into every subscription of its market.
+
+Subscriptions conflate: level quantities are absolute, so a slow consumer
+keeps one pending value per (side, price) instead of a backlog, and trade
+prints accumulate up to max_trades. Past that the subscription is marked
+for resync and the connection sends a fresh snapshot instead.
+
+Messages (YES book; NO prices are 100 - p on the opposite side):
+    {"type": "snapshot", "market_id", "seq", "bids": [[price, qty]...], "asks": [...]}
+    {"type": "update", "market_id", "seq", "prev_seq", "bids", "asks", "trades": [...]}
+Update levels with qty 0 are removed. Seqs are the book's own (see
+MatchingEngine.book_seq), shared with GET /markets/{id}/orderbook?since=.
+``prev_seq`` is the seq of the previous message on the same connection;
+seqs skipped in between were conflated or did not change the book.
+"""
+
+import asyncio
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from config.settings import settings
+from src.pm_common.metrics import REGISTRY
+from src.pm_matching.domain.models import CommandOutcome
+
+BookSource = Callable[[str, int], Awaitable[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]
+# BookSource(market_id, depth) -> (bids, asks), e.g. MatchingEngine.book_levels
+
+_RESYNCS = REGISTRY.counter(
+    "pm_market_feed_resyncs_total", "Snapshots re-sent to slow feed subscribers"
+)
+
+
+def trade_print(row: dict[str, Any]) -> dict[str, Any]:
+    """Public view of a trades row: no users or order ids."""
+    taker_is_buyer = row["taker_order_id"] == row["buy_order_id"]
+    return {
+        "trade_id": row["trade_id"],
+        "price": row["price"],
+        "quantity": row["quantity"],
+        "taker_side": "BUY" if taker_is_buyer else "SELL",
+        "executed_at": row["executed_at"].isoformat(),
+    }
+
+
+class FeedSubscription:
+    def __init__(self, market_id: str, max_trades: int) -> None:
+        self.market_id = market_id
+        self.seq = 0  # newest seq folded in (or of the snapshot)
+        self.sent_seq = 0  # seq of the last message sent
+        self._max_trades = max_trades
+        self._levels: dict[tuple[str, int], int] = {}
+        self._trades: list[dict[str, Any]] = []
+        self._resync = False
+        self._ready = asyncio.Event()
+
+    def offer(
+        self, seq: int, levels: dict[tuple[str, int], int], prints: list[dict[str, Any]]
+    ) -> None:
+        if seq <= self.seq or self._resync:
+            return  # already in the snapshot, or a snapshot is coming anyway
+        self.seq = seq
+        self._levels.update(levels)
+        self._trades.extend(prints)
+        if len(self._trades) > self._max_trades:
+            self._resync = True
+            self._levels.clear()
+            self._trades.clear()
+        self._ready.set()
+
+    def reset(self, seq: int) -> None:
+        """Start over from a snapshot taken at ``seq``."""
+        self.seq = self.sent_seq = seq
+        self._levels.clear()
+        self._trades.clear()
+        self._resync = False
+        self._ready.clear()
+
+    async def next_update(self) -> dict[str, Any] | None:
+        """Wait for changes and return them merged; None when a snapshot is needed."""
+        await self._ready.wait()
+        self._ready.clear()
+        if self._resync:
+            _RESYNCS.labels().inc()
+            return None
+        levels, self._levels = self._levels, {}
+        prints, self._trades = self._trades, []
+        message = {
+            "type": "update",
+            "market_id": self.market_id,
+            "seq": self.seq,
+            "prev_seq": self.sent_seq,
+            "bids": sorted(([p, q] for (s, p), q in levels.items() if s == "BUY"), reverse=True),
+            "asks": sorted([p, q] for (s, p), q in levels.items() if s == "SELL"),
+            "trades": prints,
+        }
+        self.sent_seq = self.seq
+        return message
+
+
+class MarketDataFeed:
+    def __init__(self, max_trades: int = 500, depth: int = 20) -> None:
+        self._max_trades = max_trades
+        self.depth = depth
+        self._seq: dict[str, int] = defaultdict(int)
+        self._subs: dict[str, set[FeedSubscription]] = defaultdict(set)
+        self._queue: deque[tuple[int, CommandOutcome]] = deque()
+        self._wakeup = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subs.values())
+
+    def seq(self, market_id: str) -> int:
+        return self._seq[market_id]
+
+    def on_outcome(self, outcome: CommandOutcome) -> None:
+        """Engine listener: queue; never blocks."""
+        if not outcome.levels and not outcome.trades:
+            return
+        self._seq[outcome.market_id] = outcome.seq
+        if self._subs.get(outcome.market_id):
+            self._queue.append((outcome.seq, outcome))
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        """Fan queued outcomes out to subscriptions until cancelled."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                seq, outcome = self._queue.popleft()
+                subs = self._subs.get(outcome.market_id)
+                if not subs:
+                    continue
+                prints = [trade_print(row) for row in outcome.trades]
+                for sub in subs:
+                    sub.offer(seq, outcome.levels, prints)
+
+    def subscribe(self, market_id: str) -> FeedSubscription:
+        sub = FeedSubscription(market_id, self._max_trades)
+        self._subs[market_id].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: FeedSubscription) -> None:
+        subs = self._subs.get(sub.market_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.market_id]
+
+    async def snapshot(self, sub: FeedSubscription, source: BookSource) -> dict[str, Any]:
+        """Snapshot message for ``sub``; resets its pending changes.
+
+        The seq is read before the book: any command after it arrives as an
+        update with a higher seq, and level quantities are absolute, so one
+        that is also reflected in the snapshot is harmless to re-apply.
+        """
+        seq = self._seq[sub.market_id]
+        sub.reset(seq)
+        bids, asks = await source(sub.market_id, self.depth)
+        return {
+            "type": "snapshot",
+            "market_id": sub.market_id,
+            "seq": seq,
+            "bids": [list(level) for level in bids],
+            "asks": [list(level) for level in asks],
+        }
+
+
+_feed: MarketDataFeed | None = None
+
+
+def get_market_data_feed() -> MarketDataFeed:
+    global _feed  # noqa: PLW0603
+    if _feed is None:
+        _feed = MarketDataFeed(settings.MARKET_FEED_MAX_TRADES, settings.MARKET_FEED_DEPTH)
+    return _feed
+
+
+REGISTRY.callback(
+    "pm_market_feed_subscribers",
+    "Open market-data WebSocket subscriptions",
+    lambda: [((), _feed.subscriber_count)] if _feed is not None else [],
+)
@@ -0,0 +1,149 @@
+"""MarketReadCache — coalesced, short-TTL caching for the market read endpoints.
+
+Three TTLCaches: market rows (get_market_by_id, MARKET_CACHE_TTL_MS),
+list_markets pages (MARKET_LIST_CACHE_TTL_MS) and order book responses
+(ORDERBOOK_CACHE_TTL_MS, kept very short). A miss runs the loader once per
+key however many requests ask for it at the same time; the others await the
+same result (or exception). A TTL of 0 keeps the coalescing without caching.
+
+Invalidation bumps a per-market generation that is part of the keys, so
+stale entries become unreachable at once and a fetch already in flight
+cannot store a pre-invalidation result under a live key:
+
+- invalidate_book(): registered as a MatchingEngine listener
+  (main.lifespan), called after every command that touched the market.
+- invalidate_market(): after an admin status change (AdminService).
+
+Other processes see those changes when their entries expire.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from config.settings import settings
+from src.pm_common.metrics import REGISTRY
+from src.pm_common.ttl_cache import TTLCache
+from src.pm_market.application.schemas import MarketListResponse, OrderbookResponse
+from src.pm_market.domain.models import Market
+from src.pm_matching.domain.models import CommandOutcome
+
+_CACHE_SIZE = 10_000
+
+
+class MarketReadCache:
+    def __init__(
+        self,
+        market_ttl_ms: float = 2000.0,
+        list_ttl_ms: float = 1000.0,
+        book_ttl_ms: float = 100.0,
+        maxsize: int = _CACHE_SIZE,
+    ) -> None:
+        self.markets: TTLCache[Hashable, Market | None] = TTLCache(maxsize, market_ttl_ms / 1000)
+        self.lists: TTLCache[Hashable, MarketListResponse] = TTLCache(maxsize, list_ttl_ms / 1000)
+        self.books: TTLCache[Hashable, OrderbookResponse] = TTLCache(maxsize, book_ttl_ms / 1000)
+        self._market_generations: dict[str, int] = {}  # market_id -> invalidations so far
+        self._book_generations: dict[str, int] = {}
+        self._list_generation = 0
+        self._inflight: dict[tuple[int, Hashable], asyncio.Future[Any]] = {}
+        self.coalesced = 0
+
+    # -- keys and invalidation ----------------------------------------------
+
+    def market_key(self, market_id: str) -> Hashable:
+        return market_id, self._market_generations.get(market_id, 0)
+
+    def book_key(self, market_id: str, depth: int) -> Hashable:
+        return market_id, self._book_generations.get(market_id, 0), depth
+
+    def list_key(self, *params: Hashable) -> Hashable:
+        return self._list_generation, *params
+
+    def invalidate_book(self, market_id: str) -> None:
+        self._book_generations[market_id] = self._book_generations.get(market_id, 0) + 1
+
+    def invalidate_market(self, market_id: str) -> None:
+        """The market's row changed (e.g. status): drop its row, books and every list page."""
+        self._market_generations[market_id] = self._market_generations.get(market_id, 0) + 1
+        self.invalidate_book(market_id)
+        self._list_generation += 1
+
+    def on_outcome(self, outcome: CommandOutcome) -> None:
+        """Engine listener: the command may have changed the market's book."""
+        self.invalidate_book(outcome.market_id)
+
+    # -- loading ------------------------------------------------------------
+
+    async def get[V](
+        self, cache: TTLCache[Hashable, V], key: Hashable, loader: Callable[[], Awaitable[V]]
+    ) -> V:
+        """Cached value for ``key``, else the result of one shared ``loader()`` call.
+
+        ``None`` results are returned but not cached.
+        """
+        value = cache.get(key)
+        if value is not None:
+            return value
+        flight_key = (id(cache), key)
+        while (flight := self._inflight.get(flight_key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise  # this request was cancelled, not the fetch
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = flight
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            flight.cancel()  # waiters retry with a fetch of their own
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            flight.exception()  # retrieved: no "never retrieved" warning without waiters
+            raise
+        else:
+            flight.set_result(value)
+            if value is not None:
+                cache.set(key, value)
+        finally:
+            del self._inflight[flight_key]
+        return value
+
+
+_cache: MarketReadCache | None = None
+
+
+def get_market_read_cache() -> MarketReadCache:
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        _cache = MarketReadCache(
+            settings.MARKET_CACHE_TTL_MS,
+            settings.MARKET_LIST_CACHE_TTL_MS,
+            settings.ORDERBOOK_CACHE_TTL_MS,
+        )
+    return _cache
+
+
+REGISTRY.callback(
+    "pm_market_cache_lookups_total",
+    "Market read cache lookups",
+    lambda: [
+        ((name, result), cache.hits if result == "hit" else cache.misses)
+        for name, cache in (
+            ("market", _cache.markets), ("list", _cache.lists), ("book", _cache.books)
+        )
+        for result in ("hit", "miss")
+    ]
+    if _cache is not None
+    else [],
+    ("cache", "result"),
+    kind="counter",
+)
+REGISTRY.callback(
+    "pm_market_cache_coalesced_total",
+    "Market reads that awaited another request's in-flight fetch",
+    lambda: [((), _cache.coalesced)] if _cache is not None else [],
+    kind="counter",
+)
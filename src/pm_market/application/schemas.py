@@ -11,11 +11,13 @@ YES->NO orderbook conversion (per API contract §4.3):
 
 import base64
 import json
+from datetime import UTC, datetime
 
 from pydantic import BaseModel
 
 from src.pm_common.cents import cents_to_display
-from src.pm_market.domain.models import Market, OrderbookSnapshot
+from src.pm_market.domain.models import Candle, Market, OrderbookSnapshot
+from src.pm_matching.domain.models import BookChanges, TapeTrade
 
 # ---------------------------------------------------------------------------
 # Cursor utilities
@@ -96,6 +98,7 @@ class OrderbookResponse(BaseModel):
     no: OrderSideOut
     last_trade_price_cents: int | None
     updated_at: str
+    seq: int | None = None
 
     @classmethod
     def from_snapshot(cls, snapshot: OrderbookSnapshot) -> "OrderbookResponse":
@@ -114,9 +117,146 @@ class OrderbookResponse(BaseModel):
             no=OrderSideOut(bids=no_bids, asks=no_asks),
             last_trade_price_cents=snapshot.last_trade_price_cents,
             updated_at=snapshot.updated_at.isoformat(),
+            seq=snapshot.seq,
         )
 
 
+class OrderbookDeltaResponse(BaseModel):
+    """Level changes between ``since`` and ``seq``, full book depth.
+
+    Quantities are absolute (0 = level removed); last_trade_price_cents is
+    null when nothing traded in the range.
+    """
+
+    market_id: str
+    since: int
+    seq: int
+    yes: OrderSideOut
+    no: OrderSideOut
+    last_trade_price_cents: int | None
+    updated_at: str
+
+    @classmethod
+    def from_changes(
+        cls, market_id: str, since: int, changes: BookChanges
+    ) -> "OrderbookDeltaResponse":
+        yes_bids = sorted(
+            (
+                PriceLevelOut(price_cents=p, total_quantity=q)
+                for (side, p), q in changes.levels.items()
+                if side == "BUY"
+            ),
+            key=lambda x: x.price_cents,
+            reverse=True,
+        )
+        yes_asks = sorted(
+            (
+                PriceLevelOut(price_cents=p, total_quantity=q)
+                for (side, p), q in changes.levels.items()
+                if side == "SELL"
+            ),
+            key=lambda x: x.price_cents,
+        )
+        no_bids, no_asks = _to_no_view(yes_bids, yes_asks)
+        return cls(
+            market_id=market_id,
+            since=since,
+            seq=changes.seq,
+            yes=OrderSideOut(bids=yes_bids, asks=yes_asks),
+            no=OrderSideOut(bids=no_bids, asks=no_asks),
+            last_trade_price_cents=changes.last_trade_price,
+            updated_at=datetime.now(UTC).isoformat(),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Recent trades (public tape: no users or order ids)
+# ---------------------------------------------------------------------------
+
+
+class RecentTradeOut(BaseModel):
+    trade_id: str
+    price_cents: int
+    quantity: int
+    scenario: str
+    taker_side: str
+    executed_at: str
+
+    @classmethod
+    def from_tape(cls, t: TapeTrade) -> "RecentTradeOut":
+        return cls(
+            trade_id=t.trade_id,
+            price_cents=t.price,
+            quantity=t.quantity,
+            scenario=t.scenario,
+            taker_side=t.taker_side,
+            executed_at=t.executed_at.isoformat(),
+        )
+
+
+class RecentTradesResponse(BaseModel):
+    market_id: str
+    items: list[RecentTradeOut]  # newest first
+
+
+# ---------------------------------------------------------------------------
+# Candles (YES prices)
+# ---------------------------------------------------------------------------
+
+
+class CandleOut(BaseModel):
+    start: str
+    open_cents: int
+    high_cents: int
+    low_cents: int
+    close_cents: int
+    volume: int
+    trades: int
+
+    @classmethod
+    def from_domain(cls, c: Candle) -> "CandleOut":
+        return cls(
+            start=c.start.isoformat(),
+            open_cents=c.open_cents,
+            high_cents=c.high_cents,
+            low_cents=c.low_cents,
+            close_cents=c.close_cents,
+            volume=c.volume,
+            trades=c.trades,
+        )
+
+
+class CandlesResponse(BaseModel):
+    market_id: str
+    interval: str
+    bucket_seconds: int  # interval length, times the downsampling factor
+    items: list[CandleOut]  # oldest first; buckets without trades are absent
+
+
+# ---------------------------------------------------------------------------
+# Ticker (YES prices; NO = 100 - p with bid and ask swapped)
+# ---------------------------------------------------------------------------
+
+
+class TickerItem(BaseModel):
+    market_id: str
+    best_bid_cents: int | None
+    best_bid_quantity: int
+    best_ask_cents: int | None
+    best_ask_quantity: int
+    last_trade_price_cents: int | None
+    last_trade_at: str | None
+    volume_24h: int
+    trades_24h: int
+    high_24h_cents: int | None
+    low_24h_cents: int | None
+
+
+class TickerResponse(BaseModel):
+    items: list[TickerItem]
+    updated_at: str
+
+
 # ---------------------------------------------------------------------------
 # Market list item (lightweight — no pnl_pool, no max_order_* risk params)
 # ---------------------------------------------------------------------------
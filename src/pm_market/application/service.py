@@ -2,26 +2,65 @@
 
 All methods are read-only; no commit/rollback needed.
 The caller (router) passes db session; service delegates to repository.
+With a MarketReadCache, market rows, list pages and order books are served
+through it (see read_cache.py).
 """
 
+import math
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.pm_common.errors import MarketNotActiveError, MarketNotFoundError
+from src.pm_market.application.candles import INTERVALS, downsample
+from src.pm_market.application.read_cache import MarketReadCache
 from src.pm_market.application.schemas import (
+    CandleOut,
+    CandlesResponse,
     MarketDetail,
     MarketListItem,
     MarketListResponse,
     OrderbookResponse,
+    RecentTradeOut,
+    RecentTradesResponse,
     cursor_decode,
     cursor_encode,
 )
+from src.pm_market.domain.models import Candle, Market, OrderbookSnapshot, PriceLevel
 from src.pm_market.domain.repository import MarketRepositoryProtocol
 from src.pm_market.infrastructure.persistence import MarketRepository
+from src.pm_matching.domain.models import TapeTrade
+
+VersionedBookSource = Callable[
+    [str, int], Awaitable[tuple[int, list[tuple[int, int]], list[tuple[int, int]]]]
+]
+# VersionedBookSource(market_id, depth) -> (seq, bids, asks), e.g. MatchingEngine.book_snapshot
+TradeTapeSource = Callable[[str, int], list[TapeTrade] | None]
+# TradeTapeSource(market_id, limit) -> newest trades first, None if the market has no tape;
+# e.g. MatchingEngine.recent_trades
+CandleSource = Callable[
+    [AsyncSession, str, str, datetime | None, datetime | None, int], Awaitable[list[Candle]]
+]
+# CandleSource(db, market_id, interval, start, end, limit) -> oldest first,
+# e.g. CandleAggregator.candles
 
 
 class MarketApplicationService:
-    def __init__(self, repo: MarketRepositoryProtocol | None = None) -> None:
+    def __init__(
+        self, repo: MarketRepositoryProtocol | None = None, cache: MarketReadCache | None = None
+    ) -> None:
         self._repo: MarketRepositoryProtocol = repo or MarketRepository()
+        self._cache = cache
+
+    async def _market(self, db: AsyncSession, market_id: str) -> Market | None:
+        if self._cache is None:
+            return await self._repo.get_market_by_id(db, market_id)
+        return await self._cache.get(
+            self._cache.markets,
+            self._cache.market_key(market_id),
+            lambda: self._repo.get_market_by_id(db, market_id),
+        )
 
     async def list_markets(
         self,
@@ -33,6 +72,22 @@ class MarketApplicationService:
     ) -> MarketListResponse:
         # status=None → default ACTIVE; status='ALL' → no filter
         sql_status = None if status == "ALL" else (status or "ACTIVE")
+        if self._cache is None:
+            return await self._list_markets(db, sql_status, category, cursor, limit)
+        return await self._cache.get(
+            self._cache.lists,
+            self._cache.list_key(sql_status, category, cursor, limit),
+            lambda: self._list_markets(db, sql_status, category, cursor, limit),
+        )
+
+    async def _list_markets(
+        self,
+        db: AsyncSession,
+        sql_status: str | None,
+        category: str | None,
+        cursor: str | None,
+        limit: int,
+    ) -> MarketListResponse:
         cursor_ts, cursor_id = cursor_decode(cursor)
 
         # Fetch limit+1 to detect has_more without COUNT(*)
@@ -47,18 +102,109 @@ class MarketApplicationService:
         return MarketListResponse(items=items, next_cursor=next_cursor, has_more=has_more)
 
     async def get_market(self, db: AsyncSession, market_id: str) -> MarketDetail:
-        market = await self._repo.get_market_by_id(db, market_id)
+        market = await self._market(db, market_id)
         if market is None:
             raise MarketNotFoundError(market_id)
         return MarketDetail.from_domain(market)
 
     async def get_orderbook(
-        self, db: AsyncSession, market_id: str, levels: int
+        self,
+        db: AsyncSession,
+        market_id: str,
+        levels: int,
+        book: VersionedBookSource | None = None,
+        tape: TradeTapeSource | None = None,
+    ) -> OrderbookResponse:
+        """Snapshot from ``book`` (in-memory, with seq) if given, else aggregated in DB.
+
+        The last trade price comes from ``tape`` when it holds the market.
+        """
+        if self._cache is None:
+            return await self._orderbook(db, market_id, levels, book, tape)
+        return await self._cache.get(
+            self._cache.books,
+            self._cache.book_key(market_id, levels),
+            lambda: self._orderbook(db, market_id, levels, book, tape),
+        )
+
+    async def _orderbook(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        levels: int,
+        book: VersionedBookSource | None,
+        tape: TradeTapeSource | None,
     ) -> OrderbookResponse:
-        market = await self._repo.get_market_by_id(db, market_id)
+        market = await self._market(db, market_id)
         if market is None:
             raise MarketNotFoundError(market_id)
         if market.status != "ACTIVE":
             raise MarketNotActiveError(market_id)
-        snapshot = await self._repo.get_orderbook_snapshot(db, market_id, levels)
+        if book is None:
+            snapshot = await self._repo.get_orderbook_snapshot(db, market_id, levels)
+        else:
+            seq, bids, asks = await book(market_id, levels)
+            recent = tape(market_id, 1) if tape is not None else None
+            if recent is None:
+                last_price = await self._repo.get_last_trade_price(db, market_id)
+            else:
+                last_price = recent[0].price if recent else None
+            snapshot = OrderbookSnapshot(
+                market_id=market_id,
+                yes_bids=[PriceLevel(p, q) for p, q in bids],
+                yes_asks=[PriceLevel(p, q) for p, q in asks],
+                last_trade_price_cents=last_price,
+                updated_at=datetime.now(UTC),
+                seq=seq,
+            )
         return OrderbookResponse.from_snapshot(snapshot)
+
+    async def get_recent_trades(
+        self, db: AsyncSession, market_id: str, limit: int, tape: TradeTapeSource
+    ) -> RecentTradesResponse:
+        """Newest trades from the in-memory tape; never reads the trades table.
+
+        A market without a tape (not ACTIVE when the tapes were loaded, no
+        trades since) lists nothing once it is known to exist.
+        """
+        trades = tape(market_id, limit)
+        if trades is None:
+            if await self._market(db, market_id) is None:
+                raise MarketNotFoundError(market_id)
+            trades = []
+        return RecentTradesResponse(
+            market_id=market_id, items=[RecentTradeOut.from_tape(t) for t in trades]
+        )
+
+    async def get_candles(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        interval: str,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int,
+        points: int | None,
+        candles: CandleSource,
+    ) -> CandlesResponse:
+        """The newest ``limit`` candles in [start, end), oldest first.
+
+        With ``points``, candles spanning more intervals than that are merged
+        into wider buckets.
+        """
+        items = await candles(db, market_id, interval, start, end, limit)
+        if not items and await self._market(db, market_id) is None:
+            raise MarketNotFoundError(market_id)
+        seconds = INTERVALS[interval]
+        if points is not None and items:
+            span = (items[-1].start - items[0].start).total_seconds() // seconds + 1
+            factor = math.ceil(span / points)
+            if factor > 1:
+                seconds *= factor
+                items = downsample(items, seconds)
+        return CandlesResponse(
+            market_id=market_id,
+            interval=interval,
+            bucket_seconds=seconds,
+            items=[CandleOut.from_domain(c) for c in items],
+        )
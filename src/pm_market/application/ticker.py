@@ -0,0 +1,160 @@
+"""MarketTicker — top of book, last trade and rolling 24h stats for every active market.
+
+Registered as a MatchingEngine listener: each committed trade is folded into
+its market's time buckets in O(1). GET /markets/ticker serves one
+pre-serialized body, rebuilt at most every ``refresh_ms`` from those
+buckets, the engine's committed top of book (MatchingEngine.book_top) and
+the list of ACTIVE markets. That list is the only DB read, so the request
+rate never reaches the trades table or the matching path. Concurrent
+requests that find the body stale wait for a single rebuild.
+
+Buckets are seeded from ``trades`` once at startup (warm_up). Top of book
+is null for a market whose book is not loaded; after the engine's warm-up
+that means it has no resting orders.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from src.pm_common.metrics import REGISTRY
+from src.pm_market.application.schemas import TickerItem, TickerResponse
+from src.pm_market.domain.repository import MarketRepositoryProtocol
+from src.pm_market.infrastructure.persistence import MarketRepository
+from src.pm_matching.domain.models import CommandOutcome
+
+ActiveMarketsSource = Callable[[], Awaitable[list[str]]]
+# ActiveMarketsSource() -> ids of ACTIVE markets, e.g. MarketRepository.list_active_market_ids
+TopOfBookSource = Callable[[str], tuple[int, int, int, int] | None]
+# TopOfBookSource(market_id) -> (bid, qty, ask, qty) or None, e.g. MatchingEngine.book_top
+
+_REBUILDS = REGISTRY.counter("pm_market_ticker_rebuilds_total", "Ticker body rebuilds")
+
+_WINDOW_SECONDS = 24 * 3600
+_BUCKET_SECONDS = 60
+
+
+class _MarketStats:
+    def __init__(self) -> None:
+        self.last_price: int | None = None
+        self.last_trade_at: datetime | None = None
+        self.buckets: deque[list[int]] = deque()
+        # buckets = [start, trades, volume, high, low], oldest first
+
+    def add(self, start: int, trades: int, volume: int, high: int, low: int) -> None:
+        last = self.buckets[-1] if self.buckets else None
+        if last is None or last[0] < start:
+            self.buckets.append([start, trades, volume, high, low])
+            return
+        last[1] += trades  # same bucket (or a clock step back): fold into the newest
+        last[2] += volume
+        last[3] = max(last[3], high)
+        last[4] = min(last[4], low)
+
+    def window(self, cutoff: int) -> tuple[int, int, int | None, int | None]:
+        """(trades, volume, high, low) over buckets starting at or after ``cutoff``."""
+        while self.buckets and self.buckets[0][0] < cutoff:
+            self.buckets.popleft()
+        if not self.buckets:
+            return 0, 0, None, None
+        return (
+            sum(b[1] for b in self.buckets),
+            sum(b[2] for b in self.buckets),
+            max(b[3] for b in self.buckets),
+            min(b[4] for b in self.buckets),
+        )
+
+
+class MarketTicker:
+    def __init__(
+        self,
+        refresh_ms: int = 500,
+        repo: MarketRepositoryProtocol | None = None,
+        window_seconds: int = _WINDOW_SECONDS,
+        bucket_seconds: int = _BUCKET_SECONDS,
+    ) -> None:
+        self._refresh = refresh_ms / 1000
+        self._repo: MarketRepositoryProtocol = repo or MarketRepository()
+        self._window = window_seconds
+        self._bucket = bucket_seconds
+        self._stats: dict[str, _MarketStats] = {}
+        self._body: bytes | None = None
+        self._built_at = 0.0
+        self._rebuild_lock = asyncio.Lock()
+
+    def on_outcome(self, outcome: CommandOutcome) -> None:
+        """Engine listener: fold the command's trades into its market's buckets."""
+        if outcome.trades:
+            stats = self._stats.setdefault(outcome.market_id, _MarketStats())
+            for row in outcome.trades:
+                self._add_trade(stats, row)
+
+    def _add_trade(self, stats: _MarketStats, row: dict[str, Any]) -> None:
+        executed_at: datetime = row["executed_at"]
+        start = int(executed_at.timestamp()) // self._bucket * self._bucket
+        stats.add(start, 1, row["quantity"], row["price"], row["price"])
+        stats.last_price = row["price"]
+        stats.last_trade_at = executed_at
+
+    async def warm_up(self, db: AsyncSession) -> None:
+        """Seed buckets and last trades from the trades table. Call once at startup."""
+        for bucket in await self._repo.get_trade_buckets(db, self._window, self._bucket):
+            self._stats.setdefault(bucket.market_id, _MarketStats()).add(
+                bucket.start, bucket.trades, bucket.volume, bucket.high_cents, bucket.low_cents
+            )
+        for market_id, (price, executed_at) in (await self._repo.get_last_trades(db)).items():
+            stats = self._stats.setdefault(market_id, _MarketStats())
+            stats.last_price = price
+            stats.last_trade_at = executed_at
+
+    async def body(self, markets: ActiveMarketsSource, top: TopOfBookSource) -> bytes:
+        """JSON of a TickerResponse, at most ``refresh_ms`` old."""
+        if self._body is None or time.monotonic() - self._built_at >= self._refresh:
+            async with self._rebuild_lock:
+                if self._body is None or time.monotonic() - self._built_at >= self._refresh:
+                    market_ids = await markets()
+                    self._body = self._build(market_ids, top)
+                    self._built_at = time.monotonic()
+                    _REBUILDS.labels().inc()
+        return self._body
+
+    def _build(self, market_ids: list[str], top: TopOfBookSource) -> bytes:
+        now = datetime.now(UTC)
+        cutoff = int(now.timestamp()) - self._window
+        items: list[TickerItem] = []
+        for market_id in market_ids:
+            bid, bid_qty, ask, ask_qty = top(market_id) or (0, 0, 100, 0)
+            stats = self._stats.get(market_id) or _MarketStats()
+            trades, volume, high, low = stats.window(cutoff)
+            items.append(
+                TickerItem(
+                    market_id=market_id,
+                    best_bid_cents=bid or None,
+                    best_bid_quantity=bid_qty,
+                    best_ask_cents=ask if ask < 100 else None,
+                    best_ask_quantity=ask_qty,
+                    last_trade_price_cents=stats.last_price,
+                    last_trade_at=stats.last_trade_at.isoformat() if stats.last_trade_at else None,
+                    volume_24h=volume,
+                    trades_24h=trades,
+                    high_24h_cents=high,
+                    low_24h_cents=low,
+                )
+            )
+        return TickerResponse(items=items, updated_at=now.isoformat()).model_dump_json().encode()
+
+
+_ticker: MarketTicker | None = None
+
+
+def get_market_ticker() -> MarketTicker:
+    global _ticker  # noqa: PLW0603
+    if _ticker is None:
+        _ticker = MarketTicker(settings.MARKET_TICKER_REFRESH_MS)
+    return _ticker
@@ -49,3 +49,31 @@ class OrderbookSnapshot:
     yes_asks: list[PriceLevel]       # ascending by price
     last_trade_price_cents: int | None
     updated_at: datetime
+    seq: int | None = None           # engine book sequence number; None if read from DB
+
+
+@dataclass
+class TradeBucket:
+    """Trades of one market within one time bucket."""
+
+    market_id: str
+    start: int                       # bucket start, epoch seconds
+    trades: int
+    volume: int                      # contracts
+    high_cents: int
+    low_cents: int
+
+
+@dataclass
+class Candle:
+    """OHLCV of one market over one time bucket (YES prices)."""
+
+    market_id: str
+    interval: str                    # 1m | 5m | 1h | 1d
+    start: datetime                  # bucket start, UTC
+    open_cents: int
+    high_cents: int
+    low_cents: int
+    close_cents: int
+    volume: int                      # contracts
+    trades: int
@@ -5,11 +5,13 @@ Unit tests inject a mock that conforms to this Protocol.
 Infrastructure layer provides the real implementation.
 """
 
+from datetime import datetime
 from typing import Protocol
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.pm_market.domain.models import Market, OrderbookSnapshot
+from src.pm_market.domain.models import Candle, Market, OrderbookSnapshot, TradeBucket
+from src.pm_matching.domain.models import TapeTrade
 
 
 class MarketRepositoryProtocol(Protocol):
@@ -35,3 +37,51 @@ class MarketRepositoryProtocol(Protocol):
         market_id: str,
         levels: int,
     ) -> OrderbookSnapshot: ...
+
+    async def get_last_trade_price(
+        self,
+        db: AsyncSession,
+        market_id: str,
+    ) -> int | None: ...
+
+    async def list_active_market_ids(self, db: AsyncSession) -> list[str]: ...
+
+    async def get_trade_buckets(
+        self,
+        db: AsyncSession,
+        window_seconds: int,
+        bucket_seconds: int,
+    ) -> list[TradeBucket]: ...
+
+    async def get_last_trades(
+        self,
+        db: AsyncSession,
+    ) -> dict[str, tuple[int, datetime]]: ...
+
+    async def list_market_ids(self, db: AsyncSession) -> list[str]: ...
+
+    async def save_candles(
+        self,
+        db: AsyncSession,
+        candles: list[Candle],
+        replace: bool = False,
+    ) -> None: ...
+
+    async def list_candles(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        interval: str,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int,
+    ) -> list[Candle]: ...
+
+    async def list_trades_after(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        after: tuple[datetime, str] | None,
+        before: datetime,
+        limit: int,
+    ) -> list[TapeTrade]: ...
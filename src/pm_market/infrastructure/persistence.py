@@ -4,12 +4,20 @@ All queries use raw text() SQL (no ORM).
 asyncpg NULL parameter pattern: CAST(:param AS TYPE) IS NULL required for None values.
 """
 
+from dataclasses import asdict
 from datetime import UTC, datetime
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.pm_market.domain.models import Market, OrderbookSnapshot, PriceLevel
+from src.pm_market.domain.models import (
+    Candle,
+    Market,
+    OrderbookSnapshot,
+    PriceLevel,
+    TradeBucket,
+)
+from src.pm_matching.domain.models import TapeTrade
 
 # ---------------------------------------------------------------------------
 # SQL
@@ -73,6 +81,103 @@ _LAST_TRADE_SQL = text("""
     LIMIT 1
 """)
 
+_ACTIVE_MARKET_IDS_SQL = text("""
+    SELECT id FROM markets WHERE status = 'ACTIVE' ORDER BY id
+""")
+
+_TRADE_BUCKETS_SQL = text("""
+    SELECT market_id,
+           CAST(FLOOR(EXTRACT(EPOCH FROM executed_at) / :bucket) AS BIGINT) * :bucket
+               AS bucket_start,
+           COUNT(*) AS trades, SUM(quantity) AS volume,
+           MAX(price) AS high, MIN(price) AS low
+    FROM trades
+    WHERE executed_at >= NOW() - make_interval(secs => :window)
+    GROUP BY market_id, bucket_start
+    ORDER BY market_id, bucket_start
+""")
+
+# One index probe per active market on idx_trades_market_time
+_LAST_TRADES_SQL = text("""
+    SELECT m.id AS market_id, t.price, t.executed_at
+    FROM markets m
+    CROSS JOIN LATERAL (
+        SELECT price, executed_at
+        FROM trades
+        WHERE market_id = m.id
+        ORDER BY executed_at DESC, id DESC
+        LIMIT 1
+    ) t
+    WHERE m.status = 'ACTIVE'
+""")
+
+_ALL_MARKET_IDS_SQL = text("""
+    SELECT id FROM markets ORDER BY id
+""")
+
+# Live deltas: each trade is saved exactly once, so rows add up
+_MERGE_CANDLE_SQL = text("""
+    INSERT INTO market_candles (
+        market_id, interval, bucket_start,
+        open_price, high_price, low_price, close_price, volume, trade_count
+    ) VALUES (
+        :market_id, :interval, :start,
+        :open_cents, :high_cents, :low_cents, :close_cents, :volume, :trades
+    )
+    ON CONFLICT (market_id, interval, bucket_start) DO UPDATE SET
+        high_price  = GREATEST(market_candles.high_price, EXCLUDED.high_price),
+        low_price   = LEAST(market_candles.low_price, EXCLUDED.low_price),
+        close_price = EXCLUDED.close_price,
+        volume      = market_candles.volume + EXCLUDED.volume,
+        trade_count = market_candles.trade_count + EXCLUDED.trade_count,
+        updated_at  = NOW()
+""")
+
+# Backfill: complete buckets recomputed from trades
+_REPLACE_CANDLE_SQL = text("""
+    INSERT INTO market_candles (
+        market_id, interval, bucket_start,
+        open_price, high_price, low_price, close_price, volume, trade_count
+    ) VALUES (
+        :market_id, :interval, :start,
+        :open_cents, :high_cents, :low_cents, :close_cents, :volume, :trades
+    )
+    ON CONFLICT (market_id, interval, bucket_start) DO UPDATE SET
+        open_price  = EXCLUDED.open_price,
+        high_price  = EXCLUDED.high_price,
+        low_price   = EXCLUDED.low_price,
+        close_price = EXCLUDED.close_price,
+        volume      = EXCLUDED.volume,
+        trade_count = EXCLUDED.trade_count,
+        updated_at  = NOW()
+""")
+
+_LIST_CANDLES_SQL = text("""
+    SELECT market_id, interval, bucket_start,
+           open_price, high_price, low_price, close_price, volume, trade_count
+    FROM market_candles
+    WHERE market_id = :market_id
+      AND interval = :interval
+      AND (CAST(:start AS TIMESTAMPTZ) IS NULL OR bucket_start >= CAST(:start AS TIMESTAMPTZ))
+      AND (CAST(:end AS TIMESTAMPTZ) IS NULL OR bucket_start < CAST(:end AS TIMESTAMPTZ))
+    ORDER BY bucket_start DESC
+    LIMIT :limit
+""")
+
+# Keyset over idx_trades_market_time; trade_id breaks executed_at ties
+_TRADES_AFTER_SQL = text("""
+    SELECT trade_id, price, quantity, scenario, buy_order_id, taker_order_id, executed_at
+    FROM trades
+    WHERE market_id = :market_id
+      AND executed_at < :before
+      AND (
+          CAST(:after_ts AS TIMESTAMPTZ) IS NULL
+          OR (executed_at, trade_id) > (CAST(:after_ts AS TIMESTAMPTZ), CAST(:after_id AS TEXT))
+      )
+    ORDER BY executed_at, trade_id
+    LIMIT :limit
+""")
+
 # ---------------------------------------------------------------------------
 # Row mappers
 # ---------------------------------------------------------------------------
@@ -176,11 +281,7 @@ class MarketRepository:
         asks = asks[:levels]
 
         # Step 2: last trade price
-        trade_result = await db.execute(
-            _LAST_TRADE_SQL, {"market_id": market_id}
-        )
-        trade_row = trade_result.fetchone()
-        last_price = trade_row.price if trade_row else None
+        last_price = await self.get_last_trade_price(db, market_id)
 
         return OrderbookSnapshot(
             market_id=market_id,
@@ -189,3 +290,114 @@ class MarketRepository:
             last_trade_price_cents=last_price,
             updated_at=datetime.now(UTC),
         )
+
+    async def get_last_trade_price(
+        self, db: AsyncSession, market_id: str
+    ) -> int | None:
+        trade_result = await db.execute(
+            _LAST_TRADE_SQL, {"market_id": market_id}
+        )
+        trade_row = trade_result.fetchone()
+        return trade_row.price if trade_row else None
+
+    async def list_active_market_ids(self, db: AsyncSession) -> list[str]:
+        result = await db.execute(_ACTIVE_MARKET_IDS_SQL)
+        return [row.id for row in result.fetchall()]
+
+    async def get_trade_buckets(
+        self, db: AsyncSession, window_seconds: int, bucket_seconds: int
+    ) -> list[TradeBucket]:
+        result = await db.execute(
+            _TRADE_BUCKETS_SQL, {"window": window_seconds, "bucket": bucket_seconds}
+        )
+        return [
+            TradeBucket(
+                market_id=row.market_id,
+                start=row.bucket_start,
+                trades=row.trades,
+                volume=row.volume,
+                high_cents=row.high,
+                low_cents=row.low,
+            )
+            for row in result.fetchall()
+        ]
+
+    async def get_last_trades(self, db: AsyncSession) -> dict[str, tuple[int, datetime]]:
+        result = await db.execute(_LAST_TRADES_SQL)
+        return {row.market_id: (row.price, row.executed_at) for row in result.fetchall()}
+
+    async def list_market_ids(self, db: AsyncSession) -> list[str]:
+        result = await db.execute(_ALL_MARKET_IDS_SQL)
+        return [row.id for row in result.fetchall()]
+
+    async def save_candles(
+        self, db: AsyncSession, candles: list[Candle], replace: bool = False
+    ) -> None:
+        if candles:
+            sql = _REPLACE_CANDLE_SQL if replace else _MERGE_CANDLE_SQL
+            await db.execute(sql, [asdict(c) for c in candles])
+
+    async def list_candles(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        interval: str,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int,
+    ) -> list[Candle]:
+        result = await db.execute(
+            _LIST_CANDLES_SQL,
+            {
+                "market_id": market_id,
+                "interval": interval,
+                "start": start,
+                "end": end,
+                "limit": limit,
+            },
+        )
+        return [
+            Candle(
+                market_id=row.market_id,
+                interval=row.interval,
+                start=row.bucket_start,
+                open_cents=row.open_price,
+                high_cents=row.high_price,
+                low_cents=row.low_price,
+                close_cents=row.close_price,
+                volume=row.volume,
+                trades=row.trade_count,
+            )
+            for row in reversed(result.fetchall())
+        ]
+
+    async def list_trades_after(
+        self,
+        db: AsyncSession,
+        market_id: str,
+        after: tuple[datetime, str] | None,
+        before: datetime,
+        limit: int,
+    ) -> list[TapeTrade]:
+        after_ts, after_id = after if after is not None else (None, None)
+        result = await db.execute(
+            _TRADES_AFTER_SQL,
+            {
+                "market_id": market_id,
+                "before": before,
+                "after_ts": after_ts,
+                "after_id": after_id,
+                "limit": limit,
+            },
+        )
+        return [
+            TapeTrade(
+                trade_id=row.trade_id,
+                price=row.price,
+                quantity=row.quantity,
+                scenario=row.scenario,
+                taker_side="BUY" if row.taker_order_id == row.buy_order_id else "SELL",
+                executed_at=row.executed_at,
+            )
+            for row in result.fetchall()
+        ]
@@ -0,0 +1,420 @@
+"""JournaledEngine — event-sourced matching core (JOURNAL_MODE_ENABLED).
+
+Balances, positions, markets, orders and books are authoritative in a
+MemoryClearingStore driven by the real MatchingEngine. Every state-changing
+command (place, cancel, amend, deposit, withdraw, market load) is:
+
+    1. applied in memory under one lock, so execution order == journal order
+    2. appended to the CommandJournal and its ChangeSet queued for the projector
+    3. acknowledged, and published to engine listeners, once its journal
+       line is fsynced (group commit)
+
+Commands that raise are rolled back in memory and never journaled. The
+projector writes durable change sets to Postgres asynchronously, so today's
+tables keep serving queries a few milliseconds behind.
+
+Recovery loads the last checkpoint (or, without one, the projected tables),
+re-queues its unprojected change sets and replays the journal after it.
+Replayed commands already projected (seq <= journal_projection.last_seq)
+only rebuild memory.
+
+The journaled engine owns every balance, so endpoints that move funds or
+shares outside these commands (AMM mint/burn/replace/batch-cancel, market
+resolution) are refused with JournalModeError while the mode is enabled.
+If the projector halts on an error that retrying cannot fix, commands are
+refused with ProjectionHaltedError until it is repaired and restarted.
+"""
+
+import asyncio
+import dataclasses
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.errors import (
+    InsufficientBalanceError,
+    JournalModeError,
+    ProjectionHaltedError,
+)
+from src.pm_common.metrics import REGISTRY
+from src.pm_matching.domain.models import CommandOutcome, TradeResult
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_matching.infrastructure.journal import CommandJournal
+from src.pm_matching.infrastructure.projector import JournalProjector
+from src.pm_order.application.idempotency import get_client_order_filter
+from src.pm_order.domain.models import Order
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+
+logger = logging.getLogger(__name__)
+
+_NO_DB: Any = None  # the memory store and repository never touch a session
+
+_COMMAND_MS = REGISTRY.histogram(
+    "pm_journal_command_ms", "Journaled command latency including fsync", ("command",)
+)
+
+
+def _order_args(order: Order) -> dict[str, Any]:
+    assert order.created_at is not None
+    return {
+        "id": order.id,
+        "client_order_id": order.client_order_id,
+        "market_id": order.market_id,
+        "user_id": order.user_id,
+        "side": order.original_side,
+        "direction": order.original_direction,
+        "price": order.original_price,
+        "quantity": order.quantity,
+        "time_in_force": order.time_in_force,
+        "created_at": order.created_at.isoformat(),
+    }
+
+
+def _order_from_args(args: dict[str, Any]) -> Order:
+    created_at = datetime.fromisoformat(args["created_at"])
+    return Order(
+        id=args["id"],
+        client_order_id=args["client_order_id"],
+        market_id=args["market_id"],
+        user_id=args["user_id"],
+        original_side=args["side"],
+        original_direction=args["direction"],
+        original_price=args["price"],
+        book_type="",
+        book_direction="",
+        book_price=0,
+        quantity=args["quantity"],
+        time_in_force=args["time_in_force"],
+        status="OPEN",
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+class JournaledEngine:
+    def __init__(
+        self,
+        journal: CommandJournal,
+        projector: JournalProjector,
+        checkpoint_every: int,
+        outbox: bool = False,
+        delta_ring: int = 256,
+        tape_size: int = 100,
+    ) -> None:
+        self.store = MemoryClearingStore()
+        self.repo = MemoryOrderRepository(self.store)
+        self.engine = MatchingEngine(
+            store=self.store,
+            outbox=outbox,
+            delta_ring=delta_ring,
+            tape_size=tape_size,
+            defer_publish=True,
+        )
+        self._journal = journal
+        self._projector = projector
+        self._checkpoint_every = checkpoint_every
+        self._since_checkpoint = 0
+        self._lock = asyncio.Lock()
+        # (seq, engine outcomes) of journaled commands awaiting their fsync, oldest first
+        self._unpublished: deque[tuple[int, list[CommandOutcome]]] = deque()
+        self._projector_task: asyncio.Task[None] | None = None
+        self._checkpoint_task: asyncio.Task[None] | None = None
+        self._handlers: dict[str, Callable[[dict[str, Any]], Awaitable[Any]]] = {
+            "place": self._apply_place,
+            "cancel": self._apply_cancel,
+            "amend": self._apply_amend,
+            "deposit": self._apply_deposit,
+            "withdraw": self._apply_withdraw,
+            "market": self._apply_market,
+        }
+
+    @property
+    def projection_lag(self) -> int:
+        """Journaled commands not yet applied to Postgres."""
+        return self._journal.last_seq - self._projector.projected_seq
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self, db: AsyncSession) -> None:
+        await self.recover(db)
+        await self._journal.start()
+        self._projector_task = asyncio.create_task(
+            self._projector.run(lambda: self._journal.durable_seq)
+        )
+
+    async def stop(self) -> None:
+        if self._projector_task is not None:
+            self._projector_task.cancel()
+            self._projector_task = None
+        if self._checkpoint_task is not None:
+            await self._checkpoint_task
+        await self.checkpoint()
+        if self._projector.halted is None:
+            try:
+                await self._projector.project(self._journal.durable_seq)
+            except Exception:
+                logger.exception("Final projection failed; it will be redone from the checkpoint")
+        await self._journal.close()
+
+    async def recover(self, db: AsyncSession) -> None:
+        projected = await self._projector.load_last_seq(db)
+        seq, state = self._journal.load_checkpoint()
+        if state is None:
+            await self._projector.load_state(self.store, db)
+            seq = projected
+        else:
+            self._restore(state)
+            for pending_seq, changes in state["pending"]:
+                if pending_seq > projected:
+                    self._projector.enqueue(pending_seq, changes)
+        self.store.take_changes()  # loaded rows are already in Postgres
+
+        replayed = 0
+        for entry_seq, cmd, args in self._journal.replay(seq):
+            try:
+                await self._handlers[cmd](args)
+            except Exception as exc:
+                raise RuntimeError(f"Journal replay diverged at seq {entry_seq} ({cmd})") from exc
+            for outcome in self.engine.take_sealed():
+                self.engine.publish(outcome)  # replayed commands are durable
+            changes = self.store.take_changes()
+            if entry_seq > projected:
+                self._projector.enqueue(entry_seq, changes)
+            replayed += 1
+        # Never hand out a seq the projection already claims, even with a wiped journal
+        self._journal.last_seq = max(self._journal.last_seq, projected)
+
+        for market_id in {o.market_id for o in self.store.orders.values() if o.is_active}:
+            await self.engine.rebuild_orderbook(market_id, self.repo, db)
+        logger.info(
+            "Journaled engine recovered: checkpoint seq=%d, replayed=%d, projected=%d",
+            seq,
+            replayed,
+            projected,
+        )
+
+    # -- commands ----------------------------------------------------------
+
+    async def place_order(
+        self, order: Order, db: AsyncSession
+    ) -> tuple[Order, list[TradeResult], int]:
+        await self._ensure_market(order.market_id, db)
+        result, seq, start = await self._apply("place", _order_args(order))
+        placed: Order = result[0]
+        # Before the fsync wait, so a retry arriving meanwhile is not "definitely new"
+        get_client_order_filter().add(placed.user_id, placed.client_order_id, placed.id)
+        await self._complete("place", seq, start)
+        return result  # type: ignore[no-any-return]
+
+    async def cancel_order(self, order_id: str, user_id: str) -> Order:
+        order, _ = await self._execute("cancel", {"order_id": order_id, "user_id": user_id})
+        return order  # type: ignore[no-any-return]
+
+    async def amend_order(
+        self, order_id: str, quantity: int, user_id: str
+    ) -> tuple[Order, int]:
+        result, _ = await self._execute(
+            "amend", {"order_id": order_id, "quantity": quantity, "user_id": user_id}
+        )
+        return result  # type: ignore[no-any-return]
+
+    async def deposit(self, user_id: str, amount: int) -> tuple[int, int]:
+        """Returns (available balance, journal seq of the deposit)."""
+        return await self._execute("deposit", {"user_id": user_id, "amount": amount})
+
+    async def withdraw(self, user_id: str, amount: int) -> tuple[int, int]:
+        """Returns (available balance, journal seq of the withdrawal)."""
+        return await self._execute("withdraw", {"user_id": user_id, "amount": amount})
+
+    async def _execute(self, cmd: str, args: dict[str, Any]) -> tuple[Any, int]:
+        """Apply, journal and await durability of one command; returns (result, seq)."""
+        result, seq, start = await self._apply(cmd, args)
+        await self._complete(cmd, seq, start)
+        return result, seq
+
+    async def _apply(self, cmd: str, args: dict[str, Any]) -> tuple[Any, int, float]:
+        """Apply and journal one command; returns (result, seq, start time)."""
+        if self._projector.halted is not None:
+            raise ProjectionHaltedError()
+        start = asyncio.get_running_loop().time()
+        async with self._lock:
+            result = await self._handlers[cmd](args)
+            outcomes = self.engine.take_sealed()
+            seq = self._journal.append(cmd, args)
+            self._projector.enqueue(seq, self.store.take_changes())
+            if outcomes:
+                self._unpublished.append((seq, outcomes))
+        return result, seq, start
+
+    async def _complete(self, cmd: str, seq: int, start: float) -> None:
+        """Wait until command ``seq`` is durable and publish it; start a checkpoint when due."""
+        await self._journal.wait_durable(seq)
+        self._publish_durable()
+        _COMMAND_MS.labels(cmd).observe((asyncio.get_running_loop().time() - start) * 1000)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self._checkpoint_every and self._checkpoint_task is None:
+            self._checkpoint_task = asyncio.create_task(self._background_checkpoint())
+
+    def _publish_durable(self) -> None:
+        """Publish engine outcomes of every durable command, in journal order."""
+        durable = self._journal.durable_seq
+        while self._unpublished and self._unpublished[0][0] <= durable:
+            for outcome in self._unpublished.popleft()[1]:
+                self.engine.publish(outcome)
+
+    async def _ensure_market(self, market_id: str, db: AsyncSession) -> None:
+        """Load a market into memory, or refresh its status, through a journaled command."""
+        known = self.store.markets.get(market_id)
+        if known is not None and known.status == "ACTIVE":
+            return
+        market = await self._projector.load_market(market_id, db)
+        if market is None:
+            return  # the engine reports the missing market
+        if known is None or known.status != market.status:
+            await self._execute("market", dataclasses.asdict(market))
+
+    async def _apply_place(self, args: dict[str, Any]) -> Any:
+        return await self.engine.place_order(_order_from_args(args), self.repo, _NO_DB)
+
+    async def _apply_cancel(self, args: dict[str, Any]) -> Any:
+        return await self.engine.cancel_order(args["order_id"], args["user_id"], self.repo, _NO_DB)
+
+    async def _apply_amend(self, args: dict[str, Any]) -> Any:
+        return await self.engine.amend_order(
+            args["order_id"], args["quantity"], args["user_id"], self.repo, _NO_DB
+        )
+
+    async def _apply_deposit(self, args: dict[str, Any]) -> int:
+        user_id: str = args["user_id"]
+        amount: int = args["amount"]
+        if user_id not in self.store.accounts:
+            self.store.touch(self.store.accounts, user_id)
+            self.store.open_account(user_id)
+        await self.store.credit_available(user_id, amount, _NO_DB)
+        available = self.store.accounts[user_id].available_balance
+        await self.store.insert_ledger(
+            user_id, "DEPOSIT", amount, available, "DEPOSIT", None, _NO_DB
+        )
+        return available
+
+    async def _apply_withdraw(self, args: dict[str, Any]) -> int:
+        user_id: str = args["user_id"]
+        amount: int = args["amount"]
+        account = self.store.accounts.get(user_id)
+        available = account.available_balance if account is not None else 0
+        if account is None or available < amount:
+            raise InsufficientBalanceError(amount, available)
+        await self.store.debit_available(user_id, amount, _NO_DB)
+        available -= amount
+        await self.store.insert_ledger(
+            user_id, "WITHDRAW", -amount, available, "WITHDRAW", None, _NO_DB
+        )
+        return available
+
+    async def _apply_market(self, args: dict[str, Any]) -> None:
+        market = self.store.markets.get(args["id"])
+        if market is None:
+            self.store.open_market(args["id"], args["taker_fee_bps"])
+            market = self.store.markets[args["id"]]
+            market.reserve_balance = args["reserve_balance"]
+            market.pnl_pool = args["pnl_pool"]
+            market.total_yes_shares = args["total_yes_shares"]
+            market.total_no_shares = args["total_no_shares"]
+        market.status = args["status"]
+        market.taker_fee_bps = args["taker_fee_bps"]
+
+    # -- checkpoints -------------------------------------------------------
+
+    async def _background_checkpoint(self) -> None:
+        try:
+            await self.checkpoint()
+        except Exception:
+            logger.exception("Journal checkpoint failed")
+        finally:
+            self._checkpoint_task = None
+
+    async def checkpoint(self) -> None:
+        """Snapshot memory state and unprojected change sets; prune covered segments."""
+        async with self._lock:
+            self._prune_terminal_orders()
+            seq = self._journal.last_seq
+            data = self._journal.encode_checkpoint(seq, self._snapshot())
+            self._since_checkpoint = 0
+        await self._journal.write_checkpoint(seq, data)
+        logger.info("Journal checkpoint written at seq=%d (%d bytes)", seq, len(data))
+
+    def _snapshot(self) -> dict[str, Any]:
+        return {
+            "accounts": self.store.accounts,
+            "positions": self.store.positions,
+            "markets": self.store.markets,
+            "orders": self.store.orders,
+            "client_order_ids": self.store.client_order_ids,
+            "book_seqs": self.store.book_seqs,
+            "pending": self._projector.pending,
+        }
+
+    def _restore(self, state: dict[str, Any]) -> None:
+        self.store.accounts.update(state["accounts"])
+        self.store.positions.update(state["positions"])
+        self.store.markets.update(state["markets"])
+        self.store.orders.update(state["orders"])
+        self.store.client_order_ids.update(state["client_order_ids"])
+        self.store.book_seqs.update(state.get("book_seqs", {}))
+
+    def _prune_terminal_orders(self) -> None:
+        """Drop finished orders whose final image has already reached Postgres."""
+        unprojected = {oid for _, changes in self._projector.pending for oid in changes.orders}
+        done = [
+            oid
+            for oid, o in self.store.orders.items()
+            if not o.is_active and oid not in unprojected
+        ]
+        for oid in done:
+            order = self.store.orders.pop(oid)
+            self.store.client_order_ids.pop((order.user_id, order.client_order_id), None)
+
+
+_journaled: JournaledEngine | None = None
+
+
+def get_journaled_engine() -> JournaledEngine:
+    global _journaled  # noqa: PLW0603
+    if _journaled is None:
+        _journaled = JournaledEngine(
+            CommandJournal(
+                settings.JOURNAL_DIR, settings.JOURNAL_GROUP_COMMIT_MS, settings.JOURNAL_MAX_BATCH
+            ),
+            JournalProjector(settings.JOURNAL_PROJECT_INTERVAL_MS),
+            settings.JOURNAL_CHECKPOINT_EVERY,
+            settings.OUTBOX_ENABLED,
+            settings.ORDERBOOK_DELTA_RING,
+            settings.TRADE_TAPE_SIZE,
+        )
+    return _journaled
+
+
+def require_sql_mode() -> None:
+    """Route dependency: refuse endpoints that bypass the journaled engine."""
+    if settings.JOURNAL_MODE_ENABLED:
+        raise JournalModeError()
+
+
+REGISTRY.callback(
+    "pm_journal_projection_lag",
+    "Journaled commands not yet projected to Postgres",
+    lambda: [((), _journaled.projection_lag)] if _journaled is not None else [],
+)
+REGISTRY.callback(
+    "pm_journal_projection_halted",
+    "1 while journal projection is halted on an error that retrying cannot fix",
+    lambda: [((), int(_journaled._projector.halted is not None))]
+    if _journaled is not None
+    else [],
+)
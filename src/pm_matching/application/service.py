@@ -1,4 +1,7 @@
 # src/pm_matching/application/service.py
+from config.settings import settings
+from src.pm_common.metrics import REGISTRY
+from src.pm_matching.application.journaled_engine import get_journaled_engine
 from src.pm_matching.engine.engine import MatchingEngine
 
 _engine: MatchingEngine | None = None
@@ -7,5 +10,20 @@ _engine: MatchingEngine | None = None
 def get_matching_engine() -> MatchingEngine:
     global _engine  # noqa: PLW0603
     if _engine is None:
-        _engine = MatchingEngine()
+        if settings.JOURNAL_MODE_ENABLED:
+            _engine = get_journaled_engine().engine  # books live in the journaled core
+        else:
+            _engine = MatchingEngine(
+                outbox=settings.OUTBOX_ENABLED,
+                delta_ring=settings.ORDERBOOK_DELTA_RING,
+                tape_size=settings.TRADE_TAPE_SIZE,
+            )
     return _engine
+
+
+REGISTRY.callback(
+    "pm_orderbook_orders",
+    "Resting orders per market and book side",
+    lambda: _engine.book_sizes() if _engine is not None else [],
+    ("market_id", "side"),
+)
@@ -1,5 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
+
+from src.pm_order.domain.models import Order
 
 
 @dataclass
@@ -29,3 +32,39 @@ class TradeResult:
     buy_original_price: int  # for Synthetic fee calc (NO price)
     maker_order_id: str
     taker_order_id: str
+
+
+@dataclass
+class CommandOutcome:
+    """What one successful engine command changed in a market; see add_listener()."""
+
+    market_id: str
+    seq: int = 0  # the market's book sequence number after the command
+    orders: list[Order] = field(default_factory=list)  # final state of every touched order
+    trades: list[dict[str, Any]] = field(default_factory=list)  # trades rows, oldest first
+    levels: dict[tuple[str, int], int] = field(default_factory=dict)
+    # levels[(book side, price)] = resting quantity after the command (0 = level gone)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    # outbox_events rows (see clearing outbox.py); only for add_listener(..., events=True)
+    top: tuple[int, int, int, int] | None = None  # OrderBook.top_of_book() after the command
+
+
+@dataclass
+class BookChanges:
+    """Book level changes over a range of sequence numbers; see OrderBook.changes_since()."""
+
+    seq: int  # newest seq included
+    levels: dict[tuple[str, int], int] = field(default_factory=dict)  # absolute, 0 = gone
+    last_trade_price: int | None = None  # None: no trades in the range
+
+
+@dataclass
+class TapeTrade:
+    """Public view of one trade in a market's recent-trade tape."""
+
+    trade_id: str
+    price: int  # YES price
+    quantity: int
+    scenario: str
+    taker_side: str  # YES book side of the aggressor: BUY / SELL
+    executed_at: datetime
@@ -1,7 +1,12 @@
 """MatchingEngine — stateful orchestrator for per-market order placement."""
 import asyncio
+import copy
+import itertools
 import logging
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
 from typing import Any
 
 from sqlalchemy import text
@@ -11,15 +16,25 @@ from src.pm_clearing.domain.fee import calc_fee, get_fee_trade_value
 from src.pm_clearing.domain.invariants import verify_invariants_after_trade
 from src.pm_clearing.domain.netting import execute_netting_if_needed
 from src.pm_clearing.domain.service import settle_trade
+from src.pm_clearing.domain.store import ClearingStore
 from src.pm_clearing.infrastructure.fee_collector import (
     collect_fee_from_frozen,
     collect_fee_from_proceeds,
 )
 from src.pm_clearing.infrastructure.ledger import write_ledger, write_wal_event
+from src.pm_clearing.infrastructure.outbox import outbox_rows
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 from src.pm_clearing.infrastructure.trades_writer import write_trade
 from src.pm_common.datetime_utils import utc_now
 from src.pm_common.errors import AppError
-from src.pm_matching.domain.models import TradeResult
+from src.pm_common.metrics import REGISTRY
+from src.pm_matching.domain.models import (
+    BookChanges,
+    BookOrder,
+    CommandOutcome,
+    TapeTrade,
+    TradeResult,
+)
 from src.pm_matching.engine.matching_algo import match_order
 from src.pm_matching.engine.order_book import OrderBook
 from src.pm_matching.engine.scenario import determine_scenario
@@ -33,24 +48,75 @@ from src.pm_risk.rules.price_range import check_price_range
 
 logger = logging.getLogger(__name__)
 
-_GET_MARKET_SQL = text("""
-    SELECT id, status, reserve_balance, pnl_pool,
-           total_yes_shares, total_no_shares,
-           taker_fee_bps
-    FROM markets WHERE id = :market_id FOR UPDATE
+_LOCK_WAIT_MS = REGISTRY.histogram(
+    "pm_engine_lock_wait_ms", "Time spent waiting for the per-market lock", ("market_id",)
+)
+_LOCK_HOLD_MS = REGISTRY.histogram(
+    "pm_engine_lock_hold_ms", "Time the per-market lock was held", ("market_id",)
+)
+_STAGE_MS = REGISTRY.histogram(
+    "pm_engine_stage_duration_ms", "Latency of each place-order stage", ("stage",)
+)
+_FILLS_PER_ORDER = REGISTRY.histogram(
+    "pm_engine_fills_per_order",
+    "Trades produced per placed order",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+_REBUILDS = REGISTRY.counter(
+    "pm_orderbook_rebuilds_total", "Order book rebuilds from the DB", ("market_id",)
+)
+_REBUILD_MS = REGISTRY.histogram(
+    "pm_orderbook_rebuild_duration_ms", "Order book rebuild latency", ("market_id",)
+)
+
+
+def _stage(name: str, start: float) -> float:
+    """Record the stage that began at ``start``; returns now as the next stage's start."""
+    now = time.perf_counter()
+    _STAGE_MS.labels(name).observe((now - start) * 1000)
+    return now
+
+_MARKETS_WITH_OPEN_ORDERS_SQL = text("""
+    SELECT DISTINCT market_id FROM orders WHERE status IN ('OPEN', 'PARTIALLY_FILLED')
+""")
+
+# Newest trades per ACTIVE market: one idx_trades_market_time probe each.
+# Markets without trades come back once with a NULL trade_id.
+_RECENT_TRADES_SQL = text("""
+    SELECT m.id AS market_id, t.id AS trade_id, t.price, t.quantity, t.scenario,
+           t.buy_order_id, t.taker_order_id, t.executed_at
+    FROM markets m
+    LEFT JOIN LATERAL (
+        SELECT id, price, quantity, scenario, buy_order_id, taker_order_id, executed_at
+        FROM trades
+        WHERE market_id = m.id
+        ORDER BY executed_at DESC, id DESC
+        LIMIT :limit
+    ) t ON TRUE
+    WHERE m.status = 'ACTIVE'
+    ORDER BY m.id, t.executed_at, t.id
 """)
 
-_UPDATE_MARKET_SQL = text("""
-    UPDATE markets
-    SET reserve_balance = :reserve_balance,
-        pnl_pool = :pnl_pool,
-        total_yes_shares = :total_yes_shares,
-        total_no_shares  = :total_no_shares,
-        updated_at = NOW()
-    WHERE id = :id
+_BATCH_CANCEL_BY_IDS_SQL = text("""
+    UPDATE orders SET status = 'CANCELLED', updated_at = NOW()
+    WHERE id = ANY(:ids) AND status IN ('OPEN', 'PARTIALLY_FILLED')
+    RETURNING id, frozen_amount, frozen_asset_type
 """)
 
 
+def _tape_trade(row: Mapping[Any, Any]) -> TapeTrade:
+    """TapeTrade from a trades row (as written by write_trade or read back)."""
+    taker_is_buyer = row["taker_order_id"] == row["buy_order_id"]
+    return TapeTrade(
+        trade_id=row["trade_id"],
+        price=row["price"],
+        quantity=row["quantity"],
+        scenario=row["scenario"],
+        taker_side="BUY" if taker_is_buyer else "SELL",
+        executed_at=row["executed_at"],
+    )
+
+
 class MarketState:
     """In-memory view of market row; mutated during clearing, flushed at end."""
 
@@ -65,66 +131,366 @@ class MarketState:
 
 
 class MatchingEngine:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        store: ClearingStore = sql_clearing_store,
+        outbox: bool = False,
+        delta_ring: int = 256,
+        tape_size: int = 100,
+        defer_publish: bool = False,
+    ) -> None:
+        self._store = store  # accounts/positions/markets/journals; see ClearingStore
+        self._outbox = outbox  # queue domain events per command; see clearing outbox.py
+        self._delta_ring = delta_ring  # level changes kept per book for book_changes()
+        self._tape_size = tape_size  # trades kept per market for recent_trades()
         self._orderbooks: dict[str, OrderBook] = {}
         self._market_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._open_orders: dict[str, Order] = {}
+        # _open_orders[order_id] = live handle of a resting order (mutated under market lock)
+        self._synced: set[str] = set()  # markets whose book was loaded from DB
+        self._evicted: set[str] = set()  # markets dropped after an error, not yet reloaded
+        self._warmed = False
+        self._listeners: list[Callable[[CommandOutcome], None]] = []
+        self._listener_events = False  # some listener wants CommandOutcome.events
+        self._outcomes: dict[str, CommandOutcome] = {}  # per market, current command only
+        self._last_seq: dict[str, int] = {}  # per market, last seq handed to a command
+        # defer_publish: committed outcomes wait in _sealed for the owner to publish()
+        self._defer_publish = defer_publish
+        self._sealed: list[CommandOutcome] = []
+        self._tapes: dict[str, deque[TapeTrade]] = {}  # committed trades, oldest first
+        self._tapes_loaded = False
+
+    def add_listener(
+        self, listener: Callable[[CommandOutcome], None], events: bool = False
+    ) -> None:
+        """Call ``listener`` with every command once it has committed, in seq order per market.
+
+        Commands commit through ClearingStore.commit() under the market lock
+        and are published right after, still under it. With defer_publish
+        (journal mode) the owner publishes them once they are durable.
+
+        Listeners run on the matching path and must only hand the outcome off
+        (e.g. append to a queue); exceptions are logged and swallowed. With
+        ``events`` the outcome also carries the command's domain events, at the
+        cost of reading the touched balances and positions back per command.
+        """
+        self._listeners.append(listener)
+        self._listener_events = self._listener_events or events
+
+    def _record(
+        self,
+        market_id: str,
+        orders: list[Order],
+        trades: list[dict[str, Any]],
+        levels: set[tuple[str, int]],
+        events: list[dict[str, Any]],
+    ) -> None:
+        outcome = self._outcomes.setdefault(market_id, CommandOutcome(market_id))
+        outcome.trades.extend(trades)
+        outcome.levels.update(dict.fromkeys(levels, 0))
+        if self._listeners:
+            outcome.orders.extend(copy.copy(o) for o in orders)
+            outcome.events.extend(events)
+
+    async def _command_seq(self, market_id: str, db: AsyncSession) -> int:
+        """Book sequence number the current command will commit as."""
+        outcome = self._outcomes.setdefault(market_id, CommandOutcome(market_id))
+        if not outcome.seq:
+            ob = self._orderbooks.get(market_id)
+            current = ob.seq if ob is not None else await self._store.get_book_seq(market_id, db)
+            # Deferred outcomes are sealed before the book's seq moves past them
+            outcome.seq = max(current, self._last_seq.get(market_id, 0)) + 1
+        return outcome.seq
+
+    async def _wal_event(
+        self,
+        event_type: str,
+        order_id: str,
+        market_id: str,
+        user_id: str,
+        payload: dict[str, object],
+        db: AsyncSession,
+    ) -> None:
+        book_seq = await self._command_seq(market_id, db)
+        await write_wal_event(
+            event_type, order_id, market_id, user_id, payload, db, self._store, book_seq
+        )
+
+    async def _events(
+        self, orders: list[Order], trades: list[dict[str, Any]], db: AsyncSession
+    ) -> list[dict[str, Any]]:
+        """Outbox rows for one command: queued if outbox is on, returned for listeners."""
+        if not (self._outbox or self._listener_events):
+            return []
+        rows = await outbox_rows(orders, trades, db, self._store)
+        if self._outbox and rows:
+            await self._store.insert_outbox_events(rows, db)
+        return rows
+
+    async def _commit(self, market_id: str, db: AsyncSession) -> None:
+        """Commit the finished command, then publish it (or queue it with defer_publish)."""
+        await self._store.commit(db)
+        outcome = self._outcomes.pop(market_id, None)
+        if outcome is None:
+            return
+        ob = self._orderbooks.get(market_id)
+        for side, price in outcome.levels:
+            outcome.levels[side, price] = ob.level_quantity(side, price) if ob else 0
+        if ob is not None:
+            outcome.top = ob.top_of_book()
+        if outcome.seq:
+            self._last_seq[market_id] = outcome.seq
+        if self._defer_publish:
+            self._sealed.append(outcome)
+        else:
+            self.publish(outcome)
+
+    def take_sealed(self) -> list[CommandOutcome]:
+        """Outcomes committed since the last call, oldest first (defer_publish only)."""
+        sealed, self._sealed = self._sealed, []
+        return sealed
+
+    def publish(self, outcome: CommandOutcome) -> None:
+        """Expose a committed command: book seq, delta ring and top, trade tape, listeners.
+
+        A market's outcomes must be published in seq order.
+        """
+        market_id = outcome.market_id
+        ob = self._orderbooks.get(market_id)
+        if ob is not None and outcome.seq > ob.seq:
+            last_price = outcome.trades[-1]["price"] if outcome.trades else None
+            ob.record_change(outcome.seq, outcome.levels, last_price, outcome.top)
+        if outcome.trades:
+            tape = self._tape(market_id)
+            tape.extend(_tape_trade(row) for row in outcome.trades)
+        for listener in self._listeners:
+            try:
+                listener(outcome)
+            except Exception:
+                logger.exception("Engine listener failed for market %s", market_id)
+
+    def _tape(self, market_id: str) -> deque[TapeTrade]:
+        tape = self._tapes.get(market_id)
+        if tape is None:
+            tape = self._tapes[market_id] = deque(maxlen=self._tape_size)
+        return tape
 
     def _get_or_create_lock(self, market_id: str) -> asyncio.Lock:
         return self._market_locks[market_id]
 
+    @asynccontextmanager
+    async def _locked(self, market_id: str) -> AsyncIterator[None]:
+        """Hold the market lock, recording wait and hold times."""
+        lock = self._get_or_create_lock(market_id)
+        start = time.perf_counter()
+        async with lock:
+            acquired = time.perf_counter()
+            self._outcomes.pop(market_id, None)  # left over by a failed command
+            _LOCK_WAIT_MS.labels(market_id).observe((acquired - start) * 1000)
+            try:
+                yield
+            finally:
+                _LOCK_HOLD_MS.labels(market_id).observe((time.perf_counter() - acquired) * 1000)
+
+    def book_sizes(self) -> list[tuple[tuple[str, str], float]]:
+        """Resting order count per (market_id, side), for the /metrics scrape."""
+        sizes: list[tuple[tuple[str, str], float]] = []
+        for market_id, ob in self._orderbooks.items():
+            bids = sum(1 for side, _ in ob._order_index.values() if side == "BUY")
+            sizes.append(((market_id, "BUY"), bids))
+            sizes.append(((market_id, "SELL"), len(ob._order_index) - bids))
+        return sizes
+
     def _get_or_create_orderbook(self, market_id: str) -> OrderBook:
         if market_id not in self._orderbooks:
-            self._orderbooks[market_id] = OrderBook(market_id=market_id)
+            self._orderbooks[market_id] = self._new_orderbook(market_id)
         return self._orderbooks[market_id]
 
-    async def rebuild_orderbook(self, market_id: str, db: AsyncSession) -> None:
-        """Lazy rebuild from DB on startup or after error recovery."""
-        rows = (
-            await db.execute(
-                text(
-                    "SELECT id, user_id, book_type, book_direction, book_price,"
-                    " remaining_quantity, created_at"
-                    " FROM orders WHERE market_id = :mid"
-                    " AND status IN ('OPEN','PARTIALLY_FILLED')"
-                    " ORDER BY created_at ASC"
-                ),
-                {"mid": market_id},
-            )
-        ).fetchall()
-        ob = OrderBook(market_id=market_id)
-        from src.pm_matching.domain.models import BookOrder
+    def _new_orderbook(self, market_id: str) -> OrderBook:
+        return OrderBook(market_id=market_id, deltas=deque(maxlen=self._delta_ring))
 
-        for row in rows:
-            row_any: Any = row
+    def evict_orderbook(self, market_id: str) -> None:
+        """Drop a market's book and order handles; the next order reloads them from DB."""
+        self._orderbooks.pop(market_id, None)
+        self._drop_handles(market_id)
+        self._synced.discard(market_id)
+        self._evicted.add(market_id)
+
+    def drop_market(self, market_id: str) -> None:
+        """Forget a market whose open orders were all closed outside the engine.
+
+        Used after resolution cancels every resting order directly in DB.
+        """
+        self._orderbooks.pop(market_id, None)
+        self._drop_handles(market_id)
+        self._synced.discard(market_id)
+        self._evicted.discard(market_id)
+        self._tapes.pop(market_id, None)
+
+    def _drop_handles(self, market_id: str) -> None:
+        stale = [oid for oid, o in self._open_orders.items() if o.market_id == market_id]
+        for oid in stale:
+            del self._open_orders[oid]
+
+    async def rebuild_orderbook(
+        self, market_id: str, repo: OrderRepositoryProtocol, db: AsyncSession
+    ) -> OrderBook:
+        """Lazy rebuild from DB on startup or after error recovery."""
+        start = time.perf_counter()
+        orders = await repo.list_open_by_market(market_id, db)
+        self._drop_handles(market_id)
+        ob = self._new_orderbook(market_id)
+        ob.seq = await self._store.get_book_seq(market_id, db)
+        for o in orders:
             bo = BookOrder(
-                order_id=row_any.id,
-                user_id=row_any.user_id,
-                book_type=row_any.book_type,
-                quantity=row_any.remaining_quantity,
-                created_at=row_any.created_at,
+                order_id=o.id,
+                user_id=o.user_id,
+                book_type=o.book_type,
+                quantity=o.remaining_quantity,
+                created_at=o.created_at or utc_now(),
             )
-            ob.add_order(bo, price=row_any.book_price, side=row_any.book_direction)
+            ob.add_order(bo, price=o.book_price, side=o.book_direction)
+            self._open_orders[o.id] = o
+        ob.top = ob.top_of_book()
         self._orderbooks[market_id] = ob
+        self._synced.add(market_id)
+        self._evicted.discard(market_id)
+        _REBUILDS.labels(market_id).inc()
+        _REBUILD_MS.labels(market_id).observe((time.perf_counter() - start) * 1000)
+        return ob
+
+    async def _ensure_orderbook(
+        self, market_id: str, repo: OrderRepositoryProtocol, db: AsyncSession
+    ) -> OrderBook:
+        """Return the market's book, loading it from DB first if it is not in sync."""
+        if market_id in self._synced:
+            return self._orderbooks[market_id]
+        return await self.rebuild_orderbook(market_id, repo, db)
+
+    async def warm_up(self, repo: OrderRepositoryProtocol, db: AsyncSession) -> None:
+        """Load every market with resting orders, then the trade tapes. Call once at startup."""
+        rows = (await db.execute(_MARKETS_WITH_OPEN_ORDERS_SQL)).fetchall()
+        for row in rows:
+            async with self._locked(row.market_id):
+                await self.rebuild_orderbook(row.market_id, repo, db)
+        await self.load_trade_tapes(db)
+        self._warmed = True
+
+    async def load_trade_tapes(self, db: AsyncSession) -> None:
+        """Fill every ACTIVE market's recent-trade tape from the trades table."""
+        rows = (await db.execute(_RECENT_TRADES_SQL, {"limit": self._tape_size})).fetchall()
+        self._tapes = {}
+        for row in rows:
+            tape = self._tape(row.market_id)
+            if row.trade_id is not None:
+                tape.append(_tape_trade(row._mapping))
+        self._tapes_loaded = True
+
+    def _index_complete(self, market_id: str | None) -> bool:
+        """True when the in-memory open-order index covers every resting order in scope."""
+        if market_id is None:
+            return self._warmed and not self._evicted
+        if market_id in self._evicted:
+            return False
+        return self._warmed or market_id in self._synced
+
+    def get_open_order(self, order_id: str) -> Order | None:
+        """Live handle of a resting order, or None if it is not held in memory."""
+        return self._open_orders.get(order_id)
+
+    def list_open_orders(self, user_id: str, market_id: str | None) -> list[Order] | None:
+        """A user's resting orders from memory; None if the index may be incomplete."""
+        if not self._index_complete(market_id):
+            return None
+        if market_id is None:
+            books = list(self._orderbooks.values())
+        else:
+            ob = self._orderbooks.get(market_id)
+            books = [ob] if ob is not None else []
+        orders: list[Order] = []
+        for ob in books:
+            for bo in ob.user_orders(user_id):
+                handle = self._open_orders.get(bo.order_id)
+                if handle is None:
+                    return None
+                orders.append(handle)
+        return orders
+
+    async def book_levels(
+        self, market_id: str, repo: OrderRepositoryProtocol, db: AsyncSession, depth: int
+    ) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """Aggregated (price, quantity) bids and asks of the in-memory book, best first."""
+        _, bids, asks = await self.book_snapshot(market_id, repo, db, depth)
+        return bids, asks
+
+    async def book_snapshot(
+        self, market_id: str, repo: OrderRepositoryProtocol, db: AsyncSession, depth: int
+    ) -> tuple[int, list[tuple[int, int]], list[tuple[int, int]]]:
+        """(seq, bids, asks) of the in-memory book, read between commands.
+
+        With defer_publish the levels may run ahead of seq by commands still
+        awaiting their fsync; changes carry absolute levels, so a reader that
+        applies book_changes(seq) converges.
+        """
+        async with self._locked(market_id):
+            ob = await self._ensure_orderbook(market_id, repo, db)
+            return ob.seq, ob.levels("BUY", depth), ob.levels("SELL", depth)
+
+    def book_seq(self, market_id: str) -> int | None:
+        """Sequence number of the last committed change, or None if the book is not loaded.
+
+        Lock-free: a command only bumps it when it is published, after it
+        commits, so this always names a committed state.
+        """
+        ob = self._orderbooks.get(market_id) if market_id in self._synced else None
+        return ob.seq if ob is not None else None
+
+    def book_top(self, market_id: str) -> tuple[int, int, int, int] | None:
+        """Committed (best bid, qty, best ask, qty) as of book_seq(); None if not loaded."""
+        ob = self._orderbooks.get(market_id) if market_id in self._synced else None
+        return ob.top if ob is not None else None
+
+    def recent_trades(self, market_id: str, limit: int) -> list[TapeTrade] | None:
+        """Up to ``limit`` committed trades, newest first.
+
+        None when the tapes were never loaded (see load_trade_tapes) or the
+        market has no tape: it was not ACTIVE then and has not traded since.
+        """
+        tape = self._tapes.get(market_id) if self._tapes_loaded else None
+        if tape is None:
+            return None
+        return list(itertools.islice(reversed(tape), limit))
+
+    def book_changes(self, market_id: str, since: int) -> BookChanges | None:
+        """Level changes committed after ``since``; None if the delta ring no longer has them."""
+        ob = self._orderbooks.get(market_id) if market_id in self._synced else None
+        return ob.changes_since(since) if ob is not None else None
 
     async def place_order(
         self, order: Order, repo: OrderRepositoryProtocol, db: AsyncSession
     ) -> tuple[Order, list[TradeResult], int]:
         """Main entry point. Returns (order, trades, netting_qty)."""
-        lock = self._get_or_create_lock(order.market_id)
-        async with lock:
+        async with self._locked(order.market_id):
             try:
-                async with db.begin_nested():
-                    return await self._place_order_inner(order, repo, db)
+                async with self._store.transaction(db):
+                    result = await self._place_order_inner(order, repo, db)
+                await self._commit(order.market_id, db)
             except Exception:
                 # Evict orderbook — will lazy-rebuild on next request
-                self._orderbooks.pop(order.market_id, None)
+                self.evict_orderbook(order.market_id)
                 raise
+            return result
 
     async def _place_order_inner(
         self, order: Order, repo: OrderRepositoryProtocol, db: AsyncSession
     ) -> tuple[Order, list[TradeResult], int]:
+        t = time.perf_counter()
+        # Load the book before this order is saved, so a rebuild cannot pick it up
+        ob = await self._ensure_orderbook(order.market_id, repo, db)
+        t = _stage("load_book", t)
+
         # Risk checks
-        await check_market_active(order.market_id, db)
+        await check_market_active(order.market_id, db, self._store)
         check_price_range(order.original_price)
         check_order_limit(order.quantity)
 
@@ -135,35 +501,45 @@ class MatchingEngine:
         order.book_type = book_type
         order.book_direction = book_dir
         order.book_price = book_price
+        t = _stage("risk", t)
 
         # Freeze
-        await check_and_freeze(order, db)
+        await check_and_freeze(order, db, self._store)
+        t = _stage("freeze", t)
 
         # Save order to DB
         await repo.save(order, db)
 
         # WAL: ORDER_ACCEPTED
-        await write_wal_event("ORDER_ACCEPTED", order.id, order.market_id, order.user_id, {}, db)
+        await self._wal_event(
+            "ORDER_ACCEPTED", order.id, order.market_id, order.user_id, {}, db
+        )
+        t = _stage("save", t)
 
         # Load market row FOR UPDATE
-        market_row: Any = (
-            await db.execute(_GET_MARKET_SQL, {"market_id": order.market_id})
-        ).fetchone()
-        market = MarketState(market_row)
+        market = MarketState(await self._store.load_market(order.market_id, db))
+        t = _stage("load_market", t)
 
         # Match
-        ob = self._get_or_create_orderbook(order.market_id)
         trade_results = match_order(order, ob)
+        _FILLS_PER_ORDER.labels().observe(len(trade_results))
+        t = _stage("match", t)
 
         # Clear each fill
         trades_db: list[TradeResult] = []
+        trade_rows: list[dict[str, Any]] = []
+        makers: dict[str, Order] = {}
         netting_qty = 0
         for tr in trade_results:
-            buy_pnl, sell_pnl = await settle_trade(tr, market, db, fee_bps=market.taker_fee_bps)
+            buy_pnl, sell_pnl = await settle_trade(
+                tr, market, db, fee_bps=market.taker_fee_bps, store=self._store
+            )
             _sync_frozen_amount(order, order.remaining_quantity)
             await repo.update_status(order, db)
             # Update maker order status in DB
-            await _update_maker_status(tr, repo, db)
+            maker = await self._update_maker_status(tr, repo, db)
+            if maker is not None:
+                makers[maker.id] = maker
 
             # Fee collection
             taker_is_buyer = tr.taker_order_id == tr.buy_order_id
@@ -175,18 +551,25 @@ class MatchingEngine:
             actual_fee = calc_fee(fee_base, market.taker_fee_bps)
             max_fee = _calc_max_fee(fee_base)
             if taker_book_type in ("NATIVE_BUY", "SYNTHETIC_SELL"):
-                await collect_fee_from_frozen(taker_user_id, actual_fee, max_fee, db)
+                await collect_fee_from_frozen(
+                    taker_user_id, actual_fee, max_fee, db, self._store
+                )
             else:
-                await collect_fee_from_proceeds(taker_user_id, actual_fee, db)
+                await collect_fee_from_proceeds(taker_user_id, actual_fee, db, self._store)
 
             # Persist trade
             scenario_val = determine_scenario(tr.buy_book_type, tr.sell_book_type)
-            await write_trade(tr, scenario_val.value, 0, actual_fee, buy_pnl, sell_pnl, db)
+            trade_row = await write_trade(
+                tr, scenario_val.value, 0, actual_fee, buy_pnl, sell_pnl, db, self._store
+            )
+            trade_rows.append(trade_row)
 
             # Netting for buyer
-            nq = await execute_netting_if_needed(tr.buy_user_id, order.market_id, market, db)
+            nq = await execute_netting_if_needed(
+                tr.buy_user_id, order.market_id, market, db, self._store
+            )
             netting_qty += nq
-            await write_wal_event(
+            await self._wal_event(
                 "ORDER_MATCHED",
                 order.id,
                 order.market_id,
@@ -196,25 +579,26 @@ class MatchingEngine:
             )
             trades_db.append(tr)
 
+        t = _stage("clear", t)
+
         # Finalize
         self_trade_skipped = 0  # tracked by match_order (not yet exposed; placeholder)
         await self._finalize_order(order, ob, db, repo, self_trade_skipped)
+        t = _stage("finalize", t)
 
         # Invariants (only if trades happened)
         if trade_results:
-            await verify_invariants_after_trade(market, db)
+            await verify_invariants_after_trade(market, db, self._store)
+        t = _stage("invariants", t)
 
         # Flush market row
-        await db.execute(
-            _UPDATE_MARKET_SQL,
-            {
-                "id": market.id,
-                "reserve_balance": market.reserve_balance,
-                "pnl_pool": market.pnl_pool,
-                "total_yes_shares": market.total_yes_shares,
-                "total_no_shares": market.total_no_shares,
-            },
-        )
+        await self._store.save_market(market, db)
+        events = await self._events([order, *makers.values()], trade_rows, db)
+        maker_side = "SELL" if order.book_direction == "BUY" else "BUY"
+        levels = {(maker_side, tr.price) for tr in trades_db}
+        levels.add((order.book_direction, order.book_price))
+        self._record(order.market_id, [order, *makers.values()], trade_rows, levels, events)
+        _stage("flush", t)
 
         return order, trades_db, netting_qty
 
@@ -228,8 +612,6 @@ class MatchingEngine:
     ) -> None:
         if order.remaining_quantity > 0:
             if order.time_in_force == "GTC":
-                from src.pm_matching.domain.models import BookOrder
-
                 bo = BookOrder(
                     order_id=order.id,
                     user_id=order.user_id,
@@ -238,9 +620,15 @@ class MatchingEngine:
                     created_at=order.created_at or utc_now(),
                 )
                 ob.add_order(bo, price=order.book_price, side=order.book_direction)
+                self._open_orders[order.id] = copy.copy(order)
                 if order.filled_quantity > 0:
-                    await write_wal_event(
-                        "ORDER_PARTIALLY_FILLED", order.id, order.market_id, order.user_id, {}, db
+                    await self._wal_event(
+                        "ORDER_PARTIALLY_FILLED",
+                        order.id,
+                        order.market_id,
+                        order.user_id,
+                        {},
+                        db,
                     )
             else:  # IOC
                 if order.filled_quantity == 0 and self_trade_skipped > 0:
@@ -250,53 +638,30 @@ class MatchingEngine:
                 await self._unfreeze_remainder(order, db)
                 order.status = "CANCELLED"
                 await repo.update_status(order, db)
-                await write_wal_event(
+                await self._wal_event(
                     "ORDER_EXPIRED", order.id, order.market_id, order.user_id, {}, db
                 )
 
     async def _unfreeze_remainder(self, order: Order, db: AsyncSession) -> None:
+        await self._unfreeze(order, order.frozen_amount, order.remaining_quantity, db)
+
+    async def _unfreeze(self, order: Order, amount: int, qty: int, db: AsyncSession) -> None:
+        """Release `amount` frozen funds or `qty` pending-sell shares held by `order`."""
         if order.frozen_asset_type == "FUNDS":
-            await db.execute(
-                text("""
-                    UPDATE accounts SET available_balance=available_balance+:amount,
-                    frozen_balance=frozen_balance-:amount, version=version+1, updated_at=NOW()
-                    WHERE user_id=:user_id
-                """),
-                {"user_id": order.user_id, "amount": order.frozen_amount},
-            )
+            await self._store.unfreeze_funds(order.user_id, amount, db)
             await write_ledger(
                 user_id=order.user_id,
                 entry_type="ORDER_UNFREEZE",
-                amount=order.frozen_amount,
+                amount=amount,
                 balance_after=0,
                 reference_type="ORDER",
                 reference_id=order.id,
                 db=db,
-            )
-        elif order.frozen_asset_type == "YES_SHARES":
-            await db.execute(
-                text(
-                    "UPDATE positions SET yes_pending_sell=yes_pending_sell-:qty, updated_at=NOW()"
-                    " WHERE user_id=:user_id AND market_id=:market_id"
-                ),
-                {
-                    "user_id": order.user_id,
-                    "market_id": order.market_id,
-                    "qty": order.remaining_quantity,
-                },
+                store=self._store,
             )
         else:
-            await db.execute(
-                text(
-                    "UPDATE positions SET no_pending_sell=no_pending_sell-:qty, updated_at=NOW()"
-                    " WHERE user_id=:user_id AND market_id=:market_id"
-                ),
-                {
-                    "user_id": order.user_id,
-                    "market_id": order.market_id,
-                    "qty": order.remaining_quantity,
-                },
-            )
+            side = "YES" if order.frozen_asset_type == "YES_SHARES" else "NO"
+            await self._store.release_shares(order.user_id, order.market_id, side, qty, db)
 
     async def _cancel_order_by_row(self, row: Any, db: AsyncSession) -> None:
         """Cancel an order using a raw DB row (from SELECT FOR UPDATE).
@@ -307,8 +672,10 @@ class MatchingEngine:
         order_id = str(row.id)
 
         # Remove from in-memory orderbook (safe if not present)
-        ob = self._get_or_create_orderbook(market_id)
-        ob.cancel_order(order_id)
+        ob = self._orderbooks.get(market_id)
+        if ob is not None:
+            ob.cancel_order(order_id)
+        self._open_orders.pop(order_id, None)
 
         # Unfreeze assets
         if str(row.frozen_asset_type) == "FUNDS":
@@ -355,7 +722,7 @@ class MatchingEngine:
     async def cancel_order(
         self, order_id: str, user_id: str, repo: OrderRepositoryProtocol, db: AsyncSession
     ) -> Order:
-        order = await repo.get_by_id(order_id, db)
+        order = self._open_orders.get(order_id) or await repo.get_by_id(order_id, db)
         if order is None:
             raise AppError(4004, "Order not found", http_status=404)
         if order.user_id != user_id:
@@ -363,24 +730,117 @@ class MatchingEngine:
         if not order.is_cancellable:
             raise AppError(4006, "Order cannot be cancelled", http_status=422)
 
-        lock = self._get_or_create_lock(order.market_id)
-        async with lock:
+        market_id = order.market_id
+        async with self._locked(market_id):
             try:
-                async with db.begin_nested():
-                    ob = self._get_or_create_orderbook(order.market_id)
-                    ob.cancel_order(order_id)
+                async with self._store.transaction(db):
+                    # Re-read under the market lock: a fill may have landed since.
+                    order = self._open_orders.get(order_id) or await repo.get_by_id(order_id, db)
+                    if order is None or not order.is_cancellable:
+                        raise AppError(4006, "Order cannot be cancelled", http_status=422)
+                    ob = self._orderbooks.get(market_id)
+                    if ob is not None:
+                        ob.cancel_order(order_id)
+                    self._open_orders.pop(order_id, None)
                     await self._unfreeze_remainder(order, db)
                     order.status = "CANCELLED"
                     await repo.update_status(order, db)
-                    await write_wal_event(
-                        "ORDER_CANCELLED", order.id, order.market_id, order.user_id, {}, db
+                    await self._wal_event(
+                        "ORDER_CANCELLED",
+                        order.id,
+                        market_id,
+                        order.user_id,
+                        {},
+                        db,
+                    )
+                    events = await self._events([order], [], db)
+                    self._record(
+                        market_id,
+                        [order],
+                        [],
+                        {(order.book_direction, order.book_price)},
+                        events,
+                    )
+                await self._commit(market_id, db)
+            except AppError:
+                raise
+            except Exception:
+                self.evict_orderbook(market_id)
+                raise
+            return order
+
+    async def amend_order(
+        self,
+        order_id: str,
+        new_quantity: int,
+        user_id: str,
+        repo: OrderRepositoryProtocol,
+        db: AsyncSession,
+    ) -> tuple[Order, int]:
+        """Reduce an open order's quantity in place, keeping its queue priority.
+
+        `new_quantity` is the new total order size: it must be below the current
+        quantity and above the already filled quantity. Only the released delta
+        is unfrozen. Returns (order, released) where `released` is in cents for
+        FUNDS orders and in shares otherwise.
+        """
+        order = self._open_orders.get(order_id) or await repo.get_by_id(order_id, db)
+        if order is None:
+            raise AppError(4004, "Order not found", http_status=404)
+        if order.user_id != user_id:
+            raise AppError(403, "Forbidden", http_status=403)
+
+        market_id = order.market_id
+        async with self._locked(market_id):
+            try:
+                async with self._store.transaction(db):
+                    # Re-read under the market lock: fills may have landed since.
+                    order = self._open_orders.get(order_id) or await repo.get_by_id(order_id, db)
+                    if order is None or not order.is_cancellable:
+                        raise AppError(4006, "Order cannot be amended", http_status=422)
+                    if not order.filled_quantity < new_quantity < order.quantity:
+                        raise AppError(
+                            4007,
+                            f"Amend quantity must be between {order.filled_quantity + 1}"
+                            f" and {order.quantity - 1}",
+                            http_status=422,
+                        )
+
+                    old_quantity = order.quantity
+                    old_frozen = order.frozen_amount
+                    order.quantity = new_quantity
+                    order.remaining_quantity = new_quantity - order.filled_quantity
+                    _sync_frozen_amount(order, order.remaining_quantity)
+                    released = old_frozen - order.frozen_amount
+
+                    ob = self._orderbooks.get(market_id)
+                    if ob is not None:
+                        ob.amend_order(order_id, order.remaining_quantity)
+                    await self._unfreeze(order, released, old_quantity - new_quantity, db)
+                    await repo.amend_quantity(order, db)
+                    await self._wal_event(
+                        "ORDER_AMENDED",
+                        order.id,
+                        order.market_id,
+                        order.user_id,
+                        {"old_quantity": old_quantity, "new_quantity": new_quantity},
+                        db,
                     )
-                    return order
+                    events = await self._events([order], [], db)
+                    self._record(
+                        market_id,
+                        [order],
+                        [],
+                        {(order.book_direction, order.book_price)},
+                        events,
+                    )
+                await self._commit(market_id, db)
             except AppError:
                 raise
             except Exception:
-                self._orderbooks.pop(order.market_id, None)
+                self.evict_orderbook(market_id)
                 raise
+            return order, released
 
     async def replace_order(
         self,
@@ -405,7 +865,7 @@ class MatchingEngine:
         from src.pm_common.id_generator import generate_id
 
         # Step 1: Load and validate old order (outside lock)
-        old_order = await repo.get_by_id(old_order_id, db)
+        old_order = self._open_orders.get(old_order_id) or await repo.get_by_id(old_order_id, db)
         if old_order is None:
             raise AppError(6002, "Old order not found", http_status=404)
         if str(old_order.user_id) != str(user_id):
@@ -428,17 +888,18 @@ class MatchingEngine:
         market_id = str(old_order.market_id)
 
         # Step 2: Atomic cancel + place under market lock
-        lock = self._get_or_create_lock(market_id)
-        async with lock:
+        async with self._locked(market_id):
             try:
-                async with db.begin_nested():
+                async with self._store.transaction(db):
                     # Cancel old order inline (no re-lock)
-                    ob = self._get_or_create_orderbook(market_id)
-                    ob.cancel_order(old_order_id)
+                    ob = self._orderbooks.get(market_id)
+                    if ob is not None:
+                        ob.cancel_order(old_order_id)
+                    self._open_orders.pop(old_order_id, None)
                     await self._unfreeze_remainder(old_order, db)
                     old_order.status = "CANCELLED"
                     await repo.update_status(old_order, db)
-                    await write_wal_event(
+                    await self._wal_event(
                         "ORDER_CANCELLED",
                         old_order.id,
                         market_id,
@@ -446,6 +907,14 @@ class MatchingEngine:
                         {"replace_reason": "atomic_replace"},
                         db,
                     )
+                    events = await self._events([old_order], [], db)
+                    self._record(
+                        market_id,
+                        [old_order],
+                        [],
+                        {(old_order.book_direction, old_order.book_price)},
+                        events,
+                    )
 
                     # Place new order inline (no re-lock via _place_order_inner)
                     new_order = Order(
@@ -468,11 +937,11 @@ class MatchingEngine:
                     new_order, trades, netting_qty = await self._place_order_inner(
                         new_order, repo, db
                     )
-
+                await self._commit(market_id, db)
             except AppError:
                 raise
             except Exception:
-                self._orderbooks.pop(market_id, None)
+                self.evict_orderbook(market_id)
                 raise
 
         return {
@@ -504,15 +973,130 @@ class MatchingEngine:
         market_id: str,
         user_id: str,
         cancel_scope: str,
+        repo: OrderRepositoryProtocol,
         db: AsyncSession,
     ) -> dict:
         """Batch cancel all AMM orders in a market.
 
         See interface contract v1.4 §3.2.
         cancel_scope: ALL | BUY_ONLY | SELL_ONLY (based on original_direction).
+
+        When the in-memory open-order index is complete for the market, the
+        order ids come from memory and the DB only confirms the cancel via
+        UPDATE ... RETURNING; otherwise the orders table is scanned.
         """
         from sqlalchemy import text as sql_text
 
+        empty = {
+            "market_id": market_id,
+            "cancelled_count": 0,
+            "total_unfrozen_funds_cents": 0,
+            "total_unfrozen_yes_shares": 0,
+            "total_unfrozen_no_shares": 0,
+        }
+
+        async with self._locked(market_id):
+            try:
+                async with self._store.transaction(db):
+                    orders = await self._claim_batch_cancel(market_id, user_id, cancel_scope, db)
+                    if not orders:
+                        return empty
+
+                    ob = self._orderbooks.get(market_id)
+                    total_funds = 0
+                    total_yes = 0
+                    total_no = 0
+                    levels: set[tuple[str, int]] = set()
+                    cancelled: list[Order] = []  # for events and listeners
+                    for order in orders:
+                        if ob:
+                            level = ob.level_of(order.id)
+                            if level is not None:
+                                levels.add(level)
+                            ob.cancel_order(order.id)
+                        handle = self._open_orders.pop(order.id, None)
+                        if handle is None and (self._outbox or self._listeners):
+                            handle = await repo.get_by_id(order.id, db)  # CANCELLED above
+                        if handle is not None:
+                            handle.status = "CANCELLED"
+                            cancelled.append(handle)
+                        if order.frozen_asset_type == "FUNDS":
+                            total_funds += order.frozen_amount
+                        elif order.frozen_asset_type == "YES_SHARES":
+                            total_yes += order.frozen_amount
+                        elif order.frozen_asset_type == "NO_SHARES":
+                            total_no += order.frozen_amount
+
+                    # Bulk unfreeze
+                    if total_funds > 0:
+                        await db.execute(
+                            sql_text(
+                                "UPDATE accounts SET "
+                                "available_balance = available_balance + :amt, "
+                                "frozen_balance = frozen_balance - :amt, "
+                                "version = version + 1 "
+                                "WHERE user_id = :uid"
+                            ),
+                            {"amt": total_funds, "uid": user_id},
+                        )
+                    if total_yes > 0:
+                        await db.execute(
+                            sql_text(
+                                "UPDATE positions SET yes_pending_sell = yes_pending_sell - :amt "
+                                "WHERE user_id = :uid AND market_id = :mid"
+                            ),
+                            {"amt": total_yes, "uid": user_id, "mid": market_id},
+                        )
+                    if total_no > 0:
+                        await db.execute(
+                            sql_text(
+                                "UPDATE positions SET no_pending_sell = no_pending_sell - :amt "
+                                "WHERE user_id = :uid AND market_id = :mid"
+                            ),
+                            {"amt": total_no, "uid": user_id, "mid": market_id},
+                        )
+                    # Like cancel_order: the rows carry the new book seq, so ETags, deltas
+                    # and feeds see the cancel, and a rebuild resumes past it
+                    for order in orders:
+                        await self._wal_event(
+                            "ORDER_CANCELLED", order.id, market_id, user_id,
+                            {"cancel_scope": cancel_scope}, db,
+                        )
+                    events = await self._events(cancelled, [], db)
+                    self._record(market_id, cancelled, [], levels, events)
+                await self._commit(market_id, db)
+            except AppError:
+                raise
+            except Exception:
+                # The book and open-order index were changed ahead of the DB
+                self.evict_orderbook(market_id)
+                raise
+
+        return {
+            "market_id": market_id,
+            "cancelled_count": len(orders),
+            "total_unfrozen_funds_cents": total_funds,
+            "total_unfrozen_yes_shares": total_yes,
+            "total_unfrozen_no_shares": total_no,
+        }
+
+    async def _claim_batch_cancel(
+        self, market_id: str, user_id: str, cancel_scope: str, db: AsyncSession
+    ) -> list[Any]:
+        """Mark the user's open orders in scope CANCELLED in the DB; returns their rows."""
+        from sqlalchemy import text as sql_text
+
+        if self._index_complete(market_id):
+            ob = self._orderbooks.get(market_id)
+            ids = [
+                bo.order_id
+                for bo in (ob.user_orders(user_id) if ob is not None else [])
+                if _in_cancel_scope(bo.book_type, cancel_scope)
+            ]
+            if not ids:
+                return []
+            return list((await db.execute(_BATCH_CANCEL_BY_IDS_SQL, {"ids": ids})).fetchall())
+
         direction_filter = ""
         if cancel_scope == "BUY_ONLY":
             direction_filter = "AND original_direction = 'BUY'"
@@ -530,98 +1114,49 @@ class MatchingEngine:
             ),
             {"uid": user_id, "mid": market_id},
         )
-        orders = result.fetchall()
-
-        if not orders:
-            return {
-                "market_id": market_id,
-                "cancelled_count": 0,
-                "total_unfrozen_funds_cents": 0,
-                "total_unfrozen_yes_shares": 0,
-                "total_unfrozen_no_shares": 0,
-            }
-
-        total_funds = 0
-        total_yes = 0
-        total_no = 0
-
-        lock = self._get_or_create_lock(market_id)
-        async with lock:
-            ob = self._orderbooks.get(market_id)
-            for order in orders:
-                if ob:
-                    ob.cancel_order(order.id)
-                if order.frozen_asset_type == "FUNDS":
-                    total_funds += order.frozen_amount
-                elif order.frozen_asset_type == "YES_SHARES":
-                    total_yes += order.frozen_amount
-                elif order.frozen_asset_type == "NO_SHARES":
-                    total_no += order.frozen_amount
-
+        orders = list(result.fetchall())
+        if orders:
             # Bulk cancel in DB
-            order_ids = [o.id for o in orders]
             await db.execute(
                 sql_text(
                     "UPDATE orders SET status = 'CANCELLED', updated_at = NOW() "
                     "WHERE id = ANY(:ids)"
                 ),
-                {"ids": order_ids},
+                {"ids": [o.id for o in orders]},
             )
+        return orders
 
-            # Bulk unfreeze
-            if total_funds > 0:
-                await db.execute(
-                    sql_text(
-                        "UPDATE accounts SET "
-                        "available_balance = available_balance + :amt, "
-                        "frozen_balance = frozen_balance - :amt, "
-                        "version = version + 1 "
-                        "WHERE user_id = :uid"
-                    ),
-                    {"amt": total_funds, "uid": user_id},
-                )
-            if total_yes > 0:
-                await db.execute(
-                    sql_text(
-                        "UPDATE positions SET yes_pending_sell = yes_pending_sell - :amt "
-                        "WHERE user_id = :uid AND market_id = :mid"
-                    ),
-                    {"amt": total_yes, "uid": user_id, "mid": market_id},
-                )
-            if total_no > 0:
-                await db.execute(
-                    sql_text(
-                        "UPDATE positions SET no_pending_sell = no_pending_sell - :amt "
-                        "WHERE user_id = :uid AND market_id = :mid"
-                    ),
-                    {"amt": total_no, "uid": user_id, "mid": market_id},
-                )
+    async def _update_maker_status(
+        self, tr: TradeResult, repo: OrderRepositoryProtocol, db: AsyncSession
+    ) -> Order | None:
+        """Persist the resting (maker) order's updated fill state and return the order.
 
-        return {
-            "market_id": market_id,
-            "cancelled_count": len(orders),
-            "total_unfrozen_funds_cents": total_funds,
-            "total_unfrozen_yes_shares": total_yes,
-            "total_unfrozen_no_shares": total_no,
-        }
+        Uses the in-memory handle when available, otherwise loads the order from DB.
+        """
+        maker = self._open_orders.get(tr.maker_order_id) or await repo.get_by_id(
+            tr.maker_order_id, db
+        )
+        if maker is None:
+            return None
+        maker.filled_quantity += tr.quantity
+        maker.remaining_quantity -= tr.quantity
+        if maker.remaining_quantity <= 0:
+            maker.remaining_quantity = 0
+            maker.status = "FILLED"
+            self._open_orders.pop(maker.id, None)
+        else:
+            maker.status = "PARTIALLY_FILLED"
+        _sync_frozen_amount(maker, maker.remaining_quantity)
+        await repo.update_status(maker, db)
+        return maker
 
 
-async def _update_maker_status(
-    tr: TradeResult, repo: OrderRepositoryProtocol, db: AsyncSession
-) -> None:
-    """Load the resting (maker) order from DB and persist its updated fill state."""
-    maker = await repo.get_by_id(tr.maker_order_id, db)
-    if maker is None:
-        return
-    maker.filled_quantity += tr.quantity
-    maker.remaining_quantity -= tr.quantity
-    if maker.remaining_quantity <= 0:
-        maker.remaining_quantity = 0
-        maker.status = "FILLED"
-    else:
-        maker.status = "PARTIALLY_FILLED"
-    _sync_frozen_amount(maker, maker.remaining_quantity)
-    await repo.update_status(maker, db)
+def _in_cancel_scope(book_type: str, cancel_scope: str) -> bool:
+    """Match batch-cancel scope against original_direction (BUY = NATIVE_BUY / SYNTHETIC_SELL)."""
+    if cancel_scope == "ALL":
+        return True
+    is_buy = book_type in ("NATIVE_BUY", "SYNTHETIC_SELL")
+    return is_buy == (cancel_scope == "BUY_ONLY")
 
 
 def _sync_frozen_amount(order: Order, remaining_qty: int) -> None:
@@ -31,7 +31,7 @@ def _match_buy(incoming: Order, ob: OrderBook) -> list[TradeResult]:
             _apply_fill(incoming, resting, fill_qty)
             if resting.quantity == 0:
                 queue.popleft()
-                ob._order_index.pop(resting.order_id, None)
+                ob._remove_filled(resting)
                 total -= 1
             else:
                 # resting still has quantity (incoming fully filled)
@@ -65,7 +65,7 @@ def _match_sell(incoming: Order, ob: OrderBook) -> list[TradeResult]:
             _apply_fill(incoming, resting, fill_qty)
             if resting.quantity == 0:
                 queue.popleft()
-                ob._order_index.pop(resting.order_id, None)
+                ob._remove_filled(resting)
                 total -= 1
             else:
                 # resting still has quantity (incoming fully filled)
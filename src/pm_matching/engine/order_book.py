@@ -1,7 +1,7 @@
 from collections import deque
 from dataclasses import dataclass, field
 
-from src.pm_matching.domain.models import BookOrder
+from src.pm_matching.domain.models import BookChanges, BookOrder
 
 
 @dataclass
@@ -15,6 +15,15 @@ class OrderBook:
     best_ask: int = 100  # 100 = no asks
     _order_index: dict[str, tuple[str, int]] = field(default_factory=dict)
     # _order_index[order_id] = (side, price)
+    _user_orders: dict[str, dict[str, BookOrder]] = field(default_factory=dict)
+    # _user_orders[user_id][order_id] = resting BookOrder (insertion = time priority)
+    seq: int = 0  # bumped once per committed engine command; recorded in wal_events.book_seq
+    deltas: deque[tuple[int, dict[tuple[str, int], int], int | None]] = field(
+        default_factory=lambda: deque(maxlen=256)
+    )
+    # deltas = (seq, absolute level quantities it changed, last trade price), oldest first
+    top: tuple[int, int, int, int] = (0, 0, 100, 0)
+    # top = (best bid, its quantity, best ask, its quantity) as of ``seq``
 
     def add_order(self, book_order: BookOrder, price: int, side: str) -> None:
         if side == "BUY":
@@ -26,6 +35,7 @@ class OrderBook:
             if price < self.best_ask:
                 self.best_ask = price
         self._order_index[book_order.order_id] = (side, price)
+        self._user_orders.setdefault(book_order.user_id, {})[book_order.order_id] = book_order
 
     def cancel_order(self, order_id: str) -> None:
         if order_id not in self._order_index:
@@ -35,12 +45,99 @@ class OrderBook:
         for i, bo in enumerate(queue):
             if bo.order_id == order_id:
                 del queue[i]
+                self._unindex_user(bo)
                 break
         if side == "BUY" and price == self.best_bid:
             self._refresh_best_bid()
         elif side == "SELL" and price == self.best_ask:
             self._refresh_best_ask()
 
+    def amend_order(self, order_id: str, new_quantity: int) -> bool:
+        """Reduce a resting order's quantity without moving it in its queue.
+
+        Returns False if the order is not resting in this book.
+        """
+        if order_id not in self._order_index:
+            return False
+        side, price = self._order_index[order_id]
+        queue = self.bids[price] if side == "BUY" else self.asks[price]
+        for bo in queue:
+            if bo.order_id == order_id:
+                bo.quantity = new_quantity
+                return True
+        return False
+
+    def level_of(self, order_id: str) -> tuple[str, int] | None:
+        """(side, price) of a resting order, or None if it is not in the book."""
+        return self._order_index.get(order_id)
+
+    def level_quantity(self, side: str, price: int) -> int:
+        queue = self.bids[price] if side == "BUY" else self.asks[price]
+        return sum(bo.quantity for bo in queue)
+
+    def record_change(
+        self,
+        seq: int,
+        levels: dict[tuple[str, int], int],
+        last_trade_price: int | None,
+        top: tuple[int, int, int, int] | None = None,
+    ) -> None:
+        """Advance to ``seq``; ``top`` is the top of book as of it (default: the current one)."""
+        self.seq = seq
+        self.deltas.append((seq, levels, last_trade_price))
+        self.top = top if top is not None else self.top_of_book()
+
+    def top_of_book(self) -> tuple[int, int, int, int]:
+        """(best bid, quantity, best ask, quantity); an empty side reads 0 or 100, quantity 0."""
+        bid_qty = self.level_quantity("BUY", self.best_bid) if self.best_bid else 0
+        ask_qty = self.level_quantity("SELL", self.best_ask) if self.best_ask < 100 else 0
+        return self.best_bid, bid_qty, self.best_ask, ask_qty
+
+    def changes_since(self, seq: int) -> BookChanges | None:
+        """Merged changes after ``seq``; None if the ring does not reach back that far."""
+        if seq > self.seq:
+            return None  # from another book incarnation
+        changes = BookChanges(self.seq)
+        if seq == self.seq:
+            return changes
+        if not self.deltas or self.deltas[0][0] > seq + 1:
+            return None
+        for delta_seq, levels, last_price in self.deltas:
+            if delta_seq > seq:
+                changes.levels.update(levels)
+                if last_price is not None:
+                    changes.last_trade_price = last_price
+        return changes
+
+    def levels(self, side: str, depth: int) -> list[tuple[int, int]]:
+        """Aggregated (price, quantity) levels of one side, best price first."""
+        prices = range(99, 0, -1) if side == "BUY" else range(1, 100)
+        queues = self.bids if side == "BUY" else self.asks
+        out: list[tuple[int, int]] = []
+        for p in prices:
+            if queues[p]:
+                out.append((p, sum(bo.quantity for bo in queues[p])))
+                if len(out) == depth:
+                    break
+        return out
+
+    def user_orders(self, user_id: str) -> list[BookOrder]:
+        """Resting orders of one user in this book, oldest first."""
+        return list(self._user_orders.get(user_id, {}).values())
+
+    def _remove_filled(self, book_order: BookOrder) -> None:
+        """Drop a fully filled order from both indices (queue already popped by caller)."""
+        self._order_index.pop(book_order.order_id, None)
+        self._unindex_user(book_order)
+
+    def _unindex_user(self, book_order: BookOrder) -> None:
+        orders = self._user_orders.get(book_order.user_id)
+        if orders is None:
+            return
+        orders.pop(book_order.order_id, None)
+        if not orders:
+            del self._user_orders[book_order.user_id]
+
     def _refresh_best_bid(self) -> None:
         for p in range(99, 0, -1):
             if self.bids[p]:
@@ -0,0 +1,225 @@
+"""CommandJournal — append-only local command log with group-commit fsync.
+
+Layout under the journal directory:
+    journal-<first seq>.log   one JSON line per command: {"seq", "cmd", "args"}
+    checkpoint.pkl            pickled {"seq", "state"}, replaced atomically
+
+append() assigns the next sequence number and buffers the line without
+waiting; wait_durable(seq) returns once a flush covering ``seq`` has been
+fsynced. A single flusher task writes everything that queued up while the
+previous fsync was in flight, so concurrent commands share one fsync (group
+commit); JOURNAL_GROUP_COMMIT_MS optionally lingers to grow the batches.
+
+A checkpoint starts a new segment at the next write and deletes segments
+whose commands it fully covers. Only the tail of a segment can be torn by a
+crash; such a line was never acknowledged and is truncated away on replay.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import pickle
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from src.pm_common.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_PREFIX = "journal-"
+_SEGMENT_SUFFIX = ".log"
+_CHECKPOINT_NAME = "checkpoint.pkl"
+
+_FSYNC_MS = REGISTRY.histogram("pm_journal_fsync_ms", "Journal write+fsync latency")
+_BATCH_SIZE = REGISTRY.histogram(
+    "pm_journal_group_commit_size",
+    "Commands made durable per fsync",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+
+
+class JournalFailedError(RuntimeError):
+    """The journal could not be written; no further commands are accepted."""
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"{_SEGMENT_PREFIX}{first_seq:020d}{_SEGMENT_SUFFIX}"
+
+
+def _fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class CommandJournal:
+    def __init__(
+        self, directory: str, group_commit_ms: float = 0.0, max_batch: int = 1024
+    ) -> None:
+        self._dir = Path(directory)
+        self._linger = group_commit_ms / 1000
+        self._max_batch = max_batch
+        self.last_seq = 0  # last sequence number handed out
+        self.durable_seq = 0  # last sequence number known to be on disk
+        self._buffer: list[bytes] = []
+        self._waiters: list[tuple[int, asyncio.Future[None]]] = []
+        self._wakeup = asyncio.Event()
+        self._file: BinaryIO | None = None
+        self._rotate = False
+        self._failed: BaseException | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    # -- recovery ----------------------------------------------------------
+
+    def load_checkpoint(self) -> tuple[int, Any]:
+        """Return ``(seq, state)`` of the last checkpoint, or ``(0, None)``."""
+        path = self._dir / _CHECKPOINT_NAME
+        if not path.exists():
+            return 0, None
+        data = pickle.loads(path.read_bytes())  # written only by this process
+        self.last_seq = max(self.last_seq, data["seq"])
+        return data["seq"], data["state"]
+
+    def replay(self, after_seq: int) -> Iterator[tuple[int, str, dict[str, Any]]]:
+        """Yield ``(seq, cmd, args)`` for every journaled command after ``after_seq``."""
+        for segment in self._segments():
+            lines = segment.read_bytes().splitlines(keepends=True)
+            valid = 0
+            for i, line in enumerate(lines):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    if i == len(lines) - 1:
+                        logger.warning("Truncating torn journal tail in %s", segment.name)
+                        os.truncate(segment, valid)
+                        break
+                    raise
+                valid += len(line)
+                seq = entry["seq"]
+                self.last_seq = max(self.last_seq, seq)
+                if seq > after_seq:
+                    yield seq, entry["cmd"], entry["args"]
+
+    def _segments(self) -> list[Path]:
+        if not self._dir.exists():
+            return []
+        return sorted(self._dir.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"))
+
+    # -- writing -----------------------------------------------------------
+
+    async def start(self) -> None:
+        """Open a fresh segment after the last replayed command and start flushing."""
+        self.durable_seq = self.last_seq
+        await asyncio.to_thread(self._open_segment, self.last_seq + 1)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            if self.last_seq > self.durable_seq and self._failed is None:
+                await self.wait_durable(self.last_seq)
+            self._task.cancel()
+            self._task = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def append(self, cmd: str, args: dict[str, Any]) -> int:
+        """Buffer one command and return its sequence number. Does not wait for disk."""
+        if self._failed is not None:
+            raise JournalFailedError("journal is not writable") from self._failed
+        self.last_seq += 1
+        line = json.dumps({"seq": self.last_seq, "cmd": cmd, "args": args}, default=str)
+        self._buffer.append(line.encode() + b"\n")
+        self._wakeup.set()
+        return self.last_seq
+
+    async def wait_durable(self, seq: int) -> None:
+        if seq <= self.durable_seq:
+            return
+        if self._failed is not None:
+            raise JournalFailedError("journal is not writable") from self._failed
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append((seq, future))
+        await future
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if self._linger and len(self._buffer) < self._max_batch:
+                await asyncio.sleep(self._linger)
+            self._wakeup.clear()
+            lines, self._buffer = self._buffer, []
+            upto = self.last_seq
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write, b"".join(lines), self.durable_seq + 1)
+            except OSError as exc:
+                logger.critical("Journal write failed; refusing further commands", exc_info=exc)
+                self._failed = exc
+                for _, future in self._waiters:
+                    if not future.done():
+                        future.set_exception(JournalFailedError("journal write failed"))
+                self._waiters.clear()
+                return
+            _FSYNC_MS.labels().observe((time.perf_counter() - start) * 1000)
+            _BATCH_SIZE.labels().observe(len(lines))
+            self.durable_seq = upto
+            still_waiting = []
+            for seq, future in self._waiters:
+                if seq <= upto:
+                    if not future.done():
+                        future.set_result(None)
+                else:
+                    still_waiting.append((seq, future))
+            self._waiters = still_waiting
+
+    def _open_segment(self, first_seq: int) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        if self._file is not None:
+            self._file.close()
+        self._file = (self._dir / _segment_name(first_seq)).open("ab")
+        _fsync_dir(self._dir)
+
+    def _write(self, data: bytes, first_seq: int) -> None:
+        if self._rotate:
+            self._rotate = False
+            self._open_segment(first_seq)
+        assert self._file is not None
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    # -- checkpoints -------------------------------------------------------
+
+    @staticmethod
+    def encode_checkpoint(seq: int, state: Any) -> bytes:
+        """Serialise ``state`` now, while the caller still holds it consistent."""
+        return pickle.dumps({"seq": seq, "state": state}, protocol=pickle.HIGHEST_PROTOCOL)
+
+    async def write_checkpoint(self, seq: int, data: bytes) -> None:
+        """Persist an encoded checkpoint once ``seq`` is durable, then prune segments."""
+        await self.wait_durable(seq)
+        await asyncio.to_thread(self._write_checkpoint, seq, data)
+        self._rotate = True
+
+    def _write_checkpoint(self, seq: int, data: bytes) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / (_CHECKPOINT_NAME + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self._dir / _CHECKPOINT_NAME)
+        _fsync_dir(self._dir)
+        segments = self._segments()
+        # A segment is covered when the next one starts at or before seq + 1
+        for segment, successor in itertools.pairwise(segments):
+            first = int(successor.name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+            if first <= seq + 1:
+                segment.unlink()
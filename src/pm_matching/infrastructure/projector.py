@@ -0,0 +1,300 @@
+"""JournalProjector — keeps the Postgres tables in step with the journaled engine.
+
+In journal mode the in-memory store is authoritative; accounts, positions,
+markets and orders in Postgres are projections of it, and ledger, WAL,
+trade and outbox rows are appended from it. Each journaled command hands its ChangeSet
+to enqueue(); run() periodically merges every queued set whose command is
+already durable and applies it in one transaction together with
+journal_projection.last_seq, so each command is projected exactly once.
+
+Row images are absolute, so re-applying one is harmless; only the journal
+rows rely on last_seq for exactly-once delivery.
+
+Connection and timeout errors are retried every interval. Errors that the
+same change sets would hit again (constraint, data or SQL errors) halt the
+projector instead: ``halted`` is set, pending sets are kept for the next
+checkpoint, and the journaled engine refuses commands until an operator
+repairs the data and restarts, which re-projects from the journal.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.pm_account.domain.models import Position
+from src.pm_clearing.infrastructure.memory_store import (
+    ChangeSet,
+    MemoryAccount,
+    MemoryClearingStore,
+    MemoryMarket,
+)
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
+from src.pm_common.database import async_session_factory
+from src.pm_common.metrics import REGISTRY
+from src.pm_order.infrastructure.persistence import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+_GET_LAST_SEQ_SQL = text("SELECT last_seq FROM journal_projection WHERE id = 1")
+_SET_LAST_SEQ_SQL = text(
+    "UPDATE journal_projection SET last_seq = :seq, updated_at = NOW() WHERE id = 1"
+)
+
+_UPDATE_ACCOUNT_SQL = text("""
+    UPDATE accounts
+    SET available_balance = :available_balance,
+        frozen_balance = :frozen_balance,
+        version = :version,
+        updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+_UPSERT_POSITION_SQL = text("""
+    INSERT INTO positions (user_id, market_id,
+        yes_volume, yes_cost_sum, yes_pending_sell,
+        no_volume, no_cost_sum, no_pending_sell, version)
+    VALUES (:user_id, :market_id,
+        :yes_volume, :yes_cost_sum, :yes_pending_sell,
+        :no_volume, :no_cost_sum, :no_pending_sell, :version)
+    ON CONFLICT (user_id, market_id) DO UPDATE
+    SET yes_volume = EXCLUDED.yes_volume,
+        yes_cost_sum = EXCLUDED.yes_cost_sum,
+        yes_pending_sell = EXCLUDED.yes_pending_sell,
+        no_volume = EXCLUDED.no_volume,
+        no_cost_sum = EXCLUDED.no_cost_sum,
+        no_pending_sell = EXCLUDED.no_pending_sell,
+        version = EXCLUDED.version,
+        updated_at = NOW()
+""")
+
+_UPDATE_MARKET_SQL = text("""
+    UPDATE markets
+    SET reserve_balance = :reserve_balance,
+        pnl_pool = :pnl_pool,
+        total_yes_shares = :total_yes_shares,
+        total_no_shares = :total_no_shares,
+        updated_at = NOW()
+    WHERE id = :id
+""")
+
+_UPSERT_ORDER_SQL = text("""
+    INSERT INTO orders (id, client_order_id, market_id, user_id,
+        original_side, original_direction, original_price,
+        book_type, book_direction, book_price, price_type, time_in_force,
+        quantity, filled_quantity, remaining_quantity,
+        frozen_amount, frozen_asset_type, status, created_at)
+    VALUES (:id, :client_order_id, :market_id, :user_id,
+        :original_side, :original_direction, :original_price,
+        :book_type, :book_direction, :book_price, 'LIMIT', :time_in_force,
+        :quantity, :filled_quantity, :remaining_quantity,
+        :frozen_amount, :frozen_asset_type, :status, :created_at)
+    ON CONFLICT (id) DO UPDATE
+    SET quantity = EXCLUDED.quantity,
+        filled_quantity = EXCLUDED.filled_quantity,
+        remaining_quantity = EXCLUDED.remaining_quantity,
+        frozen_amount = EXCLUDED.frozen_amount,
+        status = EXCLUDED.status,
+        updated_at = NOW()
+""")
+
+_LOAD_ACCOUNTS_SQL = text(
+    "SELECT user_id, available_balance, frozen_balance, auto_netting_enabled, version"
+    " FROM accounts"
+)
+_LOAD_POSITIONS_SQL = text("""
+    SELECT user_id, market_id, yes_volume, yes_cost_sum, yes_pending_sell,
+           no_volume, no_cost_sum, no_pending_sell, version
+    FROM positions
+""")
+_MARKET_COLUMNS = (
+    "id, status, reserve_balance, pnl_pool, total_yes_shares, total_no_shares, taker_fee_bps"
+)
+_LOAD_MARKETS_SQL = text(f"SELECT {_MARKET_COLUMNS} FROM markets")
+_GET_MARKET_SQL = text(f"SELECT {_MARKET_COLUMNS} FROM markets WHERE id = :market_id")
+
+# Re-applying the same merged change set would fail the same way
+_PERMANENT_ERRORS = (IntegrityError, DataError, ProgrammingError)
+
+_PROJECT_MS = REGISTRY.histogram(
+    "pm_journal_projection_ms", "Latency of one projector transaction"
+)
+
+
+def market_from_row(row: Any) -> MemoryMarket:
+    return MemoryMarket(
+        id=row.id,
+        status=row.status,
+        reserve_balance=row.reserve_balance,
+        pnl_pool=row.pnl_pool,
+        total_yes_shares=row.total_yes_shares,
+        total_no_shares=row.total_no_shares,
+        taker_fee_bps=row.taker_fee_bps,
+    )
+
+
+class JournalProjector:
+    def __init__(
+        self,
+        interval_ms: float = 50.0,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ) -> None:
+        self._interval = interval_ms / 1000
+        self._session_factory = session_factory
+        self.pending: list[tuple[int, ChangeSet]] = []
+        self.projected_seq = 0
+        self.halted: Exception | None = None  # set by run() on a non-retryable error
+
+    def enqueue(self, seq: int, changes: ChangeSet) -> None:
+        self.pending.append((seq, changes))
+
+    # -- recovery ----------------------------------------------------------
+
+    async def load_last_seq(self, db: AsyncSession) -> int:
+        self.projected_seq = (await db.execute(_GET_LAST_SEQ_SQL)).scalar_one()
+        return self.projected_seq
+
+    async def load_state(self, store: MemoryClearingStore, db: AsyncSession) -> None:
+        """Seed an empty store from the projected tables (no checkpoint yet)."""
+        for row in (await db.execute(_LOAD_ACCOUNTS_SQL)).fetchall():
+            store.accounts[row.user_id] = MemoryAccount(
+                row.available_balance, row.frozen_balance, row.auto_netting_enabled, row.version
+            )
+        for row in (await db.execute(_LOAD_POSITIONS_SQL)).fetchall():
+            store.positions[(row.user_id, row.market_id)] = Position(
+                user_id=row.user_id,
+                market_id=row.market_id,
+                yes_volume=row.yes_volume,
+                yes_cost_sum=row.yes_cost_sum,
+                yes_pending_sell=row.yes_pending_sell,
+                no_volume=row.no_volume,
+                no_cost_sum=row.no_cost_sum,
+                no_pending_sell=row.no_pending_sell,
+                version=row.version,
+            )
+        repo = OrderRepository()
+        for row in (await db.execute(_LOAD_MARKETS_SQL)).fetchall():
+            store.markets[row.id] = market_from_row(row)
+            for order in await repo.list_open_by_market(row.id, db):
+                store.orders[order.id] = order
+                store.client_order_ids[(order.user_id, order.client_order_id)] = order.id
+
+    async def load_market(self, market_id: str, db: AsyncSession) -> MemoryMarket | None:
+        row = (await db.execute(_GET_MARKET_SQL, {"market_id": market_id})).fetchone()
+        return market_from_row(row) if row is not None else None
+
+    # -- projection --------------------------------------------------------
+
+    async def run(self, durable_seq: Callable[[], int]) -> None:
+        """Project durable change sets every interval until cancelled or halted."""
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.project(durable_seq())
+            except _PERMANENT_ERRORS as exc:
+                self.halted = exc
+                logger.critical(
+                    "Journal projection halted after seq %d; %d change sets pending",
+                    self.projected_seq,
+                    len(self.pending),
+                    exc_info=True,
+                )
+                return
+            except Exception:
+                logger.exception("Journal projection failed; retrying")
+
+    async def project(self, upto_seq: int) -> int:
+        """Apply every queued change set with seq <= ``upto_seq``. Returns how many."""
+        count = 0
+        while count < len(self.pending) and self.pending[count][0] <= upto_seq:
+            count += 1
+        if count == 0:
+            return 0
+        merged = ChangeSet()
+        for _, changes in self.pending[:count]:
+            merged.merge(changes)
+        last_seq = self.pending[count - 1][0]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with self._session_factory() as db, db.begin():
+            await self._apply(merged, db)
+            await db.execute(_SET_LAST_SEQ_SQL, {"seq": last_seq})
+        _PROJECT_MS.labels().observe((loop.time() - start) * 1000)
+        del self.pending[:count]
+        self.projected_seq = last_seq
+        return count
+
+    async def _apply(self, changes: ChangeSet, db: AsyncSession) -> None:
+        for user_id, account in changes.accounts.items():
+            await db.execute(
+                _UPDATE_ACCOUNT_SQL,
+                {
+                    "user_id": user_id,
+                    "available_balance": account.available_balance,
+                    "frozen_balance": account.frozen_balance,
+                    "version": account.version,
+                },
+            )
+        for (user_id, market_id), p in changes.positions.items():
+            await db.execute(
+                _UPSERT_POSITION_SQL,
+                {
+                    "user_id": user_id,
+                    "market_id": market_id,
+                    "yes_volume": p.yes_volume,
+                    "yes_cost_sum": p.yes_cost_sum,
+                    "yes_pending_sell": p.yes_pending_sell,
+                    "no_volume": p.no_volume,
+                    "no_cost_sum": p.no_cost_sum,
+                    "no_pending_sell": p.no_pending_sell,
+                    "version": p.version,
+                },
+            )
+        for market in changes.markets.values():
+            await db.execute(
+                _UPDATE_MARKET_SQL,
+                {
+                    "id": market.id,
+                    "reserve_balance": market.reserve_balance,
+                    "pnl_pool": market.pnl_pool,
+                    "total_yes_shares": market.total_yes_shares,
+                    "total_no_shares": market.total_no_shares,
+                },
+            )
+        for order in changes.orders.values():
+            await db.execute(
+                _UPSERT_ORDER_SQL,
+                {
+                    "id": order.id,
+                    "client_order_id": order.client_order_id,
+                    "market_id": order.market_id,
+                    "user_id": order.user_id,
+                    "original_side": order.original_side,
+                    "original_direction": order.original_direction,
+                    "original_price": order.original_price,
+                    "book_type": order.book_type,
+                    "book_direction": order.book_direction,
+                    "book_price": order.book_price,
+                    "time_in_force": order.time_in_force,
+                    "quantity": order.quantity,
+                    "filled_quantity": order.filled_quantity,
+                    "remaining_quantity": order.remaining_quantity,
+                    "frozen_amount": order.frozen_amount,
+                    "frozen_asset_type": order.frozen_asset_type,
+                    "status": order.status,
+                    "created_at": order.created_at,
+                },
+            )
+        for row in changes.ledger:
+            await sql_clearing_store.insert_ledger(**row, db=db)
+        for row in changes.wal_events:
+            await sql_clearing_store.insert_wal_event(
+                row["market_id"], row["event_type"], row["payload"], db, row.get("book_seq")
+            )
+        for row in changes.trades:
+            await sql_clearing_store.insert_trade(row, db)
+        await sql_clearing_store.insert_outbox_events(changes.outbox, db)
@@ -8,12 +8,12 @@ from typing import Annotated
 
 from fastapi import Depends
 from fastapi.routing import APIRouter
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.pm_common.database import get_db_session
+from src.pm_common.database import DbSession
 from src.pm_common.response import ApiResponse
 from src.pm_gateway.auth.dependencies import require_amm_user
 from src.pm_gateway.user.db_models import UserModel
+from src.pm_matching.application.journaled_engine import require_sql_mode
 from src.pm_matching.application.service import get_matching_engine
 from src.pm_order.application.amm_schemas import (
     BatchCancelRequest,
@@ -30,11 +30,11 @@ router = APIRouter(tags=["AMM Orders"])
 _repo = OrderRepository()
 
 
-@router.post("/replace")
+@router.post("/replace", dependencies=[Depends(require_sql_mode)])
 async def atomic_replace(
     request: ReplaceRequest,
     current_user: Annotated[UserModel, Depends(require_amm_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
 ) -> ApiResponse:
     """Atomic Replace: cancel old order + place new order atomically.
 
@@ -42,6 +42,7 @@ async def atomic_replace(
     """
     engine = get_matching_engine()
     try:
+        # The engine commits under the market lock
         result = await engine.replace_order(
             old_order_id=request.old_order_id,
             new_order_params=request.new_order,
@@ -49,7 +50,6 @@ async def atomic_replace(
             repo=_repo,
             db=db,
         )
-        await db.commit()
     except Exception:
         await db.rollback()
         raise
@@ -61,11 +61,11 @@ async def atomic_replace(
     )
 
 
-@router.post("/batch-cancel")
+@router.post("/batch-cancel", dependencies=[Depends(require_sql_mode)])
 async def batch_cancel(
     request: BatchCancelRequest,
     current_user: Annotated[UserModel, Depends(require_amm_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
 ) -> ApiResponse:
     """Batch Cancel: cancel all AMM orders in a market by scope.
 
@@ -73,13 +73,14 @@ async def batch_cancel(
     """
     engine = get_matching_engine()
     try:
+        # The engine commits under the market lock
         result = await engine.batch_cancel(
             market_id=request.market_id,
             user_id=str(current_user.id),
             cancel_scope=request.cancel_scope,
+            repo=_repo,
             db=db,
         )
-        await db.commit()
     except Exception:
         await db.rollback()
         raise
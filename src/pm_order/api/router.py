@@ -1,20 +1,24 @@
 # src/pm_order/api/router.py
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketException, status
 
-from src.pm_common.database import get_db_session
-from src.pm_gateway.auth.dependencies import get_current_user
+from config.settings import settings
+from src.pm_common.database import DbSession, ReadDbSession
+from src.pm_common.websocket import stream_json
+from src.pm_gateway.auth.dependencies import get_current_user, get_websocket_user
 from src.pm_gateway.user.db_models import UserModel
 from src.pm_order.application import service as svc
 from src.pm_order.application.schemas import (
+    AmendOrderRequest,
+    AmendOrderResponse,
     CancelOrderResponse,
     OrderListResponse,
     OrderResponse,
     PlaceOrderRequest,
     PlaceOrderResponse,
 )
+from src.pm_order.application.user_stream import get_user_event_stream
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -23,7 +27,7 @@ router = APIRouter(prefix="/orders", tags=["orders"])
 async def place_order(
     req: PlaceOrderRequest,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
 ) -> PlaceOrderResponse:
     return await svc.place_order(req, str(current_user.id), db)
 
@@ -32,15 +36,25 @@ async def place_order(
 async def cancel_order(
     order_id: str,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
 ) -> CancelOrderResponse:
     return await svc.cancel_order(order_id, str(current_user.id), db)
 
 
+@router.post("/{order_id}/amend", response_model=AmendOrderResponse)
+async def amend_order(
+    order_id: str,
+    req: AmendOrderRequest,
+    current_user: Annotated[UserModel, Depends(get_current_user)],
+    db: DbSession,
+) -> AmendOrderResponse:
+    return await svc.amend_order(order_id, req.quantity, str(current_user.id), db)
+
+
 @router.get("", response_model=OrderListResponse)
 async def list_orders(
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: ReadDbSession,
     market_id: str | None = Query(None, description="Filter by market ID"),
     status: str | None = Query(None, description="Filter by order status"),
     side: str | None = Query(None, description="Filter by side (YES or NO)"),
@@ -57,6 +71,20 @@ async def list_orders(
 async def get_order(
     order_id: str,
     current_user: Annotated[UserModel, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db_session)],
+    db: DbSession,
 ) -> OrderResponse:
     return await svc.get_order(order_id, str(current_user.id), db)
+
+
+@router.websocket("/ws")
+async def user_stream(
+    websocket: WebSocket,
+    current_user: Annotated[UserModel, Depends(get_websocket_user)],
+    since: int | None = Query(None, ge=0, description="Last seq received, to resume"),
+) -> None:
+    """Private order, fill, balance and position events; see user_stream.py."""
+    if not settings.USER_STREAM_ENABLED:
+        raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="Stream disabled")
+    await websocket.accept()
+    messages = get_user_event_stream().messages(str(current_user.id), since)
+    await stream_json(websocket, messages)
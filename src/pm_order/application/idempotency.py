@@ -0,0 +1,162 @@
+# src/pm_order/application/idempotency.py
+"""In-memory fast path for the client_order_id idempotency check.
+
+Almost every placed order carries a fresh client_order_id, yet the check
+used to cost an indexed SELECT per request. Each user gets a scalable Bloom
+filter of every client_order_id seen, so a negative answer ("definitely
+new") skips the DB. A small LRU maps recent ids to their order id so quick
+retries are answered from the engine's live handles.
+
+The filter is only a hint. Until warm_up() has run every check goes to the
+DB, and ids written by other processes are absent from this one's filter;
+the unique constraint uq_orders_client_order_id stays the final guard and
+place_order falls back to the DB lookup when it fires.
+"""
+from collections import OrderedDict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_common.bloom import ScalableBloomFilter
+from src.pm_common.metrics import REGISTRY
+from src.pm_order.infrastructure.persistence import OrderRepository
+
+_LRU_SIZE = 10_000
+_USER_INITIAL_CAPACITY = 256
+_FP_RATE = 0.01
+
+
+class ClientOrderIdFilter:
+    def __init__(
+        self,
+        lru_size: int = _LRU_SIZE,
+        initial_capacity: int = _USER_INITIAL_CAPACITY,
+        fp_rate: float = _FP_RATE,
+    ) -> None:
+        self._lru_size = lru_size
+        self._initial_capacity = initial_capacity
+        self._fp_rate = fp_rate
+        self._filters: dict[str, ScalableBloomFilter] = {}
+        self._recent: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._warmed = False
+        # Counters
+        self.lru_hits = 0
+        self.definitely_new = 0
+        self.db_checks = 0
+        self.false_positives = 0
+
+    @property
+    def warmed(self) -> bool:
+        return self._warmed
+
+    async def warm_up(self, repo: OrderRepository, db: AsyncSession) -> None:
+        """Seed the filters with every stored client_order_id. Call once at startup.
+
+        Rows are streamed, so the orders table is never held in memory.
+        """
+        self._filters.clear()
+        async for user_id, client_order_id in repo.stream_client_order_ids(db):
+            self._filter_for(user_id).add(client_order_id)
+        self._warmed = True
+
+    def recent_order_id(self, user_id: str, client_order_id: str) -> str | None:
+        """Order id of a recently placed order with this client_order_id, if cached."""
+        key = (user_id, client_order_id)
+        order_id = self._recent.get(key)
+        if order_id is not None:
+            self._recent.move_to_end(key)
+            self.lru_hits += 1
+        return order_id
+
+    def is_definitely_new(self, user_id: str, client_order_id: str) -> bool:
+        """True only when this client_order_id has certainly never been stored."""
+        if not self._warmed:
+            return False
+        bloom = self._filters.get(user_id)
+        if bloom is None or client_order_id not in bloom:
+            self.definitely_new += 1
+            return True
+        return False
+
+    def record_db_check(self, found: bool) -> None:
+        """Record the outcome of a DB lookup the filter could not rule out."""
+        self.db_checks += 1
+        if not found and self._warmed:
+            self.false_positives += 1
+
+    def add(self, user_id: str, client_order_id: str, order_id: str) -> None:
+        self._filter_for(user_id).add(client_order_id)
+        key = (user_id, client_order_id)
+        self._recent[key] = order_id
+        self._recent.move_to_end(key)
+        if len(self._recent) > self._lru_size:
+            self._recent.popitem(last=False)
+
+    def _filter_for(self, user_id: str) -> ScalableBloomFilter:
+        bloom = self._filters.get(user_id)
+        if bloom is None:
+            bloom = ScalableBloomFilter(self._initial_capacity, self._fp_rate)
+            self._filters[user_id] = bloom
+        return bloom
+
+    def stats(self) -> dict[str, float]:
+        """Observed and theoretical false-positive rates plus memory footprint."""
+        negatives = self.definitely_new + self.false_positives
+        estimated = [b.estimated_fp_rate() for b in self._filters.values()]
+        return {
+            "users": len(self._filters),
+            "keys": sum(len(b) for b in self._filters.values()),
+            "size_bytes": sum(b.size_bytes for b in self._filters.values()),
+            "lru_size": len(self._recent),
+            "lru_hits": self.lru_hits,
+            "definitely_new": self.definitely_new,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+            "observed_fp_rate": self.false_positives / negatives if negatives else 0.0,
+            "estimated_fp_rate_max": max(estimated, default=0.0),
+        }
+
+
+_filter: ClientOrderIdFilter | None = None
+
+
+def get_client_order_filter() -> ClientOrderIdFilter:
+    global _filter  # noqa: PLW0603
+    if _filter is None:
+        _filter = ClientOrderIdFilter()
+    return _filter
+
+
+def _filter_counts() -> list[tuple[tuple[str], float]]:
+    stats = get_client_order_filter().stats()
+    return [
+        ((key,), stats[key])
+        for key in ("lru_hits", "definitely_new", "db_checks", "false_positives")
+    ]
+
+
+def _filter_fp_rates() -> list[tuple[tuple[str], float]]:
+    stats = get_client_order_filter().stats()
+    return [
+        (("observed",), stats["observed_fp_rate"]),
+        (("estimated_max",), stats["estimated_fp_rate_max"]),
+    ]
+
+
+REGISTRY.callback(
+    "pm_client_order_filter_total",
+    "client_order_id idempotency checks by outcome",
+    _filter_counts,
+    ("outcome",),
+    kind="counter",
+)
+REGISTRY.callback(
+    "pm_client_order_filter_fp_rate",
+    "Bloom filter false-positive rate",
+    _filter_fp_rates,
+    ("kind",),
+)
+REGISTRY.callback(
+    "pm_client_order_filter_bytes",
+    "Memory held by the per-user Bloom filters",
+    lambda: [((), get_client_order_filter().stats()["size_bytes"])],
+)
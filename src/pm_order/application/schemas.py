@@ -65,6 +65,20 @@ class CancelOrderResponse(BaseModel):
     remaining_quantity_cancelled: int
 
 
+class AmendOrderRequest(BaseModel):
+    quantity: int  # new total order size; must be below the current quantity
+
+
+class AmendOrderResponse(BaseModel):
+    order_id: str
+    status: str
+    quantity: int
+    filled_quantity: int
+    remaining_quantity: int
+    unfrozen_amount: int
+    unfrozen_asset_type: str
+
+
 class OrderListResponse(BaseModel):
     items: list[OrderResponse]
     next_cursor: str | None
@@ -1,13 +1,18 @@
 # src/pm_order/application/service.py
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from src.pm_common.datetime_utils import utc_now
 from src.pm_common.errors import AppError, DuplicateOrderError
 from src.pm_common.id_generator import generate_id
+from src.pm_matching.application.journaled_engine import get_journaled_engine
 from src.pm_matching.application.service import get_matching_engine
 from src.pm_matching.domain.models import TradeResult
 from src.pm_matching.engine.scenario import determine_scenario
+from src.pm_order.application.idempotency import get_client_order_filter
 from src.pm_order.application.schemas import (
+    AmendOrderResponse,
     CancelOrderResponse,
     OrderListResponse,
     OrderResponse,
@@ -20,6 +25,8 @@ from src.pm_order.infrastructure.persistence import OrderRepository
 
 _repo = OrderRepository()
 
+_OPEN_STATUSES = ("OPEN", "PARTIALLY_FILLED")
+
 
 def _order_to_response(order: Order) -> OrderResponse:
     return OrderResponse(
@@ -65,20 +72,46 @@ def _build_place_response(
     )
 
 
+async def _find_existing_order(
+    client_order_id: str, user_id: str, db: AsyncSession
+) -> Order | None:
+    """Look up a prior order with this client_order_id, skipping the DB when provably new."""
+    coid_filter = get_client_order_filter()
+    order_id = coid_filter.recent_order_id(user_id, client_order_id)
+    if order_id is not None:
+        handle = get_matching_engine().get_open_order(order_id)
+        if handle is not None:
+            return handle
+    elif coid_filter.is_definitely_new(user_id, client_order_id):
+        return None
+    existing = None
+    if settings.JOURNAL_MODE_ENABLED:  # orders not yet projected exist only in memory
+        existing = await get_journaled_engine().repo.get_by_client_order_id(
+            client_order_id, user_id, db
+        )
+    existing = existing or await _repo.get_by_client_order_id(client_order_id, user_id, db)
+    coid_filter.record_db_check(found=existing is not None)
+    return existing
+
+
+def _idempotent_replay(existing: Order, req: PlaceOrderRequest) -> PlaceOrderResponse:
+    if (
+        existing.original_side != req.side
+        or existing.original_direction != req.direction
+        or existing.original_price != req.price_cents
+        or existing.quantity != req.quantity
+    ):
+        raise DuplicateOrderError(req.client_order_id)
+    return _build_place_response(existing, [], None)
+
+
 async def place_order(
     req: PlaceOrderRequest, user_id: str, db: AsyncSession
 ) -> PlaceOrderResponse:
     # Idempotency check
-    existing = await _repo.get_by_client_order_id(req.client_order_id, user_id, db)
+    existing = await _find_existing_order(req.client_order_id, user_id, db)
     if existing:
-        if (
-            existing.original_side != req.side
-            or existing.original_direction != req.direction
-            or existing.original_price != req.price_cents
-            or existing.quantity != req.quantity
-        ):
-            raise DuplicateOrderError(req.client_order_id)
-        return _build_place_response(existing, [], None)
+        return _idempotent_replay(existing, req)
 
     order = Order(
         id=generate_id(),
@@ -97,13 +130,37 @@ async def place_order(
         created_at=utc_now(),
         updated_at=utc_now(),
     )
-    engine = get_matching_engine()
-    try:
-        order, trades, netting_qty = await engine.place_order(order, _repo, db)
-        await db.commit()
-    except Exception:
-        await db.rollback()
-        raise
+    if settings.JOURNAL_MODE_ENABLED:
+        journaled = get_journaled_engine()
+        try:
+            order, trades, netting_qty = await journaled.place_order(order, db)
+        except DuplicateOrderError:
+            # An earlier request with this client_order_id got in first (e.g. a retry
+            # sent while it waited for its fsync)
+            existing = await journaled.repo.get_by_client_order_id(
+                req.client_order_id, user_id, db
+            )
+            if existing is None:
+                raise
+            return _idempotent_replay(existing, req)
+    else:
+        engine = get_matching_engine()
+        try:
+            # The engine commits under the market lock, before anyone is told
+            order, trades, netting_qty = await engine.place_order(order, _repo, db)
+        except IntegrityError as exc:
+            await db.rollback()
+            if "uq_orders_client_order_id" not in str(exc.orig):
+                raise
+            # The filter said "new" but another process got there first
+            existing = await _repo.get_by_client_order_id(req.client_order_id, user_id, db)
+            if existing is None:
+                raise
+            return _idempotent_replay(existing, req)
+        except Exception:
+            await db.rollback()
+            raise
+        get_client_order_filter().add(user_id, order.client_order_id, order.id)
     netting: dict[str, int] | None = (
         {"netting_qty": netting_qty, "refund_amount": netting_qty * 100} if netting_qty else None
     )
@@ -113,13 +170,15 @@ async def place_order(
 async def cancel_order(
     order_id: str, user_id: str, db: AsyncSession
 ) -> CancelOrderResponse:
-    engine = get_matching_engine()
-    try:
-        order = await engine.cancel_order(order_id, user_id, _repo, db)
-        await db.commit()
-    except Exception:
-        await db.rollback()
-        raise
+    if settings.JOURNAL_MODE_ENABLED:
+        order = await get_journaled_engine().cancel_order(order_id, user_id)
+    else:
+        engine = get_matching_engine()
+        try:
+            order = await engine.cancel_order(order_id, user_id, _repo, db)
+        except Exception:
+            await db.rollback()
+            raise
     return CancelOrderResponse(
         order_id=order.id,
         status=order.status,
@@ -129,10 +188,34 @@ async def cancel_order(
     )
 
 
+async def amend_order(
+    order_id: str, quantity: int, user_id: str, db: AsyncSession
+) -> AmendOrderResponse:
+    if settings.JOURNAL_MODE_ENABLED:
+        order, released = await get_journaled_engine().amend_order(order_id, quantity, user_id)
+    else:
+        engine = get_matching_engine()
+        try:
+            order, released = await engine.amend_order(order_id, quantity, user_id, _repo, db)
+        except Exception:
+            await db.rollback()
+            raise
+    return AmendOrderResponse(
+        order_id=order.id,
+        status=order.status,
+        quantity=order.quantity,
+        filled_quantity=order.filled_quantity,
+        remaining_quantity=order.remaining_quantity,
+        unfrozen_amount=released,
+        unfrozen_asset_type=order.frozen_asset_type,
+    )
+
+
 async def get_order(
     order_id: str, user_id: str, db: AsyncSession
 ) -> OrderResponse:
-    order = await _repo.get_by_id(order_id, db)
+    # Resting orders are answered from the engine's live handles
+    order = get_matching_engine().get_open_order(order_id) or await _repo.get_by_id(order_id, db)
     if order is None:
         raise AppError(4004, "Order not found", http_status=404)
     if order.user_id != user_id:
@@ -151,16 +234,21 @@ async def list_orders(
     db: AsyncSession,
 ) -> OrderListResponse:
     statuses = [status] if status else None
-    orders = await _repo.list_by_user(
-        user_id=user_id,
-        market_id=market_id,
-        statuses=statuses,
-        side=side,
-        direction=direction,
-        limit=limit + 1,
-        cursor_id=cursor,
-        db=db,
-    )
+    orders: list[Order] | None = None
+    if status in _OPEN_STATUSES:
+        # "My open orders" — served from the engine's per-user index when complete
+        orders = _list_open_from_engine(user_id, market_id, status, side, direction, limit, cursor)
+    if orders is None:
+        orders = await _repo.list_by_user(
+            user_id=user_id,
+            market_id=market_id,
+            statuses=statuses,
+            side=side,
+            direction=direction,
+            limit=limit + 1,
+            cursor_id=cursor,
+            db=db,
+        )
     has_more = len(orders) > limit
     if has_more:
         orders = orders[:limit]
@@ -170,3 +258,28 @@ async def list_orders(
         next_cursor=next_cursor,
         has_more=has_more,
     )
+
+
+def _list_open_from_engine(
+    user_id: str,
+    market_id: str | None,
+    status: str | None,
+    side: str | None,
+    direction: str | None,
+    limit: int,
+    cursor: str | None,
+) -> list[Order] | None:
+    """Same filtering and ordering as OrderRepository.list_by_user, over live handles."""
+    handles = get_matching_engine().list_open_orders(user_id, market_id)
+    if handles is None:
+        return None
+    matched = [
+        o
+        for o in handles
+        if o.status == status
+        and (side is None or o.original_side == side)
+        and (direction is None or o.original_direction == direction)
+        and (cursor is None or o.id < cursor)
+    ]
+    matched.sort(key=lambda o: o.id, reverse=True)
+    return matched[: limit + 1]
@@ -0,0 +1,182 @@
+"""UserEventStream — private per-user order, fill, balance and position events.
+
+Registered as a MatchingEngine listener with ``events=True``, so it hears of
+a command only once it has committed (journal mode: once it is durable) and
+never pushes a fill that is then rolled back. Each command's outbox rows (see
+clearing outbox.py) are split by user, numbered with the user's next sequence
+number and appended to that user's ring buffer, so the matching path only
+does a few deque appends. Connections read their user's
+buffer from a cursor; a reconnecting client passes the last seq it saw and
+gets everything after it that is still buffered.
+
+Messages:
+    {"type": "subscribed", "seq"}     first message; seq of the newest buffered event
+    {"type": "gap", "seq"}            events after the requested seq were dropped
+                                      (buffer overflow or a restart); refetch via
+                                      GET /orders, /trades and /account/balance
+    {"seq", "type": "order", "data": {order_id, status, remaining_quantity, ...}}
+    {"seq", "type": "fill", "data": {trade_id, order_id, role, fee, realized_pnl, ...}}
+    {"seq", "type": "balance", "data": {available_balance, frozen_balance}}
+    {"seq", "type": "position", "data": {market_id, yes_volume, ...}}
+Seqs are per user and per process, strictly increasing by one.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+from config.settings import settings
+from src.pm_common.metrics import REGISTRY
+from src.pm_matching.domain.models import CommandOutcome
+
+_GAPS = REGISTRY.counter(
+    "pm_user_stream_gaps_total", "Private stream resumes that could not be served from buffer"
+)
+
+
+def fill_view(trade: dict[str, Any], user_id: str) -> dict[str, Any]:
+    """One party's side of a TRADE_EXECUTED payload."""
+    side = "buy" if trade["buy_user_id"] == user_id else "sell"
+    order_id = trade[f"{side}_order_id"]
+    role = "TAKER" if trade["taker_order_id"] == order_id else "MAKER"
+    return {
+        "trade_id": trade["trade_id"],
+        "market_id": trade["market_id"],
+        "order_id": order_id,
+        "direction": side.upper(),
+        "book_type": trade[f"{side}_book_type"],
+        "price": trade["price"],
+        "quantity": trade["quantity"],
+        "role": role,
+        "fee": trade["taker_fee"] if role == "TAKER" else trade["maker_fee"],
+        "realized_pnl": trade[f"{side}_realized_pnl"],
+        "executed_at": trade["executed_at"],
+    }
+
+
+def _split(row: dict[str, Any]) -> list[tuple[str, str, dict[str, Any]]]:
+    """(user_id, message type, data) for each user an outbox row concerns."""
+    payload = row["payload"]
+    event_type = row["event_type"]
+    if event_type == "TRADE_EXECUTED":
+        return [
+            (user_id, "fill", fill_view(payload, user_id))
+            for user_id in (payload["buy_user_id"], payload["sell_user_id"])
+        ]
+    if event_type == "ORDER_UPDATED":
+        return [(row["user_id"], "order", payload)]
+    if event_type == "BALANCE_CHANGED":
+        return [(row["user_id"], "balance", payload)]
+    return [(row["user_id"], "position", payload)]
+
+
+class _UserBuffer:
+    def __init__(self, size: int) -> None:
+        self.seq = 0
+        self.events: deque[dict[str, Any]] = deque(maxlen=size)
+        self.waiters: set[asyncio.Event] = set()
+
+    def append(self, message_type: str, data: dict[str, Any]) -> None:
+        self.seq += 1
+        self.events.append({"seq": self.seq, "type": message_type, "data": data})
+        for waiter in self.waiters:
+            waiter.set()
+
+    def after(self, seq: int) -> list[dict[str, Any]] | None:
+        """Buffered events with a higher seq; None if some of them were dropped."""
+        if seq > self.seq:
+            return None  # from before a restart
+        if seq == self.seq:
+            return []
+        if not self.events or self.events[0]["seq"] > seq + 1:
+            return None
+        return list(self.events)[len(self.events) - (self.seq - seq) :]
+
+
+class UserEventStream:
+    def __init__(self, buffer_size: int = 1000, max_users: int = 10_000) -> None:
+        self._buffer_size = buffer_size
+        self._max_users = max_users
+        self._buffers: OrderedDict[str, _UserBuffer] = OrderedDict()  # LRU by last event
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(b.waiters) for b in self._buffers.values())
+
+    def seq(self, user_id: str) -> int:
+        buffer = self._buffers.get(user_id)
+        return buffer.seq if buffer is not None else 0
+
+    def on_outcome(self, outcome: CommandOutcome) -> None:
+        """Engine listener for committed commands: append each user's events to their buffer."""
+        for row in outcome.events:
+            for user_id, message_type, data in _split(row):
+                self._buffer(user_id).append(message_type, data)
+
+    def _buffer(self, user_id: str) -> _UserBuffer:
+        buffer = self._buffers.get(user_id)
+        if buffer is None:
+            buffer = self._buffers[user_id] = _UserBuffer(self._buffer_size)
+            self._evict()
+        else:
+            self._buffers.move_to_end(user_id)
+        return buffer
+
+    def _evict(self) -> None:
+        """Drop the least recently active buffers without open connections."""
+        excess = len(self._buffers) - self._max_users
+        for user_id in list(self._buffers):
+            if excess <= 0:
+                break
+            if not self._buffers[user_id].waiters:
+                del self._buffers[user_id]
+                excess -= 1
+
+    async def messages(self, user_id: str, since: int | None) -> AsyncIterator[dict[str, Any]]:
+        """Stream for one connection: replay after ``since`` (if given), then live events."""
+        buffer = self._buffer(user_id)
+        waiter = asyncio.Event()
+        buffer.waiters.add(waiter)
+        try:
+            cursor = buffer.seq
+            yield {"type": "subscribed", "seq": cursor}
+            if since is not None:
+                if buffer.after(since) is None:
+                    _GAPS.labels().inc()
+                    yield {"type": "gap", "seq": cursor}
+                else:
+                    cursor = since
+            while True:
+                pending = buffer.after(cursor)
+                if pending is None:  # fell behind by more than the buffer
+                    _GAPS.labels().inc()
+                    cursor = buffer.seq
+                    yield {"type": "gap", "seq": cursor}
+                    continue
+                if not pending:
+                    waiter.clear()
+                    await waiter.wait()
+                    continue
+                for event in pending:
+                    cursor = event["seq"]
+                    yield event
+        finally:
+            buffer.waiters.discard(waiter)
+
+
+_stream: UserEventStream | None = None
+
+
+def get_user_event_stream() -> UserEventStream:
+    global _stream  # noqa: PLW0603
+    if _stream is None:
+        _stream = UserEventStream(settings.USER_STREAM_BUFFER, settings.USER_STREAM_MAX_USERS)
+    return _stream
+
+
+REGISTRY.callback(
+    "pm_user_stream_subscribers",
+    "Open private user-stream WebSocket connections",
+    lambda: [((), _stream.subscriber_count)] if _stream is not None else [],
+)
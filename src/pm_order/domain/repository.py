@@ -18,6 +18,10 @@ class OrderRepositoryProtocol(Protocol):
 
     async def update_status(self, order: Order, db: AsyncSession) -> None: ...
 
+    async def amend_quantity(self, order: Order, db: AsyncSession) -> None: ...
+
+    async def list_open_by_market(self, market_id: str, db: AsyncSession) -> list[Order]: ...
+
     async def list_by_user(
         self,
         user_id: str,
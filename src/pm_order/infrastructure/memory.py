@@ -0,0 +1,103 @@
+# src/pm_order/infrastructure/memory.py
+"""In-memory OrderRepositoryProtocol backed by a MemoryClearingStore.
+
+Orders live in ``store.orders`` as snapshots (copies), like rows in the
+orders table, and take part in the store's transaction rollback.
+"""
+import copy
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.datetime_utils import utc_now
+from src.pm_common.errors import DuplicateOrderError
+from src.pm_order.domain.models import Order
+
+
+class MemoryOrderRepository:
+    def __init__(self, store: MemoryClearingStore) -> None:
+        self._store = store
+        self._orders: dict[str, Order] = store.orders
+        self._client_ids: dict[tuple[str, str], str] = store.client_order_ids
+
+    async def save(self, order: Order, db: AsyncSession) -> None:
+        """Insert an order; a second order with its (user_id, client_order_id) is rejected.
+
+        The in-memory counterpart of uq_orders_client_order_id.
+        """
+        key = (order.user_id, order.client_order_id)
+        if self._client_ids.get(key, order.id) != order.id:
+            raise DuplicateOrderError(order.client_order_id)
+        self._store.touch(self._orders, order.id)
+        row = copy.copy(order)
+        row.created_at = row.created_at or utc_now()
+        self._orders[order.id] = row
+        self._store.touch(self._client_ids, key)
+        self._client_ids[key] = order.id
+
+    async def get_by_id(self, order_id: str, db: AsyncSession) -> Order | None:
+        row = self._orders.get(order_id)
+        return copy.copy(row) if row is not None else None
+
+    async def get_by_client_order_id(
+        self, client_order_id: str, user_id: str, db: AsyncSession
+    ) -> Order | None:
+        order_id = self._client_ids.get((user_id, client_order_id))
+        return await self.get_by_id(order_id, db) if order_id is not None else None
+
+    async def update_status(self, order: Order, db: AsyncSession) -> None:
+        row = self._orders.get(order.id)
+        if row is None:
+            return
+        self._store.touch(self._orders, order.id)
+        row.status = order.status
+        row.filled_quantity = order.filled_quantity
+        row.remaining_quantity = order.remaining_quantity
+        row.frozen_amount = order.frozen_amount
+        row.updated_at = utc_now()
+
+    async def amend_quantity(self, order: Order, db: AsyncSession) -> None:
+        row = self._orders.get(order.id)
+        if row is None:
+            return
+        self._store.touch(self._orders, order.id)
+        row.quantity = order.quantity
+        row.remaining_quantity = order.remaining_quantity
+        row.frozen_amount = order.frozen_amount
+        row.updated_at = utc_now()
+
+    async def list_open_by_market(self, market_id: str, db: AsyncSession) -> list[Order]:
+        rows = [o for o in self._orders.values() if o.market_id == market_id and o.is_active]
+        rows.sort(key=lambda o: (o.created_at or utc_now(), o.id))
+        return [copy.copy(o) for o in rows]
+
+    async def stream_client_order_ids(
+        self, db: AsyncSession
+    ) -> AsyncIterator[tuple[str, str]]:
+        for key in list(self._client_ids):
+            yield key
+
+    async def list_by_user(
+        self,
+        user_id: str,
+        market_id: str | None,
+        statuses: list[str] | None,
+        side: str | None,
+        direction: str | None,
+        limit: int,
+        cursor_id: str | None,
+        db: AsyncSession,
+    ) -> list[Order]:
+        rows = [
+            o
+            for o in self._orders.values()
+            if o.user_id == user_id
+            and (market_id is None or o.market_id == market_id)
+            and (not statuses or o.status in statuses)
+            and (side is None or o.original_side == side)
+            and (direction is None or o.original_direction == direction)
+            and (cursor_id is None or o.id < cursor_id)
+        ]
+        rows.sort(key=lambda o: o.id, reverse=True)
+        return [copy.copy(o) for o in rows[:limit]]
@@ -1,5 +1,6 @@
 # src/pm_order/infrastructure/persistence.py
 """OrderRepository — raw SQL persistence implementation."""
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy import text
@@ -31,6 +32,13 @@ _UPDATE_ORDER_SQL = text("""
     WHERE id = :id
 """)
 
+_AMEND_ORDER_SQL = text("""
+    UPDATE orders
+    SET quantity = :quantity, remaining_quantity = :remaining_quantity,
+        frozen_amount = :frozen_amount, updated_at = NOW()
+    WHERE id = :id
+""")
+
 _SELECT_COLUMNS = """
     id, client_order_id, market_id, user_id,
     original_side, original_direction, original_price,
@@ -49,6 +57,17 @@ _GET_ORDER_BY_CLIENT_ID_SQL = text(f"""
     FROM orders WHERE client_order_id = :client_order_id AND user_id = :user_id
 """)
 
+_LIST_OPEN_BY_MARKET_SQL = text(f"""
+    SELECT {_SELECT_COLUMNS}
+    FROM orders
+    WHERE market_id = :market_id AND status IN ('OPEN', 'PARTIALLY_FILLED')
+    ORDER BY created_at ASC, id ASC
+""")
+
+_LIST_CLIENT_ORDER_IDS_SQL = text("""
+    SELECT user_id, client_order_id FROM orders
+""")
+
 _LIST_ORDERS_SQL = text(f"""
     SELECT {_SELECT_COLUMNS}
     FROM orders
@@ -151,6 +170,29 @@ class OrderRepository:
             },
         )
 
+    async def amend_quantity(self, order: Order, db: AsyncSession) -> None:
+        await db.execute(
+            _AMEND_ORDER_SQL,
+            {
+                "id": order.id,
+                "quantity": order.quantity,
+                "remaining_quantity": order.remaining_quantity,
+                "frozen_amount": order.frozen_amount,
+            },
+        )
+
+    async def list_open_by_market(self, market_id: str, db: AsyncSession) -> list[Order]:
+        result = await db.execute(_LIST_OPEN_BY_MARKET_SQL, {"market_id": market_id})
+        return [_row_to_order(row) for row in result.fetchall()]
+
+    async def stream_client_order_ids(
+        self, db: AsyncSession
+    ) -> AsyncIterator[tuple[str, str]]:
+        """Yield every stored (user_id, client_order_id) from a server-side cursor."""
+        result = await db.stream(_LIST_CLIENT_ORDER_IDS_SQL)
+        async for row in result:
+            yield row.user_id, row.client_order_id
+
     async def list_by_user(
         self,
         user_id: str,
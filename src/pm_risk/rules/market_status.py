@@ -1,14 +1,14 @@
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.pm_clearing.domain.store import ClearingStore
+from src.pm_clearing.infrastructure.sql_store import sql_clearing_store
 from src.pm_common.errors import MarketNotActiveError, MarketNotFoundError
 
-_SQL = text("SELECT status FROM markets WHERE id = :market_id")
 
-
-async def check_market_active(market_id: str, db: AsyncSession) -> None:
-    result = await db.execute(_SQL, {"market_id": market_id})
-    status = result.scalar_one_or_none()
+async def check_market_active(
+    market_id: str, db: AsyncSession, store: ClearingStore = sql_clearing_store
+) -> None:
+    status = await store.market_status(market_id, db)
     if status is None:
         raise MarketNotFoundError(market_id)
     if status != "ACTIVE":
@@ -3,8 +3,12 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from config.settings import settings
 from src.main import app
 
+# Suites hammer /auth from one client; rate limiting has its own unit tests
+settings.RATE_LIMIT_ENABLED = False
+
 
 @pytest.fixture
 async def client() -> AsyncClient:
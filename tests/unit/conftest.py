@@ -0,0 +1,10 @@
+"""Fixtures shared by the unit suites."""
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from tests.unit.helpers import open_store
+
+
+@pytest.fixture
+def store() -> MemoryClearingStore:
+    return open_store()
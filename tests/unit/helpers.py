@@ -0,0 +1,38 @@
+"""Builders shared by the unit suites that run MatchingEngine over MemoryClearingStore."""
+from typing import Any
+
+from src.pm_clearing.infrastructure.fee_collector import PLATFORM_FEE_USER_ID
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_order.domain.models import Order
+
+
+def make_order(
+    order_id: str, user_id: str, side: str, price: int, qty: int = 10, **fields: Any
+) -> Order:
+    """An OPEN GTC BUY order in mkt-1, before the engine transforms it."""
+    return Order(
+        id=order_id,
+        client_order_id=f"c-{order_id}",
+        market_id="mkt-1",
+        user_id=user_id,
+        original_side=side,
+        original_direction="BUY",
+        original_price=price,
+        book_type="",
+        book_direction="",
+        book_price=0,
+        quantity=qty,
+        time_in_force="GTC",
+        status="OPEN",
+        **fields,
+    )
+
+
+def open_store() -> MemoryClearingStore:
+    """mkt-1 at 20 bps taker fee, the fee account, and alice and bob with 100_000 each."""
+    store = MemoryClearingStore()
+    store.open_market("mkt-1", taker_fee_bps=20)
+    store.open_account(PLATFORM_FEE_USER_ID)
+    store.open_account("alice", 100_000)
+    store.open_account("bob", 100_000)
+    return store
@@ -4,6 +4,9 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.pm_clearing.infrastructure.market_stats import SKETCH_PRECISION
+from src.pm_common.hyperloglog import HyperLogLog
+
 
 @pytest.mark.asyncio
 async def test_get_market_stats_returns_aggregates() -> None:
@@ -12,11 +15,16 @@ async def test_get_market_stats_returns_aggregates() -> None:
     market_mock = MagicMock()
     market_mock.fetchone.return_value = MagicMock(status="ACTIVE", id="mkt-1")
     stats_mock = MagicMock()
+    sketch = HyperLogLog(SKETCH_PRECISION)
+    for user_id in ("alice", "bob", "carol", "alice"):
+        sketch.add(user_id)
     stats_row = MagicMock()
-    stats_row.total_trades = 5
-    stats_row.total_volume = 100
-    stats_row.total_fees = 12
-    stats_row.unique_traders = 3
+    stats_row.trade_count = 5
+    stats_row.volume = 100
+    stats_row.notional = 5500
+    stats_row.fees = 12
+    stats_row.trader_sketch = sketch.to_bytes()
+    stats_row.reconciled_at = None
     stats_mock.fetchone.return_value = stats_row
     db.execute.side_effect = [market_mock, stats_mock]
     svc = AdminService()
@@ -24,6 +32,8 @@ async def test_get_market_stats_returns_aggregates() -> None:
     assert result["total_trades"] == 5
     assert result["total_volume"] == 100
     assert result["total_fees"] == 12
+    assert result["total_notional"] == 5500
+    assert result["vwap_cents"] == 55.0
     assert result["unique_traders"] == 3
     assert result["market_id"] == "mkt-1"
     assert result["status"] == "ACTIVE"
@@ -41,3 +51,18 @@ async def test_get_market_stats_raises_when_not_found() -> None:
     with pytest.raises(AppError) as exc_info:
         await svc.get_market_stats("mkt-missing", db)
     assert exc_info.value.http_status == 404
+
+
+@pytest.mark.asyncio
+async def test_get_market_stats_before_first_trade() -> None:
+    from src.pm_admin.application.service import AdminService
+    db = AsyncMock()
+    market_mock = MagicMock()
+    market_mock.fetchone.return_value = MagicMock(status="ACTIVE", id="mkt-1")
+    stats_mock = MagicMock()
+    stats_mock.fetchone.return_value = None
+    db.execute.side_effect = [market_mock, stats_mock]
+    result = await AdminService().get_market_stats("mkt-1", db)
+    assert result["total_trades"] == 0
+    assert result["unique_traders"] == 0
+    assert result["vwap_cents"] is None
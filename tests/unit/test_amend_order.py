@@ -0,0 +1,159 @@
+"""Unit tests for MatchingEngine.amend_order — in-place quantity reduction."""
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_common.errors import AppError
+from src.pm_matching.domain.models import BookOrder
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.domain.models import Order
+
+
+def _make_order(**kwargs: Any) -> Order:
+    defaults: dict[str, Any] = {
+        "id": "order-1",
+        "client_order_id": "client-1",
+        "market_id": "mkt-1",
+        "user_id": "user-1",
+        "original_side": "YES",
+        "original_direction": "BUY",
+        "original_price": 65,
+        "book_type": "NATIVE_BUY",
+        "book_direction": "BUY",
+        "book_price": 65,
+        "quantity": 100,
+        "frozen_amount": 6513,  # 65*100=6500 + ceil(6500*20/10000)=13
+        "frozen_asset_type": "FUNDS",
+        "time_in_force": "GTC",
+        "status": "OPEN",
+    }
+    defaults.update(kwargs)
+    return Order(**defaults)
+
+
+def _db() -> AsyncMock:
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()  # get_book_seq() -> scalar_one()
+    savepoint = AsyncMock()
+    savepoint.__aenter__ = AsyncMock(return_value=None)
+    savepoint.__aexit__ = AsyncMock(return_value=False)
+    db.begin_nested = MagicMock(return_value=savepoint)
+    return db
+
+
+def _rest(engine: MatchingEngine, order: Order) -> None:
+    ob = engine._get_or_create_orderbook(order.market_id)
+    for oid in ("ahead", order.id, "behind"):
+        ob.add_order(
+            BookOrder(
+                order_id=oid,
+                user_id="user-x" if oid != order.id else order.user_id,
+                book_type=order.book_type,
+                quantity=order.remaining_quantity,
+                created_at=datetime.now(UTC),
+            ),
+            price=order.book_price,
+            side=order.book_direction,
+        )
+
+
+class TestAmendOrderValidation:
+    async def test_not_found_raises_4004(self) -> None:
+        repo = AsyncMock()
+        repo.get_by_id.return_value = None
+        with pytest.raises(AppError) as exc:
+            await MatchingEngine().amend_order("order-1", 50, "user-1", repo, _db())
+        assert exc.value.code == 4004
+
+    async def test_wrong_user_raises_403(self) -> None:
+        repo = AsyncMock()
+        repo.get_by_id.return_value = _make_order(user_id="other-user")
+        with pytest.raises(AppError) as exc:
+            await MatchingEngine().amend_order("order-1", 50, "user-1", repo, _db())
+        assert exc.value.code == 403
+
+    async def test_filled_order_raises_4006(self) -> None:
+        repo = AsyncMock()
+        repo.get_by_id.return_value = _make_order(status="FILLED")
+        with pytest.raises(AppError) as exc:
+            await MatchingEngine().amend_order("order-1", 50, "user-1", repo, _db())
+        assert exc.value.code == 4006
+
+    @pytest.mark.parametrize("qty", [100, 150, 30, 0])
+    async def test_quantity_out_of_range_raises_4007(self, qty: int) -> None:
+        repo = AsyncMock()
+        repo.get_by_id.return_value = _make_order(status="PARTIALLY_FILLED", filled_quantity=30)
+        with pytest.raises(AppError) as exc:
+            await MatchingEngine().amend_order("order-1", qty, "user-1", repo, _db())
+        assert exc.value.code == 4007
+
+
+class TestAmendOrder:
+    async def test_funds_order_releases_only_delta(self) -> None:
+        engine = MatchingEngine()
+        order = _make_order()
+        _rest(engine, order)
+        repo = AsyncMock()
+        repo.get_by_id.return_value = order
+
+        amended, released = await engine.amend_order("order-1", 60, "user-1", repo, _db())
+
+        # new frozen = 65*60=3900 + ceil(3900*20/10000)=8 → 3908
+        assert amended.frozen_amount == 3908
+        assert released == 6513 - 3908
+        assert amended.quantity == 60
+        assert amended.remaining_quantity == 60
+        repo.amend_quantity.assert_awaited_once()
+
+    async def test_keeps_queue_priority(self) -> None:
+        engine = MatchingEngine()
+        order = _make_order()
+        _rest(engine, order)
+        repo = AsyncMock()
+        repo.get_by_id.return_value = order
+
+        await engine.amend_order("order-1", 60, "user-1", repo, _db())
+
+        queue = engine._orderbooks["mkt-1"].bids[65]
+        assert [bo.order_id for bo in queue] == ["ahead", "order-1", "behind"]
+        assert queue[1].quantity == 60
+
+    async def test_partially_filled_shares_order(self) -> None:
+        engine = MatchingEngine()
+        order = _make_order(
+            original_direction="SELL",
+            book_type="NATIVE_SELL",
+            book_direction="SELL",
+            frozen_asset_type="YES_SHARES",
+            frozen_amount=70,
+            filled_quantity=30,
+            status="PARTIALLY_FILLED",
+        )
+        _rest(engine, order)
+        repo = AsyncMock()
+        repo.get_by_id.return_value = order
+
+        amended, released = await engine.amend_order("order-1", 50, "user-1", repo, _db())
+
+        assert amended.remaining_quantity == 20
+        assert amended.frozen_amount == 20
+        assert released == 50
+        assert engine._orderbooks["mkt-1"].asks[65][1].quantity == 20
+
+    async def test_writes_single_wal_event(self) -> None:
+        engine = MatchingEngine()
+        order = _make_order(frozen_asset_type="NO_SHARES", book_type="SYNTHETIC_BUY")
+        repo = AsyncMock()
+        repo.get_by_id.return_value = order
+        db = _db()
+
+        await engine.amend_order("order-1", 60, "user-1", repo, db)
+
+        wal_calls = [
+            c for c in db.execute.await_args_list
+            if "INSERT INTO wal_events" in str(c.args[0])
+        ]
+        assert len(wal_calls) == 1
+        assert wal_calls[0].args[1]["event_type"] == "ORDER_AMENDED"
@@ -7,6 +7,7 @@ import pytest
 from fastapi import HTTPException
 
 from src.pm_account.domain.constants import AMM_USER_ID
+from src.pm_gateway.auth import cache as auth_cache
 from src.pm_gateway.auth.dependencies import get_current_user
 from src.pm_gateway.user.db_models import UserModel
 
@@ -17,6 +18,11 @@ REGULAR_USER_STR = "12345678-1234-5678-1234-567812345678"
 REGULAR_USER_UUID = UUID(REGULAR_USER_STR)
 
 
+@pytest.fixture(autouse=True)
+def _clear_auth_cache() -> None:
+    auth_cache.clear()
+
+
 def _mock_db(user: object) -> AsyncMock:
     """Build an AsyncMock db that returns *user* from scalar_one_or_none()."""
     mock_result = MagicMock()
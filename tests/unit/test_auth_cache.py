@@ -0,0 +1,112 @@
+"""Unit tests for the get_current_user token/user caches."""
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.pm_common.errors import AccountDisabledError
+from src.pm_common.ttl_cache import TTLCache
+from src.pm_gateway.auth import cache as auth_cache
+from src.pm_gateway.auth.dependencies import get_current_user
+from src.pm_gateway.auth.jwt_handler import create_access_token
+from src.pm_gateway.user.db_models import UserModel
+
+USER_UUID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+
+@pytest.fixture(autouse=True)
+def _clear_auth_cache() -> None:
+    auth_cache.clear()
+
+
+def _user(is_active: bool = True) -> UserModel:
+    return UserModel(
+        id=USER_UUID,
+        username="alice",
+        email="alice@example.com",
+        password_hash="$2b$12$fakehash",
+        is_active=is_active,
+    )
+
+
+def _mock_db(user: object) -> AsyncMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = user
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_entry_expires(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        with patch("src.pm_common.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1, ttl=5)
+        with patch("src.pm_common.ttl_cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_non_positive_ttl_is_not_stored(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1, ttl=-1)
+        assert len(cache) == 0
+
+    def test_lru_eviction(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+
+class TestTokenCache:
+    def test_payload_cached_until_exp(self) -> None:
+        auth_cache.put_token_payload("t", {"sub": "u", "exp": time.time() + 60})
+        assert auth_cache.get_token_payload("t") is not None
+
+    def test_expired_or_missing_exp_not_cached(self) -> None:
+        auth_cache.put_token_payload("t1", {"sub": "u", "exp": time.time() - 1})
+        auth_cache.put_token_payload("t2", {"sub": "u"})
+        assert auth_cache.get_token_payload("t1") is None
+        assert auth_cache.get_token_payload("t2") is None
+
+
+class TestGetCurrentUserCaching:
+    async def test_second_request_skips_decode_and_query(self) -> None:
+        token = create_access_token(str(USER_UUID))
+        db = _mock_db(_user())
+        await get_current_user(token=token, db=db)
+        before = auth_cache.stats()
+        with patch("src.pm_gateway.auth.dependencies.decode_token") as decode:
+            user = await get_current_user(token=token, db=db)
+            decode.assert_not_called()
+        assert db.execute.await_count == 1
+        assert user.id == USER_UUID
+        assert user.username == "alice"
+        after = auth_cache.stats()
+        assert after["token"]["hits"] == before["token"]["hits"] + 1
+        assert after["user"]["hits"] == before["user"]["hits"] + 1
+
+    async def test_cached_user_is_a_detached_copy(self) -> None:
+        token = create_access_token(str(USER_UUID))
+        first = await get_current_user(token=token, db=_mock_db(_user()))
+        second = await get_current_user(token=token, db=_mock_db(None))
+        assert second is not first
+        assert second.email == first.email
+
+    async def test_invalidate_user_drops_cached_user(self) -> None:
+        token = create_access_token(str(USER_UUID))
+        await get_current_user(token=token, db=_mock_db(_user()))
+        auth_cache.invalidate_user(USER_UUID)
+        with pytest.raises(AccountDisabledError):
+            await get_current_user(token=token, db=_mock_db(_user(is_active=False)))
@@ -6,6 +6,15 @@ import pytest
 from src.pm_matching.engine.engine import MatchingEngine
 
 
+def _db() -> AsyncMock:
+    db = AsyncMock()
+    savepoint = AsyncMock()
+    savepoint.__aenter__ = AsyncMock(return_value=None)
+    savepoint.__aexit__ = AsyncMock(return_value=False)
+    db.begin_nested = MagicMock(return_value=savepoint)
+    return db
+
+
 # ---------------------------------------------------------------------------
 # AMM Batch Cancel API tests (interface contract v1.4 §3.2)
 # ---------------------------------------------------------------------------
@@ -18,7 +27,7 @@ class TestBatchCancel:
         from src.pm_account.domain.constants import AMM_USER_ID
 
         engine = MatchingEngine()
-        db = AsyncMock()
+        db = _db()
 
         # Mock: 3 active AMM orders
         mock_orders = MagicMock()
@@ -42,6 +51,7 @@ class TestBatchCancel:
             market_id="mkt-1",
             user_id=AMM_USER_ID,
             cancel_scope="ALL",
+            repo=AsyncMock(),
             db=db,
         )
         assert result["cancelled_count"] == 3
@@ -52,7 +62,7 @@ class TestBatchCancel:
         from src.pm_account.domain.constants import AMM_USER_ID
 
         engine = MatchingEngine()
-        db = AsyncMock()
+        db = _db()
 
         mock_orders = MagicMock()
         mock_orders.fetchall.return_value = []
@@ -62,6 +72,7 @@ class TestBatchCancel:
             market_id="mkt-1",
             user_id=AMM_USER_ID,
             cancel_scope="ALL",
+            repo=AsyncMock(),
             db=db,
         )
         assert result["cancelled_count"] == 0
@@ -72,7 +83,7 @@ class TestBatchCancel:
         from src.pm_account.domain.constants import AMM_USER_ID
 
         engine = MatchingEngine()
-        db = AsyncMock()
+        db = _db()
 
         mock_orders = MagicMock()
         mock_orders.fetchall.return_value = [
@@ -91,6 +102,7 @@ class TestBatchCancel:
             market_id="mkt-1",
             user_id=AMM_USER_ID,
             cancel_scope="BUY_ONLY",
+            repo=AsyncMock(),
             db=db,
         )
         assert result["cancelled_count"] == 2
@@ -101,7 +113,7 @@ class TestBatchCancel:
         from src.pm_account.domain.constants import AMM_USER_ID
 
         engine = MatchingEngine()
-        db = AsyncMock()
+        db = _db()
 
         mock_orders = MagicMock()
         mock_orders.fetchall.return_value = [
@@ -124,6 +136,7 @@ class TestBatchCancel:
             market_id="mkt-1",
             user_id=AMM_USER_ID,
             cancel_scope="ALL",
+            repo=AsyncMock(),
             db=db,
         )
         assert result["total_unfrozen_funds_cents"] == 1000
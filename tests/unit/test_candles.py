@@ -0,0 +1,154 @@
+"""OHLCV candles: incremental builder, flush/merge reads, downsampling and backfill."""
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_market.application.candles import (
+    CandleAggregator,
+    CandleBuilder,
+    backfill_market,
+)
+from src.pm_market.application.service import MarketApplicationService
+from src.pm_market.domain.models import Candle
+from src.pm_matching.domain.models import CommandOutcome, TapeTrade
+
+_T0 = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _trade(price: int, quantity: int, seconds: float) -> dict[str, Any]:
+    return {"price": price, "quantity": quantity, "executed_at": _T0 + timedelta(seconds=seconds)}
+
+
+class _Session:
+    @asynccontextmanager
+    async def begin(self) -> Any:
+        yield
+
+
+@asynccontextmanager
+async def _session_factory() -> Any:
+    yield _Session()
+
+
+class _StoredRepo:
+    """list_candles/save_candles over a dict, merging like _MERGE_CANDLE_SQL."""
+
+    def __init__(self) -> None:
+        self.rows: dict[tuple[str, str, datetime], Candle] = {}
+
+    async def save_candles(self, db: Any, candles: list[Candle], replace: bool = False) -> None:
+        for c in candles:
+            key = (c.market_id, c.interval, c.start)
+            old = self.rows.get(key)
+            self.rows[key] = c if old is None or replace else _merged(old, c)
+
+    async def list_candles(
+        self, db: Any, market_id: str, interval: str, start: Any, end: Any, limit: int
+    ) -> list[Candle]:
+        rows = [c for (m, i, _), c in sorted(self.rows.items()) if (m, i) == (market_id, interval)]
+        return rows[-limit:]
+
+
+def _merged(old: Candle, new: Candle) -> Candle:
+    return replace(
+        old,
+        high_cents=max(old.high_cents, new.high_cents),
+        low_cents=min(old.low_cents, new.low_cents),
+        close_cents=new.close_cents,
+        volume=old.volume + new.volume,
+        trades=old.trades + new.trades,
+    )
+
+
+class TestCandleBuilder:
+    def test_trades_fold_into_every_interval_and_close_on_rollover(self) -> None:
+        builder = CandleBuilder()
+        assert builder.add("m", 50, 2, _T0) == []
+        assert builder.add("m", 55, 1, _T0 + timedelta(seconds=30)) == []
+        closed = builder.add("m", 48, 4, _T0 + timedelta(seconds=61))
+
+        assert [c.interval for c in closed] == ["1m"]
+        assert (closed[0].open_cents, closed[0].high_cents, closed[0].close_cents) == (50, 55, 55)
+        hour = builder.get("m", "1h")
+        assert hour is not None
+        assert (hour.low_cents, hour.close_cents, hour.volume, hour.trades) == (48, 48, 7, 3)
+
+    def test_take_only_returns_buckets_over_by_the_cutoff(self) -> None:
+        builder = CandleBuilder()
+        builder.add("m", 50, 1, _T0)
+        taken = builder.take(ended_by=_T0 + timedelta(minutes=5))
+        assert sorted(c.interval for c in taken) == ["1m", "5m"]
+        assert builder.get("m", "1h") is not None
+
+
+class TestCandleAggregator:
+    async def test_reads_merge_stored_and_unflushed_candles(self) -> None:
+        repo = _StoredRepo()
+        agg = CandleAggregator(repo=repo, session_factory=_session_factory)  # type: ignore[arg-type]
+        agg.on_outcome(CommandOutcome("m", trades=[_trade(50, 2, 0), _trade(60, 1, 10)]))
+        assert await agg.flush_once() == 4
+        agg.on_outcome(CommandOutcome("m", trades=[_trade(40, 3, 20)]))
+
+        (minute,) = await agg.candles(None, "m", "1m", None, None, 10)  # type: ignore[arg-type]
+        assert (minute.open_cents, minute.high_cents, minute.low_cents) == (50, 60, 40)
+        assert (minute.close_cents, minute.volume, minute.trades) == (40, 6, 3)
+
+        await agg.flush_once()
+        assert repo.rows["m", "1m", _T0] == minute
+
+    async def test_failed_flush_keeps_the_deltas(self) -> None:
+        repo = _StoredRepo()
+        repo.save_candles = AsyncMock(side_effect=RuntimeError("db down"))  # type: ignore[method-assign]
+        agg = CandleAggregator(repo=repo, session_factory=_session_factory)  # type: ignore[arg-type]
+        agg.on_outcome(CommandOutcome("m", trades=[_trade(50, 2, 0)]))
+        with pytest.raises(RuntimeError):
+            await agg.flush_once()
+        (minute,) = await agg.candles(None, "m", "1m", None, None, 10)  # type: ignore[arg-type]
+        assert minute.volume == 2
+
+
+class TestCandlesEndpoint:
+    async def test_points_merge_into_wider_aligned_buckets(self) -> None:
+        minutes = [
+            Candle("m", "1m", _T0 + timedelta(minutes=i), 50 + i, 50 + i, 50 + i, 50 + i, 1, 1)
+            for i in range(10)
+        ]
+
+        async def source(*args: Any) -> list[Candle]:
+            return minutes
+
+        resp = await MarketApplicationService(MagicMock()).get_candles(
+            None, "m", "1m", None, None, 500, 2, source  # type: ignore[arg-type]
+        )
+        assert resp.bucket_seconds == 300
+        assert [(c.open_cents, c.close_cents, c.volume) for c in resp.items] == [
+            (50, 54, 5),
+            (55, 59, 5),
+        ]
+
+
+async def test_backfill_streams_chunks_and_skips_open_buckets() -> None:
+    trades = [
+        TapeTrade(f"t{i}", 50 + i, 1, "MINT", "BUY", _T0 + timedelta(seconds=30 * i))
+        for i in range(5)
+    ]
+    repo = MagicMock()
+    repo.list_trades_after = AsyncMock(side_effect=[trades[:3], trades[3:]])
+    repo.save_candles = AsyncMock()
+    db = MagicMock(commit=AsyncMock())
+
+    written = await backfill_market(db, "m", _T0 + timedelta(minutes=2), 3, repo)
+
+    assert repo.list_trades_after.await_args_list[1].args[2] == (trades[2].executed_at, "t2")
+    saved = [c for call in repo.save_candles.await_args_list for c in call.args[1]]
+    assert all(call.kwargs == {"replace": True} for call in repo.save_candles.await_args_list)
+    assert sorted((c.interval, c.start.minute, c.volume) for c in saved) == [
+        ("1m", 0, 2),
+        ("1m", 1, 2),
+    ]
+    assert written == 2
+    assert db.commit.await_count == 2
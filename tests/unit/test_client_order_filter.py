@@ -0,0 +1,181 @@
+"""Unit tests for the Bloom filter and the client_order_id idempotency fast path."""
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.pm_common.bloom import BloomFilter, ScalableBloomFilter
+from src.pm_common.errors import DuplicateOrderError
+from src.pm_order.application import service as order_service
+from src.pm_order.application.idempotency import ClientOrderIdFilter
+from src.pm_order.application.schemas import PlaceOrderRequest
+from tests.unit.test_open_order_index import _make_order
+
+
+async def _rows(*rows: tuple[str, str]) -> AsyncIterator[tuple[str, str]]:
+    for row in rows:
+        yield row
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self) -> None:
+        bf = BloomFilter(capacity=1000, fp_rate=0.01)
+        keys = [f"k{i}" for i in range(1000)]
+        for k in keys:
+            bf.add(k)
+        assert all(k in bf for k in keys)
+
+    def test_false_positive_rate_near_design(self) -> None:
+        bf = BloomFilter(capacity=1000, fp_rate=0.01)
+        for i in range(1000):
+            bf.add(f"in-{i}")
+        fps = sum(f"out-{i}" in bf for i in range(10_000))
+        assert fps / 10_000 < 0.03
+        assert 0.005 < bf.estimated_fp_rate() < 0.02
+
+    def test_scalable_grows_past_initial_capacity(self) -> None:
+        sbf = ScalableBloomFilter(initial_capacity=16, fp_rate=0.01)
+        keys = [f"k{i}" for i in range(500)]
+        for k in keys:
+            sbf.add(k)
+        assert len(sbf) == 500
+        assert all(k in sbf for k in keys)
+        assert sbf.estimated_fp_rate() < 0.02
+
+    def test_invalid_parameters(self) -> None:
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, fp_rate=1.0)
+
+
+class TestClientOrderIdFilter:
+    def test_not_definitely_new_before_warm_up(self) -> None:
+        f = ClientOrderIdFilter()
+        assert not f.is_definitely_new("u1", "c1")
+
+    async def test_warm_up_seeds_filters(self) -> None:
+        f = ClientOrderIdFilter()
+        repo = MagicMock()
+        repo.stream_client_order_ids.return_value = _rows(("u1", "c1"), ("u2", "c2"))
+        await f.warm_up(repo, AsyncMock())
+        assert not f.is_definitely_new("u1", "c1")
+        assert f.is_definitely_new("u1", "c2")  # per-user keyspace
+        assert f.is_definitely_new("u3", "c1")
+        assert f.stats()["keys"] == 2
+
+    def test_lru_evicts_oldest(self) -> None:
+        f = ClientOrderIdFilter(lru_size=2)
+        f.add("u1", "c1", "o1")
+        f.add("u1", "c2", "o2")
+        f.add("u1", "c3", "o3")
+        assert f.recent_order_id("u1", "c1") is None
+        assert f.recent_order_id("u1", "c3") == "o3"
+
+    async def test_false_positive_metrics(self) -> None:
+        f = ClientOrderIdFilter()
+        repo = MagicMock()
+        repo.stream_client_order_ids.return_value = _rows()
+        await f.warm_up(repo, AsyncMock())
+        assert f.is_definitely_new("u1", "c1")
+        f.record_db_check(found=False)
+        stats = f.stats()
+        assert stats["definitely_new"] == 1
+        assert stats["false_positives"] == 1
+        assert stats["observed_fp_rate"] == 0.5
+
+
+def _req(**kwargs: object) -> PlaceOrderRequest:
+    defaults: dict[str, object] = {
+        "client_order_id": "client-1",
+        "market_id": "mkt-1",
+        "side": "YES",
+        "direction": "BUY",
+        "price_cents": 65,
+        "quantity": 100,
+    }
+    defaults.update(kwargs)
+    return PlaceOrderRequest(**defaults)  # type: ignore[arg-type]
+
+
+class TestFindExistingOrder:
+    async def test_definitely_new_skips_db(self) -> None:
+        f = ClientOrderIdFilter()
+        f._warmed = True
+        with (
+            patch.object(order_service, "get_client_order_filter", return_value=f),
+            patch.object(order_service, "_repo") as repo,
+        ):
+            repo.get_by_client_order_id = AsyncMock()
+            assert await order_service._find_existing_order("c1", "u1", AsyncMock()) is None
+            repo.get_by_client_order_id.assert_not_awaited()
+
+    async def test_possible_duplicate_hits_db(self) -> None:
+        f = ClientOrderIdFilter()
+        f._warmed = True
+        f._filter_for("user-1").add("client-1")
+        existing = _make_order()
+        with (
+            patch.object(order_service, "get_client_order_filter", return_value=f),
+            patch.object(order_service, "_repo") as repo,
+        ):
+            repo.get_by_client_order_id = AsyncMock(return_value=existing)
+            found = await order_service._find_existing_order("client-1", "user-1", AsyncMock())
+        assert found is existing
+        assert f.db_checks == 1
+        assert f.false_positives == 0
+
+    async def test_recent_id_served_from_engine_handle(self) -> None:
+        f = ClientOrderIdFilter()
+        f.add("user-1", "client-1", "order-1")
+        handle = _make_order()
+        engine = MagicMock()
+        engine.get_open_order.return_value = handle
+        with (
+            patch.object(order_service, "get_client_order_filter", return_value=f),
+            patch.object(order_service, "get_matching_engine", return_value=engine),
+            patch.object(order_service, "_repo") as repo,
+        ):
+            repo.get_by_client_order_id = AsyncMock()
+            found = await order_service._find_existing_order("client-1", "user-1", AsyncMock())
+            repo.get_by_client_order_id.assert_not_awaited()
+        assert found is handle
+
+
+class TestPlaceOrderUniqueViolation:
+    async def test_unique_violation_replays_existing_order(self) -> None:
+        f = ClientOrderIdFilter()
+        f._warmed = True
+        engine = MagicMock()
+        engine.place_order = AsyncMock(
+            side_effect=IntegrityError("INSERT", {}, Exception("uq_orders_client_order_id"))
+        )
+        existing = _make_order(client_order_id="client-1")
+        db = AsyncMock()
+        with (
+            patch.object(order_service, "get_client_order_filter", return_value=f),
+            patch.object(order_service, "get_matching_engine", return_value=engine),
+            patch.object(order_service, "_repo") as repo,
+        ):
+            repo.get_by_client_order_id = AsyncMock(return_value=existing)
+            resp = await order_service.place_order(_req(), "user-1", db)
+        db.rollback.assert_awaited_once()
+        assert resp.order.id == existing.id
+        assert resp.trades == []
+
+    async def test_unique_violation_with_different_params_is_duplicate(self) -> None:
+        f = ClientOrderIdFilter()
+        f._warmed = True
+        engine = MagicMock()
+        engine.place_order = AsyncMock(
+            side_effect=IntegrityError("INSERT", {}, Exception("uq_orders_client_order_id"))
+        )
+        with (
+            patch.object(order_service, "get_client_order_filter", return_value=f),
+            patch.object(order_service, "get_matching_engine", return_value=engine),
+            patch.object(order_service, "_repo") as repo,
+        ):
+            repo.get_by_client_order_id = AsyncMock(return_value=_make_order(quantity=5))
+            with pytest.raises(DuplicateOrderError):
+                await order_service.place_order(_req(), "user-1", AsyncMock())
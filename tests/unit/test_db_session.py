@@ -0,0 +1,71 @@
+"""Request sessions: lazy pool checkout, early close, per-workload pools and pool metrics."""
+from typing import Annotated, Any
+from unittest.mock import MagicMock, patch
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from src.pm_common import database
+from src.pm_common.database import DbSession, TimedQueuePool, async_session_factory
+
+
+async def test_session_without_statements_never_checks_out() -> None:
+    with patch.object(TimedQueuePool, "_do_get", side_effect=AssertionError("checked out")):
+        async with async_session_factory() as db, db.begin():
+            assert isinstance(db, AsyncSession)
+
+
+def test_db_session_closes_before_the_response_is_sent() -> None:
+    events: list[str] = []
+
+    async def session() -> object:
+        events.append("open")
+        yield object()
+        events.append("close")
+
+    app = FastAPI()
+    app.dependency_overrides[database.get_db_session] = session
+
+    async def user(db: DbSession) -> str:
+        return "alice"
+
+    @app.get("/")
+    async def endpoint(name: Annotated[str, Depends(user)], db: DbSession) -> dict[str, str]:
+        events.append("endpoint")
+        return {"name": name}
+
+    @app.middleware("http")
+    async def record_send(request: Any, call_next: Any) -> Any:
+        response = await call_next(request)
+        events.append("response")
+        return response
+
+    with TestClient(app) as client:
+        assert client.get("/").json() == {"name": "alice"}
+    # one session, shared with the sub-dependency, closed before the response goes out
+    assert events == ["open", "endpoint", "close", "response"]
+
+
+def test_checkin_observes_hold_time_once() -> None:
+    record = MagicMock(info={})
+    before = database._POOL_CHECKOUTS.labels("read").value
+    database._checkout_listener("read")(None, record, None)
+    assert database._POOL_CHECKOUTS.labels("read").value == before + 1
+
+    count = database._POOL_HOLD_MS.labels("read").count
+    database._on_checkin(None, record)
+    database._on_checkin(None, record)  # invalidated connections can check in without info
+    assert database._POOL_HOLD_MS.labels("read").count == count + 1
+
+
+def test_each_workload_has_its_own_pool() -> None:
+    pools = {name: engine.pool for name, engine in database.ENGINES.items()}
+    assert set(pools) == {"write", "read", "batch"}
+    assert len({id(pool) for pool in pools.values()}) == 3
+    for name, pool in pools.items():
+        assert isinstance(pool, TimedQueuePool)
+        assert pool.workload == name
+    assert pools["batch"].size() == settings.DB_BATCH_POOL_SIZE
+    assert database.batch_session_factory.kw["bind"] is database.batch_engine
@@ -5,11 +5,13 @@ from src.pm_common.errors import (
     AppError,
     InsufficientBalanceError,
     InvalidResolutionResultError,
+    JournalModeError,
     MarketNotActiveError,
     MarketNotFoundError,
     MarketStateInvalidForResolutionError,
     OrderNotFoundError,
     SelfTradeError,
+    SqlProfilerDisabledError,
 )
 from src.pm_common.response import error_response, success_response
 
@@ -73,6 +75,11 @@ class TestSpecificErrors:
         assert err.code == 3004
         assert err.http_status == 422
 
+    def test_system_conflicts_have_distinct_codes(self) -> None:
+        assert SqlProfilerDisabledError().code == 9004
+        assert JournalModeError().code == 9005
+        assert JournalModeError().http_status == 409
+
 
 class TestApiResponse:
     def test_success(self) -> None:
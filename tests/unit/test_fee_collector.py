@@ -51,4 +51,4 @@ async def test_write_trade_executes_insert() -> None:
         sell_pnl=100,
         db=db,
     )
-    db.execute.assert_awaited_once()
+    assert db.execute.await_count == 2  # trades row, then the market_stats upsert
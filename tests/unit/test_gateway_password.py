@@ -1,6 +1,14 @@
 """Unit tests for password hashing utilities."""
 
-from src.pm_gateway.auth.password import hash_password, verify_password
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.pm_common.errors import ServiceBusyError
+from src.pm_gateway.auth import password
+from src.pm_gateway.auth.password import hash_password, run_password_work, verify_password
 
 
 def test_hash_is_not_plain():
@@ -24,3 +32,20 @@ def test_same_plain_produces_different_hashes():
     h1 = hash_password("MySecret1")
     h2 = hash_password("MySecret1")
     assert h1 != h2
+
+
+async def test_run_password_work_runs_off_loop_thread():
+    loop_thread = threading.get_ident()
+    worker_thread = await run_password_work(threading.get_ident)
+    assert worker_thread != loop_thread
+    hashed = await run_password_work(hash_password, "MySecret1")
+    assert await run_password_work(verify_password, "MySecret1", hashed) is True
+
+
+async def test_run_password_work_rejects_when_pool_saturated():
+    with (
+        patch.object(password, "_slots", asyncio.Semaphore(0)),
+        patch.object(password, "_QUEUE_TIMEOUT_SECONDS", 0.01),
+        pytest.raises(ServiceBusyError),
+    ):
+        await password.run_password_work(hash_password, "MySecret1")
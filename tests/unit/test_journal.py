@@ -0,0 +1,268 @@
+"""CommandJournal and JournaledEngine recovery — local files only, no database."""
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pm_clearing.infrastructure.fee_collector import PLATFORM_FEE_USER_ID
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore, MemoryMarket
+from src.pm_common.datetime_utils import utc_now
+from src.pm_common.errors import (
+    DuplicateOrderError,
+    InsufficientBalanceError,
+    ProjectionHaltedError,
+)
+from src.pm_matching.application import journaled_engine
+from src.pm_matching.application.journaled_engine import JournaledEngine
+from src.pm_matching.domain.models import CommandOutcome
+from src.pm_matching.infrastructure.journal import CommandJournal
+from src.pm_matching.infrastructure.projector import JournalProjector
+from src.pm_order.application.idempotency import ClientOrderIdFilter
+from src.pm_order.domain.models import Order
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+class _FakeProjector(JournalProjector):
+    """Projector over an empty database: every market exists, last_seq is settable."""
+
+    def __init__(self, projected_seq: int = 0) -> None:
+        super().__init__()
+        self.projected_seq = projected_seq
+
+    async def load_last_seq(self, db: AsyncSession) -> int:
+        return self.projected_seq
+
+    async def load_state(self, store: MemoryClearingStore, db: AsyncSession) -> None:
+        store.open_account(PLATFORM_FEE_USER_ID)
+
+    async def load_market(self, market_id: str, db: AsyncSession) -> MemoryMarket | None:
+        return MemoryMarket(market_id, status="ACTIVE", taker_fee_bps=20)
+
+
+def _segments(directory: Path) -> list[Path]:
+    return sorted(directory.glob("journal-*.log"))
+
+
+def _append_bytes(path: Path, data: bytes) -> None:
+    with path.open("ab") as f:
+        f.write(data)
+
+
+def _order(order_id: str, user_id: str, side: str, price: int, qty: int = 10) -> Order:
+    return make_order(order_id, user_id, side, price, qty, created_at=utc_now())
+
+
+async def _started(directory: Path, projector: JournalProjector) -> JournaledEngine:
+    journaled = JournaledEngine(CommandJournal(str(directory)), projector, checkpoint_every=1000)
+    await journaled.recover(_DB)
+    await journaled._journal.start()
+    return journaled
+
+
+def _state(journaled: JournaledEngine) -> tuple[Any, ...]:
+    store = journaled.store
+    return (
+        {uid: (a.available_balance, a.frozen_balance) for uid, a in store.accounts.items()},
+        {key: (p.yes_volume, p.no_volume) for key, p in store.positions.items()},
+        {mid: (m.reserve_balance, m.total_yes_shares) for mid, m in store.markets.items()},
+        {oid: (o.status, o.remaining_quantity) for oid, o in store.orders.items()},
+    )
+
+
+class TestCommandJournal:
+    async def test_concurrent_appends_become_durable_together(self, tmp_path: Path) -> None:
+        journal = CommandJournal(str(tmp_path), group_commit_ms=5)
+        await journal.start()
+        seqs = [journal.append("deposit", {"n": n}) for n in range(3)]
+        await asyncio.gather(*(journal.wait_durable(s) for s in seqs))
+        await journal.close()
+
+        assert seqs == [1, 2, 3]
+        assert journal.durable_seq == 3
+        replayed = list(CommandJournal(str(tmp_path)).replay(0))
+        assert [(seq, args["n"]) for seq, _, args in replayed] == [(1, 0), (2, 1), (3, 2)]
+
+    async def test_torn_tail_is_truncated_on_replay(self, tmp_path: Path) -> None:
+        journal = CommandJournal(str(tmp_path))
+        await journal.start()
+        await journal.wait_durable(journal.append("deposit", {"n": 1}))
+        await journal.close()
+        (segment,) = _segments(tmp_path)
+        intact = segment.stat().st_size
+        _append_bytes(segment, b'{"seq": 2, "cmd": "dep')
+
+        reopened = CommandJournal(str(tmp_path))
+        assert [seq for seq, _, _ in reopened.replay(0)] == [1]
+        assert segment.stat().st_size == intact
+        assert reopened.last_seq == 1
+
+    async def test_checkpoint_round_trip_prunes_covered_segments(self, tmp_path: Path) -> None:
+        journal = CommandJournal(str(tmp_path))
+        await journal.start()
+        first = journal.append("deposit", {"n": 1})
+        await journal.write_checkpoint(first, journal.encode_checkpoint(first, {"k": 1}))
+        second = journal.append("deposit", {"n": 2})
+        await journal.write_checkpoint(second, journal.encode_checkpoint(second, {"k": 2}))
+        await journal.wait_durable(journal.append("deposit", {"n": 3}))
+        await journal.close()
+
+        reopened = CommandJournal(str(tmp_path))
+        assert reopened.load_checkpoint() == (2, {"k": 2})
+        assert [seq for seq, _, _ in reopened.replay(2)] == [3]
+        assert len(_segments(tmp_path)) == 2
+
+
+class TestJournaledEngineRecovery:
+    async def _trade(self, journaled: JournaledEngine) -> None:
+        await journaled.deposit("alice", 100_000)
+        await journaled.deposit("bob", 100_000)
+        await journaled.place_order(_order("o1", "alice", "YES", 60), _DB)
+        await journaled.place_order(_order("o2", "bob", "NO", 40, qty=4), _DB)
+
+    async def test_replay_rebuilds_identical_state(self, tmp_path: Path) -> None:
+        journaled = await _started(tmp_path, _FakeProjector())
+        await self._trade(journaled)
+        await journaled._journal.close()
+        assert journaled.store.markets["mkt-1"].total_yes_shares == 4
+
+        recovered = await _started(tmp_path, _FakeProjector())
+        assert _state(recovered) == _state(journaled)
+        assert [seq for seq, _ in recovered._projector.pending] == [1, 2, 3, 4, 5]
+        # The resting remainder of o1 is back on the book and still cancellable
+        order = await recovered.cancel_order("o1", "alice")
+        assert order.status == "CANCELLED"
+
+    async def test_checkpoint_plus_tail_skips_projected_commands(self, tmp_path: Path) -> None:
+        journaled = await _started(tmp_path, _FakeProjector())
+        await journaled.deposit("alice", 100_000)
+        await journaled.deposit("bob", 100_000)
+        await journaled.checkpoint()
+        await journaled.place_order(_order("o1", "alice", "YES", 60), _DB)
+        await journaled.place_order(_order("o2", "bob", "NO", 40, qty=4), _DB)
+        await journaled._journal.close()
+
+        recovered = await _started(tmp_path, _FakeProjector(projected_seq=4))
+        assert _state(recovered) == _state(journaled)
+        assert [seq for seq, _ in recovered._projector.pending] == [5]
+        assert recovered._journal.last_seq == 5
+
+    async def test_rejected_command_is_not_journaled(self, tmp_path: Path) -> None:
+        journaled = await _started(tmp_path, _FakeProjector())
+        await journaled.deposit("alice", 500)
+        with pytest.raises(InsufficientBalanceError):
+            await journaled.withdraw("alice", 1_000)
+        available, seq = await journaled.withdraw("alice", 200)
+        await journaled._journal.close()
+
+        assert (available, seq) == (300, 2)
+        assert [cmd for _, cmd, _ in CommandJournal(str(tmp_path)).replay(0)] == [
+            "deposit",
+            "withdraw",
+        ]
+
+
+class TestClientOrderIds:
+    async def test_concurrent_duplicate_is_rejected_before_journaling(
+        self, tmp_path: Path
+    ) -> None:
+        journaled = await _started(tmp_path, _FakeProjector())
+        await journaled.deposit("alice", 100_000)
+        first, retry = _order("o1", "alice", "YES", 60), _order("o2", "alice", "YES", 60)
+        retry.client_order_id = first.client_order_id
+
+        results = await asyncio.gather(
+            journaled.place_order(first, _DB),
+            journaled.place_order(retry, _DB),
+            return_exceptions=True,
+        )
+        await journaled._journal.close()
+
+        assert sum(isinstance(r, DuplicateOrderError) for r in results) == 1
+        assert len(journaled.store.orders) == 1
+        assert [cmd for _, cmd, _ in CommandJournal(str(tmp_path)).replay(0)] == [
+            "deposit",
+            "market",
+            "place",
+        ]
+
+    async def test_filter_knows_the_order_before_it_is_durable(self, tmp_path: Path) -> None:
+        journaled = await _started(tmp_path, _FakeProjector())
+        await journaled.deposit("alice", 100_000)
+        coid_filter = ClientOrderIdFilter()
+        seen: list[str | None] = []
+        wait_durable = journaled._journal.wait_durable
+
+        async def recording_wait(seq: int) -> None:
+            seen.append(coid_filter.recent_order_id("alice", "c-o1"))
+            await wait_durable(seq)
+
+        with (
+            patch.object(journaled_engine, "get_client_order_filter", return_value=coid_filter),
+            patch.object(journaled._journal, "wait_durable", recording_wait),
+        ):
+            await journaled.place_order(_order("o1", "alice", "YES", 60), _DB)
+        await journaled._journal.close()
+        assert seen[-1] == "o1"
+
+
+class TestPublication:
+    async def test_listeners_hear_of_a_command_once_it_is_durable(self, tmp_path: Path) -> None:
+        journaled = await _started(tmp_path, _FakeProjector())
+        await journaled.deposit("alice", 100_000)
+        outcomes: list[CommandOutcome] = []
+        journaled.engine.add_listener(outcomes.append)
+        heard: list[int] = []
+        wait_durable = journaled._journal.wait_durable
+
+        async def recording_wait(seq: int) -> None:
+            heard.append(len(outcomes))
+            await wait_durable(seq)
+
+        with patch.object(journaled._journal, "wait_durable", recording_wait):
+            await journaled.place_order(_order("o1", "alice", "YES", 60), _DB)
+        await journaled._journal.close()
+        assert heard[-1] == 0
+        assert [o.levels for o in outcomes] == [{("BUY", 60): 10}]
+        assert journaled.engine.book_seq("mkt-1") == outcomes[0].seq
+
+
+class TestProjectorHalt:
+    async def test_permanent_error_halts_projection_and_commands(self, tmp_path: Path) -> None:
+        projector = _FakeProjector()
+        projector._interval = 0
+        error = IntegrityError("INSERT", {}, Exception("uq_orders_client_order_id"))
+        with patch.object(projector, "project", side_effect=error):
+            await asyncio.wait_for(projector.run(lambda: 1), timeout=1)
+        assert projector.halted is error
+
+        journaled = await _started(tmp_path, projector)
+        with pytest.raises(ProjectionHaltedError):
+            await journaled.deposit("alice", 100)
+        await journaled._journal.close()
+        assert journaled._journal.last_seq == 0
+
+    async def test_transient_error_is_retried(self) -> None:
+        projector = _FakeProjector()
+        projector._interval = 0
+        calls = 0
+
+        async def flaky(upto_seq: int) -> int:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("gone")
+            raise asyncio.CancelledError
+
+        with (
+            patch.object(projector, "project", side_effect=flaky),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await projector.run(lambda: 1)
+        assert calls == 2
+        assert projector.halted is None
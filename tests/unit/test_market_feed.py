@@ -0,0 +1,179 @@
+"""Market-data feed: engine outcomes, conflating subscriptions and the WebSocket pump."""
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.errors import AppError
+from src.pm_common.websocket import stream_json
+from src.pm_market.application.feed import MarketDataFeed
+from src.pm_matching.domain.models import CommandOutcome
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+@pytest.fixture
+def engine(
+    store: MemoryClearingStore,
+) -> tuple[MatchingEngine, MemoryOrderRepository, list[CommandOutcome]]:
+    eng = MatchingEngine(store=store)
+    outcomes: list[CommandOutcome] = []
+    eng.add_listener(outcomes.append)
+    return eng, MemoryOrderRepository(store), outcomes
+
+
+async def _empty_book(market_id: str, depth: int) -> tuple[list[Any], list[Any]]:
+    return [], []
+
+
+def _outcome(seq: int, levels: dict[tuple[str, int], int], trades: int = 0) -> CommandOutcome:
+    rows = [
+        {
+            "trade_id": f"t{i}",
+            "price": 60,
+            "quantity": 1,
+            "buy_order_id": "b",
+            "taker_order_id": "b",
+            "executed_at": datetime(2026, 1, 1, tzinfo=UTC),
+        }
+        for i in range(trades)
+    ]
+    return CommandOutcome("mkt-1", seq=seq, levels=levels, trades=rows)
+
+
+class TestEngineOutcomes:
+    async def test_resting_order_and_fill_report_absolute_levels(self, engine: Any) -> None:
+        eng, repo, outcomes = engine
+        await eng.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        assert outcomes[-1].levels == {("BUY", 60): 10}
+
+        await eng.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+        outcome = outcomes[-1]
+        assert outcome.levels[("BUY", 60)] == 6
+        assert [t["quantity"] for t in outcome.trades] == [4]
+        assert {o.id: o.status for o in outcome.orders} == {
+            "o2": "FILLED",
+            "o1": "PARTIALLY_FILLED",
+        }
+
+        await eng.cancel_order("o1", "alice", repo, _DB)
+        assert outcomes[-1].levels == {("BUY", 60): 0}
+
+    async def test_failed_command_notifies_nobody(self, engine: Any) -> None:
+        eng, repo, outcomes = engine
+        with pytest.raises(AppError):
+            await eng.place_order(make_order("o1", "alice", "YES", 60, qty=100_000), repo, _DB)
+        assert outcomes == []
+
+    async def test_failed_commit_notifies_nobody(self, engine: Any) -> None:
+        eng, repo, outcomes = engine
+        await eng.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        with (
+            patch.object(eng._store, "commit", AsyncMock(side_effect=OSError("lost"))),
+            pytest.raises(OSError),
+        ):
+            await eng.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+        assert len(outcomes) == 1
+        assert eng.book_seq("mkt-1") is None  # evicted, rebuilt from the store on next use
+
+    async def test_book_levels_aggregates_per_price(self, engine: Any) -> None:
+        eng, repo, _ = engine
+        await eng.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await eng.place_order(make_order("o2", "bob", "YES", 60, qty=5), repo, _DB)
+        await eng.place_order(make_order("o3", "bob", "NO", 30), repo, _DB)
+        assert await eng.book_levels("mkt-1", repo, _DB, 10) == ([(60, 15)], [(70, 10)])
+
+
+class TestFeedSubscription:
+    async def test_updates_are_conflated_per_level(self) -> None:
+        feed = MarketDataFeed(max_trades=10)
+        sub = feed.subscribe("mkt-1")
+        snapshot = await feed.snapshot(sub, _empty_book)
+        runner = asyncio.create_task(feed.run())
+        try:
+            feed.on_outcome(_outcome(1, {("BUY", 60): 10}))
+            feed.on_outcome(_outcome(2, {("BUY", 60): 6, ("SELL", 70): 3}, trades=1))
+            feed.on_outcome(_outcome(3, {("SELL", 70): 0}))
+            await asyncio.sleep(0)
+            update = await sub.next_update()
+        finally:
+            runner.cancel()
+
+        assert snapshot["seq"] == 0
+        assert update is not None
+        assert (update["prev_seq"], update["seq"]) == (0, 3)
+        assert update["bids"] == [[60, 6]]
+        assert update["asks"] == [[70, 0]]
+        assert [t["taker_side"] for t in update["trades"]] == ["BUY"]
+
+    async def test_outcomes_before_the_snapshot_are_skipped(self) -> None:
+        feed = MarketDataFeed()
+        feed.on_outcome(_outcome(1, {("BUY", 60): 10}))
+        sub = feed.subscribe("mkt-1")
+        snapshot = await feed.snapshot(sub, _empty_book)
+        sub.offer(1, {("BUY", 60): 10}, [])
+        assert snapshot["seq"] == 1
+        assert sub.seq == 1
+        assert not sub._levels
+
+    async def test_trade_overflow_forces_a_fresh_snapshot(self) -> None:
+        feed = MarketDataFeed(max_trades=2)
+        sub = feed.subscribe("mkt-1")
+        await feed.snapshot(sub, _empty_book)
+        sub.offer(1, {}, [{"trade_id": "t"}] * 3)
+        assert await sub.next_update() is None
+
+        snapshot = await feed.snapshot(sub, _empty_book)
+        sub.offer(2, {("BUY", 61): 1}, [])
+        update = await sub.next_update()
+        assert update is not None
+        assert (snapshot["type"], update["prev_seq"]) == ("snapshot", snapshot["seq"])
+
+    async def test_unsubscribe_stops_queueing(self) -> None:
+        feed = MarketDataFeed()
+        sub = feed.subscribe("mkt-1")
+        feed.unsubscribe(sub)
+        feed.on_outcome(_outcome(1, {("BUY", 60): 1}))
+        assert feed.subscriber_count == 0
+        assert not feed._queue
+        assert feed.seq("mkt-1") == 1
+
+
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.closed = asyncio.Event()
+
+    async def send_json(self, message: dict[str, Any]) -> None:
+        self.sent.append(message)
+
+    async def receive(self) -> dict[str, Any]:
+        await self.closed.wait()
+        return {"type": "websocket.disconnect"}
+
+
+class TestStreamJson:
+    async def test_disconnect_cancels_an_idle_stream(self) -> None:
+        socket = _FakeSocket()
+        cancelled = asyncio.Event()
+
+        async def messages() -> Any:
+            try:
+                yield {"n": 1}
+                await asyncio.Event().wait()  # nothing more to say
+                yield {"n": 2}
+            finally:
+                cancelled.set()
+
+        pump = asyncio.create_task(stream_json(socket, messages()))  # type: ignore[arg-type]
+        await asyncio.sleep(0.01)
+        socket.closed.set()
+        await asyncio.wait_for(pump, 1)
+        assert socket.sent == [{"n": 1}]
+        assert cancelled.is_set()
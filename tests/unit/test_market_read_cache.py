@@ -0,0 +1,101 @@
+"""MarketReadCache: single-flight loads, TTL caching and generation invalidation."""
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_common.errors import MarketNotFoundError
+from src.pm_market.application.read_cache import MarketReadCache
+from src.pm_market.application.service import MarketApplicationService
+from src.pm_market.domain.models import Market
+from src.pm_matching.domain.models import CommandOutcome
+
+_DB: Any = None
+
+
+def _slow_loader(result: Any = "value") -> tuple[AsyncMock, asyncio.Event]:
+    release = asyncio.Event()
+
+    async def load() -> Any:
+        await release.wait()
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    return AsyncMock(side_effect=load), release
+
+
+class TestSingleFlight:
+    async def test_concurrent_misses_share_one_load(self) -> None:
+        cache = MarketReadCache()
+        loader, release = _slow_loader()
+        tasks = [asyncio.create_task(cache.get(cache.books, "k", loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == ["value"] * 5
+        assert loader.await_count == 1
+        assert cache.coalesced == 4
+        assert await cache.get(cache.books, "k", loader) == "value"
+        assert loader.await_count == 1
+
+    async def test_errors_reach_every_waiter_and_are_not_cached(self) -> None:
+        cache = MarketReadCache()
+        loader, release = _slow_loader(MarketNotFoundError("m"))
+        tasks = [asyncio.create_task(cache.get(cache.markets, "k", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, MarketNotFoundError) for r in results)
+        with pytest.raises(MarketNotFoundError):
+            await cache.get(cache.markets, "k", loader)
+        assert loader.await_count == 2
+
+    async def test_cancelled_leader_hands_the_load_to_a_waiter(self) -> None:
+        cache = MarketReadCache()
+        loader, release = _slow_loader()
+        leader = asyncio.create_task(cache.get(cache.books, "k", loader))
+        waiter = asyncio.create_task(cache.get(cache.books, "k", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await waiter == "value"
+        assert loader.await_count == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+class TestInvalidation:
+    def test_engine_outcome_moves_only_the_book_keys(self) -> None:
+        cache = MarketReadCache()
+        book, market, page = cache.book_key("m", 10), cache.market_key("m"), cache.list_key("A")
+        cache.on_outcome(CommandOutcome("m"))
+        assert cache.book_key("m", 10) != book
+        assert (cache.market_key("m"), cache.list_key("A")) == (market, page)
+
+        cache.invalidate_market("m")
+        assert cache.market_key("m") != market
+        assert cache.list_key("A") != page
+        assert cache.book_key("other", 10) == ("other", 0, 10)
+
+
+class TestCachedService:
+    async def test_orderbook_reads_hit_sql_once_until_the_book_changes(self) -> None:
+        repo = MagicMock()
+        repo.get_market_by_id = AsyncMock(return_value=MagicMock(spec=Market, status="ACTIVE"))
+        repo.get_last_trade_price = AsyncMock(return_value=None)
+        book = AsyncMock(return_value=(7, [(55, 10)], []))
+        cache = MarketReadCache()
+        service = MarketApplicationService(repo, cache)
+
+        first = await service.get_orderbook(_DB, "m", 10, book)
+        assert await service.get_orderbook(_DB, "m", 10, book) is first
+        cache.on_outcome(CommandOutcome("m"))
+        await service.get_orderbook(_DB, "m", 10, book)
+
+        assert book.await_count == 2
+        assert repo.get_market_by_id.await_count == 1  # the market row outlives book changes
@@ -0,0 +1,99 @@
+"""Running market stats: HyperLogLog sketch, per-trade upsert and reconciliation."""
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_clearing.infrastructure import market_stats
+from src.pm_clearing.infrastructure.sql_store import SqlClearingStore
+from src.pm_common.hyperloglog import HyperLogLog
+
+
+def _trade(buy: str, sell: str, price: int = 60, quantity: int = 5) -> dict[str, Any]:
+    return {
+        "market_id": "mkt-1",
+        "buy_user_id": buy,
+        "sell_user_id": sell,
+        "price": price,
+        "quantity": quantity,
+        "maker_fee": 0,
+        "taker_fee": 3,
+    }
+
+
+class TestHyperLogLog:
+    def test_small_counts_are_exact_and_duplicates_ignored(self) -> None:
+        sketch = HyperLogLog()
+        for user_id in ["alice", "bob", "carol", "bob", "alice"]:
+            sketch.add(user_id)
+        assert sketch.count() == 3
+
+    def test_large_count_within_error_and_merge_is_union(self) -> None:
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(60_000):
+            a.add(f"u{i}")
+        for i in range(40_000, 100_000):
+            b.add(f"u{i}")
+        a.merge(b)
+        assert abs(a.count() - 100_000) < 100_000 * 0.05
+        assert HyperLogLog(registers=a.to_bytes()).count() == a.count()
+
+    def test_rejects_mismatched_registers(self) -> None:
+        with pytest.raises(ValueError):
+            HyperLogLog(11, bytes(10))
+
+
+class TestRecordTrade:
+    async def test_insert_trade_updates_the_stats_in_the_same_session(self) -> None:
+        db = MagicMock(execute=AsyncMock())
+        await SqlClearingStore().insert_trade(_trade("alice", "bob"), db)
+
+        assert db.execute.await_count == 2
+        params = db.execute.await_args_list[1].args[1]
+        sketch = HyperLogLog(market_stats.SKETCH_PRECISION)
+        assert (params["buy_reg"], params["buy_rank"]) == sketch.register("alice")
+        assert (params["notional"], params["fees"]) == (300, 3)
+
+    async def test_shared_register_takes_the_higher_rank(self) -> None:
+        sketch = HyperLogLog(market_stats.SKETCH_PRECISION)
+        first: dict[int, tuple[str, int]] = {}
+        for user_id in (f"u{i}" for i in range(10_000)):
+            reg, rank = sketch.register(user_id)
+            if reg in first and first[reg][1] != rank:
+                break
+            first.setdefault(reg, (user_id, rank))
+        other, other_rank = first[reg]
+
+        db = MagicMock(execute=AsyncMock())
+        await market_stats.record_trade(_trade(other, user_id), db)
+        params = db.execute.await_args.args[1]
+        assert params["buy_reg"] == params["sell_reg"]
+        assert params["buy_rank"] == params["sell_rank"] == max(rank, other_rank)
+
+
+async def test_reconcile_rebuilds_totals_and_sketch() -> None:
+    at = datetime(2026, 1, 1, tzinfo=UTC)
+    totals = MagicMock(trade_count=4, volume=20, notional=1100, fees=6)
+
+    async def _users() -> Any:
+        for user_id in ("alice", "bob", "carol"):
+            yield user_id
+
+    db = MagicMock()
+    db.execute = AsyncMock(
+        side_effect=[
+            MagicMock(),
+            MagicMock(one=MagicMock(return_value=totals)),
+            MagicMock(scalar_one=MagicMock(return_value=at)),
+        ]
+    )
+    db.stream = AsyncMock(return_value=MagicMock(scalars=MagicMock(return_value=_users())))
+
+    stats, exact = await market_stats.reconcile("mkt-1", db)
+
+    assert (stats.trade_count, stats.volume, stats.vwap_cents) == (4, 20, 55.0)
+    assert stats.unique_traders == exact == 3
+    assert stats.reconciled_at == at
+    written = db.execute.await_args_list[2].args[1]["trader_sketch"]
+    assert HyperLogLog(market_stats.SKETCH_PRECISION, written).count() == 3
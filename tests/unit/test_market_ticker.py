@@ -0,0 +1,85 @@
+"""All-markets ticker: committed top of book, rolling trade buckets and the cached body."""
+import json
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.response import success_json
+from src.pm_market.application.ticker import MarketTicker
+from src.pm_market.domain.models import TradeBucket
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+@pytest.fixture
+def setup(store: MemoryClearingStore) -> tuple[MatchingEngine, MemoryOrderRepository, MarketTicker]:
+    engine = MatchingEngine(store=store)
+    ticker = MarketTicker(refresh_ms=60_000)
+    engine.add_listener(ticker.on_outcome)
+    return engine, MemoryOrderRepository(store), ticker
+
+
+def _markets(*ids: str) -> AsyncMock:
+    return AsyncMock(return_value=list(ids))
+
+
+class TestMarketTicker:
+    async def test_top_of_book_last_trade_and_volume(self, setup: Any) -> None:
+        engine, repo, ticker = setup
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await engine.place_order(make_order("o2", "alice", "NO", 35), repo, _DB)  # YES ask 65
+        await engine.place_order(make_order("o3", "bob", "NO", 40, qty=4), repo, _DB)
+
+        body = json.loads(await ticker.body(_markets("mkt-1", "mkt-2"), engine.book_top))
+        first, idle = body["items"]
+        assert (first["best_bid_cents"], first["best_bid_quantity"]) == (60, 6)
+        assert (first["best_ask_cents"], first["best_ask_quantity"]) == (65, 10)
+        assert first["last_trade_price_cents"] == 60
+        assert (first["volume_24h"], first["trades_24h"]) == (4, 1)
+        assert idle["best_bid_cents"] is None and idle["last_trade_price_cents"] is None
+
+    async def test_body_is_rebuilt_at_most_once_per_refresh(self, setup: Any) -> None:
+        engine, repo, ticker = setup
+        markets = _markets("mkt-1")
+        first = await ticker.body(markets, engine.book_top)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        assert await ticker.body(markets, engine.book_top) is first
+        markets.assert_awaited_once()
+
+        stale = MarketTicker(refresh_ms=0)
+        await stale.body(markets, engine.book_top)
+        assert json.loads(await stale.body(markets, engine.book_top))["items"][0][
+            "best_bid_cents"
+        ] == 60
+
+    async def test_warm_up_seeds_buckets_and_old_trades_leave_the_window(self) -> None:
+        now = int(datetime.now(UTC).timestamp())
+        repo = MagicMock()
+        repo.get_trade_buckets = AsyncMock(
+            return_value=[
+                TradeBucket("mkt-1", now - 2 * 86400, 9, 90, 70, 10),  # outside the window
+                TradeBucket("mkt-1", now - 120, 2, 5, 55, 52),
+            ]
+        )
+        old = datetime.now(UTC) - timedelta(days=3)
+        repo.get_last_trades = AsyncMock(return_value={"mkt-1": (53, old), "mkt-2": (20, old)})
+        ticker = MarketTicker(repo=repo)
+        await ticker.warm_up(_DB)
+
+        items = json.loads(await ticker.body(_markets("mkt-1", "mkt-2"), lambda _: None))["items"]
+        assert (items[0]["trades_24h"], items[0]["volume_24h"]) == (2, 5)
+        assert (items[0]["high_24h_cents"], items[0]["low_24h_cents"]) == (55, 52)
+        assert items[1]["last_trade_price_cents"] == 20
+        assert items[1]["volume_24h"] == 0 and items[1]["high_24h_cents"] is None
+
+
+def test_success_json_wraps_a_serialized_body() -> None:
+    envelope = json.loads(success_json(b'{"items":[]}', "req_1"))
+    assert envelope["data"] == {"items": []}
+    assert (envelope["code"], envelope["request_id"]) == (0, "req_1")
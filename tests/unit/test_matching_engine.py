@@ -1,6 +1,6 @@
 """Unit tests for MatchingEngine orchestrator."""
 from typing import Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -117,3 +117,22 @@ class TestCancelOrderValidation:
         with pytest.raises(AppError) as exc:
             await engine.cancel_order("order-1", "user-1", repo, db)
         assert exc.value.code == 4006
+
+    async def test_cancel_order_filled_while_waiting_raises_4006(
+        self, engine: MatchingEngine
+    ) -> None:
+        repo = AsyncMock()
+        repo.get_by_id.side_effect = [
+            _make_order(user_id="user-1", status="OPEN"),
+            _make_order(user_id="user-1", status="FILLED"),  # re-read under the lock
+        ]
+        db = AsyncMock()
+        savepoint = AsyncMock()
+        savepoint.__aenter__ = AsyncMock(return_value=None)
+        savepoint.__aexit__ = AsyncMock(return_value=False)
+        db.begin_nested = MagicMock(return_value=savepoint)
+        from src.pm_common.errors import AppError
+        with pytest.raises(AppError) as exc:
+            await engine.cancel_order("order-1", "user-1", repo, db)
+        assert exc.value.code == 4006
+        repo.update_status.assert_not_awaited()
@@ -0,0 +1,92 @@
+"""MatchingEngine end-to-end over MemoryClearingStore — no database involved."""
+from typing import Any
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.errors import AppError
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+
+@pytest.fixture
+def engine(store: MemoryClearingStore) -> MatchingEngine:
+    return MatchingEngine(store=store)
+
+
+@pytest.fixture
+def repo(store: MemoryClearingStore) -> MemoryOrderRepository:
+    return MemoryOrderRepository(store)
+
+
+class TestMintThroughEngine:
+    async def test_mint_moves_funds_positions_and_reserve(
+        self, store: MemoryClearingStore, engine: MatchingEngine, repo: MemoryOrderRepository
+    ) -> None:
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        _, trades, _ = await engine.place_order(make_order("o2", "bob", "NO", 40), repo, _DB)
+
+        assert len(trades) == 1
+        market = store.markets["mkt-1"]
+        assert market.reserve_balance == 1000
+        assert market.total_yes_shares == market.total_no_shares == 10
+        assert store.positions[("alice", "mkt-1")].yes_volume == 10
+        assert store.positions[("bob", "mkt-1")].no_volume == 10
+
+        # Cash is conserved across accounts, the fee account and the reserve
+        accounts = store.accounts.values()
+        held = sum(a.available_balance + a.frozen_balance for a in accounts)
+        assert held + market.reserve_balance == 200_000
+        assert store.journal_counts["trades"] == 1
+
+    async def test_cancel_unfreezes_funds(
+        self, store: MemoryClearingStore, engine: MatchingEngine, repo: MemoryOrderRepository
+    ) -> None:
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        assert store.accounts["alice"].frozen_balance > 0
+
+        cancelled = await engine.cancel_order("o1", "alice", repo, _DB)
+
+        assert cancelled.status == "CANCELLED"
+        assert store.accounts["alice"].frozen_balance == 0
+        assert store.accounts["alice"].available_balance == 100_000
+        assert store.orders["o1"].status == "CANCELLED"
+
+
+class TestRollback:
+    async def test_failed_order_leaves_state_untouched(
+        self, store: MemoryClearingStore, engine: MatchingEngine, repo: MemoryOrderRepository
+    ) -> None:
+        store.open_account("carol", 100)
+        with pytest.raises(AppError):
+            await engine.place_order(make_order("o1", "carol", "YES", 60), repo, _DB)
+
+        assert store.accounts["carol"].available_balance == 100
+        assert "o1" not in store.orders
+        assert store.wal_events == []
+
+    async def test_exception_mid_transaction_restores_snapshots(
+        self, store: MemoryClearingStore
+    ) -> None:
+        with pytest.raises(RuntimeError):
+            async with store.transaction(_DB):
+                await store.freeze_funds("alice", 500, _DB)
+                await store.add_shares("alice", "mkt-1", "YES", 5, 300, _DB)
+                await store.insert_ledger("alice", "ORDER_FREEZE", -500, 0, "ORDER", "o1", _DB)
+                raise RuntimeError("boom")
+
+        assert store.accounts["alice"].available_balance == 100_000
+        assert store.accounts["alice"].frozen_balance == 0
+        assert ("alice", "mkt-1") not in store.positions
+        assert store.ledger == []
+        assert store.journal_counts["ledger"] == 0
+
+    async def test_counts_only_without_journals(self) -> None:
+        s = MemoryClearingStore(keep_journals=False)
+        await s.insert_wal_event("mkt-1", "ORDER_ACCEPTED", {}, _DB)
+        assert s.wal_events == []
+        assert s.journal_counts["wal_events"] == 1
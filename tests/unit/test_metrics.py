@@ -0,0 +1,104 @@
+"""Unit tests for the metrics registry, engine instrumentation and /metrics."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import AsyncClient
+
+from src.pm_common.metrics import MetricsRegistry
+from src.pm_matching.engine import engine as engine_module
+from src.pm_matching.engine.engine import MatchingEngine
+from tests.unit.test_open_order_index import _make_order
+
+
+class TestMetricsRegistry:
+    def test_counter_and_gauge_render(self) -> None:
+        reg = MetricsRegistry()
+        orders = reg.counter("t_orders_total", "Orders", ("market_id",))
+        depth = reg.gauge("t_depth", "Depth")
+        orders.labels("m1").inc()
+        orders.labels("m1").inc(2)
+        depth.labels().set(1.5)
+        text = reg.render()
+        assert "# TYPE t_orders_total counter" in text
+        assert 't_orders_total{market_id="m1"} 3' in text
+        assert "t_depth 1.5" in text
+
+    def test_histogram_render(self) -> None:
+        reg = MetricsRegistry()
+        hist = reg.histogram("t_latency_ms", "Latency", buckets=(1, 10))
+        hist.labels().observe(0.5)
+        hist.labels().observe(5)
+        text = reg.render()
+        assert 't_latency_ms_bucket{le="1"} 1' in text
+        assert 't_latency_ms_bucket{le="10"} 2' in text
+        assert 't_latency_ms_bucket{le="+Inf"} 2' in text
+        assert "t_latency_ms_sum 5.5" in text
+        assert "t_latency_ms_count 2" in text
+
+    def test_callback_and_label_escaping(self) -> None:
+        reg = MetricsRegistry()
+        reg.callback("t_cb", "Callback", lambda: [(('a"b',), 7)], ("k",))
+        assert 't_cb{k="a\\"b"} 7' in reg.render()
+
+    def test_duplicate_name_and_label_arity(self) -> None:
+        reg = MetricsRegistry()
+        fam = reg.counter("t_dup", "Dup", ("a",))
+        with pytest.raises(ValueError):
+            reg.gauge("t_dup", "Dup")
+        with pytest.raises(ValueError):
+            fam.labels("x", "y")
+
+
+class TestEngineInstrumentation:
+    async def test_lock_wait_and_hold_recorded(self) -> None:
+        engine = MatchingEngine()
+        before = engine_module._LOCK_HOLD_MS.labels("mkt-metrics").count
+        async with engine._locked("mkt-metrics"):
+            pass
+        assert engine_module._LOCK_HOLD_MS.labels("mkt-metrics").count == before + 1
+        assert engine_module._LOCK_WAIT_MS.labels("mkt-metrics").count >= 1
+
+    async def test_rebuild_counted_and_book_sizes(self) -> None:
+        engine = MatchingEngine()
+        repo = AsyncMock()
+        repo.list_open_by_market.return_value = [
+            _make_order(id="o1", market_id="mkt-sizes"),
+            _make_order(
+                id="o2", market_id="mkt-sizes", book_type="NATIVE_SELL", book_direction="SELL"
+            ),
+            _make_order(id="o3", market_id="mkt-sizes", book_price=60),
+        ]
+        before = engine_module._REBUILDS.labels("mkt-sizes").value
+        db = AsyncMock()
+        db.execute.return_value.scalar_one = MagicMock(return_value=0)  # get_book_seq()
+        await engine.rebuild_orderbook("mkt-sizes", repo, db)
+        assert engine_module._REBUILDS.labels("mkt-sizes").value == before + 1
+        assert sorted(engine.book_sizes()) == [
+            (("mkt-sizes", "BUY"), 2),
+            (("mkt-sizes", "SELL"), 1),
+        ]
+
+    def test_stage_observes_and_returns_now(self) -> None:
+        hist = engine_module._STAGE_MS.labels("test-stage")
+        before = hist.count
+        t = engine_module._stage("test-stage", 0.0)
+        assert t > 0
+        assert hist.count == before + 1
+
+
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    for name in (
+        "pm_http_request_duration_ms",
+        "pm_engine_lock_wait_ms",
+        "pm_engine_stage_duration_ms",
+        "pm_orderbook_orders",
+        "pm_db_pool_checkout_wait_ms",
+        "pm_db_pool_connections",
+        "pm_rate_limit_checks_total",
+        "pm_auth_cache_lookups_total",
+        "pm_client_order_filter_fp_rate",
+    ):
+        assert f"# TYPE {name} " in resp.text
@@ -0,0 +1,181 @@
+"""Unit tests for the in-memory per-user open-order index."""
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_matching.domain.models import BookOrder
+from src.pm_matching.engine.engine import MatchingEngine, _in_cancel_scope
+from src.pm_matching.engine.matching_algo import match_order
+from src.pm_matching.engine.order_book import OrderBook
+from src.pm_order.domain.models import Order
+
+
+def _bo(order_id: str, user_id: str, book_type: str = "NATIVE_BUY", qty: int = 100) -> BookOrder:
+    return BookOrder(
+        order_id=order_id,
+        user_id=user_id,
+        book_type=book_type,
+        quantity=qty,
+        created_at=datetime.now(UTC),
+    )
+
+
+def _make_order(**kwargs: Any) -> Order:
+    defaults: dict[str, Any] = {
+        "id": "order-1",
+        "client_order_id": "client-1",
+        "market_id": "mkt-1",
+        "user_id": "user-1",
+        "original_side": "YES",
+        "original_direction": "BUY",
+        "original_price": 65,
+        "book_type": "NATIVE_BUY",
+        "book_direction": "BUY",
+        "book_price": 65,
+        "quantity": 100,
+        "frozen_amount": 6513,
+        "frozen_asset_type": "FUNDS",
+        "time_in_force": "GTC",
+        "status": "OPEN",
+        "created_at": datetime.now(UTC),
+    }
+    defaults.update(kwargs)
+    return Order(**defaults)
+
+
+def _db() -> AsyncMock:
+    db = AsyncMock()
+    db.execute.return_value.scalar_one = MagicMock(return_value=0)  # get_book_seq()
+    return db
+
+
+def _tx_db() -> AsyncMock:
+    """A session whose begin_nested() works as the engine's savepoint."""
+    db = AsyncMock()
+    savepoint = AsyncMock()
+    savepoint.__aenter__ = AsyncMock(return_value=None)
+    savepoint.__aexit__ = AsyncMock(return_value=False)
+    db.begin_nested = MagicMock(return_value=savepoint)
+    return db
+
+
+async def _synced_engine(orders: list[Order]) -> MatchingEngine:
+    engine = MatchingEngine()
+    repo = AsyncMock()
+    repo.list_open_by_market.return_value = orders
+    await engine.rebuild_orderbook("mkt-1", repo, _db())
+    return engine
+
+
+class TestOrderBookUserIndex:
+    def test_add_and_cancel_maintain_index(self) -> None:
+        ob = OrderBook(market_id="mkt-1")
+        ob.add_order(_bo("o1", "u1"), price=60, side="BUY")
+        ob.add_order(_bo("o2", "u1"), price=61, side="BUY")
+        ob.add_order(_bo("o3", "u2"), price=61, side="BUY")
+        assert [bo.order_id for bo in ob.user_orders("u1")] == ["o1", "o2"]
+        ob.cancel_order("o1")
+        assert [bo.order_id for bo in ob.user_orders("u1")] == ["o2"]
+        ob.cancel_order("o2")
+        assert ob.user_orders("u1") == []
+        assert "u1" not in ob._user_orders
+
+    def test_fully_filled_maker_leaves_index(self) -> None:
+        ob = OrderBook(market_id="mkt-1")
+        ob.add_order(_bo("maker", "u2", "NATIVE_SELL", qty=10), price=60, side="SELL")
+        taker = _make_order(id="taker", user_id="u1", quantity=10)
+        match_order(taker, ob)
+        assert ob.user_orders("u2") == []
+
+
+class TestEngineOpenOrderIndex:
+    def test_index_incomplete_before_sync(self) -> None:
+        engine = MatchingEngine()
+        assert engine.list_open_orders("user-1", "mkt-1") is None
+        assert engine.list_open_orders("user-1", None) is None
+
+    async def test_rebuild_populates_handles(self) -> None:
+        o1 = _make_order(id="o1")
+        o2 = _make_order(id="o2", user_id="user-2")
+        engine = await _synced_engine([o1, o2])
+        assert engine.get_open_order("o1") is o1
+        assert engine.list_open_orders("user-1", "mkt-1") == [o1]
+        assert engine.list_open_orders("user-2", "mkt-1") == [o2]
+
+    async def test_evict_drops_handles(self) -> None:
+        engine = await _synced_engine([_make_order(id="o1")])
+        engine.evict_orderbook("mkt-1")
+        assert engine.get_open_order("o1") is None
+        assert engine.list_open_orders("user-1", "mkt-1") is None
+
+    async def test_drop_market_after_warm_up_reports_empty(self) -> None:
+        engine = MatchingEngine()
+        db = AsyncMock()
+        rows = MagicMock()
+        rows.fetchall.return_value = [MagicMock(market_id="mkt-1")]
+        db.execute.return_value = rows
+        repo = AsyncMock()
+        repo.list_open_by_market.return_value = [_make_order(id="o1")]
+        await engine.warm_up(repo, db)
+        engine.drop_market("mkt-1")
+        assert engine.list_open_orders("user-1", None) == []
+
+    async def test_batch_cancel_uses_index_and_confirms_in_db(self) -> None:
+        engine = await _synced_engine([
+            _make_order(id="o1"),
+            _make_order(
+                id="o2", original_direction="SELL", book_type="NATIVE_SELL",
+                book_direction="SELL", frozen_asset_type="YES_SHARES", frozen_amount=100,
+            ),
+        ])
+        db = _tx_db()
+        confirmed = MagicMock()
+        confirmed.fetchall.return_value = [
+            MagicMock(id="o1", frozen_amount=6513, frozen_asset_type="FUNDS"),
+        ]
+        db.execute.return_value = confirmed
+
+        result = await engine.batch_cancel("mkt-1", "user-1", "BUY_ONLY", AsyncMock(), db)
+
+        first_sql = str(db.execute.await_args_list[0].args[0])
+        assert "RETURNING" in first_sql
+        assert db.execute.await_args_list[0].args[1] == {"ids": ["o1"]}
+        assert result["cancelled_count"] == 1
+        assert result["total_unfrozen_funds_cents"] == 6513
+        assert engine.get_open_order("o1") is None
+        assert engine.get_open_order("o2") is not None
+
+    async def test_batch_cancel_failing_in_db_drops_the_index(self) -> None:
+        engine = await _synced_engine([_make_order(id="o1")])
+        db = _tx_db()
+        confirmed = MagicMock()
+        confirmed.fetchall.return_value = [
+            MagicMock(id="o1", frozen_amount=6513, frozen_asset_type="FUNDS"),
+        ]
+        db.execute.side_effect = [confirmed, OSError("connection lost")]
+
+        with pytest.raises(OSError):
+            await engine.batch_cancel("mkt-1", "user-1", "ALL", AsyncMock(), db)
+
+        # The DB rolls back with o1 still open; memory must not claim otherwise
+        assert engine.list_open_orders("user-1", "mkt-1") is None
+        assert engine.book_seq("mkt-1") is None
+
+    async def test_batch_cancel_without_resting_orders_skips_db(self) -> None:
+        engine = await _synced_engine([])
+        db = _tx_db()
+        result = await engine.batch_cancel("mkt-1", "user-1", "ALL", AsyncMock(), db)
+        assert result["cancelled_count"] == 0
+        db.execute.assert_not_awaited()
+
+
+class TestInCancelScope:
+    def test_scope_matches_original_direction(self) -> None:
+        assert _in_cancel_scope("NATIVE_BUY", "BUY_ONLY")
+        assert _in_cancel_scope("SYNTHETIC_SELL", "BUY_ONLY")  # Buy NO
+        assert _in_cancel_scope("NATIVE_SELL", "SELL_ONLY")
+        assert _in_cancel_scope("SYNTHETIC_BUY", "SELL_ONLY")  # Sell NO
+        assert not _in_cancel_scope("NATIVE_BUY", "SELL_ONLY")
+        assert _in_cancel_scope("SYNTHETIC_BUY", "ALL")
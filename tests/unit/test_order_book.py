@@ -67,3 +67,17 @@ class TestOrderBookCancel:
     def test_cancel_nonexistent_is_noop(self) -> None:
         ob = OrderBook(market_id="mkt-1")
         ob.cancel_order("ghost")  # must not raise
+
+
+class TestOrderBookAmend:
+    def test_amend_keeps_queue_position(self) -> None:
+        ob = OrderBook(market_id="mkt-1")
+        ob.add_order(_bo("o1"), price=65, side="BUY")
+        ob.add_order(_bo("o2"), price=65, side="BUY")
+        assert ob.amend_order("o1", 40) is True
+        assert [bo.order_id for bo in ob.bids[65]] == ["o1", "o2"]
+        assert ob.bids[65][0].quantity == 40
+
+    def test_amend_nonexistent_returns_false(self) -> None:
+        ob = OrderBook(market_id="mkt-1")
+        assert ob.amend_order("ghost", 10) is False
@@ -0,0 +1,141 @@
+"""Order book sequence numbers: wal_events.book_seq, the delta ring and versioned snapshots."""
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.errors import AppError
+from src.pm_market.application.schemas import OrderbookDeltaResponse
+from src.pm_market.application.service import MarketApplicationService
+from src.pm_market.domain.models import Market
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+
+class TestBookSeq:
+    async def test_each_command_bumps_seq_once_and_records_it(
+        self, store: MemoryClearingStore
+    ) -> None:
+        engine = MatchingEngine(store=store)
+        repo = MemoryOrderRepository(store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await engine.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+
+        assert engine.book_seq("mkt-1") == 2
+        seqs = [row["book_seq"] for row in store.wal_events]
+        assert seqs[0] == 1
+        assert set(seqs[1:]) == {2}  # accept, match and fill rows of the second order
+
+    async def test_rejected_command_leaves_seq_alone(self, store: MemoryClearingStore) -> None:
+        engine = MatchingEngine(store=store)
+        repo = MemoryOrderRepository(store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        with pytest.raises(AppError):
+            await engine.place_order(make_order("o2", "bob", "YES", 60, qty=100_000), repo, _DB)
+        await engine.rebuild_orderbook("mkt-1", repo, _DB)  # a failed command evicts the book
+        assert engine.book_seq("mkt-1") == 1
+
+    async def test_rebuild_resumes_from_the_recorded_seq(
+        self, store: MemoryClearingStore
+    ) -> None:
+        engine = MatchingEngine(store=store)
+        repo = MemoryOrderRepository(store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        engine.evict_orderbook("mkt-1")
+        assert engine.book_seq("mkt-1") is None
+
+        await engine.cancel_order("o1", "alice", repo, _DB)  # book not loaded
+        await engine.rebuild_orderbook("mkt-1", repo, _DB)
+        assert engine.book_seq("mkt-1") == 2
+        assert engine.book_changes("mkt-1", 1) is None  # ring starts empty
+
+
+    async def test_batch_cancel_bumps_seq_and_records_the_level(
+        self, store: MemoryClearingStore
+    ) -> None:
+        engine = MatchingEngine(store=store)
+        repo = MemoryOrderRepository(store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        db = AsyncMock()  # batch_cancel confirms and unfreezes with raw SQL
+        db.execute.return_value.fetchall = MagicMock(
+            return_value=[MagicMock(id="o1", frozen_amount=612, frozen_asset_type="FUNDS")]
+        )
+
+        result = await engine.batch_cancel("mkt-1", "alice", "ALL", repo, db)
+
+        assert result["cancelled_count"] == 1
+        assert engine.book_seq("mkt-1") == 2
+        assert store.wal_events[-1]["book_seq"] == 2
+        changes = engine.book_changes("mkt-1", 1)
+        assert changes is not None and changes.levels == {("BUY", 60): 0}
+        assert engine.book_top("mkt-1") == (0, 0, 100, 0)
+
+
+class TestDeltaRing:
+    async def test_changes_since_merge_absolute_levels(
+        self, store: MemoryClearingStore
+    ) -> None:
+        engine = MatchingEngine(store=store)
+        repo = MemoryOrderRepository(store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await engine.place_order(make_order("o2", "alice", "YES", 55), repo, _DB)
+        await engine.place_order(make_order("o3", "bob", "NO", 40, qty=4), repo, _DB)
+
+        changes = engine.book_changes("mkt-1", 1)
+        assert changes is not None
+        assert changes.seq == 3
+        assert changes.levels == {("BUY", 55): 10, ("BUY", 60): 6, ("SELL", 60): 0}
+        assert changes.last_trade_price == 60
+
+        unchanged = engine.book_changes("mkt-1", 3)
+        assert unchanged is not None and not unchanged.levels
+
+    async def test_ring_overflow_and_future_seq_are_not_covered(
+        self, store: MemoryClearingStore
+    ) -> None:
+        engine = MatchingEngine(store=store, delta_ring=2)
+        repo = MemoryOrderRepository(store)
+        for i, price in enumerate((50, 51, 52)):
+            await engine.place_order(make_order(f"o{i}", "alice", "YES", price), repo, _DB)
+
+        assert engine.book_changes("mkt-1", 0) is None
+        assert engine.book_changes("mkt-1", 1) is not None
+        assert engine.book_changes("mkt-1", 7) is None
+
+    async def test_delta_response_carries_no_view(self, store: MemoryClearingStore) -> None:
+        engine = MatchingEngine(store=store)
+        repo = MemoryOrderRepository(store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        changes = engine.book_changes("mkt-1", 0)
+        assert changes is not None
+
+        resp = OrderbookDeltaResponse.from_changes("mkt-1", 0, changes)
+        assert (resp.since, resp.seq) == (0, 1)
+        assert resp.yes.bids[0].price_cents == 60
+        assert resp.no.asks[0].price_cents == 40
+
+
+class TestVersionedSnapshot:
+    async def test_snapshot_from_book_source_carries_seq(self) -> None:
+        market = MagicMock(spec=Market, status="ACTIVE")
+        repo = MagicMock()
+        repo.get_market_by_id = AsyncMock(return_value=market)
+        repo.get_last_trade_price = AsyncMock(return_value=61)
+        repo.get_orderbook_snapshot = AsyncMock()
+
+        async def book(market_id: str, depth: int) -> Any:
+            return 7, [(60, 5)], [(62, 3)]
+
+        resp = await MarketApplicationService(repo).get_orderbook(_DB, "mkt-1", 10, book)
+
+        repo.get_orderbook_snapshot.assert_not_awaited()
+        assert resp.seq == 7
+        assert resp.last_trade_price_cents == 61
+        assert [lv.price_cents for lv in resp.no.bids] == [38]
+        assert datetime.fromisoformat(resp.updated_at).tzinfo == UTC
@@ -0,0 +1,165 @@
+"""Transactional outbox: events queued by MatchingEngine and published by OutboxRelay."""
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_clearing.infrastructure.outbox_relay import LocalEventStream, OutboxRelay
+from src.pm_common.errors import AppError
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+
+@pytest.fixture
+def repo(store: MemoryClearingStore) -> MemoryOrderRepository:
+    return MemoryOrderRepository(store)
+
+
+def _events(store: MemoryClearingStore, event_type: str) -> list[dict[str, Any]]:
+    return [r for r in store.outbox if r["event_type"] == event_type]
+
+
+class TestEngineOutbox:
+    async def test_trade_queues_order_trade_balance_and_position_events(
+        self, store: MemoryClearingStore, repo: MemoryOrderRepository
+    ) -> None:
+        engine = MatchingEngine(store=store, outbox=True)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        store.outbox.clear()
+        await engine.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+
+        orders = {e["payload"]["order_id"]: e["payload"] for e in _events(store, "ORDER_UPDATED")}
+        assert orders["o2"]["status"] == "FILLED"
+        assert orders["o1"]["status"] == "PARTIALLY_FILLED"
+        assert orders["o1"]["remaining_quantity"] == 6
+
+        (trade,) = _events(store, "TRADE_EXECUTED")
+        assert trade["payload"]["quantity"] == 4
+        assert {"buy_realized_pnl", "sell_realized_pnl", "taker_fee"} <= trade["payload"].keys()
+        assert isinstance(trade["payload"]["executed_at"], str)
+
+        balances = {e["user_id"]: e["payload"] for e in _events(store, "BALANCE_CHANGED")}
+        assert balances["alice"]["available_balance"] == store.accounts["alice"].available_balance
+        assert balances["bob"]["frozen_balance"] == store.accounts["bob"].frozen_balance
+        positions = {e["user_id"]: e["payload"] for e in _events(store, "POSITION_CHANGED")}
+        assert positions["alice"]["yes_volume"] == 4
+        assert positions["bob"]["no_volume"] == 4
+
+    async def test_cancel_queues_order_and_balance_events(
+        self, store: MemoryClearingStore, repo: MemoryOrderRepository
+    ) -> None:
+        engine = MatchingEngine(store=store, outbox=True)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        store.outbox.clear()
+        await engine.cancel_order("o1", "alice", repo, _DB)
+
+        assert [e["event_type"] for e in store.outbox] == ["ORDER_UPDATED", "BALANCE_CHANGED"]
+        assert store.outbox[0]["payload"]["status"] == "CANCELLED"
+        assert store.outbox[1]["payload"]["frozen_balance"] == 0
+
+    async def test_batch_cancel_queues_order_and_balance_events(
+        self, store: MemoryClearingStore, repo: MemoryOrderRepository
+    ) -> None:
+        engine = MatchingEngine(store=store, outbox=True)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        store.outbox.clear()
+        db = AsyncMock()  # batch_cancel confirms and unfreezes with raw SQL
+        db.execute.return_value.fetchall = MagicMock(
+            return_value=[MagicMock(id="o1", frozen_amount=612, frozen_asset_type="FUNDS")]
+        )
+        await engine.batch_cancel("mkt-1", "alice", "ALL", repo, db)
+
+        assert [e["event_type"] for e in store.outbox] == ["ORDER_UPDATED", "BALANCE_CHANGED"]
+        assert store.outbox[0]["payload"]["order_id"] == "o1"
+        assert store.outbox[0]["payload"]["status"] == "CANCELLED"
+
+    async def test_snapshots_carry_increasing_versions(
+        self, store: MemoryClearingStore, repo: MemoryOrderRepository
+    ) -> None:
+        engine = MatchingEngine(store=store, outbox=True)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await engine.cancel_order("o1", "alice", repo, _DB)
+
+        versions = [e["payload"]["version"] for e in _events(store, "BALANCE_CHANGED")]
+        assert versions == sorted(set(versions))
+        assert versions[-1] == store.accounts["alice"].version
+
+    async def test_rejected_order_leaves_no_events(
+        self, store: MemoryClearingStore, repo: MemoryOrderRepository
+    ) -> None:
+        engine = MatchingEngine(store=store, outbox=True)
+        with pytest.raises(AppError):
+            await engine.place_order(make_order("o1", "alice", "YES", 60, qty=100_000), repo, _DB)
+        assert store.outbox == []
+
+    async def test_disabled_by_default(
+        self, store: MemoryClearingStore, repo: MemoryOrderRepository
+    ) -> None:
+        engine = MatchingEngine(store=store)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        assert store.outbox == []
+
+
+def _session_factory(rows: list[Any]) -> MagicMock:
+    db = AsyncMock()
+    db.execute.return_value = MagicMock(fetchall=MagicMock(return_value=rows))
+    db.begin = MagicMock(return_value=AsyncMock())
+    session = AsyncMock()
+    session.__aenter__.return_value = db
+    return MagicMock(return_value=session)
+
+
+def _row(outbox_id: int, payload: Any) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=outbox_id,
+        event_type="BALANCE_CHANGED",
+        market_id=None,
+        user_id="alice",
+        payload=payload,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+
+class TestOutboxRelay:
+    async def test_publishes_batch_in_outbox_order(self) -> None:
+        stream = LocalEventStream(maxlen=100)
+        factory = _session_factory([_row(2, '{"a": 2}'), _row(1, {"a": 1})])
+        relay = OutboxRelay(stream, batch_size=10, session_factory=factory)
+
+        assert await relay.relay_once() == 2
+        entries = stream.read()
+        assert [(i, e["outbox_id"]) for i, e in entries] == [(1, "1"), (2, "2")]
+        assert entries[0][1]["payload"] == '{"a": 1}'
+        assert entries[0][1]["market_id"] == ""
+        assert stream.read(after_id=1) == entries[1:]
+
+    async def test_lower_id_committed_late_is_still_read(self) -> None:
+        stream = LocalEventStream(maxlen=100)
+        await OutboxRelay(stream, session_factory=_session_factory([_row(5, "{}")])).relay_once()
+        ((cursor, _),) = stream.read()
+        # id 3 belonged to a transaction that committed after 5 was relayed
+        await OutboxRelay(stream, session_factory=_session_factory([_row(3, "{}")])).relay_once()
+
+        assert [e["outbox_id"] for _, e in stream.read(after_id=cursor)] == ["3"]
+
+    async def test_publish_failure_propagates_so_the_claim_rolls_back(self) -> None:
+        publisher = AsyncMock()
+        publisher.publish.side_effect = ConnectionError("redis down")
+        factory = _session_factory([_row(1, "{}")])
+        relay = OutboxRelay(publisher, session_factory=factory)
+
+        with pytest.raises(ConnectionError):
+            await relay.relay_once()
+
+    async def test_empty_outbox_publishes_nothing(self) -> None:
+        publisher = AsyncMock()
+        factory = _session_factory([])
+        assert await OutboxRelay(publisher, session_factory=factory).relay_once() == 0
+        publisher.publish.assert_not_called()
@@ -0,0 +1,147 @@
+"""Unit tests for the token-bucket rate limiting middleware."""
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.middleware.cors import CORSMiddleware
+
+from config.settings import settings
+from src.main import app as main_app
+from src.pm_account.domain.constants import AMM_USER_ID
+from src.pm_gateway.auth import cache as auth_cache
+from src.pm_gateway.auth.jwt_handler import create_access_token
+from src.pm_gateway.middleware.rate_limit import (
+    AUTH_RULE,
+    ORDER_RULE,
+    QUERY_RULE,
+    LocalLimiter,
+    RateLimitMiddleware,
+    TokenBucket,
+    classify,
+)
+
+
+@pytest.fixture(autouse=True)
+def _enable_rate_limit() -> Any:
+    auth_cache.clear()
+    with patch.object(settings, "RATE_LIMIT_ENABLED", True):
+        yield
+
+
+class TestClassify:
+    def test_rules(self) -> None:
+        assert classify("POST", "/api/v1/auth/login") is AUTH_RULE
+        assert classify("POST", "/api/v1/orders") is ORDER_RULE
+        assert classify("POST", "/api/v1/orders/123/cancel") is ORDER_RULE
+        assert classify("GET", "/api/v1/orders") is QUERY_RULE
+        assert classify("GET", "/api/v1/markets") is QUERY_RULE
+
+    def test_unlimited_paths(self) -> None:
+        assert classify("GET", "/health") is None
+        assert classify("POST", "/api/v1/amm/orders/replace") is None
+        assert classify("POST", "/api/v1/admin/markets/m1/resolve") is None
+
+
+class TestTokenBucket:
+    def test_burst_then_refill(self) -> None:
+        bucket = TokenBucket(capacity=2, rate=1.0, tokens=2, updated=0.0)
+        assert bucket.take(0.0) == 0.0
+        assert bucket.take(0.0) == 0.0
+        assert bucket.take(0.0) == pytest.approx(1.0)
+        assert bucket.take(1.0) == 0.0
+
+    def test_local_limiter_is_lru_bounded(self) -> None:
+        limiter = LocalLimiter(max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.take(key, AUTH_RULE, 0.0)
+        assert list(limiter._buckets) == ["b", "c"]
+
+
+def _scope(method: str, path: str, token: str | None = None) -> dict[str, Any]:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": headers,
+        "client": ("10.0.0.1", 1234),
+    }
+
+
+async def _call(mw: RateLimitMiddleware, scope: dict[str, Any]) -> list[dict[str, Any]]:
+    sent: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    await mw(scope, AsyncMock(), send)
+    return sent
+
+
+def _middleware(redis_result: Any = (1, "0")) -> tuple[RateLimitMiddleware, AsyncMock]:
+    app = AsyncMock()
+    mw = RateLimitMiddleware(app)
+    mw._script = AsyncMock(return_value=list(redis_result))
+    return mw, app
+
+
+class TestRateLimitMiddleware:
+    async def test_local_bucket_rejects_without_redis(self) -> None:
+        mw, app = _middleware()
+        for _ in range(AUTH_RULE.limit):
+            assert await _call(mw, _scope("POST", "/api/v1/auth/login")) == []
+        sent = await _call(mw, _scope("POST", "/api/v1/auth/login"))
+        assert app.await_count == AUTH_RULE.limit
+        assert mw._script.await_count == AUTH_RULE.limit
+        start = sent[0]
+        assert start["status"] == 429
+        assert (b"retry-after", b"12") in start["headers"]
+        assert json.loads(sent[1]["body"])["code"] == 9001
+
+    async def test_redis_rejection(self) -> None:
+        mw, app = _middleware(redis_result=(0, "2.5"))
+        sent = await _call(mw, _scope("GET", "/api/v1/markets"))
+        app.assert_not_awaited()
+        assert sent[0]["status"] == 429
+        assert (b"retry-after", b"3") in sent[0]["headers"]
+
+    async def test_redis_failure_fails_open_and_backs_off(self) -> None:
+        mw, app = _middleware()
+        mw._script.side_effect = ConnectionError("down")
+        await _call(mw, _scope("GET", "/api/v1/markets"))
+        await _call(mw, _scope("GET", "/api/v1/markets"))
+        assert app.await_count == 2
+        assert mw._script.await_count == 1
+
+    async def test_keyed_by_user_when_token_valid(self) -> None:
+        mw, _ = _middleware()
+        token = create_access_token("user-1")
+        await _call(mw, _scope("POST", "/api/v1/orders", token=token))
+        assert mw._script.await_args.kwargs["keys"] == ["ratelimit:order:user-1"]
+
+    async def test_amm_user_exempt(self) -> None:
+        mw, app = _middleware(redis_result=(0, "60"))
+        token = create_access_token(AMM_USER_ID)
+        await _call(mw, _scope("GET", "/api/v1/markets", token=token))
+        app.assert_awaited_once()
+        mw._script.assert_not_awaited()
+
+    async def test_disabled_passes_through(self) -> None:
+        mw, app = _middleware(redis_result=(0, "60"))
+        with patch.object(settings, "RATE_LIMIT_ENABLED", False):
+            await _call(mw, _scope("GET", "/api/v1/markets"))
+        app.assert_awaited_once()
+
+    async def test_overhead_recorded(self) -> None:
+        mw, _ = _middleware()
+        await _call(mw, _scope("GET", "/api/v1/markets"))
+        stats = mw.stats.as_dict()
+        assert stats["checks"] >= 1
+        assert stats["overhead_us_max"] > 0
+
+
+def test_cors_wraps_the_rate_limiter() -> None:
+    # user_middleware lists the outermost first; 429s need CORS headers too
+    order = [m.cls for m in main_app.user_middleware]
+    assert order.index(CORSMiddleware) < order.index(RateLimitMiddleware)
@@ -0,0 +1,105 @@
+"""Unit tests for the pure-ASGI request logging middleware and its histograms."""
+import json
+import logging
+import logging.handlers
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from config.settings import settings
+from src.pm_common.log_queue import start_queue_logging, stop_queue_logging
+from src.pm_common.metrics import Histogram
+from src.pm_gateway.middleware import request_log
+from src.pm_gateway.middleware.request_log import RequestLogMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str, request: Request) -> dict[str, Any]:
+        return {"item_id": item_id, "request_id": request.state.request_id}
+
+    @app.get("/boom")
+    async def boom() -> None:
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestLogMiddleware)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def _reset_histograms() -> None:
+    request_log.route_latency.clear()
+
+
+async def _get(path: str) -> Any:
+    transport = ASGITransport(app=_app(), raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        return await ac.get(path)
+
+
+class TestRequestLogMiddleware:
+    async def test_request_id_injected_into_state(self) -> None:
+        resp = await _get("/items/42")
+        assert resp.status_code == 200
+        assert resp.json()["request_id"].startswith("req_")
+        assert len(resp.json()["request_id"]) == 16
+
+    async def test_histogram_keyed_by_route_template(self) -> None:
+        await _get("/items/1")
+        await _get("/items/2")
+        await _get("/nope")
+        hist = request_log.route_latency.labels("GET", "/items/{item_id}")
+        assert hist.count == 2
+        assert request_log.route_latency.labels("GET", "<unmatched>").count == 1
+
+    async def test_sampling_still_logs_errors(self, caplog: pytest.LogCaptureFixture) -> None:
+        with (
+            patch.object(settings, "REQUEST_LOG_SAMPLE_RATE", 0.0),
+            caplog.at_level(logging.INFO, logger="pm.request"),
+        ):
+            await _get("/items/1")
+            await _get("/boom")
+        assert len(caplog.records) == 1
+        assert "→ 500" in caplog.records[0].getMessage()
+
+    async def test_json_format(self, caplog: pytest.LogCaptureFixture) -> None:
+        with (
+            patch.object(settings, "REQUEST_LOG_JSON", True),
+            caplog.at_level(logging.INFO, logger="pm.request"),
+        ):
+            await _get("/items/7")
+        record = json.loads(caplog.records[0].getMessage())
+        assert record["route"] == "/items/{item_id}"
+        assert record["status"] == 200
+
+
+class TestHistogram:
+    def test_counts_and_quantiles(self) -> None:
+        hist = Histogram(buckets=(1, 10, 100))
+        for v in (0.5, 5, 5, 50):
+            hist.observe(v)
+        assert hist.count == 4
+        assert hist.cumulative() == [(1, 1), (10, 3), (100, 4), (float("inf"), 4)]
+        assert 1 <= hist.quantile(0.5) <= 10
+        assert hist.quantile(0.99) <= 100
+
+    def test_empty_and_overflow(self) -> None:
+        hist = Histogram(buckets=(1, 10))
+        assert hist.quantile(0.5) == 0.0
+        hist.observe(1000)
+        assert hist.quantile(0.99) == 10
+
+
+def test_queue_logging_round_trip() -> None:
+    start_queue_logging(("pm.test_queue",))
+    lg = logging.getLogger("pm.test_queue")
+    assert not lg.propagate
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in lg.handlers)
+    stop_queue_logging()
+    assert lg.propagate
+    assert lg.handlers == []
@@ -0,0 +1,130 @@
+"""Unit tests for the opt-in request sampling profiler."""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from config.settings import settings
+from src.pm_common.sampling_profiler import (
+    SamplingProfilerMiddleware,
+    StackSampler,
+    collapse,
+    enforce_retention,
+    should_profile,
+)
+
+
+def _scope(path: str = "/api/v1/orders", headers: list[tuple[bytes, bytes]] | None = None) -> Any:
+    return {"type": "http", "method": "POST", "path": path, "headers": headers or []}
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestCollapse:
+    def test_root_first_module_qualified(self) -> None:
+        def inner() -> str:
+            return collapse(sys._getframe())
+
+        stack = collapse(sys._getframe()).split(";")
+        inner_stack = inner().split(";")
+        assert inner_stack[-1] == f"{__name__}:inner"
+        assert inner_stack[:-1] == stack
+
+
+class TestStackSampler:
+    def test_captures_busy_function(self) -> None:
+        sampler = StackSampler(threading.get_ident(), 0.001)
+        sampler.start()
+        _spin(0.1)
+        stacks = sampler.stop()
+        assert sum(stacks.values()) > 0
+        assert any(f"{__name__}:_spin" in s for s in stacks)
+
+
+class TestRetention:
+    def test_drops_oldest_over_file_limit(self, tmp_path: Path) -> None:
+        for i in range(5):
+            p = tmp_path / f"{i}.collapsed"
+            p.write_text("a 1\n")
+            os.utime(p, (i, i))
+        enforce_retention(tmp_path, max_files=3, max_bytes=10_000)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "2.collapsed", "3.collapsed", "4.collapsed",
+        ]
+
+    def test_drops_oldest_over_byte_limit(self, tmp_path: Path) -> None:
+        for i in range(3):
+            p = tmp_path / f"{i}.collapsed"
+            p.write_text("x" * 100)
+            os.utime(p, (i, i))
+        enforce_retention(tmp_path, max_files=10, max_bytes=250)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["1.collapsed", "2.collapsed"]
+
+
+class TestShouldProfile:
+    def test_token_header_must_match(self) -> None:
+        with (
+            patch.object(settings, "PROFILER_TOKEN", "s3cret"),
+            patch.object(settings, "PROFILER_SAMPLE_RATE", 1.0),
+        ):
+            assert should_profile(_scope("/x", [(b"x-profile", b"s3cret")]))
+            assert not should_profile(_scope("/api/v1/orders", [(b"x-profile", b"nope")]))
+
+    def test_header_ignored_without_token(self) -> None:
+        with (
+            patch.object(settings, "PROFILER_TOKEN", ""),
+            patch.object(settings, "PROFILER_SAMPLE_RATE", 0.0),
+        ):
+            assert not should_profile(_scope(headers=[(b"x-profile", b"")]))
+
+    def test_sampling_is_limited_to_path_prefix(self) -> None:
+        with (
+            patch.object(settings, "PROFILER_TOKEN", ""),
+            patch.object(settings, "PROFILER_SAMPLE_RATE", 1.0),
+            patch.object(settings, "PROFILER_PATH_PREFIX", "/api/v1/orders"),
+        ):
+            assert should_profile(_scope("/api/v1/orders/abc"))
+            assert not should_profile(_scope("/api/v1/markets"))
+
+
+def _read_profiles(directory: Path) -> dict[str, list[str]]:
+    return {p.name: p.read_text().splitlines() for p in directory.glob("*.collapsed")}
+
+
+class TestMiddleware:
+    async def test_writes_collapsed_file_for_profiled_request(self, tmp_path: Path) -> None:
+        app = FastAPI()
+
+        @app.get("/busy")
+        async def busy() -> dict[str, bool]:
+            _spin(0.05)
+            return {"ok": True}
+
+        app.add_middleware(SamplingProfilerMiddleware)
+        with (
+            patch.object(settings, "PROFILER_TOKEN", "t"),
+            patch.object(settings, "PROFILER_INTERVAL_MS", 1.0),
+            patch.object(settings, "PROFILER_DIR", str(tmp_path)),
+        ):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                plain = await client.get("/busy")
+                profiled = await client.get("/busy", headers={"X-Profile": "t"})
+
+        assert plain.status_code == profiled.status_code == 200
+        profiles = _read_profiles(tmp_path)
+        assert len(profiles) == 1
+        [(name, lines)] = profiles.items()
+        assert "_GET_busy_" in name
+        assert any(f"{__name__}:_spin" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
@@ -0,0 +1,109 @@
+"""Unit tests for the per-request SQL statement profiler."""
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from config.settings import settings
+from src.pm_admin.application.service import AdminService
+from src.pm_common import sql_profiler
+from src.pm_common.errors import SqlProfilerDisabledError
+from src.pm_common.sql_profiler import RequestProfile, SqlProfilerMiddleware, normalize
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> None:
+    sql_profiler.reset()
+
+
+def _sqlite_engine() -> Any:
+    engine = create_engine("sqlite://")
+    sql_profiler.install(SimpleNamespace(sync_engine=engine))  # type: ignore[arg-type]
+    return engine
+
+
+class TestNormalize:
+    def test_collapses_whitespace_and_param_lists(self) -> None:
+        stmt = "SELECT *\n    FROM orders  WHERE id IN ($1, $2, $3)"
+        assert normalize(stmt) == "SELECT * FROM orders WHERE id IN (...)"
+
+
+class TestCursorHooks:
+    def test_records_only_inside_a_profile(self) -> None:
+        engine = _sqlite_engine()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert sql_profiler.top_statements() == []
+
+        profile = RequestProfile()
+        token = sql_profiler._current.set(profile)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT   1"))
+                conn.execute(text("SELECT 2"))
+        finally:
+            sql_profiler._current.reset(token)
+        assert profile.count == 3
+        assert profile.statements["SELECT 1"].count == 2
+        report = {row["statement"]: row["count"] for row in sql_profiler.top_statements()}
+        assert report == {"SELECT 1": 2, "SELECT 2": 1}
+        assert len(sql_profiler.top_statements(1)) == 1
+
+    def test_install_is_idempotent(self) -> None:
+        engine = create_engine("sqlite://")
+        holder = SimpleNamespace(sync_engine=engine)
+        sql_profiler.install(holder)  # type: ignore[arg-type]
+        sql_profiler.install(holder)  # type: ignore[arg-type]
+        profile = RequestProfile()
+        token = sql_profiler._current.set(profile)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            sql_profiler._current.reset(token)
+        assert profile.count == 1
+
+
+class TestMiddleware:
+    async def test_headers_report_request_queries(self) -> None:
+        engine = _sqlite_engine()
+        app = FastAPI()
+
+        @app.get("/q")
+        async def q() -> dict[str, str]:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            return {"ok": "1"}
+
+        app.add_middleware(SqlProfilerMiddleware)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get("/q")
+        assert resp.headers["x-db-queries"] == "2"
+        assert float(resp.headers["x-db-time-ms"]) >= 0
+        assert sql_profiler._current.get() is None
+
+
+class TestAdminReport:
+    def test_disabled_raises(self) -> None:
+        with pytest.raises(SqlProfilerDisabledError) as exc_info:
+            AdminService().sql_profile_report(10)
+        assert exc_info.value.code == 9004
+
+    def test_enabled_returns_report(self) -> None:
+        engine = _sqlite_engine()
+        token = sql_profiler._current.set(RequestProfile())
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            sql_profiler._current.reset(token)
+        with patch.object(settings, "SQL_PROFILE_ENABLED", True):
+            result = AdminService().sql_profile_report(10)
+        assert result["statements"][0]["statement"] == "SELECT 1"
@@ -0,0 +1,103 @@
+"""Recent-trade tape: committed trades per market, warm-up from trades, public views."""
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_common.errors import MarketNotFoundError
+from src.pm_market.application.service import MarketApplicationService
+from src.pm_market.domain.models import Market
+from src.pm_matching.domain.models import TapeTrade
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+_AT = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _db(*trades: tuple[str, str | None, int]) -> MagicMock:
+    """Session whose execute() returns _RECENT_TRADES_SQL rows (market_id, trade_id, price)."""
+    rows = []
+    for market_id, trade_id, price in trades:
+        mapping = {
+            "market_id": market_id,
+            "trade_id": trade_id,
+            "price": price,
+            "quantity": 1,
+            "scenario": "TRANSFER_YES",
+            "buy_order_id": "b",
+            "taker_order_id": "s",
+            "executed_at": _AT,
+        }
+        rows.append(SimpleNamespace(_mapping=mapping, **mapping))
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(fetchall=MagicMock(return_value=rows)))
+    return db
+
+
+@pytest.fixture
+def engine(store: MemoryClearingStore) -> tuple[MatchingEngine, MemoryOrderRepository]:
+    return MatchingEngine(store=store, tape_size=2), MemoryOrderRepository(store)
+
+
+class TestEngineTape:
+    async def test_committed_trades_are_kept_newest_first(self, engine: Any) -> None:
+        eng, repo = engine
+        await eng.load_trade_tapes(_db(("mkt-1", "t0", 55)))
+        await eng.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await eng.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+
+        (newest,) = eng.recent_trades("mkt-1", 1)
+        assert (newest.price, newest.quantity, newest.taker_side) == (60, 4, "SELL")
+        assert newest.scenario
+        assert [t.price for t in eng.recent_trades("mkt-1", 10)] == [60, 55]
+
+    async def test_tape_is_bounded_and_unknown_until_loaded(self, engine: Any) -> None:
+        eng, _ = engine
+        assert eng.recent_trades("mkt-1", 10) is None
+        await eng.load_trade_tapes(
+            _db(("mkt-1", "t0", 50), ("mkt-1", "t1", 51), ("mkt-1", "t2", 52), ("mkt-2", None, 0))
+        )
+        assert [t.trade_id for t in eng.recent_trades("mkt-1", 10)] == ["t2", "t1"]
+        assert eng.recent_trades("mkt-2", 10) == []  # active, never traded
+        assert eng.recent_trades("mkt-3", 10) is None
+
+
+class TestMarketServiceTape:
+    async def test_orderbook_last_price_comes_from_the_tape(self) -> None:
+        repo = MagicMock()
+        repo.get_market_by_id = AsyncMock(return_value=MagicMock(spec=Market, status="ACTIVE"))
+        repo.get_last_trade_price = AsyncMock()
+
+        async def book(market_id: str, depth: int) -> Any:
+            return 3, [], []
+
+        def tape(market_id: str, limit: int) -> list[TapeTrade]:
+            return [TapeTrade("t1", 57, 1, "MINT", "BUY", _AT)][:limit]
+
+        resp = await MarketApplicationService(repo).get_orderbook(_DB, "mkt-1", 10, book, tape)
+        assert resp.last_trade_price_cents == 57
+        repo.get_last_trade_price.assert_not_awaited()
+
+    async def test_recent_trades_without_a_tape_check_the_market(self) -> None:
+        repo = MagicMock()
+        repo.get_market_by_id = AsyncMock(return_value=None)
+        service = MarketApplicationService(repo)
+        with pytest.raises(MarketNotFoundError):
+            await service.get_recent_trades(_DB, "nope", 10, lambda m, n: None)
+
+        resp = await service.get_recent_trades(
+            _DB, "mkt-1", 10, lambda m, n: [TapeTrade("t1", 57, 2, "MINT", "BUY", _AT)]
+        )
+        assert resp.items[0].model_dump() == {
+            "trade_id": "t1",
+            "price_cents": 57,
+            "quantity": 2,
+            "scenario": "MINT",
+            "taker_side": "BUY",
+            "executed_at": _AT.isoformat(),
+        }
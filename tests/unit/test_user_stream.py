@@ -0,0 +1,109 @@
+"""Private user stream: engine events split per user, ring buffers and resume."""
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.pm_clearing.infrastructure.memory_store import MemoryClearingStore
+from src.pm_matching.domain.models import CommandOutcome
+from src.pm_matching.engine.engine import MatchingEngine
+from src.pm_order.application.user_stream import UserEventStream
+from src.pm_order.infrastructure.memory import MemoryOrderRepository
+from tests.unit.helpers import make_order
+
+_DB: Any = None
+
+
+@pytest.fixture
+def setup(
+    store: MemoryClearingStore,
+) -> tuple[MatchingEngine, MemoryOrderRepository, UserEventStream]:
+    engine = MatchingEngine(store=store)
+    stream = UserEventStream(buffer_size=100)
+    engine.add_listener(stream.on_outcome, events=True)
+    return engine, MemoryOrderRepository(store), stream
+
+
+async def _take(messages: Any, n: int) -> list[dict[str, Any]]:
+    return [await asyncio.wait_for(anext(messages), 1) for _ in range(n)]
+
+
+class TestUserEventStream:
+    async def test_fill_reaches_both_parties_with_their_side(self, setup: Any) -> None:
+        engine, repo, stream = setup
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        await engine.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+
+        alice = await _take(stream.messages("alice", since=0), 1 + stream.seq("alice"))
+        by_type = {m["type"]: m["data"] for m in alice[1:]}
+        assert by_type["order"]["order_id"] == "o1"
+        assert by_type["order"]["status"] == "PARTIALLY_FILLED"
+        assert by_type["fill"]["order_id"] == "o1"
+        assert by_type["fill"]["role"] == "MAKER"
+        assert by_type["fill"]["quantity"] == 4
+        assert {"available_balance", "frozen_balance"} <= by_type["balance"].keys()
+        assert by_type["position"]["yes_volume"] == 4
+
+        bob = await _take(stream.messages("bob", since=0), 1 + stream.seq("bob"))
+        fill = next(m["data"] for m in bob if m["type"] == "fill")
+        assert (fill["order_id"], fill["role"], fill["direction"]) == ("o2", "TAKER", "SELL")
+        assert {m["data"]["order_id"] for m in bob if m["type"] == "order"} == {"o2"}
+
+    async def test_resume_replays_only_newer_events(self, setup: Any) -> None:
+        engine, repo, stream = setup
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        seen = stream.seq("alice")
+        await engine.cancel_order("o1", "alice", repo, _DB)
+
+        messages = stream.messages("alice", since=seen)
+        hello, *replayed = await _take(messages, 1 + stream.seq("alice") - seen)
+        assert hello == {"type": "subscribed", "seq": stream.seq("alice")}
+        assert [m["seq"] for m in replayed] == list(range(seen + 1, stream.seq("alice") + 1))
+        assert replayed[0]["data"]["status"] == "CANCELLED"
+
+    async def test_live_events_follow_the_subscription(self, setup: Any) -> None:
+        engine, repo, stream = setup
+        messages = stream.messages("alice", since=None)
+        assert await _take(messages, 1) == [{"type": "subscribed", "seq": 0}]
+        assert stream.subscriber_count == 1
+
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        (first,) = await _take(messages, 1)
+        assert first["seq"] == 1
+        await messages.aclose()
+        assert stream.subscriber_count == 0
+
+    async def test_failed_commit_pushes_nothing(self, setup: Any) -> None:
+        engine, repo, stream = setup
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        seen = stream.seq("alice")
+        with (
+            patch.object(engine._store, "commit", AsyncMock(side_effect=OSError("lost"))),
+            pytest.raises(OSError),
+        ):
+            await engine.place_order(make_order("o2", "bob", "NO", 40, qty=4), repo, _DB)
+        assert stream.seq("alice") == seen
+        assert stream.seq("bob") == 0
+
+    async def test_overflowed_or_unknown_seq_reports_a_gap(self, setup: Any) -> None:
+        engine, repo, _ = setup
+        stream = UserEventStream(buffer_size=1)
+        engine.add_listener(stream.on_outcome, events=True)
+        await engine.place_order(make_order("o1", "alice", "YES", 60), repo, _DB)
+        newest = stream.seq("alice")
+        assert newest > 1
+
+        assert (await _take(stream.messages("alice", since=0), 2))[1] == {
+            "type": "gap",
+            "seq": newest,
+        }
+        restarted = await _take(stream.messages("alice", since=newest + 5), 2)
+        assert restarted[1]["type"] == "gap"
+
+    async def test_idle_buffers_are_evicted_beyond_max_users(self) -> None:
+        stream = UserEventStream(max_users=1)
+        row = {"event_type": "BALANCE_CHANGED", "user_id": "alice", "payload": {}}
+        stream.on_outcome(CommandOutcome("mkt-1", events=[row]))
+        stream.on_outcome(CommandOutcome("mkt-1", events=[{**row, "user_id": "bob"}]))
+        assert (stream.seq("alice"), stream.seq("bob")) == (0, 1)